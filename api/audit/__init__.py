@@ -0,0 +1,53 @@
+"""
+Tamper-evident audit log for LUMEN SDK API.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from .log import (
+    API_KEY_CREATED,
+    API_KEY_REVOKED,
+    EVALUATION_COMPLETED,
+    GENESIS,
+    POLICY_PACK_DISABLED,
+    POLICY_PACK_ENABLED,
+    AuditEvent,
+    AuditIntegrityError,
+    AuditLog,
+    AuditLogLocked,
+    Checkpoint,
+    InclusionProof,
+    get_audit_log,
+    init_audit_log,
+    record_events,
+    record_key,
+    set_audit_log,
+)
+from .merkle import MerkleTree, verify_inclusion
+from .segments import SegmentCorrupt, SegmentReader, SegmentWriter, WriterLock
+
+__all__ = [
+    "API_KEY_CREATED",
+    "API_KEY_REVOKED",
+    "EVALUATION_COMPLETED",
+    "GENESIS",
+    "POLICY_PACK_DISABLED",
+    "POLICY_PACK_ENABLED",
+    "AuditEvent",
+    "AuditIntegrityError",
+    "AuditLog",
+    "AuditLogLocked",
+    "Checkpoint",
+    "InclusionProof",
+    "MerkleTree",
+    "SegmentCorrupt",
+    "SegmentReader",
+    "SegmentWriter",
+    "WriterLock",
+    "get_audit_log",
+    "init_audit_log",
+    "record_events",
+    "record_key",
+    "set_audit_log",
+    "verify_inclusion",
+]
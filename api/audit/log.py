@@ -0,0 +1,815 @@
+"""
+Hash-chained, append-only audit log for LUMEN SDK API.
+
+The Python counterpart of the AuditChain in src/primitives/AuditEvent.ts:
+every event carries the hash of its predecessor, and its own hash covers
+that link, so changing any past event breaks the chain from there on.
+
+Events are stored in binary segment files (see audit.segments) under
+AUDIT_LOG_DIR: the canonical JSON that is hashed is the entry payload and
+the hash is in the entry header, so checking an event's hash reads the
+mapped segment without copying or re-encoding it. Every
+AUDIT_CHECKPOINT_INTERVAL events the block is sealed: its Merkle root,
+and the root of the tree over all sealed events (merkle.MerkleTree,
+built from the block roots), are appended to checkpoints.log.
+Publishing a checkpoint root anchors every event before it:
+
+- appends hash one event, and sealing a block hashes its leaves once, so
+  appends are amortized O(1);
+- prove() returns an O(log n) inclusion path of a sealed event against a
+  checkpoint root;
+- verify_range() rehashes the requested events and proves the last sealed
+  one, which covers the rest of the range through the chain;
+- verify() checks the checkpoint roots and the events since the last
+  checkpoint instead of rehashing the whole log (deep=True does that).
+
+Evaluation events are keyed by record_id, so find() looks a record up
+through each segment's key table. A segment rolls over every
+AUDIT_SEGMENT_EVENTS events; sealed segments beyond the newest
+AUDIT_HOT_SEGMENTS are compressed in the background.
+
+Events after the last checkpoint are protected by the chain alone until
+their block is sealed.
+
+One process writes a directory: opening a log takes an exclusive flock
+on its lock file, and a second opener gets AuditLogLocked. Each worker
+process writes its own chain, in the first worker-<n> directory under
+AUDIT_LOG_DIR that no live process holds (see init_audit_log()), so a
+recycled worker carries on the chain of the one it replaces. Events carry
+the AI outcome of evaluations, so AUDIT_LOG_DIR must be configured
+outside the shared temporary directory, and files are owner-only.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+from uuid import uuid4
+import logging
+
+from .merkle import MerkleTree, leaf_hash, verify_inclusion
+from .segments import (
+    NO_KEY,
+    Entry,
+    SegmentCorrupt,
+    SegmentReader,
+    SegmentWriter,
+    WriterLock,
+    compress_segment,
+    list_segments,
+    segment_base,
+)
+
+logger = logging.getLogger(__name__)
+
+# Audit log configuration - override via environment
+# Required; each worker writes a worker-<n> directory under it
+AUDIT_LOG_DIR = os.getenv("AUDIT_LOG_DIR", "")
+# Events per sealed block (a power of two)
+AUDIT_CHECKPOINT_INTERVAL = int(os.getenv("AUDIT_CHECKPOINT_INTERVAL", "1024"))
+# Events per segment file (a multiple of the checkpoint interval)
+AUDIT_SEGMENT_EVENTS = int(os.getenv("AUDIT_SEGMENT_EVENTS", "65536"))
+# Events between sparse index entries
+AUDIT_INDEX_INTERVAL = int(os.getenv("AUDIT_INDEX_INTERVAL", "64"))
+# Sealed segments left uncompressed (and mapped); older ones are compressed
+AUDIT_HOT_SEGMENTS = int(os.getenv("AUDIT_HOT_SEGMENTS", "2"))
+AUDIT_COMPRESS_SEGMENTS = os.getenv("AUDIT_COMPRESS_SEGMENTS", "true").lower() == "true"
+# Segment readers kept open
+AUDIT_OPEN_SEGMENTS = int(os.getenv("AUDIT_OPEN_SEGMENTS", "8"))
+
+# previous_hash of the first event, as in AuditChain
+GENESIS = "GENESIS"
+CHECKPOINTS_FILE = "checkpoints.log"
+
+# Event types written by the API (AuditEvent.ts names where one exists)
+EVALUATION_COMPLETED = "EVALUATION_COMPLETED"
+API_KEY_CREATED = "API_KEY_CREATED"
+API_KEY_REVOKED = "API_KEY_REVOKED"
+POLICY_PACK_ENABLED = "POLICY_PACK_ENABLED"
+POLICY_PACK_DISABLED = "POLICY_PACK_DISABLED"
+
+
+def _canonical(body: Dict[str, Any]) -> bytes:
+    return json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def record_key(record_id: str) -> bytes:
+    """Segment key of a record id."""
+    return hashlib.blake2b(record_id.encode("utf-8"), digest_size=16).digest()
+
+
+class AuditIntegrityError(Exception):
+    """Raised when stored events do not match their hashes, chain or checkpoints."""
+
+    def __init__(self, sequence: int, message: str):
+        super().__init__(f"Audit event {sequence}: {message}")
+        self.sequence = sequence
+
+
+class AuditLogLocked(Exception):
+    """Raised when another process has an audit log directory open."""
+
+
+class AuditEvent:
+    """An immutable audit event."""
+
+    __slots__ = (
+        "sequence", "event_id", "event_type", "org_id", "actor", "timestamp", "payload",
+        "previous_hash", "hash",
+    )
+
+    def __init__(
+        self,
+        sequence: int,
+        event_id: str,
+        event_type: str,
+        org_id: str,
+        actor: Dict[str, Any],
+        timestamp: str,
+        payload: Dict[str, Any],
+        previous_hash: str,
+        hash: Optional[str] = None,
+    ):
+        self.sequence = sequence
+        self.event_id = event_id
+        self.event_type = event_type
+        self.org_id = org_id
+        self.actor = actor
+        self.timestamp = timestamp
+        self.payload = payload
+        self.previous_hash = previous_hash
+        self.hash = hash if hash is not None else self.compute_hash()
+
+    def body(self) -> bytes:
+        """Canonical JSON of every field but the hash (what is hashed and stored)."""
+        return _canonical({name: getattr(self, name) for name in self.__slots__[:-1]})
+
+    def compute_hash(self) -> str:
+        """SHA-256 of body()."""
+        return hashlib.sha256(self.body()).hexdigest()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_entry(cls, entry: Entry) -> "AuditEvent":
+        """
+        Parse a segment entry.
+
+        Raises:
+            AuditIntegrityError: If the payload is not an event
+        """
+        try:
+            return cls(**json.loads(bytes(entry.payload)), hash=entry.digest.hex())
+        except (ValueError, TypeError) as e:
+            raise AuditIntegrityError(entry.sequence, f"unreadable event ({e})") from None
+
+
+class Checkpoint:
+    """A sealed block: its Merkle root and the root of everything up to it."""
+
+    __slots__ = ("size", "block_root", "root", "head", "timestamp")
+
+    def __init__(self, size: int, block_root: str, root: str, head: str, timestamp: float):
+        self.size = size
+        self.block_root = block_root
+        self.root = root
+        # Hash of the last event in the block
+        self.head = head
+        self.timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class InclusionProof:
+    """Merkle inclusion path of one event against a checkpoint root."""
+
+    __slots__ = ("sequence", "event_hash", "size", "root", "path")
+
+    def __init__(self, sequence: int, event_hash: str, size: int, root: str, path: List[str]):
+        self.sequence = sequence
+        self.event_hash = event_hash
+        self.size = size
+        self.root = root
+        self.path = path
+
+    def verify(self, root: Optional[str] = None) -> bool:
+        """
+        Check the path.
+
+        Args:
+            root: Trusted root of a checkpoint of this size (e.g. one
+                published earlier); defaults to the root in the proof
+
+        Returns:
+            bool: True if the event is included under the root
+        """
+        try:
+            return verify_inclusion(
+                leaf_hash(bytes.fromhex(self.event_hash)), self.sequence, self.size,
+                [bytes.fromhex(node) for node in self.path], bytes.fromhex(root or self.root),
+            )
+        except ValueError:
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class AuditLog:
+    """Segmented, checkpointed audit log in a directory."""
+
+    def __init__(
+        self,
+        directory: str = AUDIT_LOG_DIR,
+        checkpoint_interval: int = AUDIT_CHECKPOINT_INTERVAL,
+        segment_events: int = AUDIT_SEGMENT_EVENTS,
+        index_interval: int = AUDIT_INDEX_INTERVAL,
+        hot_segments: int = AUDIT_HOT_SEGMENTS,
+        compress: bool = AUDIT_COMPRESS_SEGMENTS,
+    ):
+        """
+        Args:
+            directory: Directory of the segment and checkpoint files
+            checkpoint_interval: Events per sealed block
+            segment_events: Events per segment file
+            index_interval: Events between sparse index entries
+            hot_segments: Sealed segments kept uncompressed
+            compress: Compress colder segments when a segment rolls over
+
+        Raises:
+            ValueError: If the interval is not a power of two, or segments
+                do not hold whole blocks
+        """
+        if checkpoint_interval < 1 or checkpoint_interval & (checkpoint_interval - 1):
+            raise ValueError("checkpoint_interval must be a power of two")
+        if segment_events < 1 or segment_events % checkpoint_interval:
+            raise ValueError("segment_events must be a multiple of checkpoint_interval")
+        self.directory = directory
+        self.checkpoint_interval = checkpoint_interval
+        self.segment_events = segment_events
+        self.index_interval = max(1, index_interval)
+        self.hot_segments = max(0, hot_segments)
+        self.compress = compress
+        self.compressed = 0
+        self._lock = threading.Lock()
+        self._writer_lock = WriterLock(directory)
+        self._compressor: Optional[threading.Thread] = None
+        self._compress_pending = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._opened = False
+        self._checkpoints: List[Checkpoint] = []
+        # Tree over the block roots of sealed blocks
+        self._tree = MerkleTree()
+        # Leaf hashes of the open block
+        self._leaves: List[bytes] = []
+        self._head = GENESIS
+        self._size = 0
+        self._writer: Optional[SegmentWriter] = None
+        self._readers: "OrderedDict[int, SegmentReader]" = OrderedDict()
+        self._checkpoint_file = None
+
+    # --- Files --------------------------------------------------------------
+
+    def _segment_first(self, sequence: int) -> int:
+        return sequence - sequence % self.segment_events
+
+    def _open(self) -> None:
+        """Load checkpoints and the open block (once)."""
+        if self._opened:
+            return
+        try:
+            self._load()
+        except SegmentCorrupt as e:
+            sequence = self._size
+            self._close_files()
+            self._reset()
+            raise AuditIntegrityError(sequence, str(e)) from None
+        except Exception:
+            self._close_files()
+            self._reset()
+            raise
+
+    def _close_files(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        for reader in self._readers.values():
+            reader.close()
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.close()
+        # Last: nothing may be written once another process can open the log
+        self._writer_lock.release()
+
+    def _load(self) -> None:
+        # Before anything is read: recovery truncates torn tails, which
+        # must not race another writer's appends
+        if not self._writer_lock.acquire():
+            raise AuditLogLocked(f"Audit log {self.directory} is open in another process")
+        checkpoints_path = os.path.join(self.directory, CHECKPOINTS_FILE)
+        if os.path.exists(checkpoints_path):
+            with open(checkpoints_path, "rb") as f:
+                data = f.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                logger.warning(f"Dropping torn final line of {checkpoints_path}")
+                with open(checkpoints_path, "r+b") as f:
+                    f.truncate(complete)
+            for index, line in enumerate(data[:complete].splitlines()):
+                try:
+                    checkpoint = Checkpoint(**json.loads(line))
+                except (ValueError, TypeError):
+                    raise AuditIntegrityError(
+                        (index + 1) * self.checkpoint_interval - 1, "unreadable checkpoint"
+                    ) from None
+                self._checkpoints.append(checkpoint)
+                self._tree.append(bytes.fromhex(checkpoint.block_root))
+        if self._checkpoints:
+            self._size, self._head = self._checkpoints[-1].size, self._checkpoints[-1].head
+        self._checkpoint_file = open(os.open(checkpoints_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600), "ab")
+        self._opened = True
+
+        # Events written after the last checkpoint
+        first = self._segment_first(self._size)
+        base = segment_base(self.directory, first)
+        if not os.path.exists(base + ".seg"):
+            if self._size % self.segment_events:
+                raise AuditIntegrityError(self._size, "segment of the last checkpoint is missing")
+            return
+        self._writer = SegmentWriter(base, first, self.index_interval, self._writer_lock)
+        end = first + self._writer.count
+        if end < self._size:
+            raise AuditIntegrityError(end, "segment ends before the last checkpoint")
+        for entry in SegmentReader(base, first).entries(self._size, end):
+            self._accept(self._verified(entry, self._size, self._head))
+        if self._size:
+            logger.info(f"Audit log opened at {self._size} events, {len(self._checkpoints)} checkpoints")
+
+    def _reader(self, first: int) -> SegmentReader:
+        if self._writer is not None and first == self._writer.first:
+            # The segment being written grows: map it afresh
+            self._writer.flush()
+            return SegmentReader(self._writer.base, first)
+        reader = self._readers.get(first)
+        if reader is None:
+            reader = SegmentReader(segment_base(self.directory, first), first)
+            self._readers[first] = reader
+            if len(self._readers) > AUDIT_OPEN_SEGMENTS:
+                self._readers.popitem(last=False)[1].close()
+        else:
+            self._readers.move_to_end(first)
+        return reader
+
+    def _entries(self, start: int, end: int) -> Iterator[Entry]:
+        for first in range(self._segment_first(start), end, self.segment_events):
+            yield from self._reader(first).entries(max(start, first), min(end, first + self.segment_events))
+
+    def _verified(self, entry: Entry, sequence: int, previous_hash: Optional[str]) -> AuditEvent:
+        """Parse an entry, checking its hash, sequence and (unless None) chain link."""
+        if entry.sequence != sequence:
+            raise AuditIntegrityError(sequence, f"found sequence {entry.sequence}")
+        # Hashes the stored bytes in place
+        if hashlib.sha256(entry.payload).digest() != entry.digest:
+            raise AuditIntegrityError(sequence, "hash does not match the event")
+        event = AuditEvent.from_entry(entry)
+        if event.sequence != sequence:
+            raise AuditIntegrityError(sequence, f"event carries sequence {event.sequence}")
+        if previous_hash is not None and event.previous_hash != previous_hash:
+            raise AuditIntegrityError(sequence, "previous_hash does not match the preceding event")
+        return event
+
+    def _accept(self, event: AuditEvent) -> None:
+        """Add a written event to the open block, sealing it when full."""
+        self._leaves.append(leaf_hash(bytes.fromhex(event.hash)))
+        self._head = event.hash
+        self._size += 1
+        if len(self._leaves) == self.checkpoint_interval:
+            self._seal()
+
+    def _seal(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+        block_root = MerkleTree(self._leaves).root()
+        self._tree.append(block_root)
+        checkpoint = Checkpoint(self._size, block_root.hex(), self._tree.root().hex(), self._head, time.time())
+        self._checkpoint_file.write(_canonical(checkpoint.to_dict()) + b"\n")
+        self._checkpoint_file.flush()
+        os.fsync(self._checkpoint_file.fileno())
+        self._checkpoints.append(checkpoint)
+        self._leaves = []
+        if self._size % self.segment_events == 0 and self._writer is not None:
+            # Next event starts a new segment
+            self._writer.seal()
+            self._writer = None
+            if self.compress:
+                self._compress_pending = True
+                if self._compressor is None:
+                    self._compressor = threading.Thread(target=self._compress_in_background, daemon=True)
+                    self._compressor.start()
+
+    def open(self) -> None:
+        """
+        Open the log now rather than on first use.
+
+        Raises:
+            AuditLogLocked: If another process has the directory open
+            AuditIntegrityError: If the stored events after the last
+                checkpoint do not verify
+        """
+        with self._lock:
+            self._open()
+
+    # --- Writing ------------------------------------------------------------
+
+    def append_many(
+        self, event_type: str, org_id: str, actor: Dict[str, Any], payloads: Iterable[Dict[str, Any]]
+    ) -> List[AuditEvent]:
+        """
+        Append one event per payload.
+
+        Args:
+            event_type: Event type, e.g. EVALUATION_COMPLETED
+            org_id: Organization the events belong to
+            actor: Who caused them, e.g. {"type": "SERVICE", "id": key_id}
+            payloads: JSON-serializable event payloads; a record_id in the
+                payload makes the event findable with find()
+
+        Returns:
+            List[AuditEvent]: The appended events
+        """
+        with self._lock:
+            self._open()
+            timestamp = datetime.now(timezone.utc).isoformat()
+            events = []
+            for payload in payloads:
+                fields = {
+                    "sequence": self._size, "event_id": str(uuid4()), "event_type": event_type, "org_id": org_id,
+                    "actor": actor, "timestamp": timestamp, "payload": payload, "previous_hash": self._head,
+                }
+                body = _canonical(fields)
+                digest = hashlib.sha256(body).digest()
+                record_id = payload.get("record_id")
+                if self._writer is None:
+                    first = self._segment_first(self._size)
+                    self._writer = SegmentWriter(
+                        segment_base(self.directory, first), first, self.index_interval, self._writer_lock
+                    )
+                self._writer.append(self._size, record_key(record_id) if record_id else NO_KEY, digest, body)
+                event = AuditEvent(**fields, hash=digest.hex())
+                self._accept(event)
+                events.append(event)
+            if self._writer is not None:
+                self._writer.flush()
+            return events
+
+    def append(self, event_type: str, org_id: str, actor: Dict[str, Any], payload: Dict[str, Any]) -> AuditEvent:
+        """Append one event (see append_many)."""
+        return self.append_many(event_type, org_id, actor, [payload])[0]
+
+    # --- Reading ------------------------------------------------------------
+
+    def _read(self, start: int, end: int) -> List[AuditEvent]:
+        if not 0 <= start <= end <= self._size:
+            raise ValueError(f"Range {start}-{end} is outside the log (0-{self._size})")
+        return [AuditEvent.from_entry(entry) for entry in self._entries(start, end)]
+
+    def read(self, start: int, end: int) -> List[AuditEvent]:
+        """
+        Events with sequence in [start, end), as stored (not verified).
+
+        Raises:
+            ValueError: If the range is outside the log
+        """
+        with self._lock:
+            self._open()
+            return self._read(start, end)
+
+    def find(self, record_id: str) -> List[AuditEvent]:
+        """
+        Events about a record (as stored, not verified), oldest first.
+
+        Each segment's key table is binary searched; the payloads of the
+        matches are parsed.
+        """
+        key = record_key(record_id)
+        with self._lock:
+            self._open()
+            sequences: List[int] = []
+            for first in range(0, self._size, self.segment_events):
+                if self._writer is not None and first == self._writer.first:
+                    sequences.extend(self._writer.keys.get(key, []))
+                else:
+                    sequences.extend(self._reader(first).find(key))
+            events = [event for sequence in sequences for event in self._read(sequence, sequence + 1)]
+            return [event for event in events if event.payload.get("record_id") == record_id]
+
+    def export(self, start: int, end: int, out: BinaryIO) -> int:
+        """
+        Write events with sequence in [start, end) to a binary stream as
+        JSON lines (the stored event plus its hash), without parsing them.
+
+        Returns:
+            int: Number of events written
+
+        Raises:
+            ValueError: If the range is outside the log
+        """
+        with self._lock:
+            self._open()
+            if not 0 <= start <= end <= self._size:
+                raise ValueError(f"Range {start}-{end} is outside the log (0-{self._size})")
+            written = 0
+            for entry in self._entries(start, end):
+                # Payloads are JSON objects: splice the hash in before the closing brace
+                out.write(entry.payload[:-1])
+                out.write(b',"hash":"' + entry.digest.hex().encode("ascii") + b'"}\n')
+                written += 1
+            return written
+
+    def _prove(self, sequence: int, size: int) -> InclusionProof:
+        interval = self.checkpoint_interval
+        if size % interval or not 0 < size <= len(self._checkpoints) * interval:
+            raise ValueError(f"No checkpoint at {size} events")
+        if not 0 <= sequence < size:
+            raise ValueError(f"Event {sequence} is not covered by the checkpoint at {size} events")
+        block = sequence // interval
+        digests = [entry.digest for entry in self._entries(block * interval, (block + 1) * interval)]
+        leaves = MerkleTree(leaf_hash(digest) for digest in digests)
+        path = leaves.path(sequence % interval) + self._tree.path(block, size // interval)
+        return InclusionProof(
+            sequence, digests[sequence % interval].hex(), size,
+            self._tree.root(size // interval).hex(), [node.hex() for node in path],
+        )
+
+    def prove(self, sequence: int, size: Optional[int] = None) -> InclusionProof:
+        """
+        Inclusion proof of a sealed event.
+
+        Args:
+            sequence: Event to prove
+            size: Checkpoint (event count) to prove against; None for the latest
+
+        Returns:
+            InclusionProof with O(log n) hashes
+
+        Raises:
+            ValueError: If the event is not covered by that checkpoint
+        """
+        with self._lock:
+            self._open()
+            return self._prove(sequence, len(self._checkpoints) * self.checkpoint_interval if size is None else size)
+
+    # --- Verification -------------------------------------------------------
+
+    def _verify_range(self, start: int, end: int) -> List[AuditEvent]:
+        if not 0 <= start < end <= self._size:
+            raise ValueError(f"Range {start}-{end} is outside the log (0-{self._size})")
+        sealed = len(self._checkpoints) * self.checkpoint_interval
+        # Unsealed events are anchored by the chain from the last checkpoint
+        first = min(start, sealed) if end > sealed else start
+        previous = None
+        if first == 0:
+            previous = GENESIS
+        elif first == sealed:
+            previous = self._checkpoints[-1].head
+
+        events = []
+        for entry in self._entries(first, end):
+            event = self._verified(entry, first + len(events), previous)
+            events.append(event)
+            previous = event.hash
+        if len(events) != end - first:
+            raise AuditIntegrityError(first + len(events), "missing from its segment")
+
+        # The chain ties every earlier event in the range to the last sealed one
+        last = min(end, sealed) - 1
+        if last >= first:
+            proof = self._prove(last, sealed)
+            if proof.event_hash != events[last - first].hash or not proof.verify():
+                raise AuditIntegrityError(last, "not included under the checkpoint root")
+        return events[start - first:]
+
+    def verify_range(self, start: int, end: int) -> List[AuditEvent]:
+        """
+        Read and verify events with sequence in [start, end).
+
+        Rehashes the range (plus the unsealed events before it, if it ends
+        after the last checkpoint) and checks one O(log n) inclusion proof.
+
+        Returns:
+            List[AuditEvent]: The verified events
+
+        Raises:
+            ValueError: If the range is empty or outside the log
+            AuditIntegrityError: If an event was altered
+        """
+        with self._lock:
+            self._open()
+            return self._verify_range(start, end)
+
+    def verify(self, deep: bool = False) -> int:
+        """
+        Verify the log.
+
+        Checks every checkpoint root against the block roots, then the
+        events since the last checkpoint and the proof of the last sealed
+        event. deep=True also rehashes every sealed block.
+
+        Returns:
+            int: Number of events rehashed
+
+        Raises:
+            AuditIntegrityError: If an event or checkpoint was altered
+        """
+        with self._lock:
+            self._open()
+            interval = self.checkpoint_interval
+            tree = MerkleTree()
+            for index, checkpoint in enumerate(self._checkpoints):
+                tree.append(bytes.fromhex(checkpoint.block_root))
+                if tree.root().hex() != checkpoint.root or checkpoint.size != (index + 1) * interval:
+                    raise AuditIntegrityError(checkpoint.size - 1, "checkpoint root does not match the block roots")
+
+            checked = 0
+            if deep:
+                previous = GENESIS
+                for block, checkpoint in enumerate(self._checkpoints):
+                    leaves = MerkleTree()
+                    for entry in self._entries(block * interval, checkpoint.size):
+                        event = self._verified(entry, block * interval + len(leaves), previous)
+                        leaves.append(leaf_hash(entry.digest))
+                        previous = event.hash
+                    if len(leaves) != interval or leaves.root().hex() != checkpoint.block_root:
+                        raise AuditIntegrityError(checkpoint.size - 1, "block does not match its checkpoint")
+                    checked += interval
+
+            sealed = len(self._checkpoints) * interval
+            start = sealed if deep or not sealed else sealed - 1
+            if self._size > start:
+                checked += len(self._verify_range(start, self._size))
+            return checked
+
+    # --- Cold segments ------------------------------------------------------
+
+    def compress_cold_segments(self) -> int:
+        """
+        Compress sealed segments older than the newest hot_segments.
+
+        A compressed segment is inflated into memory when it is read.
+
+        Returns:
+            int: Number of segments compressed
+        """
+        with self._lock:
+            self._open()
+            active = self._segment_first(self._size)
+        sealed = [first for first in list_segments(self.directory) if first < active]
+        cold = sealed[:max(0, len(sealed) - self.hot_segments)]
+        compressed = 0
+        for first in cold:
+            base = segment_base(self.directory, first)
+            if not os.path.exists(base + ".seg"):
+                continue
+            if not os.path.exists(base + ".seg.z"):
+                compress_segment(base)
+                compressed += 1
+            with self._lock:
+                reader = self._readers.pop(first, None)
+                if reader is not None:
+                    reader.close()
+                os.remove(base + ".seg")
+        self.compressed += compressed
+        return compressed
+
+    def _compress_in_background(self) -> None:
+        # Runs until no segment has rolled over since the last pass
+        while True:
+            with self._lock:
+                if not self._compress_pending:
+                    self._compressor = None
+                    return
+                self._compress_pending = False
+            try:
+                count = self.compress_cold_segments()
+                if count:
+                    logger.info(f"Compressed {count} cold audit segments")
+            except Exception as e:
+                logger.error(f"Audit segment compression failed: {e}")
+
+    # --- Lifecycle ----------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        """Number of events in the log."""
+        with self._lock:
+            self._open()
+            return self._size
+
+    def checkpoint(self) -> Optional[Checkpoint]:
+        """The latest checkpoint, whose root can be published."""
+        with self._lock:
+            self._open()
+            return self._checkpoints[-1] if self._checkpoints else None
+
+    def close(self) -> None:
+        """Close the files; the log reopens from disk on next use."""
+        compressor = self._compressor
+        if compressor is not None:
+            compressor.join()
+        with self._lock:
+            self._close_files()
+            self._reset()
+
+    def stats(self) -> dict:
+        """Return event, checkpoint and segment counts."""
+        with self._lock:
+            return {
+                "events": self._size,
+                "checkpoints": len(self._checkpoints),
+                "unsealed": len(self._leaves),
+                "segments": (self._size - 1) // self.segment_events + 1 if self._size else 0,
+                "compressed_segments": self.compressed,
+                "root": self._checkpoints[-1].root if self._checkpoints else None,
+            }
+
+
+# Global audit log instance (this worker's log, opened at startup)
+_audit_log: Optional[AuditLog] = None
+
+
+def init_audit_log(directory: str = AUDIT_LOG_DIR) -> AuditLog:
+    """
+    Open this worker's audit log, unless one is installed already.
+
+    The log is the first worker-<n> directory under directory that no
+    live process has open.
+
+    Args:
+        directory: Parent directory of the workers' logs
+
+    Returns:
+        AuditLog: The opened log
+
+    Raises:
+        ValueError: If directory is not set or is in the temporary directory
+        AuditIntegrityError: If the log does not verify when opened
+    """
+    global _audit_log
+    if _audit_log is not None:
+        return _audit_log
+    if not directory:
+        raise ValueError("AUDIT_LOG_DIR must be set")
+    tmp = os.path.realpath(tempfile.gettempdir())
+    if os.path.commonpath([os.path.realpath(directory), tmp]) == tmp:
+        raise ValueError(f"AUDIT_LOG_DIR must not be in the temporary directory ({tmp})")
+
+    for slot in itertools.count():
+        log = AuditLog(os.path.join(directory, f"worker-{slot}"))
+        try:
+            log.open()
+        except AuditLogLocked:
+            continue
+        logger.info(f"Audit log {log.directory} opened at {log.size} events")
+        _audit_log = log
+        return log
+
+
+def set_audit_log(log: Optional[AuditLog]) -> None:
+    """Install an audit log instance (used by tests and embedding apps)."""
+    global _audit_log
+    _audit_log = log
+
+
+def get_audit_log() -> AuditLog:
+    """
+    Get the process-wide audit log.
+
+    Raises:
+        RuntimeError: If the audit log hasn't been initialized
+    """
+    if _audit_log is None:
+        raise RuntimeError("Audit log not initialized. Call init_audit_log() first.")
+    return _audit_log
+
+
+def record_events(event_type: str, org_id: str, actor: Dict[str, Any], payloads: Iterable[Dict[str, Any]]) -> None:
+    """
+    Append events to the process-wide audit log.
+
+    Failures are logged rather than raised, so a full or unwritable disk
+    does not fail the request that is being audited.
+    """
+    try:
+        get_audit_log().append_many(event_type, org_id, actor, payloads)
+    except Exception as e:
+        logger.error(f"Audit log append failed for {event_type}: {e}")
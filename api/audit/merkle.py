@@ -0,0 +1,142 @@
+"""
+Append-only Merkle tree for LUMEN SDK API audit checkpoints.
+
+Trees have the RFC 6962 (Certificate Transparency) shape: leaves are
+hashed as SHA-256(0x00 || data) and interior nodes as
+SHA-256(0x01 || left || right), and a tree of n leaves splits at the
+largest power of two below n. Every complete, aligned subtree hash is
+kept, so appends are amortized O(1) and roots and inclusion paths of
+any prefix of the tree cost O(log^2 n) hashes at most.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import hashlib
+from typing import Iterable, List, Optional
+
+
+def leaf_hash(data: bytes) -> bytes:
+    """Hash of a leaf."""
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash of an interior node."""
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _split(size: int) -> int:
+    """Largest power of two below size (size > 1)."""
+    return 1 << ((size - 1).bit_length() - 1)
+
+
+class MerkleTree:
+    """
+    Merkle tree over already-hashed nodes.
+
+    Nodes are usually leaf_hash() values, or the roots of complete
+    subtrees of equal size (so a tree of block roots has the same shape
+    and root as the tree of all leaves of those blocks).
+    """
+
+    def __init__(self, nodes: Iterable[bytes] = ()):
+        # _levels[h][j]: hash of the complete subtree of 2**h nodes starting at j * 2**h
+        self._levels: List[List[bytes]] = [[]]
+        for node in nodes:
+            self.append(node)
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    def append(self, node: bytes) -> None:
+        """Add a node on the right of the tree."""
+        level, index = 0, len(self._levels[0])
+        self._levels[0].append(node)
+        while index % 2 == 1:
+            node = node_hash(self._levels[level][index - 1], node)
+            level, index = level + 1, index // 2
+            if level == len(self._levels):
+                self._levels.append([])
+            self._levels[level].append(node)
+
+    def _subtree(self, start: int, size: int) -> bytes:
+        # Callers only ask for ranges aligned like the RFC 6962 split, so a
+        # power-of-two range is always a stored complete subtree
+        if size & (size - 1) == 0:
+            height = size.bit_length() - 1
+            return self._levels[height][start >> height]
+        split = _split(size)
+        return node_hash(self._subtree(start, split), self._subtree(start + split, size - split))
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        """
+        Root of the tree over the first size nodes.
+
+        Args:
+            size: Number of nodes; None for the whole tree
+
+        Returns:
+            bytes: Root hash (SHA-256 of nothing for an empty tree)
+        """
+        size = len(self) if size is None else size
+        if not 0 <= size <= len(self):
+            raise ValueError(f"Tree has {len(self)} nodes, not {size}")
+        if size == 0:
+            return hashlib.sha256(b"").digest()
+        return self._subtree(0, size)
+
+    def path(self, index: int, size: Optional[int] = None) -> List[bytes]:
+        """
+        Inclusion path of a node in the tree over the first size nodes.
+
+        Args:
+            index: Position of the node
+            size: Number of nodes; None for the whole tree
+
+        Returns:
+            List[bytes]: Sibling hashes from the node up to the root
+        """
+        size = len(self) if size is None else size
+        if not 0 <= index < size <= len(self):
+            raise ValueError(f"No node {index} in a tree of {size}")
+        path, start = [], 0
+        while size > 1:
+            split = _split(size)
+            if index < split:
+                path.append(self._subtree(start + split, size - split))
+                size = split
+            else:
+                path.append(self._subtree(start, split))
+                start, index, size = start + split, index - split, size - split
+        path.reverse()
+        return path
+
+
+def verify_inclusion(node: bytes, index: int, size: int, path: List[bytes], root: bytes) -> bool:
+    """
+    Check an inclusion path (RFC 9162, section 2.1.3.2).
+
+    Args:
+        node: Hash of the node the path is for
+        index: Position of the node
+        size: Number of nodes in the tree
+        path: Sibling hashes from MerkleTree.path()
+        root: Root hash of the tree
+
+    Returns:
+        bool: True if the path leads from the node to the root
+    """
+    if not 0 <= index < size:
+        return False
+    fn, sn, result = index, size - 1, node
+    for sibling in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            result = node_hash(sibling, result)
+            while not fn & 1 and fn != 0:
+                fn, sn = fn >> 1, sn >> 1
+        else:
+            result = node_hash(result, sibling)
+        fn, sn = fn >> 1, sn >> 1
+    return sn == 0 and result == root
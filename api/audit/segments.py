@@ -0,0 +1,359 @@
+"""
+Binary segment files for the LUMEN SDK API audit log.
+
+A segment holds consecutive entries of the log. Each entry is a fixed-size
+header followed by its payload:
+
+    length u32 | crc32 u32 | sequence u64 | key 16 bytes | digest 32 bytes | payload
+
+Files of the segment whose first sequence is F (segment-F.*):
+
+- .seg: file header (magic, version, first sequence) and entries; .seg.z
+  once a cold segment is compressed
+- .idx: sparse index, (sequence, offset) of every index_interval-th entry
+- .keys: (key, sequence) of every keyed entry, sorted by key, written when
+  the segment is sealed
+
+SegmentReader maps a segment with mmap and yields memoryview payloads, so
+range scans and key lookups copy nothing until a payload is parsed.
+Compressed segments are inflated into memory once and read the same way.
+
+A directory has one writer process. It holds a WriterLock (an exclusive
+flock on the directory's lock file), and SegmentWriter refuses to recover
+or append to a segment without it: recovery truncates what looks like a
+torn final entry and rewrites the index, which would destroy another
+writer's appends in flight.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import bisect
+import fcntl
+import mmap
+import os
+import re
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LUMNSEG1"
+VERSION = 1
+# magic, version, flags, reserved, first sequence
+FILE_HEADER = struct.Struct("<8sHHIQ")
+# payload length, payload CRC-32, sequence, key, digest
+ENTRY_HEADER = struct.Struct("<IIQ16s32s")
+INDEX_ENTRY = struct.Struct("<QQ")
+KEY_ENTRY = struct.Struct("<16sQ")
+NO_KEY = bytes(16)
+
+LOCK_FILE = "lock"
+
+_SEGMENT_NAME = re.compile(r"segment-(\d{12})\.seg(\.z)?$")
+
+
+class SegmentCorrupt(Exception):
+    """Raised when a segment file is not a valid sequence of entries."""
+
+    def __init__(self, path: str, offset: int, message: str):
+        super().__init__(f"{path} at byte {offset}: {message}")
+        self.path = path
+        self.offset = offset
+
+
+class Entry:
+    """An entry read from a segment; payload is a view into the segment."""
+
+    __slots__ = ("sequence", "key", "digest", "payload")
+
+    def __init__(self, sequence: int, key: bytes, digest: bytes, payload: memoryview):
+        self.sequence = sequence
+        self.key = key
+        self.digest = digest
+        self.payload = payload
+
+
+def segment_base(directory: str, first: int) -> str:
+    """Path of a segment's files, without extension."""
+    return os.path.join(directory, f"segment-{first:012d}")
+
+
+def list_segments(directory: str) -> List[int]:
+    """First sequences of the segments in a directory, in order."""
+    if not os.path.isdir(directory):
+        return []
+    firsts = set()
+    for name in os.listdir(directory):
+        match = _SEGMENT_NAME.match(name)
+        if match:
+            firsts.add(int(match.group(1)))
+    return sorted(firsts)
+
+
+def _create(path: str):
+    """Open a new file for writing, readable by its owner only."""
+    return open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb")
+
+
+def _check_header(view, path: str, first: int) -> None:
+    if len(view) < FILE_HEADER.size:
+        raise SegmentCorrupt(path, 0, "missing file header")
+    magic, version, _, _, header_first = FILE_HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise SegmentCorrupt(path, 0, "not a version 1 segment")
+    if header_first != first:
+        raise SegmentCorrupt(path, 0, f"starts at sequence {header_first}, not {first}")
+
+
+class WriterLock:
+    """Exclusive flock on a log directory, held by its writer process."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """
+        Take the lock, creating the directory (mode 0700) if needed.
+
+        Returns:
+            bool: False if another process holds it
+        """
+        if self._fd is not None:
+            return True
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd = os.open(os.path.join(self.directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SegmentWriter:
+    """Appends entries to the newest segment of a log."""
+
+    def __init__(self, base: str, first: int, index_interval: int, lock: WriterLock):
+        """
+        Open a segment for appending, creating it or recovering it.
+
+        An entry torn by a crash mid-write at the end of the file is cut
+        off, and the sparse index is rebuilt from the entries.
+
+        Args:
+            lock: The held writer lock of the segment's directory
+
+        Raises:
+            ValueError: If the lock is not held or is for another directory
+            SegmentCorrupt: If an entry before the end is damaged
+        """
+        if not lock.held or os.path.realpath(lock.directory) != os.path.realpath(os.path.dirname(base)):
+            raise ValueError(f"Writing {base} requires holding its directory's writer lock")
+        self.lock = lock
+        self.base = base
+        self.first = first
+        self.index_interval = index_interval
+        self.count = 0
+        # key -> sequences, for lookups before the key table is written
+        self.keys: Dict[bytes, List[int]] = {}
+        index = self._recover(base + ".seg")
+        with _create(base + ".idx") as f:
+            f.write(b"".join(INDEX_ENTRY.pack(sequence, offset) for sequence, offset in index))
+        self._data = open(base + ".seg", "ab")
+        self._index = open(base + ".idx", "ab")
+
+    def _recover(self, path: str) -> List[tuple]:
+        if not os.path.exists(path) or os.path.getsize(path) < FILE_HEADER.size:
+            with _create(path) as f:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION, 0, 0, self.first))
+            self.size = FILE_HEADER.size
+            return []
+
+        with open(path, "rb") as f:
+            data = f.read()
+        view = memoryview(data)
+        _check_header(view, path, self.first)
+        index = []
+        offset = FILE_HEADER.size
+        while offset + ENTRY_HEADER.size <= len(data):
+            length, crc, sequence, key, _ = ENTRY_HEADER.unpack_from(data, offset)
+            end = offset + ENTRY_HEADER.size + length
+            if end > len(data):
+                break
+            if zlib.crc32(view[offset + ENTRY_HEADER.size:end]) != crc:
+                if end == len(data):
+                    break
+                raise SegmentCorrupt(path, offset, "payload CRC mismatch")
+            if sequence != self.first + self.count:
+                raise SegmentCorrupt(path, offset, f"sequence {sequence}, expected {self.first + self.count}")
+            if self.count % self.index_interval == 0:
+                index.append((sequence, offset))
+            self._track(sequence, key)
+            offset = end
+        view.release()
+        if offset < len(data):
+            logger.warning(f"Dropping torn final entry of {path}")
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+        self.size = offset
+        return index
+
+    def _track(self, sequence: int, key: bytes) -> None:
+        self.count += 1
+        if key != NO_KEY:
+            self.keys.setdefault(key, []).append(sequence)
+
+    def append(self, sequence: int, key: bytes, digest: bytes, payload: bytes) -> None:
+        """Write an entry (buffered until flush())."""
+        if not self.lock.held:
+            raise ValueError(f"Writer lock of {self.base} was released")
+        if self.count % self.index_interval == 0:
+            self._index.write(INDEX_ENTRY.pack(sequence, self.size))
+        self._data.write(ENTRY_HEADER.pack(len(payload), zlib.crc32(payload), sequence, key, digest))
+        self._data.write(payload)
+        self.size += ENTRY_HEADER.size + len(payload)
+        self._track(sequence, key)
+
+    def flush(self) -> None:
+        self._data.flush()
+        self._index.flush()
+
+    def seal(self) -> None:
+        """Write the key table and close the segment."""
+        self.flush()
+        pairs = sorted((key, sequence) for key, sequences in self.keys.items() for sequence in sequences)
+        with _create(self.base + ".keys.tmp") as f:
+            f.write(b"".join(KEY_ENTRY.pack(key, sequence) for key, sequence in pairs))
+        os.replace(self.base + ".keys.tmp", self.base + ".keys")
+        self.close()
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+
+class SegmentReader:
+    """Read-only view of a segment (mapped, or inflated if compressed)."""
+
+    def __init__(self, base: str, first: int):
+        """
+        Raises:
+            FileNotFoundError: If the segment does not exist
+            SegmentCorrupt: If it is not a segment
+        """
+        self.first = first
+        self.compressed = not os.path.exists(base + ".seg")
+        path = base + (".seg.z" if self.compressed else ".seg")
+        with open(path, "rb") as f:
+            if self.compressed:
+                self._buffer = zlib.decompress(f.read())
+            else:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._buffer)
+        _check_header(self._view, path, first)
+
+        self._index_sequences = [first]
+        self._index_offsets = [FILE_HEADER.size]
+        if os.path.exists(base + ".idx"):
+            with open(base + ".idx", "rb") as f:
+                for sequence, offset in INDEX_ENTRY.iter_unpack(f.read()):
+                    if sequence > self._index_sequences[-1]:
+                        self._index_sequences.append(sequence)
+                        self._index_offsets.append(offset)
+        self._keys = None
+        if os.path.exists(base + ".keys"):
+            with open(base + ".keys", "rb") as f:
+                self._keys = f.read()
+
+    @property
+    def size(self) -> int:
+        """Bytes of entries (uncompressed), including the file header."""
+        return len(self._view)
+
+    def entries(self, start: int, end: int) -> Iterator[Entry]:
+        """
+        Entries with sequence in [start, end), in order.
+
+        The sparse index gives the offset of the nearest preceding indexed
+        entry; from there the headers are walked.
+        """
+        position = bisect.bisect_right(self._index_sequences, start) - 1
+        offset = self._index_offsets[max(position, 0)]
+        view = self._view
+        while offset + ENTRY_HEADER.size <= len(view):
+            length, _, sequence, key, digest = ENTRY_HEADER.unpack_from(view, offset)
+            payload_end = offset + ENTRY_HEADER.size + length
+            if sequence >= end or payload_end > len(view):
+                return
+            if sequence >= start:
+                yield Entry(sequence, key, digest, view[offset + ENTRY_HEADER.size:payload_end])
+            offset = payload_end
+
+    def find(self, key: bytes) -> List[int]:
+        """
+        Sequences of the entries with a key.
+
+        Binary search of the key table; a segment without one (not sealed
+        yet) has its headers scanned instead.
+        """
+        if self._keys is None:
+            return [entry.sequence for entry in self.entries(self.first, 2 ** 64 - 1) if entry.key == key]
+        keys, width = self._keys, KEY_ENTRY.size
+        low, high = 0, len(keys) // width
+        while low < high:
+            middle = (low + high) // 2
+            if keys[middle * width:middle * width + 16] < key:
+                low = middle + 1
+            else:
+                high = middle
+        sequences = []
+        while low * width < len(keys):
+            found, sequence = KEY_ENTRY.unpack_from(keys, low * width)
+            if found != key:
+                break
+            sequences.append(sequence)
+            low += 1
+        return sequences
+
+    def close(self) -> None:
+        """Unmap the segment; views still held by callers keep it alive."""
+        try:
+            self._view.release()
+            if not self.compressed:
+                self._buffer.close()
+        except BufferError:
+            pass
+
+
+def compress_segment(base: str, level: int = 6) -> int:
+    """
+    Write a sealed segment's .seg file as .seg.z.
+
+    The compressed file replaces nothing until it is complete; the caller
+    removes the .seg file once no reader needs it.
+
+    Returns:
+        int: Size of the compressed file
+    """
+    with open(base + ".seg", "rb") as f:
+        data = f.read()
+    compressed = zlib.compress(data, level)
+    with _create(base + ".seg.z.tmp") as f:
+        f.write(compressed)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(base + ".seg.z.tmp", base + ".seg.z")
+    return len(compressed)
@@ -2,21 +2,24 @@
 API key authentication for LUMEN SDK API.
 
 Enterprise Implementation:
-- Supabase-backed key storage with bcrypt hashing
+- Repository-backed key storage with bcrypt hashing
 - Key prefix indexing for fast lookups
 - Expiration and usage tracking
 - Rate limiting metadata
+- Verified-key cache to skip bcrypt for recently seen keys
 
 Copyright 2026 Forge Partners Inc.
 """
 
 from datetime import datetime, timezone
 from typing import Optional
-from fastapi import HTTPException, Security, status
+from fastapi import HTTPException, Request, Security, status
 from fastapi.security import APIKeyHeader
-import bcrypt
 import logging
-from .supabase_client import get_supabase
+from db.repository import get_repository
+from .key_cache import get_key_cache
+from .hashing import get_hash_executor
+from .last_used import get_last_used_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +38,18 @@ class APIKeyInfo:
         self.environment = environment
 
 
-async def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> APIKeyInfo:
+async def authenticate_api_key(api_key: Optional[str]) -> APIKeyInfo:
     """
-    Verify API key against Supabase database.
+    Verify API key against the key store.
     
     Flow:
-    1. Extract key prefix (first 20 chars) for fast lookup
-    2. Query api_keys table WHERE key_prefix matches AND status = 'active'
-    3. bcrypt.verify(submitted_key, stored_hash)
-    4. Check expiration
-    5. Update last_used_at
-    6. Return org_id + plan info for rate limiting
+    1. Return the cached result if this key was verified (or rejected) recently
+    2. Extract key prefix (first 20 chars) for fast lookup
+    3. Query api_keys table WHERE key_prefix matches AND status = 'active'
+    4. bcrypt.verify(submitted_key, stored_hash)
+    5. Check expiration
+    6. Record last_used_at (written back in batches)
+    7. Return org_id + plan info for rate limiting
     
     Args:
         api_key: API key from X-API-Key header
@@ -71,25 +75,36 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> APIKeyInfo:
         )
     
     key_prefix = api_key[:20]
+    key_cache = get_key_cache()
     
     try:
-        supabase = get_supabase()
+        # Fast path: recently verified key (expiry is enforced by the cache)
+        cached = key_cache.get(api_key)
+        if cached is not None:
+            get_last_used_buffer().touch(cached.key_id)
+            return cached
+        
+        if key_cache.is_rejected(api_key):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid API key.",
+            )
         
         # Query for active keys with matching prefix
-        result = supabase.from_("api_keys").select(
-            "id, org_id, key_hash, name, environment, expires_at, organizations!inner(plan)"
-        ).eq("key_prefix", key_prefix).eq("status", "active").execute()
+        candidates = await get_repository().find_active_keys_by_prefix(key_prefix)
         
-        if not result.data:
+        if not candidates:
+            key_cache.reject(api_key)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid API key.",
             )
         
         # Verify hash for each candidate (usually just one)
-        for candidate in result.data:
-            stored_hash = candidate["key_hash"].encode('utf-8')
-            if bcrypt.checkpw(api_key.encode('utf-8'), stored_hash):
+        # bcrypt runs on the hash executor, never on the event loop
+        hash_executor = get_hash_executor()
+        for candidate in candidates:
+            if await hash_executor.checkpw(api_key, candidate["key_hash"]):
                 # Check expiration
                 if candidate.get("expires_at"):
                     expiry = datetime.fromisoformat(candidate["expires_at"].replace('Z', '+00:00'))
@@ -99,21 +114,23 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> APIKeyInfo:
                             detail="API key has expired.",
                         )
                 
-                # Update last_used_at
-                supabase.from_("api_keys").update({
-                    "last_used_at": datetime.now(timezone.utc).isoformat()
-                }).eq("id", candidate["id"]).execute()
+                # Record last_used_at (flushed in bulk by the write-behind buffer)
+                get_last_used_buffer().touch(candidate["id"])
                 
-                # Return key info
-                return APIKeyInfo(
+                key_info = APIKeyInfo(
                     key_id=candidate["id"],
                     org_id=candidate["org_id"],
-                    plan=candidate["organizations"]["plan"],
+                    plan=candidate["plan"],
                     name=candidate["name"],
                     environment=candidate["environment"]
                 )
+                key_cache.put(api_key, key_info, candidate.get("expires_at"))
+                
+                # Return key info
+                return key_info
         
         # If we get here, no hash matched
+        key_cache.reject(api_key)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API key.",
@@ -129,11 +146,47 @@ async def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> APIKeyInfo:
         )
 
 
-async def get_api_key_optional(api_key: str = Security(API_KEY_HEADER)) -> Optional[APIKeyInfo]:
+async def verify_api_key(request: Request, api_key: str = Security(API_KEY_HEADER)) -> APIKeyInfo:
+    """
+    Verify the request's API key at most once per request.
+    
+    The first consumer (middleware or route dependency) runs the full
+    verification; its outcome, success or failure, is stored on
+    request.state and reused by every later consumer of the same request.
+    
+    Args:
+        request: Incoming request carrying the per-request state
+        api_key: API key from X-API-Key header
+        
+    Returns:
+        APIKeyInfo: API key metadata if valid
+        
+    Raises:
+        HTTPException: If API key is missing or invalid
+    """
+    previous = getattr(request.state, "api_key_auth", None)
+    if previous is not None and previous[0] == api_key:
+        outcome = previous[1]
+        if isinstance(outcome, HTTPException):
+            raise outcome
+        return outcome
+    
+    try:
+        key_info = await authenticate_api_key(api_key)
+    except HTTPException as e:
+        request.state.api_key_auth = (api_key, e)
+        raise
+    
+    request.state.api_key_auth = (api_key, key_info)
+    return key_info
+
+
+async def get_api_key_optional(request: Request, api_key: str = Security(API_KEY_HEADER)) -> Optional[APIKeyInfo]:
     """
     Optional API key verification (for endpoints that work with or without auth).
     
     Args:
+        request: Incoming request carrying the per-request state
         api_key: API key from X-API-Key header
         
     Returns:
@@ -143,14 +196,14 @@ async def get_api_key_optional(api_key: str = Security(API_KEY_HEADER)) -> Optio
         return None
     
     try:
-        return await verify_api_key(api_key)
+        return await verify_api_key(request, api_key)
     except HTTPException:
         return None
 
 
-def hash_api_key(api_key: str) -> str:
+async def hash_api_key(api_key: str) -> str:
     """
-    Hash an API key using bcrypt.
+    Hash an API key using bcrypt on the password-hash executor.
     
     Args:
         api_key: Plain text API key
@@ -158,6 +211,4 @@ def hash_api_key(api_key: str) -> str:
     Returns:
         str: Bcrypt hash of the API key
     """
-    salt = bcrypt.gensalt()
-    hash_bytes = bcrypt.hashpw(api_key.encode('utf-8'), salt)
-    return hash_bytes.decode('utf-8')
\ No newline at end of file
+    return await get_hash_executor().hashpw(api_key)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Password-hash executor for LUMEN SDK API.
+
+bcrypt is deliberately slow, so all hashing and verification runs on a
+dedicated pool instead of the asyncio event loop. A thread pool is the
+default (bcrypt releases the GIL); a process pool can be selected for
+hosts where hashing competes with other CPU-bound work.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+import bcrypt
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Executor configuration - override via environment
+HASH_EXECUTOR_KIND = os.getenv("HASH_EXECUTOR", "thread")
+HASH_EXECUTOR_WORKERS = int(os.getenv("HASH_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def _timed_checkpw(submitted_at: float, password: bytes, hashed: bytes) -> tuple[float, bool]:
+    """Run bcrypt.checkpw and report when the pool picked the job up."""
+    return time.time(), bcrypt.checkpw(password, hashed)
+
+
+def _timed_hashpw(submitted_at: float, password: bytes) -> tuple[float, bytes]:
+    """Run bcrypt.hashpw and report when the pool picked the job up."""
+    return time.time(), bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+class HashExecutor:
+    """
+    Runs bcrypt work on a thread or process pool and tracks its load.
+
+    Metrics:
+    - queue_depth: jobs waiting for a free worker (in-flight beyond pool size)
+    - in_flight: jobs submitted but not yet completed
+    - wait time: delay between submission and a worker starting the job
+    """
+
+    def __init__(self, kind: str = HASH_EXECUTOR_KIND, max_workers: int = HASH_EXECUTOR_WORKERS):
+        if kind not in ("thread", "process"):
+            raise ValueError("HASH_EXECUTOR must be 'thread' or 'process'")
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="lumen-hash"
+                )
+            logger.info(f"Password-hash executor started ({self.kind}, {self.max_workers} workers)")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+        try:
+            started_at, result = await loop.run_in_executor(self._get_executor(), fn, submitted_at, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        finished_at = time.time()
+        wait = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self._completed += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._run_total += max(0.0, finished_at - started_at)
+        return result
+
+    async def checkpw(self, password: str, hashed: str) -> bool:
+        """Verify a plain text secret against a bcrypt hash off the event loop."""
+        return await self._run(_timed_checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    async def hashpw(self, password: str) -> str:
+        """Hash a plain text secret with a fresh salt off the event loop."""
+        hash_bytes = await self._run(_timed_hashpw, password.encode('utf-8'))
+        return hash_bytes.decode('utf-8')
+
+    def stats(self) -> dict:
+        """Return queue depth, wait-time and throughput metrics."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "queue_depth": max(0, self._in_flight - self.max_workers),
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": completed,
+                "avg_wait_ms": round(self._wait_total / completed * 1000, 3) if completed else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 3),
+                "avg_run_ms": round(self._run_total / completed * 1000, 3) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Global executor instance
+_hash_executor = HashExecutor()
+
+
+def get_hash_executor() -> HashExecutor:
+    """Get the process-wide password-hash executor."""
+    return _hash_executor
@@ -10,7 +10,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 import os
 import logging
-from .supabase_client import get_supabase
+from db.repository import get_repository
 
 logger = logging.getLogger(__name__)
 
@@ -64,17 +64,14 @@ async def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(
             )
         
         # Look up user's organization
-        supabase = get_supabase()
-        org_result = supabase.from_("organizations").select("id, name, plan").eq("owner_id", user_id).execute()
+        org = await get_repository().get_organization_by_owner(user_id)
         
-        if not org_result.data:
+        if not org:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Organization not found for user"
             )
         
-        org = org_result.data[0]
-        
         return {
             "user_id": user_id,
             "org_id": org["id"],
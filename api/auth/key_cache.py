@@ -0,0 +1,236 @@
+"""
+Verified API key cache for LUMEN SDK API.
+
+Keeps recently verified keys in memory so hot keys skip the Supabase lookup
+and the bcrypt comparison in verify_api_key. Recently rejected keys are
+remembered too, so a flood of invalid keys is turned away without touching
+the database. Entries are keyed by an HMAC-SHA256 digest of the full key;
+the plaintext key is never stored.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+# Cache configuration - override via environment
+KEY_CACHE_TTL_SECONDS = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+KEY_CACHE_MAX_ENTRIES = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", "10000"))
+REJECTED_KEY_TTL_SECONDS = float(os.getenv("API_KEY_REJECTED_TTL_SECONDS", "30"))
+REJECTED_KEY_MAX_ENTRIES = int(os.getenv("API_KEY_REJECTED_MAX_ENTRIES", "10000"))
+
+
+class _CacheEntry:
+    """A cached verification result."""
+
+    __slots__ = ("info", "expires_at", "key_expires_at")
+
+    def __init__(self, info: Any, expires_at: float, key_expires_at: Optional[float]):
+        self.info = info
+        self.expires_at = expires_at
+        self.key_expires_at = key_expires_at
+
+
+class VerifiedKeyCache:
+    """
+    Bounded LRU cache of successfully verified API keys with TTL expiry.
+
+    The TTL bounds how long a revoked key keeps working on workers that did
+    not see the revocation; revocations handled by this worker take effect
+    immediately through invalidate_key_id().
+
+    A second, separately bounded LRU holds digests of keys that failed
+    verification: keys with no active prefix match, which includes revoked
+    keys, and keys whose hash matched no candidate. Caching a revoked key
+    as rejected is harmless, since revocation is final. Expired keys are
+    refused after their hash matched and are not recorded. A new key is
+    random, so a rejected digest cannot shadow a valid key.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = KEY_CACHE_TTL_SECONDS,
+        max_entries: int = KEY_CACHE_MAX_ENTRIES,
+        secret: Optional[bytes] = None,
+        rejected_ttl_seconds: float = REJECTED_KEY_TTL_SECONDS,
+        rejected_max_entries: int = REJECTED_KEY_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.rejected_ttl_seconds = rejected_ttl_seconds
+        self.rejected_max_entries = rejected_max_entries
+        # Per-process secret: digests are useless outside this worker
+        self._secret = secret or os.getenv("API_KEY_CACHE_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._by_key_id: Dict[str, Set[str]] = {}
+        # digest -> time the rejection expires
+        self._rejected: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected_hits = 0
+
+    def digest(self, api_key: str) -> str:
+        """Return the keyed digest used as the cache key for an API key."""
+        return hmac.new(self._secret, api_key.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def get(self, api_key: str) -> Optional[Any]:
+        """
+        Look up a verified key.
+
+        Args:
+            api_key: Plain text API key from the request
+
+        Returns:
+            The cached APIKeyInfo, or None on a miss, TTL expiry or key expiry
+        """
+        digest = self.digest(api_key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            if now >= entry.expires_at or (entry.key_expires_at is not None and now >= entry.key_expires_at):
+                self._remove(digest)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry.info
+
+    def put(self, api_key: str, info: Any, key_expires_at: Optional[str] = None) -> None:
+        """
+        Cache a successful verification.
+
+        Args:
+            api_key: Plain text API key that was verified
+            info: APIKeyInfo returned by verification
+            key_expires_at: The key's own expires_at (ISO 8601), if any
+        """
+        digest = self.digest(api_key)
+        expiry = None
+        if key_expires_at:
+            expiry = datetime.fromisoformat(key_expires_at.replace('Z', '+00:00')).timestamp()
+        entry = _CacheEntry(info, time.time() + self.ttl_seconds, expiry)
+        with self._lock:
+            if digest in self._entries:
+                self._remove(digest)
+            self._entries[digest] = entry
+            self._by_key_id.setdefault(info.key_id, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def is_rejected(self, api_key: str) -> bool:
+        """Whether this key failed verification within the rejection TTL."""
+        digest = self.digest(api_key)
+        with self._lock:
+            expires_at = self._rejected.get(digest)
+            if expires_at is None:
+                return False
+            if time.time() >= expires_at:
+                del self._rejected[digest]
+                return False
+            self.rejected_hits += 1
+            return True
+
+    def reject(self, api_key: str) -> None:
+        """Remember that a key failed verification."""
+        digest = self.digest(api_key)
+        with self._lock:
+            self._rejected.pop(digest, None)
+            self._rejected[digest] = time.time() + self.rejected_ttl_seconds
+            while len(self._rejected) > self.rejected_max_entries:
+                self._rejected.popitem(last=False)
+
+    def invalidate_key_id(self, key_id: str) -> int:
+        """
+        Drop every cached entry for a key id (e.g. after revocation).
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            digests = self._by_key_id.pop(key_id, set())
+            for digest in digests:
+                self._entries.pop(digest, None)
+            return len(digests)
+
+    def purge_expired(self) -> int:
+        """
+        Remove entries past their TTL or key expiry.
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            stale = [
+                digest for digest, entry in self._entries.items()
+                if now >= entry.expires_at or (entry.key_expires_at is not None and now >= entry.key_expires_at)
+            ]
+            for digest in stale:
+                self._remove(digest)
+            rejected = [digest for digest, expires_at in self._rejected.items() if now >= expires_at]
+            for digest in rejected:
+                del self._rejected[digest]
+            return len(stale) + len(rejected)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._by_key_id.clear()
+            self._rejected.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss/eviction counters."""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejected_size": len(self._rejected),
+            "rejected_hits": self.rejected_hits,
+        }
+
+    def _remove(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        digests = self._by_key_id.get(entry.info.key_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_key_id[entry.info.key_id]
+
+
+# Global cache instance
+_key_cache = VerifiedKeyCache()
+
+
+def get_key_cache() -> VerifiedKeyCache:
+    """Get the process-wide verified key cache."""
+    return _key_cache
+
+
+def invalidate_cached_key(key_id: str) -> int:
+    """
+    Invalidate cached verifications for a key id.
+
+    Called by key revocation so the revoked key stops working on this
+    worker immediately; other workers drop it within the cache TTL.
+    """
+    return _key_cache.invalidate_key_id(key_id)
@@ -0,0 +1,140 @@
+"""
+Write-behind buffer for api_keys.last_used_at.
+
+Authenticated requests record the time a key was used in memory; the
+buffer keeps only the latest timestamp per key and writes them back in
+bulk on an interval or once enough keys are pending. The portal's key
+listing tolerates a few seconds of staleness.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import logging
+from db.repository import get_repository
+
+logger = logging.getLogger(__name__)
+
+# Buffer configuration - override via environment
+LAST_USED_FLUSH_INTERVAL_SECONDS = float(os.getenv("LAST_USED_FLUSH_INTERVAL_SECONDS", "5"))
+LAST_USED_MAX_PENDING = int(os.getenv("LAST_USED_MAX_PENDING", "500"))
+
+# Maximum ids per UPDATE ... WHERE id IN (...) statement
+_UPDATE_CHUNK_SIZE = 100
+
+
+class LastUsedBuffer:
+    """
+    Coalescing buffer of key_id -> latest last_used_at.
+
+    Flushes group keys by their timestamp (to the second) so each group is
+    written with a single UPDATE ... WHERE id IN (...).
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = LAST_USED_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = LAST_USED_MAX_PENDING,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, datetime] = {}
+        self._flush_requested = asyncio.Event()
+        self._stopping = False
+        self.flushes = 0
+        self.rows_written = 0
+
+    def touch(self, key_id: str, used_at: Optional[datetime] = None) -> None:
+        """
+        Record that a key was used.
+
+        Args:
+            key_id: API key id
+            used_at: Usage time (defaults to now)
+        """
+        used_at = (used_at or datetime.now(timezone.utc)).replace(microsecond=0)
+        current = self._pending.get(key_id)
+        if current is None or used_at > current:
+            self._pending[key_id] = used_at
+        if len(self._pending) >= self.max_pending:
+            self._flush_requested.set()
+
+    def pending_count(self) -> int:
+        """Number of keys waiting to be written."""
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """
+        Write all pending timestamps.
+
+        Returns:
+            int: Number of keys written
+        """
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, {}
+
+        groups: Dict[datetime, List[str]] = defaultdict(list)
+        for key_id, used_at in batch.items():
+            groups[used_at].append(key_id)
+
+        written = 0
+        try:
+            repository = get_repository()
+            for used_at, key_ids in groups.items():
+                for i in range(0, len(key_ids), _UPDATE_CHUNK_SIZE):
+                    chunk = key_ids[i:i + _UPDATE_CHUNK_SIZE]
+                    await repository.touch_api_keys(chunk, used_at.isoformat())
+                    written += len(chunk)
+                    for key_id in chunk:
+                        del batch[key_id]
+        except Exception as e:
+            logger.error(f"Failed to flush last_used_at updates: {e}")
+            # Put unwritten entries back unless a newer touch superseded them
+            for key_id, used_at in batch.items():
+                current = self._pending.get(key_id)
+                if current is None or used_at > current:
+                    self._pending[key_id] = used_at
+
+        self.flushes += 1
+        self.rows_written += written
+        return written
+
+    async def run(self) -> None:
+        """Background loop: flush on the interval or when the buffer fills."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def stop(self) -> None:
+        """Stop the background loop and write anything still pending."""
+        self._stopping = True
+        self._flush_requested.set()
+        await self.flush()
+
+    def stats(self) -> dict:
+        """Return buffer size and flush counters."""
+        return {
+            "pending": len(self._pending),
+            "flush_interval_seconds": self.flush_interval,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+        }
+
+
+# Global buffer instance
+_last_used_buffer = LastUsedBuffer()
+
+
+def get_last_used_buffer() -> LastUsedBuffer:
+    """Get the process-wide last_used_at buffer."""
+    return _last_used_buffer
@@ -1,46 +1,75 @@
 """
 Supabase client initialization for LUMEN SDK API.
 
+Provides a non-blocking PostgREST client for the Supabase project, backed
+by a pooled httpx.AsyncClient. Application code does not use this client
+directly; it goes through the repository layer in db/.
+
 Copyright 2026 Forge Partners Inc.
 """
 
 import os
 from typing import Optional
-from supabase import create_client, Client
+import httpx
+from postgrest import AsyncPostgrestClient
 import logging
+from db.repository import get_repository
 
 logger = logging.getLogger(__name__)
 
+# Connection pool configuration - override via environment
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "50"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "20"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+SUPABASE_READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "10"))
+
 # Global Supabase client instance
-_supabase_client: Optional[Client] = None
+_supabase_client: Optional[AsyncPostgrestClient] = None
 
 
-def init_supabase() -> Client:
+def init_supabase() -> AsyncPostgrestClient:
     """
-    Initialize Supabase client with service key.
-    
+    Initialize the async Supabase (PostgREST) client with service key.
+
     Returns:
-        Client: Initialized Supabase client
-        
+        AsyncPostgrestClient: Initialized client sharing one connection pool
+
     Raises:
         ValueError: If required environment variables are missing
         Exception: If client initialization fails
     """
     global _supabase_client
-    
+
     if _supabase_client is not None:
         return _supabase_client
-        
+
     url = os.getenv("SUPABASE_URL")
     service_key = os.getenv("SUPABASE_SERVICE_KEY")
-    
+
     if not url:
         raise ValueError("SUPABASE_URL environment variable is required")
     if not service_key:
         raise ValueError("SUPABASE_SERVICE_KEY environment variable is required")
-    
+
     try:
-        _supabase_client = create_client(url, service_key)
+        rest_url = f"{url.rstrip('/')}/rest/v1"
+        headers = {
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        http_client = httpx.AsyncClient(
+            base_url=rest_url,
+            headers=headers,
+            timeout=httpx.Timeout(SUPABASE_READ_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+            ),
+            follow_redirects=True,
+        )
+        _supabase_client = AsyncPostgrestClient(rest_url, headers=headers, http_client=http_client)
         logger.info("✅ Supabase client initialized successfully")
         return _supabase_client
     except Exception as e:
@@ -48,13 +77,13 @@ def init_supabase() -> Client:
         raise
 
 
-def get_supabase() -> Client:
+def get_supabase() -> AsyncPostgrestClient:
     """
     Get the Supabase client instance.
-    
+
     Returns:
-        Client: Supabase client instance
-        
+        AsyncPostgrestClient: Supabase client instance
+
     Raises:
         RuntimeError: If client hasn't been initialized
     """
@@ -63,18 +92,24 @@ def get_supabase() -> Client:
     return _supabase_client
 
 
+async def close_supabase() -> None:
+    """Close the Supabase client's connection pool."""
+    global _supabase_client
+
+    if _supabase_client is not None:
+        await _supabase_client.aclose()
+        _supabase_client = None
+
+
 async def health_check() -> bool:
     """
-    Check if Supabase connection is healthy.
-    
+    Check if the data backend is healthy.
+
     Returns:
         bool: True if connection is healthy, False otherwise
     """
     try:
-        client = get_supabase()
-        # Simple query to test connection
-        result = client.from_("api_keys").select("count", count="exact").limit(1).execute()
-        return True
+        return await get_repository().ping()
     except Exception as e:
         logger.error(f"Supabase health check failed: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,67 @@
+"""
+Audit log benchmark for LUMEN SDK API.
+
+Appends events to an audit log (audit.log) and times appends, an
+inclusion proof, a range verification, a record_id lookup, a raw export
+of the log and verifying the whole log from its checkpoints against
+rehashing every event.
+
+Usage (from the api directory):
+    python benchmarks/bench_audit.py [--events 200000] [--batch 100]
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audit import AuditLog
+
+ACTOR = {"type": "SERVICE", "id": "key_bench"}
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = AuditLog(directory)
+        start = time.perf_counter()
+        for batch in range(args.events // args.batch):
+            log.append_many("EVALUATION_COMPLETED", "org", ACTOR, [
+                {"record_id": f"{batch:08d}-{index:04d}", "lumen_score": 85, "tier": 1, "verdict": "ALLOW",
+                 "packs": {"ca-on-phipa": True}}
+                for index in range(args.batch)
+            ])
+        elapsed = time.perf_counter() - start
+        print(f"{log.size} events   append {elapsed / log.size * 1e6:6.2f} us/event")
+
+        middle = log.size // 2
+        proof_ms = timed(lambda: log.prove(middle))
+        print(f"prove one event       {proof_ms:8.2f} ms   ({len(log.prove(middle).path)} hashes)")
+        print(f"verify_range 1000     {timed(lambda: log.verify_range(middle, middle + 1000)):8.2f} ms")
+        record_id = f"{middle // args.batch:08d}-0000"
+        print(f"find record_id        {timed(lambda: log.find(record_id)):8.2f} ms")
+        with open(os.devnull, "wb") as out:
+            print(f"export all            {timed(lambda: log.export(0, log.size, out)):8.2f} ms")
+        print(f"verify (checkpoints)  {timed(log.verify):8.2f} ms")
+        print(f"verify (deep)         {timed(lambda: log.verify(deep=True)):8.2f} ms")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compliance rule engine benchmark for LUMEN SDK API.
+
+Times evaluating one context against all six packs with the compiled
+plan (compliance.engine), for a context without PHI (PHI-only checks are
+pre-resolved) and a fully populated PHI context. For reference, also
+times compiling the packs on every evaluation, as an engine without a
+startup compile step would. The budget is well under 1 ms per evaluation.
+
+Usage (from the api directory):
+    python benchmarks/bench_compliance.py [--repeat 20000]
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from compliance import RuleEngine, get_rule_engine
+
+NO_PHI_CONTEXT = {"phiPresent": False, "purpose": "triage"}
+PHI_CONTEXT = {
+    "phiPresent": True,
+    "phiTypes": ["diagnosis", "medication"],
+    "purpose": "treatment",
+    "userRole": "healthcare_provider",
+    "isTPO": True,
+    "forTreatment": True,
+    "isHealthcareProvision": True,
+    "consentType": "deemed",
+    "safeguards": ["administrative", "physical", "technical"],
+    "encryptionAtRest": True,
+    "encryptionInTransit": True,
+    "accessControlsImplemented": True,
+    "auditLoggingEnabled": True,
+    "retentionDays": 3650,
+    "isEHRSystem": True,
+    "breachDetected": True,
+    "breachScope": "major",
+    "breachNotificationSent": True,
+    "aiActRiskCategory": "high",
+    "riskAssessmentCompleted": True,
+    "humanOversight": True,
+}
+
+
+def per_call_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    engine = get_rule_engine()
+    plan = engine.plan()
+    checks = len(plan.steps)
+    print(f"{len(plan.packs)} packs, {checks} checks per evaluation")
+    print(f"{'case':<28}{'us/eval':>10}")
+    for name, context in (("compiled, no PHI", NO_PHI_CONTEXT), ("compiled, PHI", PHI_CONTEXT)):
+        print(f"{name:<28}{per_call_us(lambda: plan.evaluate(context), args.repeat):>10.1f}")
+    uncompiled = per_call_us(lambda: RuleEngine().evaluate(PHI_CONTEXT), max(1, args.repeat // 10))
+    print(f"{'compile per call, PHI':<28}{uncompiled:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
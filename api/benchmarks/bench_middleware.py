@@ -0,0 +1,183 @@
+"""
+Middleware overhead benchmark for LUMEN SDK API.
+
+Measures POST /v1/evaluate latency through three middleware stacks built
+around the same routes:
+
+- none: no rate-limit or usage middleware (baseline)
+- base-http: the previous BaseHTTPMiddleware implementations
+- asgi: the current pure-ASGI RateLimitMiddleware and UsageTrackingMiddleware
+
+Requests go through httpx's in-process ASGI transport against the memory
+repository, so the numbers isolate framework and middleware cost.
+
+Usage (from the api directory):
+    python benchmarks/bench_middleware.py [--requests 3000]
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Keep the limiter and quota out of the way of the measurement
+os.environ.setdefault("RATE_LIMIT_PRO_PER_MINUTE", "100000000")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bcrypt
+import httpx
+from fastapi import FastAPI, Request, HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from audit import AuditLog, set_audit_log
+from auth.api_keys import verify_api_key
+from db.memory_backend import InMemoryRepository
+from db.repository import set_repository
+from middleware import RateLimitMiddleware, UsageTrackingMiddleware
+from middleware.rate_limit import RATE_LIMIT_WINDOW_SECONDS, get_plan_rate_limit, get_rate_limiter
+from middleware.usage_counter import get_usage_counter
+from routes import evaluate
+
+API_KEY = "lumen_pk_live_" + "b" * 43
+EVALUATION = {
+    "ai_output": "Patient should take 500mg metformin twice daily.",
+    "human_action": "accepted",
+    "compliance_packs": ["us-fed-hipaa"],
+}
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """RateLimitMiddleware as it was before the pure-ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        if not request.url.path.startswith("/v1/"):
+            return await call_next(request)
+        api_key = request.headers.get("X-API-Key")
+        if not api_key:
+            return await call_next(request)
+        try:
+            api_key_info = await verify_api_key(request, api_key)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+        allowed, metadata = await get_rate_limiter().is_allowed(
+            api_key_info.key_id, get_plan_rate_limit(api_key_info.plan), RATE_LIMIT_WINDOW_SECONDS
+        )
+        if not allowed:
+            return JSONResponse(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                content={"detail": "Rate limit exceeded"})
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(metadata["limit"])
+        response.headers["X-RateLimit-Remaining"] = str(metadata["remaining"])
+        response.headers["X-RateLimit-Reset"] = str(metadata["reset"])
+        return response
+
+
+class LegacyUsageTrackingMiddleware(BaseHTTPMiddleware):
+    """UsageTrackingMiddleware as it was before the pure-ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next):
+        if not request.url.path.startswith("/v1/evaluate"):
+            return await call_next(request)
+        api_key = request.headers.get("X-API-Key")
+        if not api_key:
+            return await call_next(request)
+        try:
+            api_key_info = await verify_api_key(request, api_key)
+        except HTTPException:
+            return await call_next(request)
+        counter = get_usage_counter()
+        now = datetime.now(timezone.utc)
+        period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+        current_count = await counter.current(api_key_info.org_id, period_start)
+        limit = 1000 if api_key_info.plan == "free" else 50000
+        if current_count >= limit:
+            return JSONResponse(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                content={"detail": "Monthly evaluation limit exceeded"})
+        response = await call_next(request)
+        if 200 <= response.status_code < 300:
+            new_count = counter.add(api_key_info.org_id, period_start, 1, now)
+            response.headers["X-Lumen-Usage-Limit"] = str(limit)
+            response.headers["X-Lumen-Usage-Used"] = str(new_count)
+            response.headers["X-Lumen-Usage-Remaining"] = str(limit - new_count)
+            response.headers["X-Lumen-Usage-Percent"] = f"{new_count / limit * 100:.1f}"
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+    if stack == "base-http":
+        app.add_middleware(LegacyRateLimitMiddleware)
+        app.add_middleware(LegacyUsageTrackingMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(RateLimitMiddleware)
+        app.add_middleware(UsageTrackingMiddleware)
+    app.include_router(evaluate.router)
+    return app
+
+
+def seed_repository() -> None:
+    repository = InMemoryRepository()
+    org = repository.add_organization("Benchmark Org", plan="pro")
+    repository.api_keys["bench-key"] = {
+        "id": "bench-key",
+        "org_id": org["id"],
+        "name": "bench",
+        "environment": "live",
+        "key_prefix": API_KEY[:20],
+        "key_hash": bcrypt.hashpw(API_KEY.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8"),
+        "status": "active",
+        "expires_at": None,
+    }
+    set_repository(repository)
+
+
+async def run(stack: str, requests: int) -> list:
+    transport = httpx.ASGITransport(app=build_app(stack))
+    headers = {"X-API-Key": API_KEY}
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up: first request verifies the key with bcrypt and fills caches
+        for _ in range(50):
+            (await client.post("/v1/evaluate", json=EVALUATION, headers=headers)).raise_for_status()
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.post("/v1/evaluate", json=EVALUATION, headers=headers)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    seed_repository()
+    results = {}
+    # Evaluations append audit events; the app opens its log at startup
+    with tempfile.TemporaryDirectory() as directory:
+        audit_log = AuditLog(directory)
+        set_audit_log(audit_log)
+        for stack in ("none", "base-http", "asgi"):
+            timings = asyncio.run(run(stack, args.requests))
+            results[stack] = (statistics.mean(timings) * 1e6, statistics.quantiles(timings, n=100)[98] * 1e6)
+        audit_log.close()
+
+    baseline = results["none"][0]
+    print(f"POST /v1/evaluate, {args.requests} requests per stack")
+    print(f"{'stack':<12}{'mean us':>10}{'p99 us':>10}{'overhead us':>14}")
+    for stack, (mean, p99) in results.items():
+        print(f"{stack:<12}{mean:>10.1f}{p99:>10.1f}{mean - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Monte Carlo risk adjustment benchmark for LUMEN SDK API.
+
+Times the vectorized simulation in scoring.monte_carlo for each risk
+class and, for reference, the same simulation written as a per-run
+Python loop. ADR 001 budgets about 50 ms per evaluation for 10,000 runs.
+Also times a batch of evaluations run together with monte_carlo.run, as
+/v1/evaluate/batch does, against running them one at a time.
+
+Usage (from the api directory):
+    python benchmarks/bench_monte_carlo.py [--repeat 200]
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scoring import monte_carlo
+
+STRATEGIC_FACTORS = [
+    {"factorName": "Technical Maturity", "confidence": "Moderate"},
+    {"factorName": "Regulatory Alignment", "confidence": "Strong"},
+    {"factorName": "Labour Impact", "confidence": "Moderate"},
+    {"factorName": "Vendor Ecosystem", "confidence": "Limited"},
+    {"factorName": "Funding Pathway", "confidence": "Moderate"},
+]
+DECISION_INPUT = {
+    "citationIntegrity": {"totalCitations": 9, "verifiedCitations": 8, "fabricatedCitations": 0, "mismatchedCitations": 1},
+    "controlResults": [
+        {"controlId": "phipa-001", "passed": True, "severity": "CRITICAL"},
+        {"controlId": "phipa-002", "passed": True, "severity": "HIGH"},
+        {"controlId": "phipa-003", "passed": False, "severity": "LOW"},
+    ],
+    "evidenceMetrics": {"sourceCount": 4, "avgRetrievalScore": 0.73, "documentTypeCount": 2},
+    "workflowContext": {"hasDefinedBoundaries": True, "hasMonitoringPlan": True},
+}
+
+
+def loop_simulation(runs: int, seed: int) -> float:
+    """Per-run Python loop over the same linear model; returns the 5th percentile."""
+    values, ranges, weights = monte_carlo.composite_model(STRATEGIC_FACTORS, DECISION_INPUT)
+    values, ranges, weights = values.tolist(), ranges.tolist(), weights.tolist()
+    rng = random.Random(seed)
+    scores = []
+    for _ in range(runs):
+        strategic = decision = 0.0
+        for value, spread, (strategic_weight, decision_weight) in zip(values, ranges, weights):
+            sample = min(100.0, max(0.0, value - spread + 2 * spread * rng.random()))
+            strategic += sample * strategic_weight
+            decision += sample * decision_weight
+        scores.append(min(40.0, max(0.4, strategic)) + decision)
+    scores.sort()
+    return scores[runs * monte_carlo.WORST_CASE_PERCENTILE // 100]
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'risk class':<12}{'runs':>8}{'numpy ms':>11}{'loop ms':>10}")
+    for risk_class in ("LOW", "MODERATE", "HIGH", "CRITICAL"):
+        runs = monte_carlo.run_count(risk_class)
+        vectorized = timed(lambda: monte_carlo.compute_monte_carlo_variance(
+            STRATEGIC_FACTORS, DECISION_INPUT, risk_class=risk_class
+        ), args.repeat)
+        loop = timed(lambda: loop_simulation(runs, 1), max(1, args.repeat // 20))
+        print(f"{risk_class:<12}{runs:>8}{vectorized:>11.2f}{loop:>10.2f}")
+
+    # Distinct inputs (and so distinct seeds) of mixed risk classes
+    radars = (None, {"legal": "Amber"}, {"legal": "Red"})
+    simulations = [
+        monte_carlo.prepare(STRATEGIC_FACTORS[: 1 + i % 5], DECISION_INPUT, radars[i % 3])
+        for i in range(args.batch)
+    ]
+    repeat = max(1, args.repeat // 20)
+    batched = timed(lambda: monte_carlo.run(simulations), repeat)
+    single = timed(lambda: [monte_carlo.run([simulation]) for simulation in simulations], repeat)
+    print(f"\nbatch of {args.batch}: run together {batched:.2f} ms, one at a time {single:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
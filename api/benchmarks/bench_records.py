@@ -0,0 +1,96 @@
+"""
+Record listing benchmark for LUMEN SDK API.
+
+Fills a SQLite record store with one organization's records and times
+fetching a page at increasing depths with keyset cursors (records.store)
+against LIMIT/OFFSET, with and without a tier filter.
+
+Usage (from the api directory):
+    python benchmarks/bench_records.py [--records 200000] [--page-size 50]
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from records import EvaluationRecord, RecordQuery, SQLiteRecordStore
+
+PACKS = [{"pack_id": "ca-on-phipa", "version": "v1", "passed": True, "checks": []}]
+
+
+def fill(store: SQLiteRecordStore, count: int) -> None:
+    records = [
+        EvaluationRecord(
+            f"{index:012d}", "org", 1_700_000_000 + index * 0.5, 85, index % 3 + 1, ("ALLOW", "WARN", "BLOCK")[index % 3],
+            0.9, "accepted", ["ca-on-phipa"], "Take 500mg twice daily.", {}, PACKS,
+        )
+        for index in range(count)
+    ]
+    for start in range(0, count, 10_000):
+        store._insert(records[start:start + 10_000])
+
+
+def offset_page(store: SQLiteRecordStore, page_size: int, offset: int, tier=None) -> list:
+    tier_filter = "AND tier = ? " if tier is not None else ""
+    args = ("org", tier, page_size, offset) if tier is not None else ("org", page_size, offset)
+    return store._read(
+        f"SELECT {store._COLUMNS} FROM records WHERE org_id = ? {tier_filter}"
+        "ORDER BY created_at DESC, record_id DESC LIMIT ? OFFSET ?", *args
+    )
+
+
+def timed(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e3
+
+
+async def positions(store: SQLiteRecordStore, page_size: int, depth: int, query: RecordQuery) -> list:
+    """Cursor of the page at each depth (walked once, not timed)."""
+    cursors, after = [None], None
+    for _ in range(depth):
+        records = await store.list("org", page_size, query, after)
+        after = records[-1].position
+        cursors.append(after)
+    return cursors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteRecordStore(str(Path(directory) / "records.db"))
+        fill(store, args.records)
+        print(f"{args.records} records, {args.page_size} per page")
+
+        for label, tier in (("all", None), ("tier=2", 2)):
+            query = RecordQuery(tier=tier)
+            matching = args.records if tier is None else args.records // 3
+            depths = [0, matching // args.page_size // 10, matching // args.page_size - 1]
+            cursors = asyncio.run(positions(store, args.page_size, depths[-1], query))
+            for depth in depths:
+                after = cursors[depth]
+                sql, sql_args = store._list_query("org", args.page_size, query, after)
+                keyset = timed(lambda: store._read(sql, *sql_args))
+                offset = timed(lambda: offset_page(store, args.page_size, depth * args.page_size, tier))
+                print(f"{label:7s} page {depth + 1:6d}   cursor {keyset:7.2f} ms   offset {offset:7.2f} ms")
+
+        asyncio.run(store.close())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Identifier scanner benchmark for LUMEN SDK API.
+
+Times scanning 100 KB AI outputs for the identifier patterns of all six
+packs with the single-pass scanner (compliance.scanner: one combined
+regular expression driving a word-level Aho-Corasick automaton), against
+running one regular expression per pattern and phrase.
+
+Usage (from the api directory):
+    python benchmarks/bench_scanner.py [--size 100000] [--repeat 20]
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from compliance import get_rule_engine
+from compliance.scanner import CHECK_PATTERNS, IDENTIFIER_PHRASES, IDENTIFIER_REGEXES
+
+WORDS = (
+    "the patient reports mild chest pain after exercise and was advised to continue "
+    "metformin 500mg twice daily with follow up in cardiology clinic in two weeks"
+).split()
+IDENTIFIERS = (
+    "SSN 123-45-6789", "date of birth", "jane.doe@example.com", "HIV", "MRN: 1234567",
+    "(416) 555-1234", "health card 1234-567-890-AB", "2026-02-13", "M5V 2T6",
+)
+
+
+def sample_output(size: int, seed: int = 42) -> str:
+    """Clinical-looking text with an identifier roughly every 100 words."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice(IDENTIFIERS) if rng.random() < 0.01 else rng.choice(WORDS)
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)[:size]
+
+
+def per_pattern_scan(text: str, regexes, phrases) -> dict:
+    """One pass per pattern and per phrase, for comparison."""
+    found = {}
+    for check_id, names in CHECK_PATTERNS.items():
+        spans = []
+        for name in names:
+            for pattern in regexes.get(name, ()):
+                spans.extend((m.start(), m.end(), name) for m in pattern.finditer(text))
+            for pattern in phrases.get(name, ()):
+                spans.extend((m.start(), m.end(), name) for m in pattern.finditer(text))
+        if spans:
+            found[check_id] = spans
+    return found
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    text = sample_output(args.size)
+    scanner = get_rule_engine().plan().scanner
+    regexes = {name: [re.compile(pattern)] for name, (_, pattern) in IDENTIFIER_REGEXES.items()}
+    phrases = {
+        name: [re.compile(r"\b" + r"\W+".join(map(re.escape, phrase.split())) + r"\b", re.IGNORECASE)
+               for phrase in group]
+        for name, group in IDENTIFIER_PHRASES.items()
+    }
+    patterns = len(regexes) + sum(len(group) for group in phrases.values())
+
+    single = timed(lambda: scanner.scan(text), args.repeat)
+    separate = timed(lambda: per_pattern_scan(text, regexes, phrases), args.repeat)
+    matches = sum(len(spans) for spans in scanner.scan(text).values())
+    print(f"{len(text) / 1000:.0f} KB output, {patterns} patterns, {matches} check matches")
+    print(f"single pass     {single:8.2f} ms  {len(text) / single / 1e3:6.1f} MB/s")
+    print(f"per pattern     {separate:8.2f} ms  {len(text) / separate / 1e3:6.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
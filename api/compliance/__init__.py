@@ -0,0 +1,18 @@
+"""
+Compliance rule engine for LUMEN SDK API.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from .context import EvaluationContext
+from .engine import CheckResult, EvaluationPlan, PackResult, RuleEngine, compile_pack, get_rule_engine
+
+__all__ = [
+    "CheckResult",
+    "EvaluationContext",
+    "EvaluationPlan",
+    "PackResult",
+    "RuleEngine",
+    "compile_pack",
+    "get_rule_engine",
+]
@@ -0,0 +1,136 @@
+"""
+Evaluation context for LUMEN SDK API compliance checks.
+
+The context is the ``context`` object of an evaluation request, using the
+camelCase field names of the TypeScript policy packs (src/packs). Every
+field a rule can read is extracted once per evaluation into a slotted
+object, so rules read attributes instead of repeating dictionary lookups.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from typing import Any, Mapping
+
+# (attribute, context key) for every field read by a rule
+CONTEXT_FIELDS = (
+    # PHI and purpose
+    ("phi_present", "phiPresent"),
+    ("phi_types", "phiTypes"),
+    ("purpose", "purpose"),
+    ("user_role", "userRole"),
+    ("is_tpo", "isTPO"),
+    ("for_treatment", "forTreatment"),
+    ("is_healthcare_provision", "isHealthcareProvision"),
+    ("public_health_purpose", "publicHealthPurpose"),
+    ("law_enforcement_purpose", "lawEnforcementPurpose"),
+    ("research_purpose", "researchPurpose"),
+    ("research_irb_approved", "researchIRBApproved"),
+    ("secondary_use", "secondaryUse"),
+    ("minimum_necessary_applied", "minimumNecessaryApplied"),
+    ("collected_from_individual", "collectedFromIndividual"),
+    ("records_accurate", "recordsAccurate"),
+    ("retention_days", "retentionDays"),
+    # Consent and authorization
+    ("has_explicit_consent", "hasExplicitConsent"),
+    ("consent_type", "consentType"),
+    ("has_authorization", "hasAuthorization"),
+    ("valid_authorization", "validAuthorization"),
+    ("substitute_decision_maker", "substituteDecisionMaker"),
+    ("npp_provided", "nppProvided"),
+    # Custodians, agents and business associates
+    ("custodian_id", "custodianId"),
+    ("baa_in_place", "baaInPlace"),
+    ("agent_agreement_in_place", "agentAgreementInPlace"),
+    ("transfer_agreement_in_place", "transferAgreementInPlace"),
+    ("privacy_officer_designated", "privacyOfficerDesignated"),
+    ("security_officer_designated", "securityOfficerDesignated"),
+    ("workforce_training_completed", "workforceTrainingCompleted"),
+    ("sanction_policy_implemented", "sanctionPolicyImplemented"),
+    # Residency and safeguards
+    ("is_canadian_residency", "isCanadianResidency"),
+    ("safeguards", "safeguards"),
+    ("admin_safeguards", "adminSafeguards"),
+    ("physical_safeguards", "physicalSafeguards"),
+    ("technical_safeguards", "technicalSafeguards"),
+    ("encryption_at_rest", "encryptionAtRest"),
+    ("encryption_in_transit", "encryptionInTransit"),
+    ("access_controls_implemented", "accessControlsImplemented"),
+    ("unique_user_identification", "uniqueUserIdentification"),
+    ("audit_logging_enabled", "auditLoggingEnabled"),
+    ("integrity_controls", "integrityControls"),
+    ("disclosure_accounting_maintained", "disclosureAccountingMaintained"),
+    ("contingency_plan_in_place", "contingencyPlanInPlace"),
+    ("risk_assessment_completed", "riskAssessmentCompleted"),
+    ("is_ehr_system", "isEHRSystem"),
+    # De-identification
+    ("is_de_identified", "isDeIdentified"),
+    ("deidentification_method", "deidentificationMethod"),
+    ("safe_harbor_removed", "safeHarborRemoved"),
+    # Individual requests
+    ("patient_access_request", "patientAccessRequest"),
+    ("access_response_days", "accessResponseDays"),
+    ("correction_request", "correctionRequest"),
+    ("amendment_request", "amendmentRequest"),
+    ("amendment_response_days", "amendmentResponseDays"),
+    # Breaches and incidents
+    ("breach_detected", "breachDetected"),
+    ("breach_scope", "breachScope"),
+    ("breach_affected_count", "breachAffectedCount"),
+    ("breach_notification_sent", "breachNotificationSent"),
+    ("breach_notification_timely", "breachNotificationTimely"),
+    ("serious_incident", "seriousIncident"),
+    ("incident_reported", "incidentReported"),
+    ("incident_response_plan", "incidentResponsePlan"),
+    # AI system governance
+    ("is_medical_device", "isMedicalDevice"),
+    ("samd_classification", "samdClassification"),
+    ("submission_pathway", "submissionPathway"),
+    ("predicate_device", "predicateDevice"),
+    ("clinical_validation_completed", "clinicalValidationCompleted"),
+    ("model_updated", "modelUpdated"),
+    ("change_control_plan", "changeControlPlan"),
+    ("real_world_monitoring", "realWorldMonitoring"),
+    ("performance_monitoring", "performanceMonitoring"),
+    ("post_market_monitoring", "postMarketMonitoring"),
+    ("bias_assessment_completed", "biasAssessmentCompleted"),
+    ("explainability_provided", "explainabilityProvided"),
+    ("training_data_documented", "trainingDataDocumented"),
+    ("human_factors_validated", "humanFactorsValidated"),
+    ("ai_disclosure_provided", "aiDisclosureProvided"),
+    ("ai_governance_policy", "aiGovernancePolicy"),
+    ("human_oversight", "humanOversight"),
+    ("impact_assessment_completed", "impactAssessmentCompleted"),
+    ("ai_system_category", "aiSystemCategory"),
+    ("risk_tolerance_defined", "riskToleranceDefined"),
+    ("continuous_improvement_process", "continuousImprovementProcess"),
+    ("ai_act_risk_category", "aiActRiskCategory"),
+    ("prohibited_practice", "prohibitedPractice"),
+    ("technical_documentation", "technicalDocumentation"),
+    ("accuracy_metrics_declared", "accuracyMetricsDeclared"),
+    ("robustness_tested", "robustnessTested"),
+    ("conformity_assessment_completed", "conformityAssessmentCompleted"),
+    ("ce_marked", "ceMarked"),
+)
+
+
+class EvaluationContext:
+    """
+    Compliance-relevant fields of an evaluation context.
+
+    Missing fields are None; rules treat None as "not declared" and, like
+    the TypeScript packs, fail most checks only on an explicit False.
+    ``detections`` holds identifier spans found in the AI output, keyed by
+    checkId (see compliance.scanner); it is filled in by the engine.
+    """
+
+    __slots__ = tuple(attribute for attribute, _ in CONTEXT_FIELDS) + ("detections",)
+
+    def __init__(self, context: Mapping[str, Any]):
+        get = context.get
+        for attribute, key in CONTEXT_FIELDS:
+            setattr(self, attribute, get(key))
+        self.detections = {}
+
+    def __repr__(self) -> str:
+        declared = {key: getattr(self, attribute) for attribute, key in CONTEXT_FIELDS if getattr(self, attribute) is not None}
+        return f"EvaluationContext({declared!r})"
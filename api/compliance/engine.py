@@ -0,0 +1,262 @@
+"""
+Compiled compliance rule engine for LUMEN SDK API.
+
+Each pack in data/packs.py is compiled once, at import, into a flat tuple
+of steps (check metadata plus its evaluator from compliance.rules). A plan
+for a set of packs concatenates their steps, and keeps a second copy in
+which PHI-only checks are pre-resolved as passing, so a context without
+PHI never calls those evaluators. Evaluating a context extracts its fields
+once (see EvaluationContext) and then walks the steps in order.
+
+Each plan also owns an identifier scanner (compliance.scanner) over the
+patterns of its checks; when the AI output is passed in, it is scanned
+once and the spans are reported on the checks that read them.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from data.packs import get_all_packs
+
+from .context import EvaluationContext
+from .rules import RULES, Evaluator
+from .scanner import IdentifierScanner, Span, create_scanner
+
+NO_PHI_REASON = "No PHI involved"
+
+# (check_id, name, severity, evaluator); evaluator None means "no PHI, passes"
+Step = Tuple[str, str, str, Optional[Evaluator]]
+
+
+class CheckResult:
+    """Outcome of one check."""
+
+    __slots__ = ("check_id", "name", "severity", "passed", "reason", "matches")
+
+    def __init__(self, check_id: str, name: str, severity: str, passed: bool, reason: str,
+                 matches: Sequence[Span] = ()):
+        self.check_id = check_id
+        self.name = name
+        self.severity = severity
+        self.passed = passed
+        self.reason = reason
+        # Identifier spans found in the AI output for this check
+        self.matches = matches
+
+    def to_dict(self) -> dict:
+        return {
+            "check_id": self.check_id,
+            "name": self.name,
+            "severity": self.severity,
+            "passed": self.passed,
+            "reason": self.reason,
+            "matches": [{"start": start, "end": end, "pattern": pattern} for start, end, pattern in self.matches],
+        }
+
+
+class PackResult:
+    """Outcomes of every check of one pack, in pack order."""
+
+    __slots__ = ("pack_id", "version", "checks")
+
+    def __init__(self, pack_id: str, version: str, checks: List[CheckResult]):
+        self.pack_id = pack_id
+        self.version = version
+        self.checks = checks
+
+    @property
+    def passed(self) -> bool:
+        return all(check.passed for check in self.checks)
+
+    @property
+    def failed(self) -> List[CheckResult]:
+        return [check for check in self.checks if not check.passed]
+
+    def to_dict(self) -> dict:
+        return {
+            "pack_id": self.pack_id,
+            "version": self.version,
+            "passed": self.passed,
+            "checks": [check.to_dict() for check in self.checks],
+        }
+
+
+class CompiledPack:
+    """A pack's checks as flat steps, with and without PHI present."""
+
+    __slots__ = ("pack_id", "version", "steps", "no_phi_steps")
+
+    def __init__(self, pack_id: str, version: str, steps: Tuple[Step, ...], no_phi_steps: Tuple[Step, ...]):
+        self.pack_id = pack_id
+        self.version = version
+        self.steps = steps
+        self.no_phi_steps = no_phi_steps
+
+
+def compile_pack(pack_id: str, pack: Mapping[str, Any]) -> CompiledPack:
+    """
+    Compile a pack definition against the registered rules.
+
+    Args:
+        pack_id: Pack identifier
+        pack: Pack definition from data/packs.py
+
+    Returns:
+        CompiledPack: The pack's evaluation steps
+
+    Raises:
+        ValueError: If a check of the pack has no registered rule
+    """
+    steps = []
+    no_phi_steps = []
+    for check in pack["checks"]:
+        registered = RULES.get(check["checkId"])
+        if registered is None:
+            raise ValueError(f"No rule registered for check {check['checkId']} of pack {pack_id}")
+        step = (check["checkId"], check["name"], check["severity"], registered.evaluator)
+        steps.append(step)
+        no_phi_steps.append(step[:3] + (None,) if registered.phi else step)
+    return CompiledPack(pack_id, pack["version"], tuple(steps), tuple(no_phi_steps))
+
+
+class EvaluationPlan:
+    """
+    Flat evaluation plan for an ordered set of compiled packs.
+
+    All steps of all packs live in one tuple; ``bounds`` records where
+    each pack's steps end.
+    """
+
+    __slots__ = ("packs", "steps", "no_phi_steps", "bounds", "scanner")
+
+    def __init__(self, packs: Iterable[CompiledPack]):
+        self.packs = tuple(packs)
+        self.steps = tuple(step for pack in self.packs for step in pack.steps)
+        self.no_phi_steps = tuple(step for pack in self.packs for step in pack.no_phi_steps)
+        bounds = []
+        end = 0
+        for pack in self.packs:
+            end += len(pack.steps)
+            bounds.append(end)
+        self.bounds = tuple(bounds)
+        self.scanner: IdentifierScanner = create_scanner(step[0] for step in self.steps)
+
+    @property
+    def pack_ids(self) -> Tuple[str, ...]:
+        return tuple(pack.pack_id for pack in self.packs)
+
+    def evaluate(
+        self,
+        context: Union[EvaluationContext, Mapping[str, Any]],
+        output: Optional[str] = None,
+    ) -> List[PackResult]:
+        """
+        Run every check of the plan against a context.
+
+        A check whose context fields have the wrong type (for example a
+        string retentionDays) fails instead of raising.
+
+        Args:
+            context: Evaluation context, or the raw request context dict
+            output: AI output to scan for identifiers; None skips scanning
+
+        Returns:
+            list: One PackResult per pack, in plan order
+        """
+        ctx = context if isinstance(context, EvaluationContext) else EvaluationContext(context)
+        if output is not None:
+            ctx.detections = self.scanner.scan(output)
+        detections = ctx.detections
+        # Identifiers in the output are PHI whatever the request claims
+        steps = self.steps if ctx.phi_present or detections else self.no_phi_steps
+
+        checks = []
+        append = checks.append
+        for check_id, name, severity, evaluator in steps:
+            if evaluator is None:
+                append(CheckResult(check_id, name, severity, True, NO_PHI_REASON, detections.get(check_id, ())))
+                continue
+            try:
+                passed, reason = evaluator(ctx)
+            except (TypeError, ValueError, AttributeError):
+                passed, reason = False, "Context fields for this check are malformed"
+            append(CheckResult(check_id, name, severity, passed, reason, detections.get(check_id, ())))
+
+        results = []
+        start = 0
+        for pack, end in zip(self.packs, self.bounds):
+            results.append(PackResult(pack.pack_id, pack.version, checks[start:end]))
+            start = end
+        return results
+
+
+class RuleEngine:
+    """
+    Compiled packs and the plans built from them.
+
+    Plans are cached per pack selection, so repeated evaluations of the
+    same packs reuse one plan.
+    """
+
+    def __init__(self, packs: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        packs = get_all_packs() if packs is None else packs
+        self.packs: Dict[str, CompiledPack] = {
+            pack_id: compile_pack(pack_id, pack) for pack_id, pack in packs.items()
+        }
+        self._plans: Dict[Tuple[str, ...], EvaluationPlan] = {}
+
+    def plan(self, pack_ids: Optional[Iterable[str]] = None) -> EvaluationPlan:
+        """
+        Get the evaluation plan for a set of packs.
+
+        Args:
+            pack_ids: Packs to evaluate, in result order (duplicates
+                ignored); None for every pack
+
+        Returns:
+            EvaluationPlan: The (cached) plan
+
+        Raises:
+            ValueError: If a pack id is unknown
+        """
+        key = tuple(self.packs) if pack_ids is None else tuple(dict.fromkeys(pack_ids))
+        plan = self._plans.get(key)
+        if plan is None:
+            unknown = [pack_id for pack_id in key if pack_id not in self.packs]
+            if unknown:
+                raise ValueError(f"Unknown compliance pack: {', '.join(unknown)}")
+            plan = EvaluationPlan(self.packs[pack_id] for pack_id in key)
+            self._plans[key] = plan
+        return plan
+
+    def evaluate(
+        self,
+        context: Union[EvaluationContext, Mapping[str, Any]],
+        pack_ids: Optional[Iterable[str]] = None,
+        output: Optional[str] = None,
+    ) -> List[PackResult]:
+        """
+        Evaluate a context against packs.
+
+        Args:
+            context: Evaluation context, or the raw request context dict
+            pack_ids: Packs to evaluate; None for every pack
+            output: AI output to scan for identifiers; None skips scanning
+
+        Returns:
+            list: One PackResult per pack
+
+        Raises:
+            ValueError: If a pack id is unknown
+        """
+        return self.plan(pack_ids).evaluate(context, output)
+
+
+# Global engine instance, compiled at startup
+_rule_engine = RuleEngine()
+
+
+def get_rule_engine() -> RuleEngine:
+    """Get the process-wide compiled rule engine."""
+    return _rule_engine
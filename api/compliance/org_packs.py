@@ -0,0 +1,234 @@
+"""
+Per-organization enabled pack cache for LUMEN SDK API.
+
+/v1/packs/enable and /disable record which packs an organization runs in
+organization_packs. Evaluations need that set on every request, so it is
+kept in memory per organization together with its compiled evaluation
+plan (see compliance.engine), and only reloaded from the repository when
+the entry expires or after the organization enables or disables a pack.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from db.repository import get_repository
+
+from .engine import EvaluationPlan, RuleEngine, get_rule_engine
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration - override via environment
+ORG_PACK_CACHE_TTL_SECONDS = float(os.getenv("ORG_PACK_CACHE_TTL_SECONDS", "60"))
+ORG_PACK_CACHE_MAX_ENTRIES = int(os.getenv("ORG_PACK_CACHE_MAX_ENTRIES", "10000"))
+
+
+class EnabledPacks:
+    """An organization's enabled packs and the plan that evaluates them."""
+
+    __slots__ = ("pack_ids", "plan", "_engine")
+
+    def __init__(self, pack_ids: Tuple[str, ...], engine: RuleEngine):
+        self.pack_ids = pack_ids
+        self.plan = engine.plan(pack_ids)
+        self._engine = engine
+
+    def select(self, requested: Iterable[str] = ()) -> EvaluationPlan:
+        """
+        Get the plan for the packs an evaluation should run.
+
+        Args:
+            requested: The request's compliance_packs; empty for every
+                enabled pack. Packs the organization has not enabled
+                (including unknown ids) are skipped.
+
+        Returns:
+            EvaluationPlan: Plan over the selected packs, in request order
+        """
+        requested = tuple(dict.fromkeys(requested))
+        if not requested:
+            return self.plan
+        return self._engine.plan(pack_id for pack_id in requested if pack_id in self.pack_ids)
+
+
+class _CacheEntry:
+    """A cached pack selection."""
+
+    __slots__ = ("packs", "expires_at")
+
+    def __init__(self, packs: EnabledPacks, expires_at: float):
+        self.packs = packs
+        self.expires_at = expires_at
+
+
+class OrgPackCache:
+    """
+    Bounded LRU cache of enabled packs per organization with TTL expiry.
+
+    The TTL bounds how long another worker keeps evaluating with packs an
+    organization has since disabled; changes handled by this worker take
+    effect immediately through invalidate().
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = ORG_PACK_CACHE_TTL_SECONDS,
+        max_entries: int = ORG_PACK_CACHE_MAX_ENTRIES,
+        engine: Optional[RuleEngine] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.engine = engine or get_rule_engine()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # Bumped by every invalidation, so a load that raced one is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter; pass the value read before loading to put()."""
+        return self._generation
+
+    def get(self, org_id: str) -> Optional[EnabledPacks]:
+        """
+        Look up an organization's enabled packs.
+
+        Returns:
+            The cached EnabledPacks, or None on a miss or TTL expiry
+        """
+        with self._lock:
+            entry = self._entries.get(org_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() >= entry.expires_at:
+                del self._entries[org_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(org_id)
+            self.hits += 1
+            return entry.packs
+
+    def put(self, org_id: str, pack_ids: Iterable[str], generation: Optional[int] = None) -> EnabledPacks:
+        """
+        Cache the packs an organization has enabled.
+
+        Ids without a compiled pack are dropped; the rest are kept in
+        catalog order, so the same set always maps to the same plan.
+
+        Args:
+            org_id: Organization ID
+            pack_ids: Enabled pack ids, as loaded from the repository
+            generation: The generation read before loading; if a pack was
+                enabled or disabled since, the result is returned uncached
+
+        Returns:
+            EnabledPacks: The organization's packs and plan
+        """
+        enabled = set(pack_ids)
+        unknown = enabled.difference(self.engine.packs)
+        if unknown:
+            logger.warning(f"Organization {org_id} has unknown packs enabled: {', '.join(sorted(unknown))}")
+        packs = EnabledPacks(tuple(pack_id for pack_id in self.engine.packs if pack_id in enabled), self.engine)
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return packs
+            self._entries.pop(org_id, None)
+            self._entries[org_id] = _CacheEntry(packs, time.time() + self.ttl_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return packs
+
+    def invalidate(self, org_id: str) -> bool:
+        """
+        Drop an organization's entry (e.g. after enabling a pack).
+
+        Returns:
+            bool: Whether an entry was removed
+        """
+        with self._lock:
+            self._generation += 1
+            return self._entries.pop(org_id, None) is not None
+
+    def purge_expired(self) -> int:
+        """
+        Remove entries past their TTL.
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            stale = [org_id for org_id, entry in self._entries.items() if now >= entry.expires_at]
+            for org_id in stale:
+                del self._entries[org_id]
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss/eviction counters."""
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Global cache instance
+_org_pack_cache = OrgPackCache()
+
+
+def get_org_pack_cache() -> OrgPackCache:
+    """Get the process-wide enabled pack cache."""
+    return _org_pack_cache
+
+
+async def get_enabled_packs(org_id: str) -> EnabledPacks:
+    """
+    Resolve the packs an organization has enabled.
+
+    Served from memory in steady state; the repository is only queried on
+    a miss.
+
+    Args:
+        org_id: Organization ID
+
+    Returns:
+        EnabledPacks: The organization's packs and compiled plan
+    """
+    cache = _org_pack_cache
+    packs = cache.get(org_id)
+    if packs is None:
+        generation = cache.generation
+        pack_ids = await get_repository().list_enabled_packs(org_id)
+        packs = cache.put(org_id, pack_ids, generation)
+    return packs
+
+
+def invalidate_enabled_packs(org_id: str) -> bool:
+    """
+    Invalidate an organization's cached packs.
+
+    Called when a pack is enabled or disabled, so this worker evaluates
+    with the new set immediately; other workers pick it up within the
+    cache TTL.
+    """
+    return _org_pack_cache.invalidate(org_id)
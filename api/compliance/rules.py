@@ -0,0 +1,854 @@
+"""
+Compliance check rules for LUMEN SDK API.
+
+One evaluator per check of the packs in data/packs.py, keyed by checkId.
+The PHIPA and HIPAA evaluators are ported from the TypeScript policy
+packs (src/packs/ca-on-phipa.ts, src/packs/us-fed-hipaa.ts); the other
+packs follow the same conventions:
+
+- Rules registered with ``phi=True`` only apply when PHI is present; the
+  engine passes them without calling the evaluator otherwise.
+- An undeclared context field (None) is "not specified" and passes unless
+  the check requires a declaration; an explicit False fails.
+
+Evaluators take an EvaluationContext and return (passed, reason). Checks
+listed in compliance.scanner.CHECK_PATTERNS also read the identifiers
+found in the AI output (ctx.detections).
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from typing import Callable, Dict, Tuple
+
+from .context import EvaluationContext
+
+Outcome = Tuple[bool, str]
+Evaluator = Callable[[EvaluationContext], Outcome]
+
+# HIPAA Safe Harbor identifiers (18 total), 45 CFR 164.514(b)(2)
+SAFE_HARBOR_IDENTIFIERS = (
+    "names",
+    "geographic_subdivisions",
+    "dates",
+    "telephone_numbers",
+    "fax_numbers",
+    "email_addresses",
+    "ssn",
+    "mrn",
+    "health_plan_numbers",
+    "account_numbers",
+    "certificate_numbers",
+    "vehicle_identifiers",
+    "device_identifiers",
+    "urls",
+    "ip_addresses",
+    "biometric_identifiers",
+    "photos",
+    "other_unique_identifiers",
+)
+
+AI_ACT_RISK_CATEGORIES = ("minimal", "limited", "high", "unacceptable")
+
+
+class Rule:
+    """A registered check evaluator."""
+
+    __slots__ = ("check_id", "evaluator", "phi")
+
+    def __init__(self, check_id: str, evaluator: Evaluator, phi: bool):
+        self.check_id = check_id
+        self.evaluator = evaluator
+        self.phi = phi
+
+
+RULES: Dict[str, Rule] = {}
+
+
+def rule(check_id: str, phi: bool = False) -> Callable[[Evaluator], Evaluator]:
+    """
+    Register an evaluator for a check.
+
+    Args:
+        check_id: checkId of the check in data/packs.py
+        phi: Whether the check only applies when PHI is present
+
+    Raises:
+        ValueError: If the check already has an evaluator
+    """
+    def register(evaluator: Evaluator) -> Evaluator:
+        if check_id in RULES:
+            raise ValueError(f"Duplicate rule for check: {check_id}")
+        RULES[check_id] = Rule(check_id, evaluator, phi)
+        return evaluator
+    return register
+
+
+def _pass(reason: str) -> Outcome:
+    return True, reason
+
+
+def _fail(reason: str) -> Outcome:
+    return False, reason
+
+
+def _detected(ctx: EvaluationContext, check_id: str) -> str:
+    """Comma-separated identifier patterns found in the output for a check."""
+    return ", ".join(sorted({name for _, _, name in ctx.detections.get(check_id, ())}))
+
+
+def _has_safeguard(safeguards, *keywords: str) -> bool:
+    return any(keyword in safeguard.lower() for safeguard in safeguards for keyword in keywords)
+
+
+# ---------------------------------------------------------------------------
+# ca-on-phipa - Ontario Personal Health Information Protection Act
+# ---------------------------------------------------------------------------
+
+@rule("phipa-001", phi=True)
+def phipa_consent(ctx: EvaluationContext) -> Outcome:
+    if ctx.substitute_decision_maker and not ctx.has_explicit_consent:
+        return _fail("Substitute decision maker authority must be verified")
+    if ctx.has_explicit_consent is True:
+        return _pass("Explicit consent obtained")
+    if ctx.consent_type == "deemed" and ctx.is_healthcare_provision:
+        return _pass("Deemed consent applies for healthcare provision under s.20")
+    if ctx.is_tpo:
+        return _pass("Consent not required for treatment, payment, or healthcare operations under s.37")
+    if ctx.patient_access_request:
+        return _pass("Consent not required for patient access request under s.23")
+    return _fail("PHIPA requires consent for collection, use, or disclosure of PHI")
+
+
+@rule("phipa-002", phi=True)
+def phipa_data_residency(ctx: EvaluationContext) -> Outcome:
+    if ctx.is_canadian_residency is False:
+        return _fail("PHI should be stored in Canada or with equivalent protections")
+    return _pass("Data residency requirements met")
+
+
+@rule("phipa-003", phi=True)
+def phipa_minimum_necessary(ctx: EvaluationContext) -> Outcome:
+    if not ctx.purpose:
+        return _fail("Purpose must be specified for PHI collection")
+    if ctx.minimum_necessary_applied is False:
+        return _fail("Collection must be limited to what is reasonably necessary for the purpose")
+    detected = _detected(ctx, "phipa-003")
+    if detected and ctx.minimum_necessary_applied is not True:
+        return _fail(f"AI output discloses identifiers beyond what the purpose requires: {detected}")
+    if ctx.collected_from_individual is False and ctx.user_role != "custodian":
+        return _fail("PHIPA requires collection directly from individual unless authorized by law")
+    return _pass("Collection purpose is documented")
+
+
+@rule("phipa-004", phi=True)
+def phipa_custodian_accountability(ctx: EvaluationContext) -> Outcome:
+    if ctx.user_role == "agent":
+        if not ctx.custodian_id:
+            return _fail("Agent access requires custodian authorization")
+        return _pass("Agent access is authorized by custodian")
+    return _pass("Not an agent access scenario")
+
+
+@rule("phipa-005", phi=True)
+def phipa_disclosure_limits(ctx: EvaluationContext) -> Outcome:
+    if ctx.has_explicit_consent:
+        return _pass("Disclosure permitted with consent")
+    if ctx.is_healthcare_provision and ctx.user_role == "healthcare_provider":
+        return _pass("Disclosure permitted for healthcare provision to another provider")
+    if ctx.is_tpo:
+        return _pass("Disclosure permitted for treatment, payment, or operations")
+    return _fail("Disclosure requires consent or statutory authority")
+
+
+@rule("phipa-006")
+def phipa_access_controls(ctx: EvaluationContext) -> Outcome:
+    if ctx.is_ehr_system:
+        if not ctx.audit_logging_enabled:
+            return _fail("EHR systems require comprehensive audit logging")
+        if not ctx.access_controls_implemented:
+            return _fail("EHR systems require role-based access controls")
+        return _pass("EHR system requirements met")
+    if ctx.phi_present and ctx.access_controls_implemented is False:
+        return _fail("Access to PHI must be restricted by access controls")
+    return _pass("Access controls verified")
+
+
+@rule("phipa-007", phi=True)
+def phipa_accuracy(ctx: EvaluationContext) -> Outcome:
+    if not ctx.phi_types:
+        return _fail("PHI types must be specified when PHI is present")
+    if ctx.records_accurate is False:
+        return _fail("PHI must be as accurate, complete and up-to-date as necessary for its purpose")
+    return _pass("PHI declaration is complete")
+
+
+@rule("phipa-008", phi=True)
+def phipa_retention(ctx: EvaluationContext) -> Outcome:
+    if ctx.retention_days is None:
+        return _fail("Retention period must be defined for PHI")
+    if ctx.retention_days < 10 * 365:
+        return _fail("PHI retention period likely insufficient (minimum typically 10 years)")
+    return _pass(f"Retention period of {ctx.retention_days} days meets requirements")
+
+
+@rule("phipa-009", phi=True)
+def phipa_third_party_agreements(ctx: EvaluationContext) -> Outcome:
+    if ctx.user_role in ("agent", "third_party"):
+        if ctx.agent_agreement_in_place is False:
+            return _fail("Agents and third parties require an agreement with the custodian")
+        return _pass("Agent agreement status verified")
+    return _pass("No agent or third party involved")
+
+
+@rule("phipa-010")
+def phipa_breach_notification(ctx: EvaluationContext) -> Outcome:
+    if not ctx.breach_detected:
+        return _pass("No breach detected")
+    if ctx.breach_scope == "minor":
+        return _pass("Minor breach - document and mitigate")
+    if not ctx.breach_notification_sent:
+        return _fail(f"{ctx.breach_scope or 'Significant'} breach requires notification to IPC and affected individuals")
+    return _pass("Breach notification requirements satisfied")
+
+
+@rule("phipa-011")
+def phipa_patient_access(ctx: EvaluationContext) -> Outcome:
+    if ctx.patient_access_request:
+        if ctx.has_explicit_consent is False:
+            return _fail("Access request requires verification of identity")
+        return _pass("Access request properly authenticated")
+    return _pass("No access request pending")
+
+
+@rule("phipa-012")
+def phipa_correction(ctx: EvaluationContext) -> Outcome:
+    if ctx.correction_request:
+        if not ctx.custodian_id:
+            return _fail("Correction requests must be processed by the custodian")
+        return _pass("Correction request properly routed to custodian")
+    return _pass("No correction request pending")
+
+
+@rule("phipa-013", phi=True)
+def phipa_circle_of_care(ctx: EvaluationContext) -> Outcome:
+    if not ctx.is_healthcare_provision:
+        return _pass("Deemed consent rules do not apply")
+    if ctx.consent_type in ("deemed", "express"):
+        return _pass("Consent (deemed or express) is in place for healthcare provision")
+    return _fail("Healthcare provision requires deemed consent with proper notice to individual")
+
+
+@rule("phipa-014", phi=True)
+def phipa_administrative_safeguards(ctx: EvaluationContext) -> Outcome:
+    safeguards = ctx.safeguards or ()
+    if not _has_safeguard(safeguards, "administrative", "admin"):
+        return _fail("Administrative safeguards required under s.10")
+    if not _has_safeguard(safeguards, "physical"):
+        return _fail("Physical safeguards required under s.10")
+    return _pass("Administrative and physical safeguards are in place")
+
+
+@rule("phipa-015", phi=True)
+def phipa_technical_safeguards(ctx: EvaluationContext) -> Outcome:
+    if not _has_safeguard(ctx.safeguards or (), "technical", "encrypt"):
+        return _fail("Technical safeguards required under s.10")
+    if ctx.encryption_at_rest and ctx.access_controls_implemented:
+        return _pass("Secure storage with encryption and access controls")
+    return _fail("Secure storage requires encryption at rest and access controls")
+
+
+# ---------------------------------------------------------------------------
+# us-fed-hipaa - Health Insurance Portability and Accountability Act
+# ---------------------------------------------------------------------------
+
+@rule("hipaa-001", phi=True)
+def hipaa_minimum_necessary(ctx: EvaluationContext) -> Outcome:
+    if ctx.user_role == "patient":
+        return _pass("Minimum necessary does not apply to own records")
+    if ctx.for_treatment:
+        return _pass("Minimum necessary does not apply for treatment purposes")
+    if ctx.minimum_necessary_applied is True:
+        return _pass("Minimum necessary standard applied")
+    if ctx.minimum_necessary_applied is False:
+        return _fail("Minimum necessary standard must be applied for non-treatment disclosures")
+    detected = _detected(ctx, "hipaa-001")
+    if detected:
+        return _fail(f"AI output discloses identifiers in a non-treatment use: {detected}")
+    return _pass("Minimum necessary assessment not applicable")
+
+
+@rule("hipaa-002", phi=True)
+def hipaa_business_associate(ctx: EvaluationContext) -> Outcome:
+    if ctx.user_role == "business_associate":
+        if ctx.baa_in_place is True:
+            return _pass("Business Associate Agreement in place")
+        if ctx.baa_in_place is False:
+            return _fail("Business Associate Agreement required before PHI disclosure to BA")
+    return _pass("Not a business associate relationship")
+
+
+@rule("hipaa-003", phi=True)
+def hipaa_authorization(ctx: EvaluationContext) -> Outcome:
+    if ctx.has_authorization and ctx.valid_authorization:
+        return _pass("Valid authorization on file")
+    if ctx.is_tpo:
+        return _pass("Authorization not required for treatment, payment, or healthcare operations")
+    if ctx.patient_access_request:
+        return _pass("Authorization not required for patient access")
+    if ctx.public_health_purpose:
+        return _pass("Authorization not required for public health purposes §164.512(b)")
+    if ctx.law_enforcement_purpose:
+        return _pass("Authorization not required for law enforcement under §164.512(f)")
+    if ctx.research_purpose and ctx.research_irb_approved:
+        return _pass("Authorization not required for IRB-approved research with waiver")
+    return _fail("HIPAA authorization required for this use/disclosure")
+
+
+@rule("hipaa-004", phi=True)
+def hipaa_access_controls(ctx: EvaluationContext) -> Outcome:
+    if ctx.technical_safeguards is False:
+        return _fail("Technical safeguards required under Security Rule")
+    if ctx.access_controls_implemented is False:
+        return _fail("Access controls required for electronic PHI")
+    if ctx.unique_user_identification is False:
+        return _fail("Unique user identification required per §164.312(a)(2)(i)")
+    return _pass("Access controls implemented")
+
+
+@rule("hipaa-005", phi=True)
+def hipaa_audit_controls(ctx: EvaluationContext) -> Outcome:
+    if ctx.audit_logging_enabled is False:
+        return _fail("Audit controls required for electronic PHI")
+    return _pass("Audit controls status verified")
+
+
+@rule("hipaa-006", phi=True)
+def hipaa_integrity_controls(ctx: EvaluationContext) -> Outcome:
+    if ctx.integrity_controls is False:
+        return _fail("Electronic PHI must be protected from improper alteration or destruction")
+    return _pass("Integrity controls status verified")
+
+
+@rule("hipaa-007", phi=True)
+def hipaa_transmission_security(ctx: EvaluationContext) -> Outcome:
+    if ctx.encryption_in_transit is False:
+        return _fail("Encryption in transit strongly recommended for PHI transmission")
+    return _pass("Transmission security status verified")
+
+
+@rule("hipaa-008", phi=True)
+def hipaa_encryption(ctx: EvaluationContext) -> Outcome:
+    if ctx.encryption_at_rest and ctx.encryption_in_transit:
+        return _pass("Encryption at rest and in transit implemented")
+    if not ctx.encryption_at_rest and not ctx.encryption_in_transit:
+        return _fail("Encryption is addressable but strongly recommended - risk analysis required if not implemented")
+    if not ctx.encryption_in_transit:
+        return _fail("Encryption in transit strongly recommended for PHI transmission")
+    return _pass("Partial encryption controls in place")
+
+
+@rule("hipaa-009")
+def hipaa_deidentification(ctx: EvaluationContext) -> Outcome:
+    if ctx.is_de_identified is False:
+        return _pass("Information is identified PHI")
+    detected = _detected(ctx, "hipaa-009")
+    if detected and (ctx.is_de_identified or ctx.deidentification_method):
+        return _fail(f"AI output for de-identified data contains identifiers: {detected}")
+    if ctx.deidentification_method == "safe_harbor":
+        removed = set(ctx.safe_harbor_removed or ())
+        missing = [identifier for identifier in SAFE_HARBOR_IDENTIFIERS if identifier not in removed]
+        if not missing:
+            return _pass("All 18 Safe Harbor identifiers removed")
+        return _fail(f"Safe Harbor requires removal of all identifiers. Missing: {', '.join(missing)}")
+    if ctx.deidentification_method == "expert_determination":
+        return _pass("Expert determination method documented")
+    return _pass("De-identification method not specified")
+
+
+@rule("hipaa-010")
+def hipaa_breach_notification(ctx: EvaluationContext) -> Outcome:
+    if not ctx.breach_detected:
+        return _pass("No breach detected")
+    reportable = (
+        ctx.breach_scope in ("reportable", "major")
+        or (ctx.breach_affected_count or 0) >= 500
+    )
+    if not reportable and ctx.breach_scope == "minor":
+        return _pass("Minor breach - document risk assessment")
+    if not ctx.breach_notification_sent:
+        return _fail("Breach notification required: notify affected individuals within 60 days, HHS without unreasonable delay")
+    if ctx.breach_notification_timely is False:
+        return _fail("Breach notifications must be timely (individuals within 60 days, HHS within 60 days for 500+ affected)")
+    return _pass("Breach notification requirements satisfied")
+
+
+@rule("hipaa-011")
+def hipaa_individual_rights(ctx: EvaluationContext) -> Outcome:
+    if ctx.phi_present and ctx.npp_provided is False:
+        return _fail("NPP must be provided to patients under §164.520")
+    if not ctx.patient_access_request:
+        return _pass("No access request pending")
+    if ctx.access_response_days is None:
+        return _fail("Access requests must be fulfilled within 30 days (60 with extension)")
+    if ctx.access_response_days > 60:
+        return _fail(f"Access request response time ({ctx.access_response_days} days) exceeds maximum 60 days")
+    if ctx.access_response_days > 30:
+        return _pass("Access request fulfilled with extension")
+    return _pass("Access request fulfilled within 30 days")
+
+
+@rule("hipaa-012")
+def hipaa_amendment(ctx: EvaluationContext) -> Outcome:
+    if not ctx.amendment_request:
+        return _pass("No amendment request pending")
+    if ctx.amendment_response_days is None:
+        return _fail("Amendment requests must be responded to within 60 days")
+    if ctx.amendment_response_days > 60:
+        return _fail(f"Amendment response time ({ctx.amendment_response_days} days) exceeds 60 days")
+    return _pass("Amendment request responded to timely")
+
+
+@rule("hipaa-013", phi=True)
+def hipaa_accounting_of_disclosures(ctx: EvaluationContext) -> Outcome:
+    if ctx.disclosure_accounting_maintained is False:
+        return _fail("Disclosures of PHI must be recorded for accounting under §164.528")
+    return _pass("Disclosure accounting status verified")
+
+
+@rule("hipaa-014")
+def hipaa_administrative_safeguards(ctx: EvaluationContext) -> Outcome:
+    if ctx.phi_present and ctx.admin_safeguards is False:
+        return _fail("Administrative safeguards required under Security Rule")
+    if ctx.privacy_officer_designated is False:
+        return _fail("Privacy officer must be designated per §164.530(a)(1)")
+    if ctx.security_officer_designated is False:
+        return _fail("Security officer must be designated per §164.308(a)(2)")
+    if ctx.sanction_policy_implemented is False:
+        return _fail("Sanction policy required for workforce compliance")
+    return _pass("Administrative safeguards status verified")
+
+
+@rule("hipaa-015", phi=True)
+def hipaa_physical_safeguards(ctx: EvaluationContext) -> Outcome:
+    if ctx.physical_safeguards is False:
+        return _fail("Physical safeguards required under Security Rule")
+    return _pass("Physical safeguards status verified")
+
+
+@rule("hipaa-016")
+def hipaa_workforce_training(ctx: EvaluationContext) -> Outcome:
+    if ctx.user_role == "workforce":
+        if ctx.workforce_training_completed is True:
+            return _pass("Workforce member has completed HIPAA training")
+        if ctx.workforce_training_completed is False:
+            return _fail("Workforce members must complete HIPAA training before accessing PHI")
+    return _pass("Not applicable to non-workforce access")
+
+
+@rule("hipaa-017", phi=True)
+def hipaa_contingency_plan(ctx: EvaluationContext) -> Outcome:
+    if ctx.contingency_plan_in_place is False:
+        return _fail("Contingency plan (backup, disaster recovery, emergency mode) required per §164.308(a)(7)")
+    return _pass("Contingency plan status verified")
+
+
+@rule("hipaa-018")
+def hipaa_risk_assessment(ctx: EvaluationContext) -> Outcome:
+    if ctx.risk_assessment_completed is False:
+        return _fail("Security risk analysis required per §164.308(a)(1)(ii)(A)")
+    return _pass("Risk assessment status verified")
+
+
+# ---------------------------------------------------------------------------
+# ca-fed-pipeda - Personal Information Protection and Electronic Documents Act
+# ---------------------------------------------------------------------------
+
+@rule("pipeda-001", phi=True)
+def pipeda_consent(ctx: EvaluationContext) -> Outcome:
+    if ctx.has_explicit_consent or ctx.consent_type in ("express", "implied"):
+        return _pass("Meaningful consent obtained")
+    return _fail("PIPEDA requires meaningful consent for collection, use, or disclosure")
+
+
+@rule("pipeda-002", phi=True)
+def pipeda_purpose(ctx: EvaluationContext) -> Outcome:
+    if not ctx.purpose:
+        return _fail("Purpose must be identified at or before collection")
+    return _pass("Purpose is identified")
+
+
+@rule("pipeda-003", phi=True)
+def pipeda_collection_limitation(ctx: EvaluationContext) -> Outcome:
+    if ctx.minimum_necessary_applied is False:
+        return _fail("Collection must be limited to what is necessary for the identified purpose")
+    detected = _detected(ctx, "pipeda-003")
+    if detected and ctx.minimum_necessary_applied is not True:
+        return _fail(f"AI output discloses personal identifiers: {detected}")
+    return _pass("Collection limitation status verified")
+
+
+@rule("pipeda-004", phi=True)
+def pipeda_use_limitation(ctx: EvaluationContext) -> Outcome:
+    if ctx.secondary_use and not ctx.has_explicit_consent:
+        return _fail("Use for a new purpose requires fresh consent")
+    return _pass("Use is limited to the identified purpose")
+
+
+@rule("pipeda-005", phi=True)
+def pipeda_disclosure_limitation(ctx: EvaluationContext) -> Outcome:
+    if ctx.user_role == "third_party" and not ctx.has_explicit_consent:
+        return _fail("Disclosure to third parties requires consent")
+    return _pass("Disclosure limitation status verified")
+
+
+@rule("pipeda-006", phi=True)
+def pipeda_accuracy(ctx: EvaluationContext) -> Outcome:
+    if ctx.records_accurate is False:
+        return _fail("Personal information must be accurate, complete and up-to-date")
+    return _pass("Accuracy status verified")
+
+
+@rule("pipeda-007", phi=True)
+def pipeda_safeguards(ctx: EvaluationContext) -> Outcome:
+    if ctx.encryption_at_rest is False or ctx.access_controls_implemented is False:
+        return _fail("Security safeguards appropriate to the sensitivity of the information required")
+    return _pass("Security safeguards status verified")
+
+
+@rule("pipeda-008")
+def pipeda_openness(ctx: EvaluationContext) -> Outcome:
+    if ctx.npp_provided is False:
+        return _fail("Privacy policies and practices must be made readily available")
+    return _pass("Openness status verified")
+
+
+@rule("pipeda-009")
+def pipeda_individual_access(ctx: EvaluationContext) -> Outcome:
+    if not ctx.patient_access_request:
+        return _pass("No access request pending")
+    if ctx.access_response_days is not None and ctx.access_response_days > 30:
+        return _fail(f"Access request response time ({ctx.access_response_days} days) exceeds 30 days")
+    return _pass("Access request handled within 30 days")
+
+
+@rule("pipeda-010")
+def pipeda_challenging_compliance(ctx: EvaluationContext) -> Outcome:
+    if ctx.privacy_officer_designated is False:
+        return _fail("An accountable individual must be designated to receive complaints")
+    return _pass("Complaint handling status verified")
+
+
+@rule("pipeda-011", phi=True)
+def pipeda_cross_border(ctx: EvaluationContext) -> Outcome:
+    if ctx.is_canadian_residency is False and ctx.transfer_agreement_in_place is not True:
+        return _fail("Transfers outside Canada require contractual protections comparable to PIPEDA")
+    return _pass("Cross-border transfer protections verified")
+
+
+@rule("pipeda-012")
+def pipeda_breach_notification(ctx: EvaluationContext) -> Outcome:
+    if not ctx.breach_detected:
+        return _pass("No breach detected")
+    if ctx.breach_scope == "minor":
+        return _pass("Breach below real risk of significant harm - keep a record")
+    if not ctx.breach_notification_sent:
+        return _fail("Breach creating a real risk of significant harm must be reported to the OPC and individuals")
+    return _pass("Breach notification requirements satisfied")
+
+
+# ---------------------------------------------------------------------------
+# us-fed-fda-aiml - FDA AI/ML-enabled medical devices
+# ---------------------------------------------------------------------------
+
+@rule("fda-001")
+def fda_samd(ctx: EvaluationContext) -> Outcome:
+    if ctx.is_medical_device and not ctx.samd_classification:
+        return _fail("SaMD risk classification must be declared for medical device software")
+    return _pass("SaMD classification verified")
+
+
+@rule("fda-002")
+def fda_clinical_validation(ctx: EvaluationContext) -> Outcome:
+    if ctx.clinical_validation_completed is False:
+        return _fail("Clinical validation required before clinical use")
+    return _pass("Clinical validation status verified")
+
+
+@rule("fda-003")
+def fda_change_control(ctx: EvaluationContext) -> Outcome:
+    if ctx.model_updated and ctx.change_control_plan is not True:
+        return _fail("Model changes require a Predetermined Change Control Plan")
+    return _pass("Change control status verified")
+
+
+@rule("fda-004")
+def fda_real_world_monitoring(ctx: EvaluationContext) -> Outcome:
+    if ctx.real_world_monitoring is False:
+        return _fail("Real-world performance monitoring plan required")
+    return _pass("Real-world monitoring status verified")
+
+
+@rule("fda-005")
+def fda_bias_assessment(ctx: EvaluationContext) -> Outcome:
+    if ctx.bias_assessment_completed is False:
+        return _fail("Bias evaluation across patient subpopulations required")
+    return _pass("Bias assessment status verified")
+
+
+@rule("fda-006")
+def fda_explainability(ctx: EvaluationContext) -> Outcome:
+    if ctx.explainability_provided is False:
+        return _fail("Basis for AI output must be explainable to the clinician")
+    return _pass("Explainability status verified")
+
+
+@rule("fda-007")
+def fda_training_data(ctx: EvaluationContext) -> Outcome:
+    if ctx.training_data_documented is False:
+        return _fail("Training data provenance and quality must be documented")
+    return _pass("Training data status verified")
+
+
+@rule("fda-008")
+def fda_performance_monitoring(ctx: EvaluationContext) -> Outcome:
+    if ctx.performance_monitoring is False:
+        return _fail("Model performance must be tracked against the PCCP")
+    return _pass("Performance monitoring status verified")
+
+
+@rule("fda-009")
+def fda_risk_management(ctx: EvaluationContext) -> Outcome:
+    if ctx.risk_assessment_completed is False:
+        return _fail("Risk management per ISO 14971 required")
+    return _pass("Risk management status verified")
+
+
+@rule("fda-010")
+def fda_human_factors(ctx: EvaluationContext) -> Outcome:
+    if ctx.human_factors_validated is False:
+        return _fail("Human factors and usability validation required")
+    return _pass("Human factors status verified")
+
+
+@rule("fda-011")
+def fda_cybersecurity(ctx: EvaluationContext) -> Outcome:
+    if ctx.encryption_in_transit is False or ctx.access_controls_implemented is False:
+        return _fail("Cybersecurity controls (encryption in transit, access control) required")
+    return _pass("Cybersecurity status verified")
+
+
+@rule("fda-012")
+def fda_labeling(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_disclosure_provided is False:
+        return _fail("Labeling must disclose the use of AI/ML to users")
+    return _pass("AI labeling status verified")
+
+
+@rule("fda-013")
+def fda_predicate(ctx: EvaluationContext) -> Outcome:
+    if ctx.submission_pathway == "510k" and not ctx.predicate_device:
+        return _fail("510(k) submissions require a predicate device comparison")
+    return _pass("Predicate requirements verified")
+
+
+@rule("fda-014")
+def fda_post_market_surveillance(ctx: EvaluationContext) -> Outcome:
+    if ctx.post_market_monitoring is False:
+        return _fail("Post-market surveillance plan required")
+    return _pass("Post-market surveillance status verified")
+
+
+# ---------------------------------------------------------------------------
+# us-fed-nist-ai - NIST AI Risk Management Framework
+# ---------------------------------------------------------------------------
+
+@rule("nist-001")
+def nist_governance(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_governance_policy is False:
+        return _fail("AI risk governance policies and accountability required (GOVERN)")
+    return _pass("AI governance status verified")
+
+
+@rule("nist-002")
+def nist_human_ai_configuration(ctx: EvaluationContext) -> Outcome:
+    if ctx.human_oversight is False:
+        return _fail("Human-AI roles and oversight must be defined (MAP-1.1)")
+    return _pass("Human-AI configuration status verified")
+
+
+@rule("nist-003")
+def nist_impact_assessment(ctx: EvaluationContext) -> Outcome:
+    if ctx.impact_assessment_completed is False:
+        return _fail("Impact assessment required (MAP-1.2)")
+    return _pass("Impact assessment status verified")
+
+
+@rule("nist-004")
+def nist_categorization(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_system_category == "":
+        return _fail("AI system category must not be empty (MAP-1.3)")
+    return _pass("AI system categorization status verified")
+
+
+@rule("nist-005")
+def nist_risk_tolerance(ctx: EvaluationContext) -> Outcome:
+    if ctx.risk_tolerance_defined is False:
+        return _fail("Organizational risk tolerance must be defined (MAP-1.4)")
+    return _pass("Risk tolerance status verified")
+
+
+@rule("nist-006")
+def nist_data_quality(ctx: EvaluationContext) -> Outcome:
+    if ctx.training_data_documented is False:
+        return _fail("Data quality and provenance must be documented (MEASURE-2.1)")
+    return _pass("Data quality status verified")
+
+
+@rule("nist-007")
+def nist_performance_monitoring(ctx: EvaluationContext) -> Outcome:
+    if ctx.performance_monitoring is False:
+        return _fail("Deployed AI performance must be monitored (MEASURE-2.2)")
+    return _pass("Performance monitoring status verified")
+
+
+@rule("nist-008")
+def nist_risk_controls(ctx: EvaluationContext) -> Outcome:
+    if ctx.risk_assessment_completed is False:
+        return _fail("Identified risks must be assessed and controlled (MANAGE-1.1)")
+    return _pass("Risk controls status verified")
+
+
+@rule("nist-009")
+def nist_incident_response(ctx: EvaluationContext) -> Outcome:
+    if ctx.incident_response_plan is False:
+        return _fail("AI incident response plan required (MANAGE-1.2)")
+    return _pass("Incident response status verified")
+
+
+@rule("nist-010")
+def nist_continuous_improvement(ctx: EvaluationContext) -> Outcome:
+    if ctx.continuous_improvement_process is False:
+        return _fail("Continuous improvement process required (MANAGE-1.3)")
+    return _pass("Continuous improvement status verified")
+
+
+# ---------------------------------------------------------------------------
+# eu-ai-act - EU Artificial Intelligence Act
+# ---------------------------------------------------------------------------
+
+@rule("ai-act-001")
+def ai_act_classification(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_act_risk_category is not None and ctx.ai_act_risk_category not in AI_ACT_RISK_CATEGORIES:
+        return _fail(f"Unknown AI Act risk category: {ctx.ai_act_risk_category}")
+    return _pass("Risk classification verified")
+
+
+@rule("ai-act-002")
+def ai_act_prohibited_practices(ctx: EvaluationContext) -> Outcome:
+    if ctx.prohibited_practice or ctx.ai_act_risk_category == "unacceptable":
+        return _fail("AI practice is prohibited under Article 5")
+    return _pass("No prohibited practice declared")
+
+
+@rule("ai-act-003")
+def ai_act_high_risk(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_act_risk_category != "high":
+        return _pass("Not a high-risk AI system")
+    if ctx.risk_assessment_completed is not True:
+        return _fail("High-risk AI systems require a risk management system (Article 9)")
+    if ctx.human_oversight is not True:
+        return _fail("High-risk AI systems require human oversight (Article 14)")
+    return _pass("High-risk requirements verified")
+
+
+@rule("ai-act-004")
+def ai_act_data_governance(ctx: EvaluationContext) -> Outcome:
+    if ctx.training_data_documented is False:
+        return _fail("Training, validation and testing data must be governed (Article 10)")
+    return _pass("Data governance status verified")
+
+
+@rule("ai-act-005")
+def ai_act_technical_documentation(ctx: EvaluationContext) -> Outcome:
+    if ctx.technical_documentation is False:
+        return _fail("Technical documentation required (Article 11)")
+    return _pass("Technical documentation status verified")
+
+
+@rule("ai-act-006")
+def ai_act_record_keeping(ctx: EvaluationContext) -> Outcome:
+    if ctx.audit_logging_enabled is False:
+        return _fail("Automatic event logging required (Article 12)")
+    return _pass("Record keeping status verified")
+
+
+@rule("ai-act-007")
+def ai_act_transparency(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_disclosure_provided is False:
+        return _fail("Deployers must be informed they are using an AI system (Article 13)")
+    return _pass("Transparency status verified")
+
+
+@rule("ai-act-008")
+def ai_act_human_oversight(ctx: EvaluationContext) -> Outcome:
+    if ctx.human_oversight is False:
+        return _fail("Human oversight measures required (Article 14)")
+    return _pass("Human oversight status verified")
+
+
+@rule("ai-act-009")
+def ai_act_accuracy(ctx: EvaluationContext) -> Outcome:
+    if ctx.accuracy_metrics_declared is False:
+        return _fail("Accuracy levels and metrics must be declared (Article 15)")
+    return _pass("Accuracy status verified")
+
+
+@rule("ai-act-010")
+def ai_act_robustness(ctx: EvaluationContext) -> Outcome:
+    if ctx.robustness_tested is False:
+        return _fail("Robustness testing required (Article 15)")
+    return _pass("Robustness status verified")
+
+
+@rule("ai-act-011")
+def ai_act_cybersecurity(ctx: EvaluationContext) -> Outcome:
+    if ctx.encryption_in_transit is False or ctx.access_controls_implemented is False:
+        return _fail("Cybersecurity measures required (Article 15)")
+    return _pass("Cybersecurity status verified")
+
+
+@rule("ai-act-012")
+def ai_act_bias_mitigation(ctx: EvaluationContext) -> Outcome:
+    if ctx.bias_assessment_completed is False:
+        return _fail("Bias examination and mitigation required (Article 10)")
+    return _pass("Bias mitigation status verified")
+
+
+@rule("ai-act-013")
+def ai_act_conformity(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_act_risk_category == "high" and ctx.conformity_assessment_completed is not True:
+        return _fail("High-risk AI systems require a conformity assessment (Article 43)")
+    return _pass("Conformity assessment status verified")
+
+
+@rule("ai-act-014")
+def ai_act_ce_marking(ctx: EvaluationContext) -> Outcome:
+    if ctx.ai_act_risk_category == "high" and ctx.ce_marked is not True:
+        return _fail("High-risk AI systems require CE marking (Article 48)")
+    return _pass("CE marking status verified")
+
+
+@rule("ai-act-015")
+def ai_act_post_market_monitoring(ctx: EvaluationContext) -> Outcome:
+    if ctx.post_market_monitoring is False:
+        return _fail("Post-market monitoring system required (Article 72)")
+    return _pass("Post-market monitoring status verified")
+
+
+@rule("ai-act-016")
+def ai_act_incident_reporting(ctx: EvaluationContext) -> Outcome:
+    if ctx.serious_incident and not ctx.incident_reported:
+        return _fail("Serious incidents must be reported to market surveillance authorities (Article 73)")
+    if ctx.incident_response_plan is False:
+        return _fail("Incident reporting procedures required (Article 73)")
+    return _pass("Incident reporting status verified")
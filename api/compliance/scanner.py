@@ -0,0 +1,247 @@
+"""
+Identifier scanner for LUMEN SDK API compliance checks.
+
+Checks such as minimum necessary and Safe Harbor de-identification depend
+on whether the AI output itself discloses identifiers. Each of those checks
+names the identifier patterns it cares about (CHECK_PATTERNS). A scanner
+compiles the patterns of the checks it serves into:
+
+- one combined regular expression holding every structured identifier
+  (SSN, phone, email, ...) as a named alternative, followed by a catch-all
+  word alternative (earlier alternatives win where both match), and
+- one Aho-Corasick automaton over lower-cased words for the identifier
+  phrases ("date of birth", "health card number", ...).
+
+A single finditer() pass over the text yields either an identifier match
+or the next word, and every word advances the automaton, so the text is
+read once however many checks and patterns are enabled.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+# Structured identifiers: name -> (class of the first character, pattern).
+# The combined regular expression groups patterns under a lookahead on
+# their first character, so most positions are rejected by one test
+# instead of one per pattern. Patterns must not contain named groups.
+IDENTIFIER_REGEXES: Dict[str, Tuple[str, str]] = {
+    "ssn": (r"\d", r"\b\d{3}-\d{2}-\d{4}\b"),
+    "sin": (r"\d", r"\b\d{3}[ -]\d{3}[ -]\d{3}\b"),
+    "health_card": (r"\d", r"\b\d{4}[ -]?\d{3}[ -]?\d{3}[ -]?[A-Z]{2}\b"),
+    "ip_address": (r"\d", r"\b(?:\d{1,3}\.){3}\d{1,3}\b"),
+    "date": (r"\d", r"\b(?:\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4})\b"),
+    "phone": (r"[\d(+]", r"(?:\+1[ .-]?)?(?:\(\d{3}\) ?|\b\d{3}[.-])\d{3}[.-]\d{4}\b"),
+    "mrn": (r"[Mm]", r"\b(?i:mrn)[:#]? ?\d{5,10}\b"),
+    "postal_code": (r"[A-Z]", r"\b[A-Z]\d[A-Z] ?\d[A-Z]\d\b"),
+    "url": (r"[Hh]", r"\b(?i:https?)://[^\s<>\"']*[^\s<>\"'.,;:!?)]"),
+    # Local part and labels are bounded (RFC 5321: 64 and 63 characters) so
+    # a failed attempt reads a fixed number of characters, not the rest of
+    # the text; unbounded, a long run of "a." or "1-" made scan() quadratic
+    "email": (r"\w", r"\b[\w.+-]{1,64}@[\w-]{1,63}(?:\.[\w-]{1,63})+\b"),
+}
+
+# Identifier phrases, matched as whole words regardless of case
+IDENTIFIER_PHRASES: Dict[str, Tuple[str, ...]] = {
+    "identifier_label": (
+        "date of birth",
+        "dob",
+        "social security number",
+        "social insurance number",
+        "medical record number",
+        "health card number",
+        "health plan number",
+        "patient name",
+        "home address",
+        "drivers license",
+    ),
+    "sensitive_condition": (
+        "hiv",
+        "aids",
+        "hepatitis c",
+        "substance use disorder",
+        "opioid use disorder",
+        "psychiatric",
+        "schizophrenia",
+        "genetic test",
+        "pregnancy termination",
+    ),
+}
+
+# checkId -> identifier patterns whose presence in the output the check reads
+CHECK_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "phipa-003": ("health_card", "sin", "mrn", "postal_code", "identifier_label", "sensitive_condition"),
+    "hipaa-001": ("ssn", "mrn", "identifier_label", "sensitive_condition"),
+    "hipaa-009": ("ssn", "phone", "email", "ip_address", "url", "date", "mrn", "identifier_label"),
+    "pipeda-003": ("sin", "email", "phone", "postal_code", "identifier_label"),
+}
+
+_WORD_GROUP = "_word"
+_WORD = re.compile(r"\w+")
+
+# (start, end, pattern name)
+Span = Tuple[int, int, str]
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton whose alphabet is lower-cased words.
+
+    Matching whole words keeps "aids" from matching inside "braids" and
+    keeps the automaton small: one node per distinct phrase prefix.
+    """
+
+    __slots__ = ("goto", "fail", "out", "max_words")
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            phrases: (phrase, pattern name) pairs
+        """
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[Tuple[str, int], ...]] = [()]
+        for phrase, name in phrases:
+            words = _WORD.findall(phrase.lower())
+            state = 0
+            for word in words:
+                following = goto[state].get(word)
+                if following is None:
+                    following = len(goto)
+                    goto[state][word] = following
+                    goto.append({})
+                    out.append(())
+                state = following
+            out[state] += ((name, len(words)),)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[following] = goto[fallback].get(word, 0)
+                out[following] += out[fail[following]]
+
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+        self.max_words = max((length for outputs in out for _, length in outputs), default=1)
+
+
+class IdentifierScanner:
+    """
+    Single-pass identifier scanner for a set of checks.
+
+    Build one per evaluation plan (see EvaluationPlan.scanner); scan() is
+    then O(len(text)) regardless of how many patterns are enabled.
+    """
+
+    def __init__(self, check_patterns: Mapping[str, Iterable[str]]):
+        """
+        Args:
+            check_patterns: checkId -> names of patterns in IDENTIFIER_REGEXES
+                or IDENTIFIER_PHRASES
+
+        Raises:
+            ValueError: If a pattern name is unknown
+        """
+        self.checks_by_pattern: Dict[str, Tuple[str, ...]] = {}
+        for check_id, names in check_patterns.items():
+            for name in names:
+                if name not in IDENTIFIER_REGEXES and name not in IDENTIFIER_PHRASES:
+                    raise ValueError(f"Unknown identifier pattern '{name}' for check {check_id}")
+                self.checks_by_pattern[name] = self.checks_by_pattern.get(name, ()) + (check_id,)
+
+        regexes = [name for name in IDENTIFIER_REGEXES if name in self.checks_by_pattern]
+        phrases = [(phrase, name) for name, group in IDENTIFIER_PHRASES.items()
+                   if name in self.checks_by_pattern for phrase in group]
+
+        groups: Dict[str, List[str]] = {}
+        for name in regexes:
+            first, pattern = IDENTIFIER_REGEXES[name]
+            groups.setdefault(first, []).append(f"(?P<{name}>{pattern})")
+        alternatives = [f"(?={first})(?:{'|'.join(patterns)})" for first, patterns in groups.items()]
+        # Words are only needed to drive the phrase automaton
+        if phrases:
+            alternatives.append(rf"(?P<{_WORD_GROUP}>\w+)")
+        self.regex = re.compile("|".join(alternatives)) if alternatives else None
+        self.automaton = PhraseAutomaton(phrases) if phrases else None
+
+    def scan(self, text: str) -> Dict[str, List[Span]]:
+        """
+        Find identifiers in a text.
+
+        Args:
+            text: Text to scan (the evaluation's ai_output)
+
+        Returns:
+            dict: checkId -> (start, end, pattern name) spans in the order found,
+            only for checks with at least one match
+        """
+        found: Dict[str, List[Span]] = {}
+        if self.regex is None:
+            return found
+
+        checks_by_pattern = self.checks_by_pattern
+        automaton = self.automaton
+        if automaton is not None:
+            goto, fail, out = automaton.goto, automaton.fail, automaton.out
+            root = goto[0]
+            # Start offsets of the last few words, for phrase spans
+            starts: deque = deque(maxlen=automaton.max_words)
+        state = 0
+
+        for match in self.regex.finditer(text):
+            name = match.lastgroup
+            if name != _WORD_GROUP:
+                span = (match.start(), match.end(), name)
+                for check_id in checks_by_pattern[name]:
+                    found.setdefault(check_id, []).append(span)
+                # An identifier breaks any phrase in progress
+                state = 0
+                continue
+
+            word = match.group().lower()
+            if state == 0:
+                # Fast path: most words start no phrase
+                state = root.get(word, 0)
+                if state == 0:
+                    continue
+            else:
+                while True:
+                    following = goto[state].get(word)
+                    if following is not None or state == 0:
+                        break
+                    state = fail[state]
+                state = following or 0
+                if state == 0:
+                    continue
+            # Every word of a phrase leaves the automaton off the root, so
+            # only those words' offsets are needed
+            starts.append(match.start())
+            for phrase_name, length in out[state]:
+                span = (starts[-length], match.end(), phrase_name)
+                for check_id in checks_by_pattern[phrase_name]:
+                    found.setdefault(check_id, []).append(span)
+        return found
+
+
+def create_scanner(check_ids: Iterable[str]) -> IdentifierScanner:
+    """
+    Build a scanner for the checks that read output identifiers.
+
+    Args:
+        check_ids: Checks of an evaluation plan; checks without patterns
+            in CHECK_PATTERNS are ignored
+
+    Returns:
+        IdentifierScanner: Scanner over the union of their patterns
+    """
+    return IdentifierScanner({
+        check_id: CHECK_PATTERNS[check_id] for check_id in check_ids if check_id in CHECK_PATTERNS
+    })
@@ -0,0 +1,23 @@
+"""
+Data-access package for LUMEN SDK API.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from .repository import (
+    Repository,
+    RepositoryError,
+    close_repository,
+    get_repository,
+    init_repository,
+    set_repository,
+)
+
+__all__ = [
+    "Repository",
+    "RepositoryError",
+    "close_repository",
+    "get_repository",
+    "init_repository",
+    "set_repository",
+]
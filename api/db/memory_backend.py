@@ -0,0 +1,201 @@
+"""
+In-memory repository backend for LUMEN SDK API.
+
+A local fake of the Supabase tables used by the API, for tests and for
+running the service without a Supabase project (DB_BACKEND=memory).
+State lives in the process and is lost on restart.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from .repository import Repository
+
+
+class InMemoryRepository(Repository):
+    """Repository backed by per-table dicts keyed by row id."""
+
+    def __init__(self):
+        self.organizations: Dict[str, Dict[str, Any]] = {}
+        self.api_keys: Dict[str, Dict[str, Any]] = {}
+        self.api_usage: Dict[str, Dict[str, Any]] = {}
+        self.organization_packs: Dict[str, Dict[str, Any]] = {}
+
+    # --- Seeding helpers ----------------------------------------------------
+
+    def add_organization(self, name: str, plan: str = "free", owner_id: Optional[str] = None,
+                         org_id: Optional[str] = None) -> Dict[str, Any]:
+        """Create an organization row and return it."""
+        org = {
+            "id": org_id or str(uuid4()),
+            "name": name,
+            "plan": plan,
+            "owner_id": owner_id,
+            "legal_acknowledgment": False,
+            "legal_acknowledgment_at": None,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.organizations[org["id"]] = org
+        return org
+
+    # --- API keys -----------------------------------------------------------
+
+    async def find_active_keys_by_prefix(self, key_prefix: str) -> List[Dict[str, Any]]:
+        rows = []
+        for key in self.api_keys.values():
+            if key["key_prefix"] != key_prefix or key["status"] != "active":
+                continue
+            org = self.organizations.get(key["org_id"])
+            if org is None:
+                continue
+            rows.append({
+                "id": key["id"],
+                "org_id": key["org_id"],
+                "key_hash": key["key_hash"],
+                "name": key["name"],
+                "environment": key["environment"],
+                "expires_at": key.get("expires_at"),
+                "plan": org["plan"],
+            })
+        return rows
+
+    async def touch_api_keys(self, key_ids: List[str], last_used_at: str) -> None:
+        for key_id in key_ids:
+            if key_id in self.api_keys:
+                self.api_keys[key_id]["last_used_at"] = last_used_at
+
+    async def count_active_keys(self, org_id: str) -> int:
+        return sum(
+            1 for key in self.api_keys.values()
+            if key["org_id"] == org_id and key["status"] == "active"
+        )
+
+    async def insert_api_key(self, key_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        row = {
+            "id": str(uuid4()),
+            "status": "active",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "expires_at": None,
+            "last_used_at": None,
+            "revoked_at": None,
+            **key_data,
+        }
+        self.api_keys[row["id"]] = row
+        return dict(row)
+
+    async def list_api_keys(self, org_id: str) -> List[Dict[str, Any]]:
+        keys = [key for key in self.api_keys.values() if key["org_id"] == org_id]
+        keys.sort(key=lambda key: key["created_at"], reverse=True)
+        return [
+            {column: key.get(column) for column in (
+                "id", "name", "environment", "key_prefix", "status",
+                "created_at", "last_used_at", "expires_at",
+            )}
+            for key in keys
+        ]
+
+    async def get_api_key_for_org(self, key_id: str, org_id: str) -> Optional[Dict[str, Any]]:
+        key = self.api_keys.get(key_id)
+        if key is None or key["org_id"] != org_id:
+            return None
+        return {"id": key["id"]}
+
+    async def revoke_api_key(self, key_id: str, revoked_at: str) -> None:
+        if key_id in self.api_keys:
+            self.api_keys[key_id]["status"] = "revoked"
+            self.api_keys[key_id]["revoked_at"] = revoked_at
+
+    # --- Organizations ------------------------------------------------------
+
+    async def get_organization_by_owner(self, owner_id: str) -> Optional[Dict[str, Any]]:
+        for org in self.organizations.values():
+            if org["owner_id"] == owner_id:
+                return {"id": org["id"], "name": org["name"], "plan": org["plan"]}
+        return None
+
+    async def record_legal_acknowledgment(self, org_id: str, acknowledged_at: str) -> None:
+        if org_id in self.organizations:
+            self.organizations[org_id]["legal_acknowledgment"] = True
+            self.organizations[org_id]["legal_acknowledgment_at"] = acknowledged_at
+
+    # --- Usage --------------------------------------------------------------
+
+    async def get_usage(self, org_id: str, period_start: str) -> Optional[Dict[str, Any]]:
+        for usage in self.api_usage.values():
+            if usage["org_id"] == org_id and usage["period_start"] == period_start:
+                return dict(usage)
+        return None
+
+    async def increment_usage(self, org_id: str, period_start: str, delta: int,
+                              last_evaluation_at: str) -> int:
+        # No await between read and write: atomic on the event loop
+        for usage in self.api_usage.values():
+            if usage["org_id"] == org_id and usage["period_start"] == period_start:
+                usage["evaluations_count"] += delta
+                usage["last_evaluation_at"] = max(usage["last_evaluation_at"] or "", last_evaluation_at)
+                return usage["evaluations_count"]
+        row_id = str(uuid4())
+        self.api_usage[row_id] = {
+            "id": row_id,
+            "org_id": org_id,
+            "period_start": period_start,
+            "evaluations_count": delta,
+            "last_evaluation_at": last_evaluation_at,
+        }
+        return delta
+
+    async def sum_usage(self, org_id: str, period_start: str, period_end: str) -> int:
+        return sum(
+            usage["evaluations_count"] for usage in self.api_usage.values()
+            if usage["org_id"] == org_id and period_start <= usage["period_start"] < period_end
+        )
+
+    # --- Policy packs -------------------------------------------------------
+
+    async def is_pack_enabled(self, org_id: str, pack_id: str) -> bool:
+        return any(
+            row["org_id"] == org_id and row["pack_id"] == pack_id and row["enabled"]
+            for row in self.organization_packs.values()
+        )
+
+    async def count_enabled_packs(self, org_id: str) -> int:
+        return sum(
+            1 for row in self.organization_packs.values()
+            if row["org_id"] == org_id and row["enabled"]
+        )
+
+    async def list_enabled_packs(self, org_id: str) -> List[str]:
+        return [
+            row["pack_id"] for row in self.organization_packs.values()
+            if row["org_id"] == org_id and row["enabled"]
+        ]
+
+    async def enable_pack(self, org_id: str, pack_id: str, enabled_at: str) -> None:
+        for row in self.organization_packs.values():
+            if row["org_id"] == org_id and row["pack_id"] == pack_id:
+                row["enabled"] = True
+                row["enabled_at"] = enabled_at
+                row["disabled_at"] = None
+                return
+        row_id = str(uuid4())
+        self.organization_packs[row_id] = {
+            "id": row_id,
+            "org_id": org_id,
+            "pack_id": pack_id,
+            "enabled": True,
+            "enabled_at": enabled_at,
+            "disabled_at": None,
+        }
+
+    async def disable_pack(self, org_id: str, pack_id: str, disabled_at: str) -> None:
+        for row in self.organization_packs.values():
+            if row["org_id"] == org_id and row["pack_id"] == pack_id:
+                row["enabled"] = False
+                row["disabled_at"] = disabled_at
+
+    # --- Lifecycle ----------------------------------------------------------
+
+    async def ping(self) -> bool:
+        return True
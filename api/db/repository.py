@@ -0,0 +1,196 @@
+"""
+Repository interface for LUMEN SDK API data access.
+
+Routes, middleware and auth code talk to the database only through a
+Repository. Every method is a coroutine so handlers never block the event
+loop on network I/O. Backends:
+
+- supabase: PostgREST over a pooled httpx.AsyncClient (production)
+- memory: in-process tables for tests and local development
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Backend configuration - override via environment
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase")
+DB_QUERY_TIMEOUT_SECONDS = float(os.getenv("DB_QUERY_TIMEOUT_SECONDS", "5"))
+
+
+class RepositoryError(Exception):
+    """Raised when a repository call fails or times out."""
+
+
+class Repository(ABC):
+    """
+    Async data-access interface.
+
+    Rows are returned as plain dicts using the column names of the
+    Supabase schema documented in the API README.
+    """
+
+    # --- API keys -----------------------------------------------------------
+
+    @abstractmethod
+    async def find_active_keys_by_prefix(self, key_prefix: str) -> List[Dict[str, Any]]:
+        """
+        Active keys with a matching prefix.
+
+        Each row has id, org_id, key_hash, name, environment, expires_at and
+        the owning organization's plan.
+        """
+
+    @abstractmethod
+    async def touch_api_keys(self, key_ids: List[str], last_used_at: str) -> None:
+        """Set last_used_at for a group of keys in one statement."""
+
+    @abstractmethod
+    async def count_active_keys(self, org_id: str) -> int:
+        """Number of active keys owned by an organization."""
+
+    @abstractmethod
+    async def insert_api_key(self, key_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Insert a key and return the stored row."""
+
+    @abstractmethod
+    async def list_api_keys(self, org_id: str) -> List[Dict[str, Any]]:
+        """An organization's keys, newest first, without key hashes."""
+
+    @abstractmethod
+    async def get_api_key_for_org(self, key_id: str, org_id: str) -> Optional[Dict[str, Any]]:
+        """A key if it belongs to the organization, else None."""
+
+    @abstractmethod
+    async def revoke_api_key(self, key_id: str, revoked_at: str) -> None:
+        """Mark a key revoked."""
+
+    # --- Organizations ------------------------------------------------------
+
+    @abstractmethod
+    async def get_organization_by_owner(self, owner_id: str) -> Optional[Dict[str, Any]]:
+        """The organization (id, name, plan) owned by a user, if any."""
+
+    @abstractmethod
+    async def record_legal_acknowledgment(self, org_id: str, acknowledged_at: str) -> None:
+        """Record the organization's legal acknowledgment."""
+
+    # --- Usage --------------------------------------------------------------
+
+    @abstractmethod
+    async def get_usage(self, org_id: str, period_start: str) -> Optional[Dict[str, Any]]:
+        """The api_usage row for an organization and period, if any."""
+
+    @abstractmethod
+    async def increment_usage(self, org_id: str, period_start: str, delta: int,
+                              last_evaluation_at: str) -> int:
+        """
+        Atomically add delta to an organization's usage for a period.
+
+        Creates the row if needed and returns the new evaluations_count.
+        """
+
+    @abstractmethod
+    async def sum_usage(self, org_id: str, period_start: str, period_end: str) -> int:
+        """Total evaluations for periods starting in [period_start, period_end)."""
+
+    # --- Policy packs -------------------------------------------------------
+
+    @abstractmethod
+    async def is_pack_enabled(self, org_id: str, pack_id: str) -> bool:
+        """Whether a pack is currently enabled for an organization."""
+
+    @abstractmethod
+    async def count_enabled_packs(self, org_id: str) -> int:
+        """Number of packs enabled for an organization."""
+
+    @abstractmethod
+    async def list_enabled_packs(self, org_id: str) -> List[str]:
+        """Ids of the packs enabled for an organization."""
+
+    @abstractmethod
+    async def enable_pack(self, org_id: str, pack_id: str, enabled_at: str) -> None:
+        """Enable a pack for an organization."""
+
+    @abstractmethod
+    async def disable_pack(self, org_id: str, pack_id: str, disabled_at: str) -> None:
+        """Disable a pack for an organization."""
+
+    # --- Lifecycle ----------------------------------------------------------
+
+    @abstractmethod
+    async def ping(self) -> bool:
+        """Cheap connectivity check."""
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+
+# Global repository instance
+_repository: Optional[Repository] = None
+
+
+async def init_repository(backend: str = DB_BACKEND) -> Repository:
+    """
+    Initialize the configured repository backend.
+
+    Args:
+        backend: 'supabase' or 'memory'
+
+    Returns:
+        Repository: The initialized repository
+
+    Raises:
+        ValueError: If the backend name is unknown or its configuration is missing
+    """
+    global _repository
+
+    if _repository is not None:
+        return _repository
+
+    if backend == "supabase":
+        from .supabase_backend import SupabaseRepository
+        _repository = SupabaseRepository(timeout=DB_QUERY_TIMEOUT_SECONDS)
+    elif backend == "memory":
+        from .memory_backend import InMemoryRepository
+        _repository = InMemoryRepository()
+    else:
+        raise ValueError(f"Unknown DB_BACKEND '{backend}' (expected 'supabase' or 'memory')")
+
+    logger.info(f"✅ Repository initialized ({backend} backend)")
+    return _repository
+
+
+def set_repository(repository: Optional[Repository]) -> None:
+    """Install a repository instance (used by tests and embedding apps)."""
+    global _repository
+    _repository = repository
+
+
+def get_repository() -> Repository:
+    """
+    Get the repository instance.
+
+    Returns:
+        Repository: Repository instance
+
+    Raises:
+        RuntimeError: If the repository hasn't been initialized
+    """
+    if _repository is None:
+        raise RuntimeError("Repository not initialized. Call init_repository() first.")
+    return _repository
+
+
+async def close_repository() -> None:
+    """Close the repository and its connection pool."""
+    global _repository
+
+    if _repository is not None:
+        await _repository.close()
+        _repository = None
@@ -0,0 +1,187 @@
+"""
+Supabase repository backend for LUMEN SDK API.
+
+Runs every query through the async PostgREST client so handlers await
+network I/O instead of blocking the event loop. Each call is bounded by a
+per-call timeout.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+from auth.supabase_client import init_supabase, close_supabase
+from .repository import Repository, RepositoryError
+
+
+class SupabaseRepository(Repository):
+    """Repository backed by Supabase PostgREST."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._client = init_supabase()
+
+    async def _execute(self, query):
+        """Execute a query builder with the per-call timeout."""
+        try:
+            return await asyncio.wait_for(query.execute(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise RepositoryError(f"Supabase query timed out after {self.timeout}s")
+
+    # --- API keys -----------------------------------------------------------
+
+    async def find_active_keys_by_prefix(self, key_prefix: str) -> List[Dict[str, Any]]:
+        result = await self._execute(
+            self._client.from_("api_keys").select(
+                "id, org_id, key_hash, name, environment, expires_at, organizations!inner(plan)"
+            ).eq("key_prefix", key_prefix).eq("status", "active")
+        )
+        rows = []
+        for row in result.data:
+            row = dict(row)
+            row["plan"] = row.pop("organizations")["plan"]
+            rows.append(row)
+        return rows
+
+    async def touch_api_keys(self, key_ids: List[str], last_used_at: str) -> None:
+        await self._execute(
+            self._client.from_("api_keys").update({
+                "last_used_at": last_used_at
+            }).in_("id", key_ids)
+        )
+
+    async def count_active_keys(self, org_id: str) -> int:
+        result = await self._execute(
+            self._client.from_("api_keys").select("count", count="exact").eq(
+                "org_id", org_id
+            ).eq("status", "active")
+        )
+        return result.count or 0
+
+    async def insert_api_key(self, key_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        result = await self._execute(self._client.from_("api_keys").insert(key_data))
+        return result.data[0] if result.data else None
+
+    async def list_api_keys(self, org_id: str) -> List[Dict[str, Any]]:
+        result = await self._execute(
+            self._client.from_("api_keys").select(
+                "id, name, environment, key_prefix, status, created_at, last_used_at, expires_at"
+            ).eq("org_id", org_id).order("created_at", desc=True)
+        )
+        return result.data
+
+    async def get_api_key_for_org(self, key_id: str, org_id: str) -> Optional[Dict[str, Any]]:
+        result = await self._execute(
+            self._client.from_("api_keys").select("id").eq("id", key_id).eq("org_id", org_id)
+        )
+        return result.data[0] if result.data else None
+
+    async def revoke_api_key(self, key_id: str, revoked_at: str) -> None:
+        await self._execute(
+            self._client.from_("api_keys").update({
+                "status": "revoked",
+                "revoked_at": revoked_at
+            }).eq("id", key_id)
+        )
+
+    # --- Organizations ------------------------------------------------------
+
+    async def get_organization_by_owner(self, owner_id: str) -> Optional[Dict[str, Any]]:
+        result = await self._execute(
+            self._client.from_("organizations").select("id, name, plan").eq("owner_id", owner_id)
+        )
+        return result.data[0] if result.data else None
+
+    async def record_legal_acknowledgment(self, org_id: str, acknowledged_at: str) -> None:
+        await self._execute(
+            self._client.from_("organizations").update({
+                "legal_acknowledgment": True,
+                "legal_acknowledgment_at": acknowledged_at
+            }).eq("id", org_id)
+        )
+
+    # --- Usage --------------------------------------------------------------
+
+    async def get_usage(self, org_id: str, period_start: str) -> Optional[Dict[str, Any]]:
+        result = await self._execute(
+            self._client.from_("api_usage").select("*").eq(
+                "org_id", org_id
+            ).eq("period_start", period_start)
+        )
+        return result.data[0] if result.data else None
+
+    async def increment_usage(self, org_id: str, period_start: str, delta: int,
+                              last_evaluation_at: str) -> int:
+        # Upsert-increment in a single statement (see increment_api_usage in README)
+        result = await self._execute(
+            self._client.rpc("increment_api_usage", {
+                "p_org_id": org_id,
+                "p_period_start": period_start,
+                "p_delta": delta,
+                "p_last_evaluation_at": last_evaluation_at
+            })
+        )
+        return int(result.data)
+
+    async def sum_usage(self, org_id: str, period_start: str, period_end: str) -> int:
+        result = await self._execute(
+            self._client.from_("api_usage").select("evaluations_count").eq(
+                "org_id", org_id
+            ).gte("period_start", period_start).lt("period_start", period_end)
+        )
+        return sum(row["evaluations_count"] for row in result.data)
+
+    # --- Policy packs -------------------------------------------------------
+
+    async def is_pack_enabled(self, org_id: str, pack_id: str) -> bool:
+        result = await self._execute(
+            self._client.from_("organization_packs").select("id").eq(
+                "org_id", org_id
+            ).eq("pack_id", pack_id).eq("enabled", True)
+        )
+        return bool(result.data)
+
+    async def count_enabled_packs(self, org_id: str) -> int:
+        result = await self._execute(
+            self._client.from_("organization_packs").select("count", count="exact").eq(
+                "org_id", org_id
+            ).eq("enabled", True)
+        )
+        return result.count or 0
+
+    async def list_enabled_packs(self, org_id: str) -> List[str]:
+        result = await self._execute(
+            self._client.from_("organization_packs").select("pack_id").eq(
+                "org_id", org_id
+            ).eq("enabled", True)
+        )
+        return [row["pack_id"] for row in result.data]
+
+    async def enable_pack(self, org_id: str, pack_id: str, enabled_at: str) -> None:
+        await self._execute(
+            self._client.from_("organization_packs").upsert({
+                "org_id": org_id,
+                "pack_id": pack_id,
+                "enabled": True,
+                "enabled_at": enabled_at
+            })
+        )
+
+    async def disable_pack(self, org_id: str, pack_id: str, disabled_at: str) -> None:
+        await self._execute(
+            self._client.from_("organization_packs").update({
+                "enabled": False,
+                "disabled_at": disabled_at
+            }).eq("org_id", org_id).eq("pack_id", pack_id)
+        )
+
+    # --- Lifecycle ----------------------------------------------------------
+
+    async def ping(self) -> bool:
+        await self._execute(
+            self._client.from_("api_keys").select("count", count="exact").limit(1)
+        )
+        return True
+
+    async def close(self) -> None:
+        await close_supabase()
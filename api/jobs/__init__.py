@@ -0,0 +1,33 @@
+"""
+Asynchronous evaluation jobs for LUMEN SDK API.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from .queue import Job, JobQueue, MemoryJobQueue, SQLiteJobQueue, create_job_queue
+from .worker import (
+    JobFailed,
+    JobWorkerPool,
+    QueueFull,
+    get_job_pool,
+    init_job_pool,
+    resolve_callback_url,
+    set_job_pool,
+    validate_callback_url,
+)
+
+__all__ = [
+    "Job",
+    "JobFailed",
+    "JobQueue",
+    "JobWorkerPool",
+    "MemoryJobQueue",
+    "QueueFull",
+    "SQLiteJobQueue",
+    "create_job_queue",
+    "get_job_pool",
+    "init_job_pool",
+    "resolve_callback_url",
+    "set_job_pool",
+    "validate_callback_url",
+]
@@ -0,0 +1,403 @@
+"""
+Job queue backends for LUMEN SDK API asynchronous evaluations.
+
+The worker pool (see jobs.worker) talks to a JobQueue. Backends:
+
+- memory: jobs in this process (single worker, tests)
+- sqlite: jobs in a SQLite database in WAL mode, shared by every worker on
+  the host; jobs survive a restart
+
+claim() hands out the oldest queued job whose organization is below its
+concurrency cap, and marks it running in the same atomic step, so the cap
+holds no matter how many workers share the queue. SQLite claims carry a
+lease: a job whose worker died is handed out again once its lease expires.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional
+from uuid import uuid4
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Backend selection - override via environment
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "memory")
+# Server worker processes on this host (read by gunicorn and uvicorn;
+# scripts/start-production.sh exports it)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# SQLite backend (job payloads may hold PHI: keep the database out of
+# shared temporary directories)
+JOB_QUEUE_SQLITE_PATH = os.getenv("JOB_QUEUE_SQLITE_PATH", "")
+# Seconds a claimed job may run before another worker may take it over
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+# Claims per job before an expired lease fails the job instead
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class Job:
+    """An evaluation job and its outcome."""
+
+    __slots__ = (
+        "id", "org_id", "payload", "record_id", "record_url", "callback_url", "status",
+        "result", "error", "attempts", "created_at", "started_at", "finished_at",
+    )
+
+    def __init__(
+        self,
+        org_id: str,
+        payload: Dict[str, Any],
+        record_id: str,
+        record_url: str,
+        callback_url: Optional[str] = None,
+        id: Optional[str] = None,
+        status: str = QUEUED,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        attempts: int = 0,
+        created_at: Optional[float] = None,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+    ):
+        self.id = id or str(uuid4())
+        self.org_id = org_id
+        self.payload = payload
+        self.record_id = record_id
+        self.record_url = record_url
+        self.callback_url = callback_url
+        self.status = status
+        self.result = result
+        self.error = error
+        self.attempts = attempts
+        self.created_at = time.time() if created_at is None else created_at
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Client-facing view of the job (GET /v1/jobs/{id} and callbacks)."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "record_id": self.record_id,
+            "defensible_record_url": self.record_url,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue(ABC):
+    """Storage and claiming of evaluation jobs."""
+
+    @abstractmethod
+    async def put(self, job: Job) -> None:
+        """Enqueue a job."""
+
+    @abstractmethod
+    async def claim(self, org_limit: int) -> Optional[Job]:
+        """
+        Take the oldest runnable job and mark it running.
+
+        Args:
+            org_limit: Most jobs of one organization running at once
+
+        Returns:
+            Job: The claimed job, or None if nothing is runnable
+        """
+
+    @abstractmethod
+    async def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None,
+                     error: Optional[str] = None) -> Optional[Job]:
+        """Record a job's result (or error) and return the finished job."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job."""
+
+    @abstractmethod
+    async def queued_count(self, org_id: str) -> int:
+        """Number of an organization's jobs waiting to run."""
+
+    @abstractmethod
+    async def purge(self, finished_before: float) -> int:
+        """Delete jobs that finished before a time; returns the number deleted."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryJobQueue(JobQueue):
+    """
+    In-process job queue.
+
+    Queued jobs are kept in one FIFO per organization, so a claim looks at
+    each organization's oldest job only, however deep its backlog.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._queued: Dict[str, Deque[Job]] = {}
+        self._running: Dict[str, int] = {}
+
+    async def put(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        self._queued.setdefault(job.org_id, deque()).append(job)
+
+    async def claim(self, org_limit: int) -> Optional[Job]:
+        oldest: Optional[Deque[Job]] = None
+        for org_id, queued in self._queued.items():
+            if self._running.get(org_id, 0) >= org_limit:
+                continue
+            if oldest is None or queued[0].created_at < oldest[0].created_at:
+                oldest = queued
+        if oldest is None:
+            return None
+
+        job = oldest.popleft()
+        if not oldest:
+            del self._queued[job.org_id]
+        self._running[job.org_id] = self._running.get(job.org_id, 0) + 1
+        job.status = RUNNING
+        job.attempts += 1
+        job.started_at = time.time()
+        return job
+
+    async def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None,
+                     error: Optional[str] = None) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None or job.status != RUNNING:
+            return job
+        running = self._running[job.org_id] - 1
+        if running:
+            self._running[job.org_id] = running
+        else:
+            del self._running[job.org_id]
+        job.status = FAILED if error is not None else SUCCEEDED
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def queued_count(self, org_id: str) -> int:
+        return len(self._queued.get(org_id, ()))
+
+    async def purge(self, finished_before: float) -> int:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < finished_before
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue in a SQLite database shared by local workers.
+
+    Claims run in a BEGIN IMMEDIATE transaction, so concurrent workers
+    serialize on the cap check and the status update. Calls run on a
+    worker thread so the event loop never blocks on the database lock.
+    """
+
+    _COLUMNS = (
+        "id, org_id, payload, record_id, record_url, callback_url, status, "
+        "result, error, attempts, created_at, started_at, finished_at"
+    )
+
+    def __init__(self, path: str, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Owner-only; SQLite gives the -wal and -shm files the same mode
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, org_id TEXT NOT NULL, "
+                "payload TEXT NOT NULL, record_id TEXT NOT NULL, record_url TEXT NOT NULL, callback_url TEXT, "
+                "status TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL, lease_expires REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_org_status ON jobs (org_id, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _job(row: tuple) -> Job:
+        (job_id, org_id, payload, record_id, record_url, callback_url, status,
+         result, error, attempts, created_at, started_at, finished_at) = row
+        return Job(
+            org_id, json.loads(payload), record_id, record_url, callback_url, id=job_id, status=status,
+            result=json.loads(result) if result is not None else None, error=error, attempts=attempts,
+            created_at=created_at, started_at=started_at, finished_at=finished_at,
+        )
+
+    def _transaction(self, fn, *args):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(conn, *args)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return value
+
+    def _put(self, conn: sqlite3.Connection, job: Job) -> None:
+        conn.execute(
+            f"INSERT INTO jobs ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job.id, job.org_id, json.dumps(job.payload), job.record_id, job.record_url, job.callback_url,
+             job.status, None, None, job.attempts, job.created_at, None, None)
+        )
+
+    def _claim(self, conn: sqlite3.Connection, org_limit: int) -> Optional[Job]:
+        now = time.time()
+        # Jobs whose workers keep dying are failed rather than retried forever
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, "Evaluation did not complete", now, RUNNING, now, self.max_attempts)
+        )
+        row = conn.execute(
+            f"SELECT {self._COLUMNS} FROM jobs "
+            "WHERE (status = ? OR (status = ? AND lease_expires < ?)) AND org_id NOT IN ("
+            "  SELECT org_id FROM jobs WHERE status = ? AND lease_expires >= ? "
+            "  GROUP BY org_id HAVING COUNT(*) >= ?) "
+            "ORDER BY seq LIMIT 1",
+            (QUEUED, RUNNING, now, RUNNING, now, org_limit)
+        ).fetchone()
+        if row is None:
+            return None
+
+        job = self._job(row)
+        job.status = RUNNING
+        job.attempts += 1
+        job.started_at = now
+        conn.execute(
+            "UPDATE jobs SET status = ?, attempts = ?, started_at = ?, lease_expires = ? WHERE id = ?",
+            (RUNNING, job.attempts, now, now + self.lease_seconds, job.id)
+        )
+        return job
+
+    def _finish(self, conn: sqlite3.Connection, job_id: str, result: Optional[Dict[str, Any]],
+                error: Optional[str]) -> Optional[Job]:
+        conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_expires = NULL "
+            "WHERE id = ? AND status = ?",
+            (FAILED if error is not None else SUCCEEDED, json.dumps(result) if result is not None else None,
+             error, time.time(), job_id, RUNNING)
+        )
+        return self._get(conn, job_id)
+
+    def _get(self, conn: sqlite3.Connection, job_id: str) -> Optional[Job]:
+        row = conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def _read(self, query: str, *args):
+        with self._lock:
+            return self._connect().execute(query, args).fetchone()
+
+    async def put(self, job: Job) -> None:
+        await asyncio.to_thread(self._transaction, self._put, job)
+
+    async def claim(self, org_limit: int) -> Optional[Job]:
+        return await asyncio.to_thread(self._transaction, self._claim, org_limit)
+
+    async def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None,
+                     error: Optional[str] = None) -> Optional[Job]:
+        return await asyncio.to_thread(self._transaction, self._finish, job_id, result, error)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        row = await asyncio.to_thread(self._read, f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", job_id)
+        return self._job(row) if row else None
+
+    async def queued_count(self, org_id: str) -> int:
+        row = await asyncio.to_thread(
+            self._read, "SELECT COUNT(*) FROM jobs WHERE org_id = ? AND status = ?", org_id, QUEUED
+        )
+        return row[0]
+
+    async def purge(self, finished_before: float) -> int:
+        def delete(conn: sqlite3.Connection) -> int:
+            return conn.execute("DELETE FROM jobs WHERE finished_at < ?", (finished_before,)).rowcount
+
+        return await asyncio.to_thread(self._transaction, delete)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_job_queue(backend: str = JOB_QUEUE_BACKEND, path: str = JOB_QUEUE_SQLITE_PATH,
+                     workers: int = WEB_CONCURRENCY) -> JobQueue:
+    """
+    Create the configured job queue backend.
+
+    Args:
+        backend: 'memory' or 'sqlite'
+        path: SQLite database file (sqlite backend)
+        workers: Server worker processes that will share the queue
+
+    Returns:
+        JobQueue: The backend (connections are opened lazily)
+
+    Raises:
+        ValueError: If the backend name is unknown, is 'memory' with more
+            than one worker (jobs would be invisible to the others), or is
+            'sqlite' without a path outside the temporary directory
+    """
+    if backend == "memory":
+        if workers > 1:
+            raise ValueError(
+                f"JOB_QUEUE_BACKEND=memory only works with a single worker (WEB_CONCURRENCY={workers}); use sqlite"
+            )
+        return MemoryJobQueue()
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("JOB_QUEUE_SQLITE_PATH must be set for the sqlite job queue")
+        tmp = os.path.realpath(tempfile.gettempdir())
+        if os.path.commonpath([os.path.realpath(path), tmp]) == tmp:
+            raise ValueError(f"JOB_QUEUE_SQLITE_PATH must not be in the temporary directory ({tmp})")
+        return SQLiteJobQueue(path)
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND '{backend}' (expected 'memory' or 'sqlite')")
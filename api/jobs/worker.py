@@ -0,0 +1,327 @@
+"""
+Worker pool for LUMEN SDK API asynchronous evaluations.
+
+A fixed number of worker tasks claim jobs from the configured JobQueue
+and run them through the job handler (the evaluation route registers its
+handler at startup). At most JOB_ORG_CONCURRENCY jobs of one organization
+run at once, and at most JOB_MAX_QUEUED_PER_ORG may wait, so one tenant's
+backlog cannot starve the others.
+
+When a job finishes, its view (as served by GET /v1/jobs/{id}) is POSTed
+to the job's callback URL, if it has one, with retries. Callbacks are
+signed with JOB_CALLBACK_SECRET when it is set.
+
+Callback hosts must resolve to public addresses only, so a callback URL
+cannot reach the metadata service, loopback or the internal network. The
+host is resolved when the job is queued and again before every delivery
+attempt, and the request goes to the address that was checked (with the
+URL's host name kept for the Host header and TLS), so a DNS answer that
+changes after the check (rebinding) is never connected to.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+import logging
+
+import httpx
+
+from .queue import Job, JobQueue, create_job_queue
+
+logger = logging.getLogger(__name__)
+
+# Worker pool configuration - override via environment
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_ORG_CONCURRENCY = int(os.getenv("JOB_ORG_CONCURRENCY", "2"))
+JOB_MAX_QUEUED_PER_ORG = int(os.getenv("JOB_MAX_QUEUED_PER_ORG", "1000"))
+# Idle workers re-check the queue this often (jobs added by other
+# processes sharing a SQLite queue are only seen by polling)
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "0.5"))
+# Finished jobs can be polled for this long
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+
+# Completion callbacks
+JOB_CALLBACK_TIMEOUT_SECONDS = float(os.getenv("JOB_CALLBACK_TIMEOUT_SECONDS", "5"))
+JOB_CALLBACK_RETRIES = int(os.getenv("JOB_CALLBACK_RETRIES", "3"))
+JOB_CALLBACK_SECRET = os.getenv("JOB_CALLBACK_SECRET", "")
+JOB_CALLBACK_ALLOW_HTTP = os.getenv("JOB_CALLBACK_ALLOW_HTTP", "false").lower() == "true"
+# Local development only: allow callbacks to loopback and private addresses
+JOB_CALLBACK_ALLOW_PRIVATE = os.getenv("JOB_CALLBACK_ALLOW_PRIVATE", "false").lower() == "true"
+
+JobHandler = Callable[[Job], Awaitable[dict]]
+
+
+class JobFailed(Exception):
+    """Raised by a job handler to fail a job with a client-facing message."""
+
+
+class QueueFull(Exception):
+    """Raised when an organization already has the maximum number of queued jobs."""
+
+
+def validate_callback_url(url: str) -> str:
+    """
+    Check that a callback URL is absolute and uses HTTPS.
+
+    Plain HTTP is accepted only with JOB_CALLBACK_ALLOW_HTTP=true (local
+    development).
+
+    Raises:
+        ValueError: If the URL is not acceptable
+    """
+    parsed = urlparse(url)
+    schemes = ("https", "http") if JOB_CALLBACK_ALLOW_HTTP else ("https",)
+    if parsed.scheme not in schemes or not parsed.hostname:
+        raise ValueError(f"callback_url must be an absolute {' or '.join(schemes)} URL")
+    return url
+
+
+def _public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return not (ip.is_loopback or ip.is_private or ip.is_link_local or ip.is_multicast
+                or ip.is_reserved or ip.is_unspecified or not ip.is_global)
+
+
+async def resolve_callback_url(url: str) -> str:
+    """
+    Check a callback URL and resolve its host to an address to deliver to.
+
+    Every address the host resolves to must be public: loopback, private
+    (RFC 1918, unique local), link-local (including 169.254.169.254),
+    multicast, reserved and shared addresses are refused, unless
+    JOB_CALLBACK_ALLOW_PRIVATE=true.
+
+    Returns:
+        str: The first resolved address
+
+    Raises:
+        ValueError: If the URL is not acceptable or its host does not resolve
+    """
+    parsed = urlparse(validate_callback_url(url))
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        infos = await asyncio.to_thread(socket.getaddrinfo, parsed.hostname, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise ValueError("callback_url host does not resolve")
+    addresses = [info[4][0] for info in infos]
+    if not addresses:
+        raise ValueError("callback_url host does not resolve")
+    if not JOB_CALLBACK_ALLOW_PRIVATE and not all(_public_address(address) for address in addresses):
+        raise ValueError("callback_url must not resolve to a loopback, private, link-local, multicast or reserved address")
+    return addresses[0]
+
+
+def sign_callback(body: bytes, secret: str) -> str:
+    """X-Lumen-Signature value for a callback body (HMAC-SHA256, hex)."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+class JobWorkerPool:
+    """
+    Worker tasks serving a job queue.
+
+    Workers wait on an event that submit() and finished jobs set, and
+    fall back to polling every poll_interval seconds.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int = JOB_WORKERS,
+        org_concurrency: int = JOB_ORG_CONCURRENCY,
+        max_queued_per_org: int = JOB_MAX_QUEUED_PER_ORG,
+        poll_interval: float = JOB_POLL_INTERVAL_SECONDS,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.queue = queue
+        self.workers = workers
+        self.org_concurrency = org_concurrency
+        self.max_queued_per_org = max_queued_per_org
+        self.poll_interval = poll_interval
+        self.handler: Optional[JobHandler] = None
+        self._http = http_client
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._callbacks: Set[asyncio.Task] = set()
+        self._stopping = False
+        self.completed = 0
+        self.failed = 0
+
+    async def submit(self, job: Job) -> Job:
+        """
+        Enqueue a job and wake an idle worker.
+
+        Raises:
+            QueueFull: If the job's organization has too many queued jobs
+        """
+        if await self.queue.queued_count(job.org_id) >= self.max_queued_per_org:
+            raise QueueFull(f"Organization has {self.max_queued_per_org} evaluation jobs queued")
+        await self.queue.put(job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def start(self, handler: JobHandler) -> None:
+        """Start the worker tasks and the retention sweep."""
+        self.handler = handler
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge_loop()))
+
+    async def stop(self) -> None:
+        """Stop the workers, wait for pending callbacks and close the queue."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._callbacks:
+            await asyncio.wait(self._callbacks, timeout=JOB_CALLBACK_TIMEOUT_SECONDS)
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        await self.queue.close()
+
+    async def _worker(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                job = await self.queue.claim(self.org_concurrency)
+            except Exception as e:
+                logger.error(f"Job claim error: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.run_job(job)
+            # A slot of this job's organization opened up for other workers
+            self._wakeup.set()
+
+    async def run_job(self, job: Job) -> Optional[Job]:
+        """Run one claimed job through the handler and record the outcome."""
+        try:
+            result = await self.handler(job)
+        except JobFailed as e:
+            finished = await self.queue.finish(job.id, error=str(e))
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e!r}")
+            finished = await self.queue.finish(job.id, error="Internal error while evaluating")
+        else:
+            finished = await self.queue.finish(job.id, result=result)
+
+        if finished is None:
+            return None
+        if finished.error is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+        if finished.callback_url:
+            task = asyncio.create_task(self._callback(finished))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+        return finished
+
+    async def _callback(self, job: Job) -> bool:
+        """POST the finished job to its callback URL, retrying with backoff."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=JOB_CALLBACK_TIMEOUT_SECONDS, follow_redirects=False)
+
+        body = json.dumps(job.to_dict(), separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json", "X-Lumen-Job-Id": job.id}
+        if JOB_CALLBACK_SECRET:
+            headers["X-Lumen-Signature"] = sign_callback(body, JOB_CALLBACK_SECRET)
+
+        url = httpx.URL(job.callback_url)
+        headers["Host"] = url.netloc.decode("ascii")
+
+        for attempt in range(JOB_CALLBACK_RETRIES):
+            try:
+                # Re-checked on every attempt: the host's DNS may have changed
+                # since the job was queued
+                address = await resolve_callback_url(job.callback_url)
+            except ValueError as e:
+                logger.warning(f"Callback for job {job.id} refused: {e}")
+            else:
+                try:
+                    response = await self._http.post(
+                        url.copy_with(host=address), content=body, headers=headers,
+                        extensions={"sni_hostname": url.raw_host.decode("ascii")},
+                    )
+                    if 200 <= response.status_code < 300:
+                        return True
+                    logger.warning(f"Callback for job {job.id} returned {response.status_code}")
+                except httpx.HTTPError as e:
+                    logger.warning(f"Callback for job {job.id} failed: {e!r}")
+            if attempt + 1 < JOB_CALLBACK_RETRIES:
+                await asyncio.sleep(2 ** attempt)
+        logger.error(f"Giving up on callback for job {job.id} after {JOB_CALLBACK_RETRIES} attempts")
+        return False
+
+    async def _purge_loop(self) -> None:
+        while not self._stopping:
+            try:
+                await self.queue.purge(time.time() - JOB_RETENTION_SECONDS)
+            except Exception as e:
+                logger.error(f"Job purge error: {e}")
+            await asyncio.sleep(60)
+
+    def stats(self) -> Dict[str, int]:
+        """Return completion counters."""
+        return {
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending_callbacks": len(self._callbacks),
+        }
+
+
+# Global pool instance (queue backend chosen by JOB_QUEUE_BACKEND at startup)
+_job_pool: Optional[JobWorkerPool] = None
+
+
+def init_job_pool() -> JobWorkerPool:
+    """
+    Create the pool over the configured job queue, unless one is installed already.
+
+    Raises:
+        ValueError: If the queue backend is unknown or doesn't fit the deployment
+    """
+    global _job_pool
+    if _job_pool is None:
+        _job_pool = JobWorkerPool(create_job_queue())
+    return _job_pool
+
+
+def set_job_pool(pool: Optional[JobWorkerPool]) -> None:
+    """Install a job pool instance (used by tests and embedding apps)."""
+    global _job_pool
+    _job_pool = pool
+
+
+def get_job_pool() -> JobWorkerPool:
+    """
+    Get the process-wide job worker pool.
+
+    Raises:
+        RuntimeError: If the pool hasn't been initialized
+    """
+    if _job_pool is None:
+        raise RuntimeError("Job pool not initialized. Call init_job_pool() first.")
+    return _job_pool
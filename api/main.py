@@ -18,13 +18,20 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 # Route imports
-from routes import evaluate, health, records, keys, packs
+from routes import evaluate, health, records, keys, packs, jobs
 
 # Middleware imports
 from middleware import UsageTrackingMiddleware, RateLimitMiddleware, cleanup_rate_limits
 
 # Auth imports  
-from auth.supabase_client import init_supabase
+from db.repository import init_repository, close_repository
+from auth.hashing import get_hash_executor
+from auth.last_used import get_last_used_buffer
+from middleware.usage_counter import get_usage_counter
+from middleware.rate_limit import get_rate_limiter
+from jobs import get_job_pool, init_job_pool
+from records import get_record_store, get_record_writer, init_record_store
+from audit import get_audit_log, init_audit_log
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +45,7 @@ API_DESCRIPTION = """
 The LUMEN SDK API provides enterprise-grade endpoints for:
 
 - **Evaluation**: Analyze AI outputs for compliance with healthcare regulations
+- **Jobs**: Queue evaluations (`mode=async`) and poll or receive a callback
 - **Records**: Retrieve and manage defensible audit records  
 - **API Keys**: Manage authentication keys with plan-based limits
 - **Policy Packs**: Configure compliance frameworks (PHIPA, HIPAA, FDA, etc.)
@@ -178,6 +186,7 @@ app.include_router(evaluate.router)
 app.include_router(records.router)
 app.include_router(keys.router)
 app.include_router(packs.router)
+app.include_router(jobs.router)
 
 
 @app.on_event("startup")
@@ -186,12 +195,24 @@ async def startup_event():
     try:
         logger.info(f"🚀 {API_TITLE} v{API_VERSION} starting up...")
         
-        # Initialize Supabase client
-        init_supabase()
-        logger.info("✅ Supabase client initialized")
+        # Initialize data-access layer (async Supabase client by default)
+        await init_repository()
+        logger.info("✅ Repository initialized")
+        init_record_store()
+        # Takes this worker's audit log directory (fails if AUDIT_LOG_DIR is unset)
+        init_audit_log()
+        
+        # Replay usage increments that were not flushed before the last exit
+        get_usage_counter().recover()
         
         # Start background tasks
         asyncio.create_task(cleanup_rate_limits())
+        asyncio.create_task(get_last_used_buffer().run())
+        asyncio.create_task(get_usage_counter().run())
+        # Also replays records spilled to the journal before the last exit
+        asyncio.create_task(get_record_writer().run())
+        # Fails for the memory queue when several workers serve the app
+        init_job_pool().start(evaluate.run_evaluation_job)
         logger.info("✅ Background tasks started")
         
         logger.info("🎯 LUMEN API ready for enterprise healthcare AI compliance")
@@ -205,7 +226,19 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info(f"👋 {API_TITLE} shutting down...")
-    # Future: cleanup database connections, background tasks, etc.
+    
+    # Stop evaluation workers (queued jobs stay queued in the SQLite backend)
+    await get_job_pool().stop()
+    
+    # Final flush of buffered last_used_at timestamps, usage increments and records
+    await get_last_used_buffer().stop()
+    await get_usage_counter().stop()
+    await get_record_writer().stop()
+    await get_rate_limiter().close()
+    get_hash_executor().shutdown()
+    await get_record_store().close()
+    get_audit_log().close()
+    await close_repository()
 
 
 @app.get("/", include_in_schema=False)
@@ -0,0 +1,517 @@
+"""
+Rate limiter backends for LUMEN SDK API.
+
+The rate limit middleware talks to a RateLimitBackend. Backends:
+
+- memory: GCRA state in this process (single worker, tests)
+- sqlite: GCRA state in a SQLite database in WAL mode, shared by every
+  worker on the host
+- redis: sliding-window counters on a Redis-protocol server, shared by
+  every worker in the deployment
+
+Each backend performs its check-and-increment atomically, so a limit holds
+no matter how many workers share the state.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Backend selection - override via environment
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+
+# Memory backend layout and incremental cleanup
+RATE_LIMIT_SHARDS = int(os.getenv("RATE_LIMIT_SHARDS", "64"))
+RATE_LIMIT_CLEANUP_BATCH = int(os.getenv("RATE_LIMIT_CLEANUP_BATCH", "1000"))
+
+# SQLite backend (required when RATE_LIMIT_BACKEND=sqlite)
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "")
+
+# Redis backend
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "8"))
+REDIS_TIMEOUT_SECONDS = float(os.getenv("REDIS_TIMEOUT_SECONDS", "1"))
+
+
+class RateLimitBackend(ABC):
+    """
+    Shared rate limiter state.
+
+    is_allowed() returns (allowed, metadata) where metadata holds limit,
+    remaining, reset (epoch seconds) and retry_after (seconds) for the
+    X-RateLimit-* and Retry-After headers.
+    """
+
+    @abstractmethod
+    async def is_allowed(self, key: str, limit: int, window_seconds: int = 60,
+                         cost: int = 1) -> tuple[bool, dict]:
+        """
+        Atomically check a request against the limit and charge it.
+
+        Args:
+            key: Rate limit key (the verified API key id)
+            limit: Maximum requests per window
+            window_seconds: Window size in seconds
+            cost: Units this request consumes
+
+        Returns:
+            tuple: (allowed: bool, metadata: dict)
+        """
+
+    async def sweep(self, max_keys: int = RATE_LIMIT_CLEANUP_BATCH) -> int:
+        """Incrementally drop expired state; returns the number of keys removed."""
+        return 0
+
+    async def cleanup(self, max_age_seconds: int = 3600):
+        """Drop all expired state."""
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+
+def _gcra(tat: Optional[float], now: float, limit: int, window_seconds: int,
+          cost: int) -> Tuple[bool, float, dict]:
+    """
+    One GCRA step.
+
+    Returns:
+        tuple: (allowed, theoretical arrival time to store, metadata)
+    """
+    interval = window_seconds / limit
+    # A TAT in the past means a full bucket (lazy expiry)
+    tat = max(tat if tat is not None else now, now)
+    new_tat = tat + interval * cost
+    # Earliest time this request could conform: a full window of tokens may
+    # be spent ahead of the TAT
+    allow_at = new_tat - window_seconds
+
+    if now < allow_at:
+        return False, tat, {
+            "limit": limit,
+            "remaining": 0,
+            "reset": math.ceil(tat),
+            "retry_after": max(math.ceil(allow_at - now), 1)
+        }
+
+    return True, new_tat, {
+        "limit": limit,
+        "remaining": int((now - allow_at) / interval + 1e-9),
+        "reset": math.ceil(new_tat),
+        "retry_after": 0
+    }
+
+
+# --- Memory -----------------------------------------------------------------
+
+class _LimiterShard:
+    """One lock stripe of limiter state."""
+
+    __slots__ = ("tats", "lock")
+
+    def __init__(self):
+        # key -> theoretical arrival time (epoch seconds). Keys are
+        # re-inserted on every update, so iteration order runs from least
+        # to most recently updated.
+        self.tats: Dict[str, float] = {}
+        self.lock = asyncio.Lock()
+
+
+class GCRARateLimit(RateLimitBackend):
+    """
+    Generic cell rate algorithm (GCRA) rate limiter.
+
+    Equivalent to a token bucket that holds `limit` tokens and refills one
+    token every window_seconds / limit. Each key stores a single float, its
+    theoretical arrival time (TAT), so checks are O(1) in time and memory
+    regardless of the plan limit.
+
+    State is split across lock-striped shards so keys in different shards
+    never wait on each other. Expired state is ignored on access and swept
+    incrementally, a bounded number of keys per shard at a time.
+    """
+
+    def __init__(self, shards: int = RATE_LIMIT_SHARDS):
+        self._shards: List[_LimiterShard] = [_LimiterShard() for _ in range(max(1, shards))]
+        self._next_sweep = 0
+
+    def _shard_for(self, key: str) -> _LimiterShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    async def is_allowed(self, key: str, limit: int, window_seconds: int = 60,
+                         cost: int = 1) -> tuple[bool, dict]:
+        shard = self._shard_for(key)
+        async with shard.lock:
+            allowed, tat, metadata = _gcra(shard.tats.get(key), time.time(), limit, window_seconds, cost)
+            if allowed:
+                shard.tats.pop(key, None)
+                shard.tats[key] = tat
+            return allowed, metadata
+
+    async def sweep(self, max_keys: int = RATE_LIMIT_CLEANUP_BATCH) -> int:
+        """
+        Incrementally drop expired state from the next shard.
+
+        Visits at most max_keys of the shard's least recently updated keys,
+        so the shard lock is held for a bounded time.
+
+        Returns:
+            int: Number of keys removed
+        """
+        shard = self._shards[self._next_sweep]
+        self._next_sweep = (self._next_sweep + 1) % len(self._shards)
+        return await self._sweep_shard(shard, max_keys)
+
+    async def cleanup(self, max_age_seconds: int = 3600):
+        """
+        Cleanup old rate limit data.
+
+        A key whose TAT has passed has a full bucket, which is the same as
+        having no state, so it can be dropped. Shards are swept one at a
+        time, yielding to the event loop in between.
+
+        Args:
+            max_age_seconds: Unused; GCRA state expires within one window
+        """
+        for shard in self._shards:
+            await self._sweep_shard(shard, len(shard.tats))
+            await asyncio.sleep(0)
+
+    async def _sweep_shard(self, shard: _LimiterShard, max_keys: int) -> int:
+        async with shard.lock:
+            now = time.time()
+            expired = []
+            for visited, (key, tat) in enumerate(shard.tats.items()):
+                if visited >= max_keys:
+                    break
+                if tat <= now:
+                    expired.append(key)
+            for key in expired:
+                del shard.tats[key]
+            return len(expired)
+
+    def size(self) -> int:
+        """Number of keys currently holding limiter state."""
+        return sum(len(shard.tats) for shard in self._shards)
+
+
+# --- SQLite -----------------------------------------------------------------
+
+class SQLiteRateLimit(RateLimitBackend):
+    """
+    GCRA limiter with state in a SQLite database shared by local workers.
+
+    Each check runs in a BEGIN IMMEDIATE transaction, which takes the
+    database write lock before reading the TAT, so concurrent workers
+    serialize on the check-and-update. WAL mode keeps those transactions
+    short. Calls run on a worker thread so the event loop never blocks on
+    the database lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Owner-only; SQLite gives the -wal and -shm files the same mode
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS rate_limits_tat ON rate_limits (tat)")
+            self._conn = conn
+        return self._conn
+
+    def _check(self, key: str, limit: int, window_seconds: int, cost: int) -> tuple[bool, dict]:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+                allowed, tat, metadata = _gcra(row[0] if row else None, time.time(), limit, window_seconds, cost)
+                if allowed:
+                    conn.execute(
+                        "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                        "ON CONFLICT (key) DO UPDATE SET tat = excluded.tat",
+                        (key, tat)
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return allowed, metadata
+
+    def _sweep(self, max_keys: Optional[int]) -> int:
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM rate_limits WHERE rowid IN "
+                "(SELECT rowid FROM rate_limits WHERE tat <= ? LIMIT ?)",
+                (time.time(), -1 if max_keys is None else max_keys)
+            )
+            return cursor.rowcount
+
+    async def is_allowed(self, key: str, limit: int, window_seconds: int = 60,
+                         cost: int = 1) -> tuple[bool, dict]:
+        return await asyncio.to_thread(self._check, key, limit, window_seconds, cost)
+
+    async def sweep(self, max_keys: int = RATE_LIMIT_CLEANUP_BATCH) -> int:
+        return await asyncio.to_thread(self._sweep, max_keys)
+
+    async def cleanup(self, max_age_seconds: int = 3600):
+        await asyncio.to_thread(self._sweep, None)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# --- Redis ------------------------------------------------------------------
+
+class RedisError(Exception):
+    """Error reply or protocol failure from a Redis-protocol server."""
+
+
+class RedisConnection:
+    """Minimal RESP2 client connection over asyncio streams."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, url: str, timeout: float) -> "RedisConnection":
+        """Connect to a redis:// URL, authenticating and selecting the db."""
+        parsed = urlparse(url)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parsed.hostname or "localhost", parsed.port or 6379),
+            timeout=timeout
+        )
+        conn = cls(reader, writer)
+        if parsed.password:
+            auth = [unquote(parsed.password)]
+            if parsed.username:
+                auth.insert(0, unquote(parsed.username))
+            await conn.execute("AUTH", *auth)
+        db = parsed.path.lstrip("/")
+        if db and db != "0":
+            await conn.execute("SELECT", db)
+        return conn
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            items = []
+            for _ in range(length):
+                try:
+                    items.append(await self._read_reply())
+                except RedisError as e:
+                    # Errors inside EXEC replies are returned, not raised
+                    items.append(e)
+            return items
+        raise RedisError(f"Unexpected reply type {kind!r}")
+
+    async def execute(self, *args):
+        """Send one command and return its reply."""
+        return (await self.pipeline([args]))[0]
+
+    async def pipeline(self, commands: List[tuple]) -> list:
+        """Send several commands in one write and read every reply."""
+        self._writer.write(b"".join(self._encode(command) for command in commands))
+        await self._writer.drain()
+        replies = []
+        error = None
+        for _ in commands:
+            try:
+                replies.append(await self._read_reply())
+            except RedisError as e:
+                # Keep reading so the connection stays in sync
+                error = error or e
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+class RedisRateLimit(RateLimitBackend):
+    """
+    Sliding-window counter limiter on a Redis-protocol server.
+
+    Each key has one counter per fixed window. A request is weighed against
+    the current window's count plus the previous window's count scaled by
+    the share of the previous window still inside the sliding window. The
+    increment, expiry and previous-window read run in one MULTI/EXEC, so
+    concurrent workers never lose or double-count a request; a request that
+    ends up over the limit gives its units back.
+
+    Uses only GET, INCRBY, DECRBY, PEXPIRE and MULTI/EXEC, so no server-side
+    scripting is required.
+    """
+
+    def __init__(self, url: str = REDIS_URL, pool_size: int = REDIS_POOL_SIZE,
+                 timeout: float = REDIS_TIMEOUT_SECONDS, prefix: str = "lumen:rl:"):
+        self.url = url
+        self.timeout = timeout
+        self.prefix = prefix
+        self._pool: asyncio.Queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def _acquire(self) -> RedisConnection:
+        await self._slots.acquire()
+        try:
+            return self._pool.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            return await RedisConnection.open(self.url, self.timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: Optional[RedisConnection]) -> None:
+        if conn is not None:
+            self._pool.put_nowait(conn)
+        self._slots.release()
+
+    async def _run(self, commands: List[tuple]) -> list:
+        conn = await self._acquire()
+        try:
+            replies = await asyncio.wait_for(conn.pipeline(commands), timeout=self.timeout)
+        except BaseException:
+            # Connection state is unknown after a failure; drop it
+            await conn.close()
+            self._release(None)
+            raise
+        self._release(conn)
+        return replies
+
+    async def is_allowed(self, key: str, limit: int, window_seconds: int = 60,
+                         cost: int = 1) -> tuple[bool, dict]:
+        now = time.time()
+        window = int(now // window_seconds)
+        current_key = f"{self.prefix}{key}:{window}"
+        previous_key = f"{self.prefix}{key}:{window - 1}"
+
+        replies = await self._run([
+            ("MULTI",),
+            ("INCRBY", current_key, cost),
+            ("PEXPIRE", current_key, window_seconds * 2000),
+            ("GET", previous_key),
+            ("EXEC",),
+        ])
+        current, _, previous = replies[-1]
+        if isinstance(current, Exception):
+            raise current
+        previous = int(previous) if previous else 0
+
+        window_end = (window + 1) * window_seconds
+        # Share of the previous window still inside the sliding window
+        overlap = (window_end - now) / window_seconds
+        used = previous * overlap + current
+
+        if used > limit:
+            await self._run([("DECRBY", current_key, cost)])
+            if current > limit or previous == 0:
+                retry_after = window_end - now
+            else:
+                # Wait until the previous window's weight has decayed enough
+                retry_after = (overlap - (limit - current) / previous) * window_seconds
+            return False, {
+                "limit": limit,
+                "remaining": 0,
+                "reset": math.ceil(window_end),
+                "retry_after": max(math.ceil(retry_after - 1e-9), 1)
+            }
+
+        return True, {
+            "limit": limit,
+            "remaining": max(int(limit - used), 0),
+            "reset": math.ceil(window_end),
+            "retry_after": 0
+        }
+
+    async def close(self) -> None:
+        while not self._pool.empty():
+            await self._pool.get_nowait().close()
+
+
+def create_rate_limiter(backend: str = RATE_LIMIT_BACKEND, path: str = RATE_LIMIT_SQLITE_PATH) -> RateLimitBackend:
+    """
+    Create the configured rate limiter backend.
+
+    Args:
+        backend: 'memory', 'sqlite' or 'redis'
+        path: SQLite database file (sqlite backend)
+
+    Returns:
+        RateLimitBackend: The backend (connections are opened lazily)
+
+    Raises:
+        ValueError: If the backend name is unknown, or is 'sqlite' without
+            a path outside the temporary directory
+    """
+    if backend == "memory":
+        return GCRARateLimit()
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("RATE_LIMIT_SQLITE_PATH must be set for the sqlite rate limiter")
+        # A predictable name in a world-writable directory can be created
+        # (or held) first by any local user
+        tmp = os.path.realpath(tempfile.gettempdir())
+        if os.path.commonpath([os.path.realpath(path), tmp]) == tmp:
+            raise ValueError(f"RATE_LIMIT_SQLITE_PATH must not be in the temporary directory ({tmp})")
+        return SQLiteRateLimit(path)
+    if backend == "redis":
+        return RedisRateLimit()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND '{backend}' (expected 'memory', 'sqlite' or 'redis')")
@@ -1,193 +1,257 @@
 """
 Rate limiting middleware for LUMEN SDK API.
 
-Per-key rate limiting with sliding window implementation.
+Per-key rate limiting with a pluggable backend (see limiter_backends). Limits
+are applied per verified key_id using the owning organization's plan.
 
 Copyright 2026 Forge Partners Inc.
 """
 
-import time
-from collections import defaultdict
+import os
 from typing import Dict, List
 from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import asyncio
 import logging
+from auth.api_keys import verify_api_key
+from .limiter_backends import RateLimitBackend, create_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Requests per minute by plan - override via environment
+PLAN_RATE_LIMITS: Dict[str, int] = {
+    "free": int(os.getenv("RATE_LIMIT_FREE_PER_MINUTE", "100")),
+    "pro": int(os.getenv("RATE_LIMIT_PRO_PER_MINUTE", "1000")),
+}
+RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+RATE_LIMIT_CLEANUP_INTERVAL_SECONDS = float(os.getenv("RATE_LIMIT_CLEANUP_INTERVAL_SECONDS", "1"))
 
-class SlidingWindowRateLimit:
+# Paths whose route charges the limiter itself, weighted by item count
+# (see charge_rate_limit); the middleware only adds the resulting headers
+WEIGHTED_PATHS = ("/v1/evaluate/batch", "/v1/evaluate/stream")
+
+
+def get_plan_rate_limit(plan: str) -> int:
+    """Requests per window for a plan; unknown plans get the free limit."""
+    return PLAN_RATE_LIMITS.get(plan, PLAN_RATE_LIMITS["free"])
+
+
+# Global rate limiter instance (backend chosen by RATE_LIMIT_BACKEND)
+_rate_limiter: RateLimitBackend = create_rate_limiter()
+
+
+def get_rate_limiter() -> RateLimitBackend:
+    """Get the process-wide rate limiter backend."""
+    return _rate_limiter
+
+
+def _rate_limit_headers(metadata: dict) -> Dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(metadata["limit"]),
+        "X-RateLimit-Remaining": str(metadata["remaining"]),
+        "X-RateLimit-Reset": str(metadata["reset"]),
+    }
+
+
+async def charge_rate_limit(request: Request, key_id: str, plan: str, cost: int) -> dict:
     """
-    Sliding window rate limiter implementation.
-    
-    Tracks request timestamps in a sliding window and enforces limits
-    based on plan tier (free: 100/min, pro: 1000/min).
+    Charge ``cost`` requests against a key's rate limit in one step.
+
+    Used by routes on WEIGHTED_PATHS once they know how many items a
+    request carries. The metadata is kept on request.state so the
+    middleware adds X-RateLimit-* headers to the response.
+
+    Args:
+        request: The request being charged
+        key_id: Verified key_id
+        plan: Plan of the key's organization
+        cost: Number of requests to charge
+
+    Returns:
+        dict: Limiter metadata (limit, remaining, reset, retry_after)
+
+    Raises:
+        HTTPException: 413 if cost exceeds the plan's limit per window,
+            429 if the limit does not have room for cost requests
     """
-    
-    def __init__(self):
-        # Storage: key -> list of request timestamps
-        self._windows: Dict[str, List[float]] = defaultdict(list)
-        self._lock = asyncio.Lock()
-    
-    async def is_allowed(self, key: str, limit: int, window_seconds: int = 60) -> tuple[bool, dict]:
-        """
-        Check if request is allowed under rate limit.
-        
-        Args:
-            key: Rate limit key (typically API key prefix)
-            limit: Maximum requests per window
-            window_seconds: Window size in seconds
-            
-        Returns:
-            tuple: (allowed: bool, metadata: dict)
-        """
-        async with self._lock:
-            now = time.time()
-            window_start = now - window_seconds
-            
-            # Clean old timestamps
-            if key in self._windows:
-                self._windows[key] = [
-                    ts for ts in self._windows[key] 
-                    if ts > window_start
-                ]
-            
-            current_count = len(self._windows[key])
-            
-            # Check if request is allowed
-            if current_count >= limit:
-                # Calculate retry-after
-                oldest_in_window = min(self._windows[key]) if self._windows[key] else now
-                retry_after = int(oldest_in_window + window_seconds - now) + 1
-                
-                return False, {
-                    "limit": limit,
-                    "remaining": 0,
-                    "reset": int(oldest_in_window + window_seconds),
-                    "retry_after": max(retry_after, 1)
-                }
-            
-            # Allow request and record timestamp
-            self._windows[key].append(now)
-            
-            # Calculate reset time (when oldest request expires)
-            reset_time = int(self._windows[key][0] + window_seconds) if self._windows[key] else int(now + window_seconds)
-            
-            return True, {
-                "limit": limit,
-                "remaining": limit - current_count - 1,
-                "reset": reset_time,
-                "retry_after": 0
-            }
-    
-    async def cleanup(self, max_age_seconds: int = 3600):
-        """
-        Cleanup old rate limit data.
-        
-        Args:
-            max_age_seconds: Remove keys older than this
-        """
-        async with self._lock:
-            now = time.time()
-            cutoff = now - max_age_seconds
-            
-            keys_to_remove = []
-            for key, timestamps in self._windows.items():
-                # Remove old timestamps
-                self._windows[key] = [ts for ts in timestamps if ts > cutoff]
-                # If no recent activity, mark for removal
-                if not self._windows[key]:
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                del self._windows[key]
+    limit = get_plan_rate_limit(plan)
+    if cost > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request carries {cost} items; the {plan} plan allows {limit} per "
+                   f"{RATE_LIMIT_WINDOW_SECONDS} seconds"
+        )
+
+    allowed, metadata = await _rate_limiter.is_allowed(key_id, limit, RATE_LIMIT_WINDOW_SECONDS, cost=cost)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "message": "Rate limit exceeded",
+                "limit": metadata["limit"],
+                "remaining": metadata["remaining"],
+                "reset": metadata["reset"]
+            },
+            headers={**_rate_limit_headers(metadata), "Retry-After": str(metadata["retry_after"])}
+        )
+
+    request.state.rate_limit = metadata
+    return metadata
 
 
-# Global rate limiter instance
-_rate_limiter = SlidingWindowRateLimit()
+async def throttle_rate_limit(key_id: str, plan: str, cost: int) -> dict:
+    """
+    Wait until ``cost`` requests fit in a key's rate limit, then charge them.
+
+    For streaming routes, where a denial can no longer be sent as a 429;
+    waiting out the limit slows the stream down to the plan's rate.
 
+    Args:
+        key_id: Verified key_id
+        plan: Plan of the key's organization
+        cost: Number of requests to charge (at most the plan's limit)
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+    Returns:
+        dict: Limiter metadata of the successful charge
+
+    Raises:
+        ValueError: If cost exceeds the plan's limit and could never fit
     """
-    Rate limiting middleware.
+    limit = get_plan_rate_limit(plan)
+    if cost > limit:
+        raise ValueError(f"Cost {cost} exceeds the {plan} plan's rate limit of {limit}")
+
+    while True:
+        allowed, metadata = await _rate_limiter.is_allowed(key_id, limit, RATE_LIMIT_WINDOW_SECONDS, cost=cost)
+        if allowed:
+            return metadata
+        await asyncio.sleep(metadata["retry_after"])
+
+
+class RateLimitMiddleware:
+    """
+    Rate limiting middleware (pure ASGI).
     
-    Enforces per-key rate limits:
+    Enforces per-key rate limits by plan (configurable via environment):
     - Free plan: 100 requests/minute
     - Pro plan: 1000 requests/minute
     
-    Uses sliding window with in-memory storage.
+    The key is verified first (the result is shared with the route through
+    request.state), so invalid keys are rejected before they get limiter
+    state and keys sharing a prefix never share a bucket.
+    
+    Rejections and 429s are sent directly without calling the app; allowed
+    responses get X-RateLimit-* headers added to their http.response.start
+    message, so the body streams through untouched.
+    
+    State lives in the RATE_LIMIT_BACKEND backend: in-process GCRA by
+    default, or SQLite / Redis to share limits across workers.
+    
+    Requests on WEIGHTED_PATHS are charged by the route, weighted by item
+    count (see charge_rate_limit); the middleware only verifies the key
+    and adds the headers the route's charge produced.
     """
 
-    def __init__(self, app, excluded_paths: List[str] = None):
-        super().__init__(app)
-        self.excluded_paths = excluded_paths or ["/health", "/docs", "/redoc", "/openapi.json"]
+    def __init__(self, app: ASGIApp, excluded_paths: List[str] = None):
+        self.app = app
+        self.excluded_paths = tuple(excluded_paths or ["/health", "/docs", "/redoc", "/openapi.json"])
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for excluded paths
-        if any(request.url.path.startswith(path) for path in self.excluded_paths):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
+        # Skip rate limiting for excluded paths and non-API endpoints
+        if path.startswith(self.excluded_paths) or not path.startswith("/v1/"):
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        # Get API key for rate limiting
+        api_key = request.headers.get("X-API-Key")
         
-        # Only apply rate limiting to API endpoints
-        if not request.url.path.startswith("/v1/"):
-            return await call_next(request)
+        if not api_key:
+            # No API key, let endpoint handle auth
+            await self.app(scope, receive, send)
+            return
         
+        # Only the key lookup and limiter check are guarded: the app is
+        # called exactly once, outside the try, so a route error is never
+        # mistaken for a limiter failure and replayed
         try:
-            # Get API key for rate limiting
-            api_key = request.headers.get("X-API-Key")
-            
-            if not api_key:
-                # No API key, let endpoint handle auth
-                return await call_next(request)
-            
-            # Use key prefix for rate limiting (privacy + efficiency)
-            rate_key = api_key[:20] if len(api_key) >= 20 else api_key
-            
-            # Determine rate limit based on key format
-            # Pro keys typically contain "live" or have specific prefixes
-            # This is a simple heuristic; in production, look up plan from DB
-            if "_live_" in api_key:
-                limit = 1000  # Pro plan
-            else:
-                limit = 100   # Free plan (default)
+            # Resolve key_id and plan from the (cached) verification result
+            api_key_info = await verify_api_key(request, api_key)
+        except HTTPException as e:
+            # Reject invalid keys here; they never allocate a bucket
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail},
+                headers=e.headers
+            )
+            await response(scope, receive, send)
+            return
+        except Exception as e:
+            logger.error(f"Rate limiting error: {e}")
+            # Don't fail requests for rate limiter errors
+            await self.app(scope, receive, send)
+            return
+        
+        if path in WEIGHTED_PATHS:
+            await self.app(scope, receive, self._send_charged_headers(scope, send))
+            return
+        
+        try:
+            limit = get_plan_rate_limit(api_key_info.plan)
             
             # Check rate limit
-            allowed, metadata = await _rate_limiter.is_allowed(rate_key, limit)
-            
-            if not allowed:
-                # Rate limit exceeded
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
+            allowed, metadata = await _rate_limiter.is_allowed(
+                api_key_info.key_id, limit, RATE_LIMIT_WINDOW_SECONDS
+            )
+        except Exception as e:
+            logger.error(f"Rate limiting error: {e}")
+            # Don't fail requests for rate limiter errors
+            await self.app(scope, receive, send)
+            return
+        
+        if not allowed:
+            # Rate limit exceeded
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "detail": {
                         "message": "Rate limit exceeded",
                         "limit": metadata["limit"],
                         "remaining": metadata["remaining"],
                         "reset": metadata["reset"]
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(metadata["limit"]),
-                        "X-RateLimit-Remaining": str(metadata["remaining"]),
-                        "X-RateLimit-Reset": str(metadata["reset"]),
-                        "Retry-After": str(metadata["retry_after"])
                     }
-                )
-            
-            # Process request
-            response = await call_next(request)
-            
-            # Add rate limit headers to response
-            response.headers["X-RateLimit-Limit"] = str(metadata["limit"])
-            response.headers["X-RateLimit-Remaining"] = str(metadata["remaining"])
-            response.headers["X-RateLimit-Reset"] = str(metadata["reset"])
-            
-            return response
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Rate limiting error: {e}")
-            # Don't fail requests for rate limiter errors
-            return await call_next(request)
+                },
+                headers={**_rate_limit_headers(metadata), "Retry-After": str(metadata["retry_after"])}
+            )
+            await response(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers to response
+                MutableHeaders(scope=message).update(_rate_limit_headers(metadata))
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
+    
+    @staticmethod
+    def _send_charged_headers(scope: Scope, send: Send) -> Send:
+        """Wrap send to add the headers of the route's own charge, if it made one."""
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                metadata = scope.get("state", {}).get("rate_limit")
+                if metadata is not None:
+                    MutableHeaders(scope=message).update(_rate_limit_headers(metadata))
+            await send(message)
+        
+        return send_with_headers
 
 
 # Background cleanup task
@@ -195,12 +259,13 @@ async def cleanup_rate_limits():
     """
     Background task to cleanup old rate limit data.
     
-    Should be called periodically (e.g., every hour).
+    Each tick sweeps a bounded batch of expired keys (one shard for the
+    memory backend), so cleanup never holds up requests behind a full pass.
     """
     while True:
         try:
-            await _rate_limiter.cleanup()
-            await asyncio.sleep(3600)  # 1 hour
+            await _rate_limiter.sweep()
+            await asyncio.sleep(RATE_LIMIT_CLEANUP_INTERVAL_SECONDS)
         except Exception as e:
             logger.error(f"Rate limit cleanup error: {e}")
-            await asyncio.sleep(300)   # 5 minutes on error
\ No newline at end of file
+            await asyncio.sleep(300)   # 5 minutes on error
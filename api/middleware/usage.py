@@ -7,146 +7,151 @@ Copyright 2026 Forge Partners Inc.
 """
 
 from datetime import datetime, timezone
-from fastapi import Request, Response, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request, HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
-from auth.supabase_client import get_supabase
 from auth.api_keys import verify_api_key
+from middleware.usage_counter import billing_period_start, get_usage_counter
 
 logger = logging.getLogger(__name__)
 
 
-class UsageTrackingMiddleware(BaseHTTPMiddleware):
+def get_plan_usage_limit(plan: str) -> int:
+    """Monthly evaluations for a plan (free: 1000, anything else: 50000)."""
+    return 1000 if plan == "free" else 50000
+
+
+def _next_month(now: datetime) -> datetime:
+    """Start of the next billing period."""
+    if now.month == 12:
+        return now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    return now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+class UsageTrackingMiddleware:
     """
-    Middleware to track API usage and enforce limits.
-    
+    Middleware to track API usage and enforce limits (pure ASGI).
+
     On every /v1/evaluate request, AFTER successful auth:
-    - Increment evaluations_count in api_usage for current period
-    - Check against plan limit (free: 1000, pro: 50000)
-    - If over limit: return 429 Too Many Requests with reset date
+    - Check against plan limit (free: 1000, pro: 50000) using the locally
+      cached count from the usage counter
+    - Increment the counter after a successful response; the counter
+      flushes atomic increments to api_usage in the background
+    - If over limit: return 429 Too Many Requests with reset date, without
+      calling the app
     - If at 80%: add X-Lumen-Usage-Warning header
+
+    Routes that evaluate several items per request read the remaining
+    allowance from ``request.state.usage_remaining`` and report what they
+    evaluated in ``request.state.usage_units``; the counter is incremented
+    by that amount in one step (default 1). Streaming routes set it to 0
+    and charge the counter themselves as they go.
+
+    Usage headers are added to the http.response.start message, so the
+    response body is never buffered.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Only track usage for evaluate endpoints
-        if not request.url.path.startswith("/v1/evaluate"):
-            return await call_next(request)
-        
+        if scope["type"] != "http" or not scope["path"].startswith("/v1/evaluate"):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        # Get API key info (this will be validated by the endpoint)
+        api_key = request.headers.get("X-API-Key")
+        if not api_key:
+            # Let the endpoint handle auth errors
+            await self.app(scope, receive, send)
+            return
+
+        # Only the key lookup and usage check are guarded; the app is called
+        # once, outside the try, so route errors are never replayed
         try:
-            # Get API key info (this will be validated by the endpoint)
-            api_key = request.headers.get("X-API-Key")
-            if not api_key:
-                # Let the endpoint handle auth errors
-                return await call_next(request)
-            
-            # Quick verification to get org info
-            # Note: This duplicates verification but ensures we have org_id
-            try:
-                api_key_info = await verify_api_key(api_key)
-                org_id = api_key_info.org_id
-                plan = api_key_info.plan
-            except:
-                # Auth will fail at endpoint level
-                return await call_next(request)
-            
+            # Verify once; the result is kept on request.state and reused
+            # by the route's verify_api_key dependency
+            api_key_info = await verify_api_key(request, api_key)
+            org_id = api_key_info.org_id
+            plan = api_key_info.plan
+
             # Check current usage and limits
-            supabase = get_supabase()
-            
+            counter = get_usage_counter()
+
             # Get current month period
             now = datetime.now(timezone.utc)
-            month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            period_key = month_start.strftime("%Y-%m")
-            
-            # Get or create usage record for this period
-            usage_result = supabase.from_("api_usage").select("*").eq(
-                "org_id", org_id
-            ).eq("period_start", month_start.isoformat()).execute()
-            
-            if usage_result.data:
-                usage_record = usage_result.data[0]
-                current_count = usage_record["evaluations_count"]
-            else:
-                current_count = 0
-            
-            # Plan limits
-            limit = 1000 if plan == "free" else 50000
-            
-            # Check if over limit
-            if current_count >= limit:
-                # Calculate next reset date
-                if now.month == 12:
-                    next_month = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-                else:
-                    next_month = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
-                
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
+            period_start = billing_period_start(now)
+
+            # Cached count; only the first request per period reads the database
+            current_count = await counter.current(org_id, period_start)
+        except HTTPException:
+            # Auth will fail at endpoint level
+            await self.app(scope, receive, send)
+            return
+        except Exception as e:
+            logger.error(f"Usage tracking middleware error: {e}")
+            # Don't fail requests for middleware errors
+            await self.app(scope, receive, send)
+            return
+
+        # Plan limits
+        limit = get_plan_usage_limit(plan)
+
+        # Check if over limit
+        if current_count >= limit:
+            next_month = _next_month(now)
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "detail": {
                         "message": "Monthly evaluation limit exceeded",
                         "plan": plan,
                         "limit": limit,
                         "used": current_count,
                         "reset_date": next_month.isoformat()
-                    },
-                    headers={
-                        "X-Lumen-Usage-Limit": str(limit),
-                        "X-Lumen-Usage-Used": str(current_count),
-                        "X-Lumen-Usage-Reset": next_month.isoformat(),
-                        "Retry-After": str(int((next_month - now).total_seconds()))
                     }
-                )
-            
-            # Process the request
-            response = await call_next(request)
-            
+                },
+                headers={
+                    "X-Lumen-Usage-Limit": str(limit),
+                    "X-Lumen-Usage-Used": str(current_count),
+                    "X-Lumen-Usage-Reset": next_month.isoformat(),
+                    "Retry-After": str(int((next_month - now).total_seconds()))
+                }
+            )
+            await response(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["usage_remaining"] = limit - current_count
+
+        async def send_with_usage(message: Message) -> None:
             # If request was successful (2xx), increment usage
-            if 200 <= response.status_code < 300:
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
                 try:
-                    if usage_result.data:
-                        # Update existing record
-                        supabase.from_("api_usage").update({
-                            "evaluations_count": current_count + 1,
-                            "last_evaluation_at": now.isoformat()
-                        }).eq("id", usage_record["id"]).execute()
-                    else:
-                        # Create new record
-                        supabase.from_("api_usage").insert({
-                            "org_id": org_id,
-                            "period_start": month_start.isoformat(),
-                            "evaluations_count": 1,
-                            "last_evaluation_at": now.isoformat()
-                        }).execute()
-                    
+                    units = state.get("usage_units", 1)
+                    new_count = counter.add(org_id, period_start, units, now) if units else current_count
+
                     # Add usage headers to response
-                    new_count = current_count + 1
                     percent_used = (new_count / limit) * 100
-                    
-                    response.headers["X-Lumen-Usage-Limit"] = str(limit)
-                    response.headers["X-Lumen-Usage-Used"] = str(new_count)
-                    response.headers["X-Lumen-Usage-Remaining"] = str(limit - new_count)
-                    response.headers["X-Lumen-Usage-Percent"] = f"{percent_used:.1f}"
-                    
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Lumen-Usage-Limit"] = str(limit)
+                    headers["X-Lumen-Usage-Used"] = str(new_count)
+                    headers["X-Lumen-Usage-Remaining"] = str(limit - new_count)
+                    headers["X-Lumen-Usage-Percent"] = f"{percent_used:.1f}"
+
                     # Warning at 80%
                     if percent_used >= 80:
-                        if now.month == 12:
-                            next_month = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-                        else:
-                            next_month = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
-                        
-                        response.headers["X-Lumen-Usage-Warning"] = (
+                        headers["X-Lumen-Usage-Warning"] = (
                             f"Approaching limit. {limit - new_count} evaluations remaining. "
-                            f"Resets {next_month.strftime('%Y-%m-%d')}."
+                            f"Resets {_next_month(now).strftime('%Y-%m-%d')}."
                         )
-                    
                 except Exception as e:
                     logger.error(f"Failed to update usage tracking: {e}")
                     # Don't fail the request for tracking errors
-                    
-            return response
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Usage tracking middleware error: {e}")
-            # Don't fail requests for middleware errors
-            return await call_next(request)
\ No newline at end of file
+            await send(message)
+
+        await self.app(scope, receive, send_with_usage)
@@ -0,0 +1,434 @@
+"""
+Write-behind monthly usage counter for LUMEN SDK API.
+
+Evaluations are counted in memory per (org_id, period_start) and flushed
+to the database as atomic increments, so the request path never does a
+read-modify-write on api_usage. Quota checks read the locally cached
+total: the committed count returned by the last flush plus increments
+not yet flushed.
+
+Every increment is appended to a journal before it is counted. Each
+process writes its own file in USAGE_JOURNAL_DIR, named when it first
+uses the counter, and holds an exclusive
+flock on it while it lives, so workers sharing the directory never rewrite
+each other's entries. On startup a counter takes over the journals whose
+lock is free (their process has exited), so a crash between flushes does
+not lose increments. Delivery is at-least-once: a crash after a flush
+commits but before the journal is compacted can re-apply that flush's
+deltas.
+
+Committed totals of past billing periods are dropped once their deltas
+have been flushed, so the cache holds about one entry per active
+organization rather than one per organization per month.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import fcntl
+import itertools
+import json
+import os
+import re
+import tempfile
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import logging
+from db.repository import get_repository
+
+logger = logging.getLogger(__name__)
+
+# Counter configuration - override via environment
+USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv("USAGE_FLUSH_INTERVAL_SECONDS", "2"))
+USAGE_COUNTER_SHARDS = int(os.getenv("USAGE_COUNTER_SHARDS", "16"))
+# Directory of per-process journals, not allowed under the temporary
+# directory (journals are replayed as billed usage). Empty disables journaling
+USAGE_JOURNAL_DIR = os.getenv("USAGE_JOURNAL_DIR", "")
+
+UsageKey = Tuple[str, str]
+
+_JOURNAL_NAME = re.compile(r"usage-\d+-\d+\.journal$")
+_instances = itertools.count()
+
+
+def billing_period_start(now: datetime) -> str:
+    """Start of the billing period containing ``now`` (ISO 8601)."""
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+
+def _valid_entry(entry) -> bool:
+    """Whether a journal entry is an increment this counter could have written."""
+    return (
+        isinstance(entry, dict)
+        and all(isinstance(entry.get(field), str) for field in ("org_id", "period_start", "at"))
+        and type(entry.get("count")) is int
+        and entry["count"] > 0
+    )
+
+
+class _Shard:
+    """Pending deltas for a subset of (org_id, period_start) keys."""
+
+    __slots__ = ("deltas", "last_at")
+
+    def __init__(self):
+        self.deltas: Dict[UsageKey, int] = {}
+        self.last_at: Dict[UsageKey, str] = {}
+
+
+class UsageCounter:
+    """
+    Sharded in-process usage counter with write-behind aggregation.
+
+    Flushing swaps out one shard at a time, so increments arriving during a
+    flush land in a fresh shard and are never blocked or lost.
+    """
+
+    def __init__(
+        self,
+        shards: int = USAGE_COUNTER_SHARDS,
+        flush_interval: float = USAGE_FLUSH_INTERVAL_SECONDS,
+        journal_dir: Optional[str] = USAGE_JOURNAL_DIR or None,
+    ):
+        self.flush_interval = flush_interval
+        self.journal_dir = journal_dir
+        # Named by the process that writes it (see _bind_journal)
+        self.journal_path: Optional[str] = None
+        self._journal_pid: Optional[int] = None
+        self._shards: List[_Shard] = [_Shard() for _ in range(max(1, shards))]
+        # Committed totals as last returned by the database
+        self._committed: Dict[UsageKey, int] = {}
+        # Deltas taken out of a shard by a flush that has not finished yet
+        self._in_flight: Dict[UsageKey, int] = {}
+        # Billing period of the last eviction pass, and whether it had to
+        # keep past-period totals that still had deltas to flush
+        self._period: Optional[str] = None
+        self._past_pending = False
+        self._journal = None
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self.flushes = 0
+        self.increments_flushed = 0
+
+    def _shard_for(self, key: UsageKey) -> _Shard:
+        return self._shards[zlib.crc32(f"{key[0]}|{key[1]}".encode("utf-8")) % len(self._shards)]
+
+    def _pending(self, key: UsageKey) -> int:
+        return self._shard_for(key).deltas.get(key, 0) + self._in_flight.get(key, 0)
+
+    async def current(self, org_id: str, period_start: str) -> int:
+        """
+        Current usage for an organization and period.
+
+        Loads the committed count from the database the first time a key is
+        seen by this worker; afterwards no database access is needed.
+        """
+        key = (org_id, period_start)
+        if key not in self._committed:
+            usage = await get_repository().get_usage(org_id, period_start)
+            # A flush may have set a newer total while we were waiting
+            self._committed.setdefault(key, usage["evaluations_count"] if usage else 0)
+        return self._committed[key] + self._pending(key)
+
+    def add(self, org_id: str, period_start: str, count: int = 1, at: Optional[datetime] = None) -> int:
+        """
+        Record evaluations.
+
+        Args:
+            org_id: Organization id
+            period_start: Billing period start (ISO 8601)
+            count: Number of evaluations to add
+            at: Evaluation time (defaults to now)
+
+        Returns:
+            int: Locally known usage after this increment
+        """
+        key = (org_id, period_start)
+        at_iso = (at or datetime.now(timezone.utc)).isoformat()
+        self._journal_append({"org_id": org_id, "period_start": period_start, "count": count, "at": at_iso})
+
+        shard = self._shard_for(key)
+        shard.deltas[key] = shard.deltas.get(key, 0) + count
+        if at_iso > shard.last_at.get(key, ""):
+            shard.last_at[key] = at_iso
+        return self._committed.get(key, 0) + self._pending(key)
+
+    async def flush(self) -> int:
+        """
+        Push pending deltas to the database as atomic increments.
+
+        Returns:
+            int: Number of evaluations flushed
+        """
+        async with self._flush_lock:
+            return await self._flush()
+
+    async def _flush(self) -> int:
+        if self.journal_dir:
+            self._bind_journal()
+        flushed = 0
+        repository = get_repository()
+        for index, shard in enumerate(self._shards):
+            if not shard.deltas:
+                continue
+            self._shards[index] = _Shard()
+            for key, delta in shard.deltas.items():
+                self._in_flight[key] = self._in_flight.get(key, 0) + delta
+
+            for key, delta in shard.deltas.items():
+                try:
+                    # The returned total includes this delta and every other
+                    # worker's flushed increments
+                    self._committed[key] = await repository.increment_usage(
+                        key[0], key[1], delta, shard.last_at[key]
+                    )
+                    flushed += delta
+                except Exception as e:
+                    logger.error(f"Failed to flush usage for org {key[0]}: {e}")
+                    # Put the delta back into the live shard for the next flush
+                    live = self._shards[index]
+                    live.deltas[key] = live.deltas.get(key, 0) + delta
+                    if shard.last_at[key] > live.last_at.get(key, ""):
+                        live.last_at[key] = shard.last_at[key]
+                finally:
+                    remaining = self._in_flight.get(key, 0) - delta
+                    if remaining > 0:
+                        self._in_flight[key] = remaining
+                    else:
+                        self._in_flight.pop(key, None)
+
+        if flushed:
+            self._compact_journal()
+        self._evict_past_periods(datetime.now(timezone.utc))
+        self.flushes += 1
+        self.increments_flushed += flushed
+        return flushed
+
+    def _evict_past_periods(self, now: datetime) -> int:
+        """
+        Drop committed totals of billing periods before the one containing ``now``.
+
+        Totals with deltas still to flush are kept until a later flush. The
+        scan only runs when the period has changed or such totals remain.
+
+        Returns:
+            int: Number of totals dropped
+        """
+        period = billing_period_start(now)
+        if period == self._period and not self._past_pending:
+            return 0
+        self._period = period
+        self._past_pending = False
+        evicted = 0
+        for key in [key for key in self._committed if key[1] < period]:
+            if self._pending(key):
+                self._past_pending = True
+                continue
+            del self._committed[key]
+            evicted += 1
+        return evicted
+
+    async def run(self) -> None:
+        """Background loop: flush every flush_interval seconds."""
+        while not self._stopping:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Usage counter flush error: {e}")
+
+    async def stop(self) -> None:
+        """Stop the background loop and flush remaining deltas."""
+        self._stopping = True
+        await self.flush()
+        if self.journal_dir:
+            self._bind_journal()
+        if self._journal is not None:
+            # Nothing left to recover: don't leave a file per worker behind
+            if not self.stats()["pending"]:
+                os.remove(self.journal_path)
+            self._journal.close()
+            self._journal = None
+
+    # --- Journal ------------------------------------------------------------
+
+    def recover(self) -> int:
+        """
+        Take over the journals of exited processes into the pending shards.
+
+        A journal whose flock can be taken belongs to no live counter. Its
+        entries are rewritten into this counter's journal before the file
+        is removed.
+
+        Returns:
+            int: Number of evaluations recovered
+        """
+        if not self.journal_dir:
+            return 0
+        self._bind_journal()
+        if not os.path.isdir(self.journal_dir):
+            return 0
+
+        recovered = 0
+        orphans = []
+        try:
+            for name in sorted(os.listdir(self.journal_dir)):
+                path = os.path.join(self.journal_dir, name)
+                # A restarted container can reuse a dead process's pid, and
+                # with it the name of this counter's journal
+                if not _JOURNAL_NAME.match(name) or (path == self.journal_path and self._journal is not None):
+                    continue
+                journal = self._lock_orphan(path)
+                if journal is None:
+                    continue
+                orphans.append((path, journal))
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn final line from a crash mid-write
+                        continue
+                    if not _valid_entry(entry):
+                        logger.warning(f"Skipping malformed usage journal entry in {name}")
+                        continue
+                    key = (entry["org_id"], entry["period_start"])
+                    shard = self._shard_for(key)
+                    shard.deltas[key] = shard.deltas.get(key, 0) + entry["count"]
+                    if entry["at"] > shard.last_at.get(key, ""):
+                        shard.last_at[key] = entry["at"]
+                    recovered += entry["count"]
+            if orphans:
+                self._compact_journal()
+                for path, _ in orphans:
+                    if path != self.journal_path:
+                        os.remove(path)
+        finally:
+            for _, journal in orphans:
+                journal.close()
+
+        if recovered:
+            logger.info(f"Recovered {recovered} unflushed evaluations from {len(orphans)} usage journal(s)")
+        return recovered
+
+    @staticmethod
+    def _lock_orphan(path: str):
+        """Open and lock another counter's journal, or None if it is live or gone."""
+        try:
+            journal = open(path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # Another recovering worker may have taken it over and removed it
+            # between our open() and flock()
+            if os.fstat(journal.fileno()).st_ino != os.stat(path).st_ino:
+                raise FileNotFoundError(path)
+        except (BlockingIOError, FileNotFoundError):
+            journal.close()
+            return None
+        return journal
+
+    def _bind_journal(self) -> None:
+        """
+        Name the calling process's journal, once per process.
+
+        The global counter is created at import, before a preloading server
+        forks its workers, so each worker names its journal when it first
+        uses the counter (recover() at startup). After a fork the inherited
+        journal handle and pending deltas are the parent's and are left to it.
+        """
+        pid = os.getpid()
+        if self._journal_pid == pid:
+            return
+        if self._journal_pid is not None:
+            self._shards = [_Shard() for _ in self._shards]
+            self._in_flight = {}
+        self._journal_pid = pid
+        self.journal_path = os.path.join(self.journal_dir, f"usage-{pid}-{next(_instances)}.journal")
+        self._journal = None
+
+    def _journal_append(self, entry: dict) -> None:
+        if not self.journal_dir:
+            return
+        self._bind_journal()
+        if self._journal is None:
+            self._compact_journal()
+        # Flushed to the OS on every write: survives a process crash
+        self._journal.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._journal.flush()
+
+    def _compact_journal(self) -> None:
+        """
+        Rewrite this counter's journal to hold only deltas still pending.
+
+        The new file is locked before it replaces the old one, so recovery
+        in another worker never sees this journal unlocked.
+        """
+        if not self.journal_dir:
+            return
+        self._bind_journal()
+        os.makedirs(self.journal_dir, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.journal_path}.tmp"
+        tmp = open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8")
+        fcntl.flock(tmp.fileno(), fcntl.LOCK_EX)
+        for shard in self._shards:
+            for key, delta in shard.deltas.items():
+                tmp.write(json.dumps({
+                    "org_id": key[0],
+                    "period_start": key[1],
+                    "count": delta,
+                    "at": shard.last_at[key],
+                }, separators=(",", ":")) + "\n")
+        tmp.flush()
+        os.fsync(tmp.fileno())
+        os.replace(tmp_path, self.journal_path)
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = tmp
+
+    def stats(self) -> dict:
+        """Return pending and flush counters."""
+        return {
+            "pending": sum(sum(shard.deltas.values()) for shard in self._shards),
+            "in_flight": sum(self._in_flight.values()),
+            "tracked_periods": len(self._committed),
+            "flushes": self.flushes,
+            "increments_flushed": self.increments_flushed,
+        }
+
+
+def create_usage_counter(journal_dir: str = USAGE_JOURNAL_DIR) -> UsageCounter:
+    """
+    Create the process-wide usage counter.
+
+    Args:
+        journal_dir: Directory of per-process journals; empty disables journaling
+
+    Returns:
+        UsageCounter: The counter (journals are opened lazily)
+
+    Raises:
+        ValueError: If journal_dir is in the temporary directory
+    """
+    if journal_dir:
+        # Anyone can create a directory there first and plant journals
+        tmp = os.path.realpath(tempfile.gettempdir())
+        if os.path.commonpath([os.path.realpath(journal_dir), tmp]) == tmp:
+            raise ValueError(f"USAGE_JOURNAL_DIR must not be in the temporary directory ({tmp})")
+    return UsageCounter(journal_dir=journal_dir or None)
+
+
+# Global counter instance
+_usage_counter = create_usage_counter()
+
+
+def set_usage_counter(counter: UsageCounter) -> None:
+    """Replace the process-wide usage counter (used by tests)."""
+    global _usage_counter
+    _usage_counter = counter
+
+
+def get_usage_counter() -> UsageCounter:
+    """Get the process-wide usage counter."""
+    return _usage_counter
@@ -4,11 +4,14 @@ Copyright 2026 Forge Partners Inc.
 """
 
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+# Longest ai_output accepted (characters); it is scanned on every evaluation
+AI_OUTPUT_MAX_LENGTH = 100_000
+
 
 class HumanAction(str, Enum):
     """Human action taken on AI output."""
@@ -26,10 +29,10 @@ class Verdict(str, Enum):
 
 class EvaluateRequest(BaseModel):
     """Request body for /v1/evaluate endpoint."""
-    ai_output: str = Field(..., description="The AI-generated output to evaluate")
+    ai_output: str = Field(..., max_length=AI_OUTPUT_MAX_LENGTH, description="The AI-generated output to evaluate")
     context: dict[str, Any] = Field(default_factory=dict, description="Additional context for evaluation")
     human_action: HumanAction = Field(..., description="Action taken by human on the AI output")
-    compliance_packs: list[str] = Field(default_factory=list, description="Compliance packs to evaluate against (e.g., 'phipa', 'hipaa')")
+    compliance_packs: list[str] = Field(default_factory=list, description="Enabled compliance packs to evaluate against (e.g., 'ca-on-phipa'); empty for all enabled packs")
 
     model_config = {
         "json_schema_extra": {
@@ -37,12 +40,37 @@ class EvaluateRequest(BaseModel):
                 "ai_output": "Patient John Doe has diabetes and takes metformin.",
                 "context": {"session_id": "abc123", "user_role": "physician"},
                 "human_action": "accepted",
-                "compliance_packs": ["phipa"]
+                "compliance_packs": ["ca-on-phipa"]
             }
         }
     }
 
 
+class IdentifierMatch(BaseModel):
+    """Identifier found in the AI output."""
+    start: int = Field(..., ge=0, description="Start offset in ai_output")
+    end: int = Field(..., ge=0, description="End offset in ai_output (exclusive)")
+    pattern: str = Field(..., description="Identifier pattern that matched")
+
+
+class CheckEvaluation(BaseModel):
+    """Outcome of one compliance check."""
+    check_id: str = Field(..., description="Check identifier")
+    name: str = Field(..., description="Check name")
+    severity: str = Field(..., description="Severity level")
+    passed: bool = Field(..., description="Whether the check passed")
+    reason: str = Field(..., description="Why the check passed or failed")
+    matches: list[IdentifierMatch] = Field(default_factory=list, description="Identifiers in ai_output read by the check")
+
+
+class PackEvaluation(BaseModel):
+    """Outcomes of every check of one compliance pack."""
+    pack_id: str = Field(..., description="Policy pack identifier")
+    version: str = Field(..., description="Pack version")
+    passed: bool = Field(..., description="Whether every check passed")
+    checks: list[CheckEvaluation] = Field(..., description="Check outcomes, in pack order")
+
+
 class EvaluateResponse(BaseModel):
     """Response body for /v1/evaluate endpoint."""
     record_id: UUID = Field(..., description="Unique identifier for this evaluation record")
@@ -51,6 +79,10 @@ class EvaluateResponse(BaseModel):
     verdict: Verdict = Field(..., description="Evaluation verdict")
     citation_integrity: float = Field(..., ge=0, le=1, description="Citation integrity score (0-1)")
     defensible_record_url: str = Field(..., description="URL to access the defensible record")
+    compliance: list[PackEvaluation] = Field(
+        default_factory=list,
+        description="Results of the organization's enabled packs (limited to compliance_packs when given)"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -60,7 +92,108 @@ class EvaluateResponse(BaseModel):
                 "tier": 1,
                 "verdict": "ALLOW",
                 "citation_integrity": 0.95,
-                "defensible_record_url": "https://lumen.forge.health/records/550e8400-e29b-41d4-a716-446655440000"
+                "defensible_record_url": "https://lumen.forge.health/records/550e8400-e29b-41d4-a716-446655440000",
+                "compliance": [
+                    {
+                        "pack_id": "ca-on-phipa",
+                        "version": "v2026-Q1-r3",
+                        "passed": True,
+                        "checks": [
+                            {
+                                "check_id": "phipa-001",
+                                "name": "Consent Verification",
+                                "severity": "critical",
+                                "passed": True,
+                                "reason": "Deemed consent applies for healthcare provision under s.20",
+                                "matches": []
+                            }
+                        ]
+                    }
+                ]
+            }
+        }
+    }
+
+
+class BatchEvaluateRequest(BaseModel):
+    """Request body for /v1/evaluate/batch endpoint."""
+    items: list[dict[str, Any]] = Field(
+        ..., min_length=1,
+        description="Evaluation requests, each validated as an /v1/evaluate body; invalid items fail individually"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [
+                    {"ai_output": "Take 500mg twice daily.", "human_action": "accepted", "compliance_packs": ["ca-on-phipa"]},
+                    {"ai_output": "Refer to cardiology.", "human_action": "modified"}
+                ]
+            }
+        }
+    }
+
+
+class BatchItemError(BaseModel):
+    """Why one batch item was not evaluated."""
+    status_code: int = Field(..., description="HTTP status the item would have received from /v1/evaluate")
+    message: str = Field(..., description="Error message")
+    details: Optional[Any] = Field(None, description="Additional error details (e.g. validation errors)")
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one batch item."""
+    index: int = Field(..., ge=0, description="Position of the item in the request")
+    status: Literal["ok", "error"] = Field(..., description="Whether the item was evaluated")
+    result: Optional[EvaluateResponse] = Field(None, description="Evaluation result when status is ok")
+    error: Optional[BatchItemError] = Field(None, description="Failure reason when status is error")
+
+
+class BatchEvaluateResponse(BaseModel):
+    """Response body for /v1/evaluate/batch endpoint."""
+    results: list[BatchItemResult] = Field(..., description="One result per item, in request order")
+    succeeded: int = Field(..., ge=0, description="Number of items evaluated (and counted as usage)")
+    failed: int = Field(..., ge=0, description="Number of items that failed")
+
+
+class EvaluationMode(str, Enum):
+    """How /v1/evaluate runs an evaluation."""
+    SYNC = "sync"
+    ASYNC = "async"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of an asynchronous evaluation job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobResponse(BaseModel):
+    """Response body for /v1/evaluate?mode=async and /v1/jobs/{id}; also the callback body."""
+    job_id: UUID = Field(..., description="Unique identifier for this job")
+    status: JobStatus = Field(..., description="Job status")
+    record_id: UUID = Field(..., description="Identifier the evaluation record will have")
+    defensible_record_url: str = Field(..., description="URL of the defensible record once the job succeeds")
+    created_at: str = Field(..., description="Enqueue timestamp")
+    started_at: Optional[str] = Field(None, description="Timestamp the job started running")
+    finished_at: Optional[str] = Field(None, description="Timestamp the job finished")
+    result: Optional[EvaluateResponse] = Field(None, description="Evaluation result when status is succeeded")
+    error: Optional[str] = Field(None, description="Failure reason when status is failed")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "job_id": "9b2f6f0e-4a8e-4b8e-9a57-0d1c1f6f2a10",
+                "status": "queued",
+                "record_id": "550e8400-e29b-41d4-a716-446655440000",
+                "defensible_record_url": "https://lumen.forge.health/records/550e8400-e29b-41d4-a716-446655440000",
+                "created_at": "2026-02-13T15:30:00+00:00",
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None
             }
         }
     }
@@ -78,6 +211,13 @@ class RecordResponse(BaseModel):
     citation_integrity: float
     created_at: str
     context: dict[str, Any] = Field(default_factory=dict)
+    compliance: list[PackEvaluation] = Field(default_factory=list)
+
+
+class RecordListResponse(BaseModel):
+    """Response body for /v1/records (one page)."""
+    records: list[RecordResponse] = Field(..., description="Records, newest first")
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to get the next page; null on the last page")
 
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,36 @@
+"""
+Defensible evaluation records for LUMEN SDK API.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from .store import (
+    EvaluationRecord,
+    MemoryRecordStore,
+    Position,
+    RecordQuery,
+    RecordStore,
+    SQLiteRecordStore,
+    create_record_store,
+    get_record_store,
+    init_record_store,
+    set_record_store,
+)
+from .writer import RecordWriter, create_record_writer, get_record_writer, set_record_writer
+
+__all__ = [
+    "EvaluationRecord",
+    "MemoryRecordStore",
+    "Position",
+    "RecordQuery",
+    "RecordStore",
+    "RecordWriter",
+    "SQLiteRecordStore",
+    "create_record_store",
+    "create_record_writer",
+    "get_record_store",
+    "get_record_writer",
+    "init_record_store",
+    "set_record_store",
+    "set_record_writer",
+]
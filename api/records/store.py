@@ -0,0 +1,486 @@
+"""
+Defensible record stores for LUMEN SDK API.
+
+Every evaluation (sync, batch, stream or async job) produces a record that
+GET /v1/records serves back to the organization that created it. Routes
+talk to a RecordStore. Backends:
+
+- memory: records in this process (tests, local development)
+- sqlite: records in a SQLite database in WAL mode, shared by every worker
+  on the host; records survive a restart. Records hold AI output and
+  context (possibly PHI), so the database path must be configured
+  explicitly and the file is created readable by its owner only
+
+Records are immutable: writing a record_id that already exists keeps the
+first write. Every read is scoped to an organization, and a record of
+another organization is reported as missing.
+
+Lists are keyset-paginated: records are ordered newest first by
+(created_at, record_id), and a page starts strictly after the position of
+the last record of the previous page. Every filter (verdict, tier, pack,
+time range) is served from an index ordered the same way, so reaching a
+page costs a seek however deep it is, and records inserted meanwhile do
+not shift later pages.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Backend selection - override via environment
+RECORD_STORE_BACKEND = os.getenv("RECORD_STORE_BACKEND", "sqlite")
+
+# SQLite backend (required when it is selected)
+RECORD_STORE_SQLITE_PATH = os.getenv("RECORD_STORE_SQLITE_PATH", "")
+
+# A position in list order: (created_at, record_id)
+Position = Tuple[float, str]
+
+
+class EvaluationRecord:
+    """A stored evaluation and its outcome."""
+
+    __slots__ = (
+        "record_id", "org_id", "created_at", "lumen_score", "tier", "verdict", "citation_integrity",
+        "human_action", "compliance_packs", "ai_output", "context", "compliance",
+    )
+
+    def __init__(
+        self,
+        record_id: str,
+        org_id: str,
+        created_at: float,
+        lumen_score: int,
+        tier: int,
+        verdict: str,
+        citation_integrity: float,
+        human_action: str,
+        compliance_packs: List[str],
+        ai_output: str,
+        context: Dict[str, Any],
+        compliance: List[Dict[str, Any]],
+    ):
+        self.record_id = record_id
+        self.org_id = org_id
+        self.created_at = created_at
+        self.lumen_score = lumen_score
+        self.tier = tier
+        self.verdict = verdict
+        self.citation_integrity = citation_integrity
+        self.human_action = human_action
+        self.compliance_packs = compliance_packs
+        self.ai_output = ai_output
+        self.context = context
+        # PackEvaluation dicts, as returned by /v1/evaluate
+        self.compliance = compliance
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Client-facing view of the record (GET /v1/records)."""
+        return {
+            "record_id": self.record_id,
+            "ai_output": self.ai_output,
+            "human_action": self.human_action,
+            "compliance_packs": self.compliance_packs,
+            "lumen_score": self.lumen_score,
+            "tier": self.tier,
+            "verdict": self.verdict,
+            "citation_integrity": self.citation_integrity,
+            "created_at": datetime.fromtimestamp(self.created_at, timezone.utc).isoformat(),
+            "context": self.context,
+            "compliance": self.compliance,
+        }
+
+    @property
+    def position(self) -> Position:
+        """Where the record sorts in list order."""
+        return (self.created_at, self.record_id)
+
+    @property
+    def pack_ids(self) -> Tuple[str, ...]:
+        """Packs the record was evaluated against."""
+        return tuple(pack["pack_id"] for pack in self.compliance)
+
+
+class RecordQuery:
+    """Filters for listing records; None matches everything."""
+
+    __slots__ = ("verdict", "tier", "pack_id", "created_after", "created_before")
+
+    def __init__(
+        self,
+        verdict: Optional[str] = None,
+        tier: Optional[int] = None,
+        pack_id: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+    ):
+        self.verdict = verdict
+        self.tier = tier
+        self.pack_id = pack_id
+        # Time range: created_after <= created_at < created_before
+        self.created_after = created_after
+        self.created_before = created_before
+
+    def matches(self, record: EvaluationRecord) -> bool:
+        """Whether a record passes every filter."""
+        return (
+            (self.verdict is None or record.verdict == self.verdict)
+            and (self.tier is None or record.tier == self.tier)
+            and (self.pack_id is None or self.pack_id in record.pack_ids)
+            and (self.created_after is None or record.created_at >= self.created_after)
+            and (self.created_before is None or record.created_at < self.created_before)
+        )
+
+
+class RecordStore(ABC):
+    """Storage of defensible evaluation records."""
+
+    @abstractmethod
+    async def put_many(self, records: Iterable[EvaluationRecord]) -> None:
+        """Store records; record_ids already stored are left unchanged."""
+
+    async def put(self, record: EvaluationRecord) -> None:
+        """Store one record."""
+        await self.put_many([record])
+
+    @abstractmethod
+    async def get(self, org_id: str, record_id: str) -> Optional[EvaluationRecord]:
+        """Look up an organization's record."""
+
+    @abstractmethod
+    async def list(
+        self,
+        org_id: str,
+        limit: int,
+        query: Optional[RecordQuery] = None,
+        after: Optional[Position] = None,
+    ) -> List[EvaluationRecord]:
+        """
+        List an organization's records, newest first.
+
+        Args:
+            org_id: Organization ID
+            limit: Most records to return
+            query: Filters; None for every record
+            after: Position of the last record of the previous page; only
+                records sorting after it (older) are returned
+
+        Returns:
+            list: Up to ``limit`` records
+        """
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryRecordStore(RecordStore):
+    """
+    In-process record store.
+
+    Positions are kept in sorted lists per organization, and per
+    organization and verdict, tier or pack. A page bisects the smallest
+    list its filters allow to the cursor and time range, then walks back
+    from there.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, EvaluationRecord] = {}
+        # (org_id,) or (org_id, filter, value) -> sorted positions
+        self._indexes: Dict[tuple, List[Position]] = {}
+
+    @staticmethod
+    def _index_keys(record: EvaluationRecord) -> List[tuple]:
+        org_id = record.org_id
+        keys = [(org_id,), (org_id, "verdict", record.verdict), (org_id, "tier", record.tier)]
+        keys.extend((org_id, "pack", pack_id) for pack_id in record.pack_ids)
+        return keys
+
+    async def put_many(self, records: Iterable[EvaluationRecord]) -> None:
+        for record in records:
+            if record.record_id in self._records:
+                continue
+            self._records[record.record_id] = record
+            for key in self._index_keys(record):
+                bisect.insort(self._indexes.setdefault(key, []), record.position)
+
+    async def get(self, org_id: str, record_id: str) -> Optional[EvaluationRecord]:
+        record = self._records.get(record_id)
+        if record is None or record.org_id != org_id:
+            return None
+        return record
+
+    async def list(
+        self,
+        org_id: str,
+        limit: int,
+        query: Optional[RecordQuery] = None,
+        after: Optional[Position] = None,
+    ) -> List[EvaluationRecord]:
+        query = query or RecordQuery()
+        keys = [(org_id,)]
+        if query.verdict is not None:
+            keys.append((org_id, "verdict", query.verdict))
+        if query.tier is not None:
+            keys.append((org_id, "tier", query.tier))
+        if query.pack_id is not None:
+            keys.append((org_id, "pack", query.pack_id))
+        positions = min((self._indexes.get(key, []) for key in keys), key=len)
+
+        # "" sorts before every record_id, so (t, "") bounds created_at at t
+        end = len(positions)
+        if after is not None:
+            end = bisect.bisect_left(positions, after, 0, end)
+        if query.created_before is not None:
+            end = bisect.bisect_left(positions, (query.created_before, ""), 0, end)
+        start = 0
+        if query.created_after is not None:
+            start = bisect.bisect_left(positions, (query.created_after, ""), 0, end)
+
+        page: List[EvaluationRecord] = []
+        for index in range(end - 1, start - 1, -1):
+            record = self._records[positions[index][1]]
+            if query.matches(record):
+                page.append(record)
+                if len(page) == limit:
+                    break
+        return page
+
+
+class SQLiteRecordStore(RecordStore):
+    """
+    Record store in a SQLite database shared by local workers.
+
+    record_id is the primary key, and (org_id, created_at, record_id) is
+    indexed alone and after verdict and tier. Each record's packs are
+    rows of record_packs, keyed (org_id, pack_id, created_at, record_id).
+    A lookup is one index probe, and a page seeks its index to the cursor
+    and reads only the entries and rows it returns. Calls run on a worker
+    thread so the event loop never blocks on the database.
+    """
+
+    _COLUMNS = (
+        "record_id, org_id, created_at, lumen_score, tier, verdict, citation_integrity, "
+        "human_action, compliance_packs, ai_output, context, compliance"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Owner-only; SQLite gives the -wal and -shm files the same mode
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "record_id TEXT PRIMARY KEY, org_id TEXT NOT NULL, created_at REAL NOT NULL, "
+                "lumen_score INTEGER NOT NULL, tier INTEGER NOT NULL, verdict TEXT NOT NULL, "
+                "citation_integrity REAL NOT NULL, human_action TEXT NOT NULL, compliance_packs TEXT NOT NULL, "
+                "ai_output TEXT NOT NULL, context TEXT NOT NULL, compliance TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS records_org_created ON records (org_id, created_at, record_id)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS records_org_verdict ON records (org_id, verdict, created_at, record_id)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS records_org_tier ON records (org_id, tier, created_at, record_id)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS record_packs ("
+                "org_id TEXT NOT NULL, pack_id TEXT NOT NULL, created_at REAL NOT NULL, record_id TEXT NOT NULL, "
+                "PRIMARY KEY (org_id, pack_id, created_at, record_id)) WITHOUT ROWID"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _record(row: tuple) -> EvaluationRecord:
+        (record_id, org_id, created_at, lumen_score, tier, verdict, citation_integrity,
+         human_action, compliance_packs, ai_output, context, compliance) = row
+        return EvaluationRecord(
+            record_id, org_id, created_at, lumen_score, tier, verdict, citation_integrity, human_action,
+            json.loads(compliance_packs), ai_output, json.loads(context), json.loads(compliance),
+        )
+
+    @staticmethod
+    def _row(record: EvaluationRecord) -> tuple:
+        return (
+            record.record_id, record.org_id, record.created_at, record.lumen_score, record.tier, record.verdict,
+            record.citation_integrity, record.human_action, json.dumps(record.compliance_packs),
+            record.ai_output, json.dumps(record.context), json.dumps(record.compliance),
+        )
+
+    def _insert(self, records: List[EvaluationRecord]) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record in records:
+                    inserted = conn.execute(
+                        f"INSERT OR IGNORE INTO records ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        self._row(record)
+                    ).rowcount
+                    if inserted:
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO record_packs (org_id, pack_id, created_at, record_id) "
+                            "VALUES (?, ?, ?, ?)",
+                            [(record.org_id, pack_id, record.created_at, record.record_id)
+                             for pack_id in record.pack_ids]
+                        )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _read(self, query: str, *args) -> List[tuple]:
+        with self._lock:
+            return self._connect().execute(query, args).fetchall()
+
+    async def put_many(self, records: Iterable[EvaluationRecord]) -> None:
+        records = [*records]
+        if records:
+            await asyncio.to_thread(self._insert, records)
+
+    async def get(self, org_id: str, record_id: str) -> Optional[EvaluationRecord]:
+        rows = await asyncio.to_thread(
+            self._read, f"SELECT {self._COLUMNS} FROM records WHERE record_id = ? AND org_id = ?", record_id, org_id
+        )
+        return self._record(rows[0]) if rows else None
+
+    @classmethod
+    def _list_query(cls, org_id: str, limit: int, query: RecordQuery, after: Optional[Position]) -> Tuple[str, list]:
+        """Build the page query: filters on the columns of the index it should seek."""
+        if query.pack_id is not None:
+            # Walk the pack's index entries, then fetch each record by key
+            source = "record_packs AS i JOIN records AS r ON r.record_id = i.record_id"
+            order = "i"
+            conditions = ["i.org_id = ?", "i.pack_id = ?"]
+            args: list = [org_id, query.pack_id]
+        else:
+            # Without statistics SQLite may prefer a created_at range on the
+            # organization index over an equality filter, so name the index
+            if query.verdict is not None:
+                index = "records_org_verdict"
+            elif query.tier is not None:
+                index = "records_org_tier"
+            else:
+                index = "records_org_created"
+            source = f"records AS r INDEXED BY {index}"
+            order = "r"
+            conditions = ["r.org_id = ?"]
+            args = [org_id]
+        if query.verdict is not None:
+            conditions.append("r.verdict = ?")
+            args.append(query.verdict)
+        if query.tier is not None:
+            conditions.append("r.tier = ?")
+            args.append(query.tier)
+        if query.created_after is not None:
+            conditions.append(f"{order}.created_at >= ?")
+            args.append(query.created_after)
+        if query.created_before is not None:
+            conditions.append(f"{order}.created_at < ?")
+            args.append(query.created_before)
+        if after is not None:
+            conditions.append(f"({order}.created_at, {order}.record_id) < (?, ?)")
+            args.extend(after)
+        columns = ", ".join(f"r.{column.strip()}" for column in cls._COLUMNS.split(","))
+        sql = (
+            f"SELECT {columns} FROM {source} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {order}.created_at DESC, {order}.record_id DESC LIMIT ?"
+        )
+        return sql, args + [limit]
+
+    async def list(
+        self,
+        org_id: str,
+        limit: int,
+        query: Optional[RecordQuery] = None,
+        after: Optional[Position] = None,
+    ) -> List[EvaluationRecord]:
+        sql, args = self._list_query(org_id, limit, query or RecordQuery(), after)
+        rows = await asyncio.to_thread(self._read, sql, *args)
+        return [self._record(row) for row in rows]
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_record_store(backend: str = RECORD_STORE_BACKEND, path: str = RECORD_STORE_SQLITE_PATH) -> RecordStore:
+    """
+    Create the configured record store backend.
+
+    Args:
+        backend: 'memory' or 'sqlite'
+        path: SQLite database file (sqlite backend)
+
+    Returns:
+        RecordStore: The backend (connections are opened lazily)
+
+    Raises:
+        ValueError: If the backend name is unknown, its configuration is
+            missing, or the sqlite path is in the temporary directory
+    """
+    if backend == "memory":
+        return MemoryRecordStore()
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("RECORD_STORE_SQLITE_PATH must be set for the sqlite record store")
+        # Records hold PHI: keep them out of shared, world-writable directories
+        tmp = os.path.realpath(tempfile.gettempdir())
+        if os.path.commonpath([os.path.realpath(path), tmp]) == tmp:
+            raise ValueError(f"RECORD_STORE_SQLITE_PATH must not be in the temporary directory ({tmp})")
+        return SQLiteRecordStore(path)
+    raise ValueError(f"Unknown RECORD_STORE_BACKEND '{backend}' (expected 'memory' or 'sqlite')")
+
+
+# Global store instance (backend chosen by RECORD_STORE_BACKEND at startup)
+_record_store: Optional[RecordStore] = None
+
+
+def init_record_store(backend: str = RECORD_STORE_BACKEND) -> RecordStore:
+    """
+    Create the configured record store, unless one is installed already.
+
+    Raises:
+        ValueError: If the backend name is unknown or its configuration is missing
+    """
+    global _record_store
+    if _record_store is None:
+        _record_store = create_record_store(backend)
+    return _record_store
+
+
+def set_record_store(store: Optional[RecordStore]) -> None:
+    """Install a record store instance (used by tests and embedding apps)."""
+    global _record_store
+    _record_store = store
+
+
+def get_record_store() -> RecordStore:
+    """
+    Get the process-wide record store.
+
+    Raises:
+        RuntimeError: If the record store hasn't been initialized
+    """
+    if _record_store is None:
+        raise RuntimeError("Record store not initialized. Call init_record_store() first.")
+    return _record_store
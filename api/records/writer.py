@@ -0,0 +1,486 @@
+"""
+Write-behind writer for LUMEN SDK API defensible records.
+
+Evaluations hand their records to the writer and return; a background
+flusher groups them into multi-row put_many() calls on the record store,
+so evaluate latency does not depend on storage latency. A failed batch is
+retried with backoff. Record stores keep the first write of a record_id,
+so a record written twice is stored once.
+
+With RECORD_JOURNAL_DIR set, every record is appended to a journal (JSON
+lines, flushed to the OS) before submit() returns, so a record is durable
+against a process crash by the time its evaluation is answered. Each
+process has its own journal file in the directory, named when it first
+uses the writer, and holds an exclusive flock on it while it lives. The journal is compacted to the records still
+queued after each flush. While the store is unavailable, records stay in
+the journal only instead of growing memory, and are replayed from it once
+the store accepts writes again. Journals whose lock is free belong to
+exited processes; a writer replays them into the store and removes them.
+
+Without a journal, records wait in memory only: records queued (at most
+RECORD_FLUSH_INTERVAL_SECONDS of evaluations, or RECORD_WRITER_MAX_PENDING
+during an outage) are lost if the process is killed. stop() flushes them
+on a clean shutdown.
+
+Records waiting in memory are served by GET /v1/records/{id} (see
+pending()); listings include them once flushed.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+from uuid import uuid4
+import logging
+
+from .store import EvaluationRecord, RecordStore, get_record_store
+
+logger = logging.getLogger(__name__)
+
+# Writer configuration - override via environment
+RECORD_FLUSH_INTERVAL_SECONDS = float(os.getenv("RECORD_FLUSH_INTERVAL_SECONDS", "0.5"))
+RECORD_FLUSH_BATCH_SIZE = int(os.getenv("RECORD_FLUSH_BATCH_SIZE", "500"))
+RECORD_WRITER_MAX_PENDING = int(os.getenv("RECORD_WRITER_MAX_PENDING", "10000"))
+RECORD_FLUSH_RETRIES = int(os.getenv("RECORD_FLUSH_RETRIES", "3"))
+RECORD_FLUSH_RETRY_BACKOFF_SECONDS = float(os.getenv("RECORD_FLUSH_RETRY_BACKOFF_SECONDS", "0.1"))
+# Directory of per-process journals, not allowed under the temporary
+# directory (records may hold PHI). Empty disables journaling
+RECORD_JOURNAL_DIR = os.getenv("RECORD_JOURNAL_DIR", "")
+
+_JOURNAL_NAME = re.compile(r"records-\d+-[0-9a-f]+\.journal(\.replay)?$")
+
+
+def _journal_line(record: EvaluationRecord) -> str:
+    entry = {name: getattr(record, name) for name in EvaluationRecord.__slots__}
+    return json.dumps(entry, separators=(",", ":")) + "\n"
+
+
+def _lock_orphan(path: str):
+    """Open and lock another writer's journal, or None if it is live or gone."""
+    try:
+        journal = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # Another writer may have replayed and removed it between our
+        # open() and flock()
+        if os.fstat(journal.fileno()).st_ino != os.stat(path).st_ino:
+            raise FileNotFoundError(path)
+    except (BlockingIOError, FileNotFoundError):
+        journal.close()
+        return None
+    return journal
+
+
+def _read_batches(journal: TextIO, batch_size: int) -> Iterator[List[EvaluationRecord]]:
+    """Parse a journal's records, up to batch_size at a time."""
+    batch: List[EvaluationRecord] = []
+    for line in journal:
+        try:
+            batch.append(EvaluationRecord(**json.loads(line)))
+        except (ValueError, TypeError):
+            # Torn final line from a crash mid-write
+            continue
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RecordWriter:
+    """
+    Bounded write-behind queue of records in front of a RecordStore.
+
+    Flushes run on an interval, or as soon as a full batch is pending.
+    """
+
+    def __init__(
+        self,
+        store: Optional[RecordStore] = None,
+        flush_interval: float = RECORD_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = RECORD_FLUSH_BATCH_SIZE,
+        max_pending: int = RECORD_WRITER_MAX_PENDING,
+        retries: int = RECORD_FLUSH_RETRIES,
+        retry_backoff: float = RECORD_FLUSH_RETRY_BACKOFF_SECONDS,
+        journal_dir: Optional[str] = RECORD_JOURNAL_DIR or None,
+    ):
+        """
+        Args:
+            store: Store to write to; None for the process-wide record store
+            journal_dir: Directory of journals; None keeps unwritten records
+                in memory only (up to max_pending) instead
+        """
+        self._store = store
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.retries = max(1, retries)
+        self.retry_backoff = retry_backoff
+        self.journal_dir = journal_dir
+        # Named by the process that writes it (see _bind_journal)
+        self.journal_path: Optional[str] = None
+        self._journal_pid: Optional[int] = None
+        # record_id -> record, in submission order
+        self._pending: "OrderedDict[str, EvaluationRecord]" = OrderedDict()
+        # The batch being written, still readable through pending()
+        self._in_flight: Dict[str, EvaluationRecord] = {}
+        self._journal = None
+        # Our previous journal while its records are replayed (keeps its lock)
+        self._replaying = None
+        # Records in the journal but not in memory
+        self._journal_only = 0
+        # Journals of exited processes may be waiting to be replayed
+        self._orphans = journal_dir is not None
+        # True while the store is failing: new records stay in the journal only
+        self.spilling = False
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.failed_attempts = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.dropped = 0
+
+    @property
+    def store(self) -> RecordStore:
+        return self._store or get_record_store()
+
+    def submit(self, records: Iterable[EvaluationRecord]) -> None:
+        """
+        Queue records for writing; never waits on the store.
+
+        With a journal, the records are journaled before this returns.
+
+        Args:
+            records: Records to store
+
+        Raises:
+            OSError: If the journal cannot be written
+        """
+        records = list(records)
+        if self.journal_dir and records:
+            self._bind_journal()
+            self._journal_append(records)
+        for record in records:
+            self.submitted += 1
+            if self.journal_dir and (self.spilling or len(self._pending) >= self.max_pending):
+                self._journal_only += 1
+                self.spilled += 1
+            elif len(self._pending) < self.max_pending:
+                self._pending.setdefault(record.record_id, record)
+            else:
+                self.dropped += 1
+                logger.error(f"Record writer full, dropping record {record.record_id}")
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+
+    def pending(self, org_id: str, record_id: str) -> Optional[EvaluationRecord]:
+        """An organization's record that is queued or being written, if any."""
+        record = self._pending.get(record_id) or self._in_flight.get(record_id)
+        if record is None or record.org_id != org_id:
+            return None
+        return record
+
+    def pending_count(self) -> int:
+        """Number of records waiting in memory."""
+        return len(self._pending) + len(self._in_flight)
+
+    async def flush(self) -> int:
+        """
+        Write journaled, then queued, records to the store.
+
+        Returns:
+            int: Number of queued records written
+        """
+        async with self._flush_lock:
+            return await self._flush()
+
+    async def _flush(self) -> int:
+        if self.journal_dir:
+            self._bind_journal()
+        if self.journal_dir and not (await self._replay_orphans() and await self._replay()):
+            # Still failing: keep memory bounded, the journal has the queue
+            self.spilling = True
+            self._spill_pending()
+            return 0
+
+        written = 0
+        while self._pending:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popitem(last=False)[1])
+            self._in_flight = {record.record_id: record for record in batch}
+            try:
+                stored = await self._put(batch)
+            finally:
+                self._in_flight = {}
+            if stored:
+                written += len(batch)
+                continue
+
+            if self.journal_dir:
+                self.spilling = True
+                self._journal_only += len(batch)
+                self.spilled += len(batch)
+                self._spill_pending()
+            else:
+                # Keep the batch ahead of newer records for the next flush
+                self._pending = OrderedDict(
+                    [(record.record_id, record) for record in batch] + list(self._pending.items())
+                )
+            break
+
+        if written and self._journal is not None and not self._journal_only:
+            self._compact_journal()
+        self.written += written
+        return written
+
+    async def _put(self, batch: List[EvaluationRecord]) -> bool:
+        """put_many with retries; False if every attempt failed."""
+        for attempt in range(self.retries):
+            try:
+                await self.store.put_many(batch)
+                self.batches += 1
+                return True
+            except Exception as e:
+                self.failed_attempts += 1
+                logger.warning(f"Record batch write failed (attempt {attempt + 1}/{self.retries}): {e!r}")
+                if attempt + 1 < self.retries:
+                    await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+        return False
+
+    async def run(self) -> None:
+        """Background loop: flush on the interval or when a batch is full."""
+        if self.journal_dir:
+            self._bind_journal()
+        else:
+            logger.warning("RECORD_JOURNAL_DIR is not set: queued records are lost if the process dies")
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Record writer flush error: {e}")
+
+    async def stop(self) -> None:
+        """Stop the background loop and write anything pending."""
+        self._stopping = True
+        self._flush_requested.set()
+        await self.flush()
+        if self._journal is not None:
+            # Everything is stored: don't leave a file per worker behind
+            if not self._pending and not self._journal_only and self._replaying is None:
+                os.remove(self.journal_path)
+            self._journal.close()
+            self._journal = None
+        if self._replaying is not None:
+            self._replaying.close()
+            self._replaying = None
+
+    # --- Journal ------------------------------------------------------------
+
+    def _bind_journal(self) -> None:
+        """
+        Name the calling process's journal, once per process.
+
+        The global writer is created at import, before a preloading server
+        forks its workers, so the name can't be chosen in __init__: each
+        worker gets its own journal the first time it uses the writer. A
+        journal handle inherited across a fork is the parent's and is left
+        to it, as are the records it had queued.
+        """
+        pid = os.getpid()
+        if self._journal_pid == pid:
+            return
+        if self._journal_pid is not None:
+            self._pending.clear()
+            self._in_flight = {}
+        self._journal_pid = pid
+        self.journal_path = os.path.join(self.journal_dir, f"records-{pid}-{uuid4().hex[:12]}.journal")
+        self._journal = None
+        self._replaying = None
+        self._journal_only = 0
+        self._orphans = True
+
+    def _journal_append(self, records: List[EvaluationRecord]) -> None:
+        if self._journal is None:
+            self._compact_journal()
+        self._journal.write("".join(_journal_line(record) for record in records))
+        # Flushed to the OS on every submit: survives a process crash
+        self._journal.flush()
+
+    def _compact_journal(self) -> None:
+        """
+        Rewrite this writer's journal to hold only the records in memory.
+
+        Only called when no record is held by the journal alone. The new
+        file is created owner-only and locked before it replaces the old
+        one, so other workers never see this journal unlocked.
+        """
+        os.makedirs(self.journal_dir, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.journal_path}.tmp"
+        tmp = open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8")
+        fcntl.flock(tmp.fileno(), fcntl.LOCK_EX)
+        records = list(self._in_flight.values()) + list(self._pending.values())
+        tmp.write("".join(_journal_line(record) for record in records))
+        tmp.flush()
+        os.replace(tmp_path, self.journal_path)
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = tmp
+
+    def _spill_pending(self) -> None:
+        """Drop queued records from memory; they are in the journal."""
+        self._journal_only += len(self._pending)
+        self.spilled += len(self._pending)
+        self._pending.clear()
+
+    async def _replay_file(self, path: str) -> Optional[int]:
+        """
+        Write a journal's records to the store; None if a batch failed.
+
+        The file is read and parsed one batch at a time on a worker thread,
+        so replaying a large journal never stalls the event loop.
+        """
+        replayed = 0
+        journal = await asyncio.to_thread(open, path, "r", encoding="utf-8")
+        try:
+            batches = _read_batches(journal, self.batch_size)
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                if not await self._put(batch):
+                    return None
+                replayed += len(batch)
+        finally:
+            journal.close()
+        return replayed
+
+    async def _replay(self) -> bool:
+        """
+        Write records held only by this writer's journal to the store.
+
+        The journal is renamed aside (keeping its lock) and a new one
+        holding the queued records takes its place, so records submitted
+        while the replay runs are journaled without touching the file
+        being read.
+
+        Returns:
+            bool: True once no record is held by the journal alone
+        """
+        replay_path = f"{self.journal_path}.replay"
+        while True:
+            if self._replaying is None:
+                if not self._journal_only:
+                    self.spilling = False
+                    return True
+                # Records submitted during the rename may land in the file
+                # being replayed as well as the new journal; the store keeps
+                # the first write of a record_id
+                await asyncio.to_thread(os.replace, self.journal_path, replay_path)
+                self._replaying, self._journal = self._journal, None
+                self._journal_only = 0
+                self._compact_journal()
+
+            replayed = await self._replay_file(replay_path)
+            if replayed is None:
+                return False
+            await asyncio.to_thread(os.remove, replay_path)
+            self._replaying.close()
+            self._replaying = None
+            self.replayed += replayed
+            logger.info(f"Replayed {replayed} journaled records into the record store")
+
+    async def _replay_orphans(self) -> bool:
+        """
+        Replay and remove the journals of exited processes.
+
+        Returns:
+            bool: True once none is left (journals of live writers are skipped)
+        """
+        if not self._orphans:
+            return True
+        if await asyncio.to_thread(os.path.isdir, self.journal_dir):
+            own = (self.journal_path, f"{self.journal_path}.replay")
+            for name in sorted(await asyncio.to_thread(os.listdir, self.journal_dir)):
+                path = os.path.join(self.journal_dir, name)
+                if not _JOURNAL_NAME.match(name) or path in own:
+                    continue
+                journal = await asyncio.to_thread(_lock_orphan, path)
+                if journal is None:
+                    continue
+                try:
+                    replayed = await self._replay_file(path)
+                    if replayed is None:
+                        return False
+                    await asyncio.to_thread(os.remove, path)
+                finally:
+                    journal.close()
+                self.replayed += replayed
+                logger.info(f"Replayed {replayed} records from the journal of an exited process ({name})")
+        self._orphans = False
+        return True
+
+    def stats(self) -> dict:
+        """Return queue size and write counters."""
+        return {
+            "pending": self.pending_count(),
+            "spilling": self.spilling,
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "failed_attempts": self.failed_attempts,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+        }
+
+
+def create_record_writer(journal_dir: str = RECORD_JOURNAL_DIR) -> RecordWriter:
+    """
+    Create the process-wide record writer.
+
+    Args:
+        journal_dir: Directory of per-process journals; empty disables journaling
+
+    Returns:
+        RecordWriter: The writer (journals are opened lazily)
+
+    Raises:
+        ValueError: If journal_dir is in the temporary directory
+    """
+    if journal_dir:
+        # Anyone can create a directory there first, then read the records
+        # journaled into it or plant journals to be replayed as records
+        tmp = os.path.realpath(tempfile.gettempdir())
+        if os.path.commonpath([os.path.realpath(journal_dir), tmp]) == tmp:
+            raise ValueError(f"RECORD_JOURNAL_DIR must not be in the temporary directory ({tmp})")
+    return RecordWriter(journal_dir=journal_dir or None)
+
+
+# Global writer instance
+_record_writer = create_record_writer()
+
+
+def set_record_writer(writer: RecordWriter) -> None:
+    """Install a record writer instance (used by tests and embedding apps)."""
+    global _record_writer
+    _record_writer = writer
+
+
+def get_record_writer() -> RecordWriter:
+    """Get the process-wide record writer."""
+    return _record_writer
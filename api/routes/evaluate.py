@@ -1,54 +1,188 @@
 """Evaluation endpoint for LUMEN SDK API."""
 
-import random
-from uuid import uuid4
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional, Sequence, Union
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from starlette.types import Receive, Scope, Send
 
-from auth.api_keys import verify_api_key
-from models.schemas import EvaluateRequest, EvaluateResponse, Verdict
+from audit import EVALUATION_COMPLETED, record_events
+from auth.api_keys import APIKeyInfo, verify_api_key
+from compliance.org_packs import EnabledPacks, get_enabled_packs
+from jobs import Job, JobFailed, QueueFull, get_job_pool, resolve_callback_url
+from middleware.rate_limit import charge_rate_limit, get_plan_rate_limit, throttle_rate_limit
+from middleware.usage import billing_period_start, get_plan_usage_limit
+from middleware.usage_counter import get_usage_counter
+from models.schemas import (
+    BatchEvaluateRequest,
+    BatchEvaluateResponse,
+    BatchItemError,
+    BatchItemResult,
+    EvaluateRequest,
+    EvaluateResponse,
+    EvaluationMode,
+    HumanAction,
+    JobResponse,
+    PackEvaluation,
+    Verdict,
+)
+from records import EvaluationRecord, get_record_writer
+from scoring import monte_carlo
+from scoring.result_cache import get_result_cache
 
 router = APIRouter(prefix="/v1", tags=["Evaluation"])
 
 # Base URL for defensible records - configure via environment
 RECORDS_BASE_URL = "https://lumen.forge.health/records"
 
+# Maximum items per /v1/evaluate/batch request
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
 
-def calculate_lumen_score(request: EvaluateRequest) -> tuple[int, int, Verdict, float]:
+# /v1/evaluate/stream: most lines scored (and charged) together, and the
+# longest accepted line; together they bound the memory held per stream
+STREAM_CHUNK_ITEMS = int(os.getenv("STREAM_CHUNK_ITEMS", "100"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
+# Most strategic factors accepted in context; each one is a column of the
+# (runs x factors) Monte Carlo draw matrix
+STRATEGIC_FACTORS_MAX = int(os.getenv("STRATEGIC_FACTORS_MAX", "50"))
+
+# Errors the kernel raises on malformed inputs in context
+SCORING_ERRORS = (KeyError, TypeError, ValueError, AttributeError, ArithmeticError)
+
+# SDK default evidence factors, used when the request carries none
+DEFAULT_STRATEGIC_FACTORS = [
+    {"factorName": "Technical Maturity", "confidence": "Moderate"},
+    {"factorName": "Regulatory Alignment", "confidence": "Strong"},
+    {"factorName": "Labour Impact", "confidence": "Moderate"},
+    {"factorName": "Vendor Ecosystem", "confidence": "Limited"},
+    {"factorName": "Funding Pathway", "confidence": "Moderate"},
+]
+
+DEFAULT_DECISION_INPUT = {
+    "citationIntegrity": {
+        "totalCitations": 0,
+        "verifiedCitations": 0,
+        "fabricatedCitations": 0,
+        "mismatchedCitations": 0,
+    },
+    "controlResults": [],
+    "evidenceMetrics": {"sourceCount": 0, "avgRetrievalScore": 0, "documentTypeCount": 0},
+}
+
+# Human action -> (passed, severity) of the human-review control
+HUMAN_REVIEW_CONTROLS = {
+    HumanAction.ACCEPTED: (True, "HIGH"),
+    HumanAction.MODIFIED: (False, "MEDIUM"),
+    HumanAction.REJECTED: (False, "CRITICAL"),
+}
+
+
+def _context_flag(context: dict[str, Any], name: str) -> bool:
+    """A boolean kernel flag from context; anything but true/false is malformed."""
+    value = context.get(name, False)
+    if not isinstance(value, bool):
+        raise TypeError(f"{name} must be a boolean, not {value!r}")
+    return value
+
+
+def build_scoring_inputs(request: EvaluateRequest) -> dict[str, Any]:
     """
-    Calculate LUMEN score and related metrics.
-    
-    MVP Implementation (v1.0.0):
-    Simplified scoring that demonstrates the API contract.
-    
-    Full Implementation (v1.1.0+):
-    Will integrate the complete LUMEN Score™ algorithm:
-    - MCDA (Multi-Criteria Decision Analysis)
-    - Monte Carlo risk adjustment
-    - NIST AI RMF weighting
-    - Citation integrity engine
-    
+    Build LUMEN kernel inputs for an evaluation request.
+
+    Kernel inputs can be passed in ``context`` using the SDK's
+    LumenScoreOptions names (``strategicFactors``, ``decisionInput``,
+    ``riskRadar``, ``fatalFlawDetected``, ``phiInvolved``); anything not
+    given falls back to the SDK defaults. The human action is recorded as
+    a human-review control in the Decision Trust input.
+
     Args:
         request: The evaluation request
-        
+
+    Returns:
+        dict: Keyword arguments for the scoring functions
+
+    Raises:
+        ValueError: If context carries more than STRATEGIC_FACTORS_MAX
+            strategic factors
+        TypeError: If fatalFlawDetected or phiInvolved is not a boolean
+    """
+    context = request.context
+    strategic_factors = context.get("strategicFactors", DEFAULT_STRATEGIC_FACTORS)
+    if len(strategic_factors) > STRATEGIC_FACTORS_MAX:
+        raise ValueError(
+            f"{len(strategic_factors)} strategic factors; the maximum is {STRATEGIC_FACTORS_MAX}"
+        )
+    decision_input = dict(context.get("decisionInput") or DEFAULT_DECISION_INPUT)
+    passed, severity = HUMAN_REVIEW_CONTROLS[request.human_action]
+    decision_input["controlResults"] = [
+        *decision_input.get("controlResults", []),
+        {"controlId": "human-review", "passed": passed, "severity": severity},
+    ]
+
+    return {
+        "strategic_factors": strategic_factors,
+        "decision_input": decision_input,
+        "risk_radar": context.get("riskRadar"),
+        "fatal_flaw_detected": _context_flag(context, "fatalFlawDetected"),
+        "phi_involved": _context_flag(context, "phiInvolved"),
+    }
+
+
+def _invalid_scoring_inputs(error: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=f"Invalid scoring inputs in context: {error!r}"
+    )
+
+
+def prepare_evaluation(request: EvaluateRequest) -> monte_carlo.Simulation:
+    """
+    Build the Monte Carlo simulation for an evaluation request.
+
+    Args:
+        request: The evaluation request
+
+    Returns:
+        Simulation: To be run with monte_carlo.run() and scored with
+        finish_evaluation()
+
+    Raises:
+        HTTPException: 422 if the kernel inputs in context are malformed
+    """
+    try:
+        return monte_carlo.prepare(**build_scoring_inputs(request))
+    except SCORING_ERRORS as e:
+        raise _invalid_scoring_inputs(e)
+
+
+def finish_evaluation(simulation: monte_carlo.Simulation) -> tuple[int, int, Verdict, float]:
+    """
+    Score an evaluation whose simulation has been run.
+
+    Args:
+        simulation: Simulation from prepare_evaluation(), after monte_carlo.run()
+
     Returns:
         tuple: (lumen_score, tier, verdict, citation_integrity)
+
+    Raises:
+        HTTPException: 422 if the kernel inputs in context are malformed
     """
-    # MVP scoring logic - demonstrates API behavior
-    # Full algorithm available in TypeScript SDK: src/scoring/LumenScore.ts
-    
-    # Base score influenced by human action
-    if request.human_action == "accepted":
-        base_score = random.randint(70, 100)
-    elif request.human_action == "modified":
-        base_score = random.randint(50, 85)
-    else:  # rejected
-        base_score = random.randint(20, 60)
-    
-    # Compliance pack adjustment (simplified)
-    compliance_penalty = len(request.compliance_packs) * 2
-    lumen_score = max(0, min(100, base_score - compliance_penalty))
-    
+    try:
+        result = monte_carlo.risk_adjusted_result(simulation)
+    except SCORING_ERRORS as e:
+        raise _invalid_scoring_inputs(e)
+
+    lumen_score = result["riskAdjustment"]["adjustedScore"]
+
     # Determine tier and verdict based on score
     if lumen_score >= 80:
         tier = 1
@@ -59,51 +193,569 @@ def calculate_lumen_score(request: EvaluateRequest) -> tuple[int, int, Verdict,
     else:
         tier = 3
         verdict = Verdict.BLOCK
-    
-    # Citation integrity (MVP: simulated, v1.1.0+: citation engine)
-    citation_integrity = round(random.uniform(0.7, 1.0), 2)
-    
+
+    citation_integrity = result["decisionTrust"]["factors"]["citationIntegrity"]["score"] / 100
+
     return lumen_score, tier, verdict, citation_integrity
 
 
-@router.post("/evaluate", response_model=EvaluateResponse)
+def calculate_lumen_score(request: EvaluateRequest) -> tuple[int, int, Verdict, float]:
+    """
+    Calculate LUMEN score and related metrics.
+
+    Runs the LUMEN Score kernel (MCDA Strategic Confidence and Decision
+    Trust, see scoring.kernel) with Monte Carlo risk adjustment (see
+    scoring.monte_carlo). Scoring is deterministic: the simulation is
+    seeded from the inputs hash, so the same request always produces the
+    same score, alone or in a batch. Results are cached under the inputs
+    hash and the requested pack versions (see scoring.result_cache).
+
+    Args:
+        request: The evaluation request
+
+    Returns:
+        tuple: (lumen_score, tier, verdict, citation_integrity)
+
+    Raises:
+        HTTPException: 422 if the kernel inputs in context are malformed
+    """
+    simulation = prepare_evaluation(request)
+    cache = get_result_cache()
+    key = cache.key(simulation.inputs_hash, request.compliance_packs)
+    scores = cache.get(key)
+    if scores is None:
+        monte_carlo.run([simulation])
+        scores = finish_evaluation(simulation)
+        cache.put(key, scores)
+    return scores
+
+
+def evaluate_compliance(request: EvaluateRequest, packs: Optional[EnabledPacks]) -> list[PackEvaluation]:
+    """
+    Run the compliance packs an evaluation selects.
+
+    Args:
+        request: The evaluation request; its compliance_packs narrow the
+            organization's enabled packs (see EnabledPacks.select)
+        packs: The organization's enabled packs, from get_enabled_packs()
+
+    Returns:
+        list: One PackEvaluation per selected pack; empty if none
+    """
+    if packs is None:
+        return []
+    plan = packs.select(request.compliance_packs)
+    if not plan.packs:
+        return []
+    return [
+        PackEvaluation.model_validate(result.to_dict())
+        for result in plan.evaluate(request.context, request.ai_output)
+    ]
+
+
+def build_response(
+    scores: tuple[int, int, Verdict, float],
+    record_id: Optional[UUID] = None,
+    compliance: Optional[list[PackEvaluation]] = None
+) -> EvaluateResponse:
+    """Create the evaluation record response for calculated scores and pack results."""
+    lumen_score, tier, verdict, citation_integrity = scores
+
+    # Generate unique record ID (async jobs reserve theirs when enqueued)
+    record_id = record_id or uuid4()
+
+    return EvaluateResponse(
+        record_id=record_id,
+        lumen_score=lumen_score,
+        tier=tier,
+        verdict=verdict,
+        citation_integrity=citation_integrity,
+        defensible_record_url=f"{RECORDS_BASE_URL}/{record_id}",
+        compliance=compliance or []
+    )
+
+
+def build_record(org_id: str, request: EvaluateRequest, response: EvaluateResponse) -> EvaluationRecord:
+    """Create the defensible record of an evaluation, to be stored under its record_id."""
+    return EvaluationRecord(
+        record_id=str(response.record_id),
+        org_id=org_id,
+        created_at=time.time(),
+        lumen_score=response.lumen_score,
+        tier=response.tier,
+        verdict=response.verdict.value,
+        citation_integrity=response.citation_integrity,
+        human_action=request.human_action.value,
+        compliance_packs=request.compliance_packs,
+        ai_output=request.ai_output,
+        context=request.context,
+        compliance=[pack.model_dump(mode="json") for pack in response.compliance],
+    )
+
+
+def save_records(records: list[EvaluationRecord], actor: dict[str, Any]) -> None:
+    """
+    Queue records for the record store and append their audit events.
+
+    Audit payloads carry the outcome only, not the AI output or context.
+
+    Args:
+        records: Records of one organization's evaluations
+        actor: Audit actor that requested them
+    """
+    if not records:
+        return
+    get_record_writer().submit(records)
+    record_events(EVALUATION_COMPLETED, records[0].org_id, actor, [
+        {
+            "record_id": record.record_id,
+            "lumen_score": record.lumen_score,
+            "tier": record.tier,
+            "verdict": record.verdict,
+            "packs": {pack["pack_id"]: pack["passed"] for pack in record.compliance},
+        }
+        for record in records
+    ])
+
+
+def key_actor(api_key_data: APIKeyInfo) -> dict[str, Any]:
+    """Audit actor for requests authenticated with an API key."""
+    return {"type": "SERVICE", "id": api_key_data.key_id}
+
+
+def _item_error(index: int, status_code: int, message: str, details: Any = None) -> BatchItemResult:
+    return BatchItemResult(
+        index=index,
+        status="error",
+        error=BatchItemError(status_code=status_code, message=message, details=details)
+    )
+
+
+def evaluate_items(
+    items: Sequence[tuple[int, Any]],
+    allowance: int,
+    org_id: str,
+    packs: Optional[EnabledPacks] = None
+) -> tuple[list[BatchItemResult], list[EvaluationRecord]]:
+    """
+    Validate and score many evaluation bodies together.
+
+    Cached results are reused and identical items are scored once; every
+    remaining Monte Carlo simulation runs in one monte_carlo.run() call,
+    so the scores match /v1/evaluate exactly.
+
+    Args:
+        items: (index, body) pairs; each body is validated as an EvaluateRequest
+        allowance: Evaluations left this billing period; valid items beyond
+            it fail with 429
+        org_id: Organization the records belong to
+        packs: The organization's enabled packs, run against every item
+
+    Returns:
+        tuple: (one result per item, in order; records of the items
+        evaluated, to be stored; number of valid items refused with 429)
+    """
+    cache = get_result_cache()
+    results: dict[int, BatchItemResult] = {}
+    # cache key -> (simulation, indices of the items it scores)
+    pending: dict[str, tuple[monte_carlo.Simulation, list[int]]] = {}
+    evaluations: dict[int, EvaluateRequest] = {}
+    # Pack results depend on ai_output too, so they are kept per item
+    compliance: dict[int, list[PackEvaluation]] = {}
+    accepted = 0
+    refused = 0
+    for index, item in items:
+        try:
+            evaluation = EvaluateRequest.model_validate(item)
+            simulation = prepare_evaluation(evaluation)
+        except ValidationError as e:
+            results[index] = _item_error(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, "Invalid evaluation request",
+                e.errors(include_url=False, include_context=False, include_input=False)
+            )
+            continue
+        except HTTPException as e:
+            results[index] = _item_error(index, e.status_code, e.detail)
+            continue
+
+        if accepted >= allowance:
+            results[index] = _item_error(index, status.HTTP_429_TOO_MANY_REQUESTS, "Monthly evaluation limit exceeded")
+            refused += 1
+            continue
+        accepted += 1
+        evaluations[index] = evaluation
+        compliance[index] = evaluate_compliance(evaluation, packs)
+
+        key = cache.key(simulation.inputs_hash, evaluation.compliance_packs)
+        scores = cache.get(key)
+        if scores is not None:
+            results[index] = BatchItemResult(
+                index=index, status="ok", result=build_response(scores, compliance=compliance[index])
+            )
+        else:
+            pending.setdefault(key, (simulation, []))[1].append(index)
+
+    monte_carlo.run([simulation for simulation, _ in pending.values()])
+
+    for key, (simulation, indices) in pending.items():
+        try:
+            scores = finish_evaluation(simulation)
+        except HTTPException as e:
+            for index in indices:
+                results[index] = _item_error(index, e.status_code, e.detail)
+            continue
+        cache.put(key, scores)
+        for index in indices:
+            results[index] = BatchItemResult(
+                index=index, status="ok", result=build_response(scores, compliance=compliance[index])
+            )
+
+    ordered = [results[index] for index, _ in items]
+    records = [
+        build_record(org_id, evaluations[result.index], result.result)
+        for result in ordered if result.status == "ok"
+    ]
+    return ordered, records, refused
+
+
+async def run_evaluation_job(job: Job) -> dict:
+    """
+    Job handler for asynchronous evaluations (see jobs.worker).
+
+    Scores the stored request off the event loop and builds the record
+    under the record_id reserved when the job was enqueued. Packs are
+    resolved when the job runs, so they reflect the organization's
+    enabled packs at that time.
+
+    Raises:
+        JobFailed: If the kernel inputs in context are malformed
+    """
+    request = EvaluateRequest.model_validate(job.payload)
+    packs = await get_enabled_packs(job.org_id)
+    try:
+        scores = await asyncio.to_thread(calculate_lumen_score, request)
+    except HTTPException as e:
+        raise JobFailed(str(e.detail))
+    response = build_response(scores, UUID(job.record_id), evaluate_compliance(request, packs))
+    save_records([build_record(job.org_id, request, response)], {"type": "SYSTEM", "id": f"job:{job.id}"})
+    return response.model_dump(mode="json")
+
+
+async def enqueue_evaluation(
+    request: EvaluateRequest,
+    api_key_data: APIKeyInfo,
+    callback_url: Optional[str] = None
+) -> JSONResponse:
+    """
+    Queue an evaluation job and answer 202 with its job view.
+
+    Scoring inputs are checked before the job is queued, so malformed
+    context is still rejected with 422 up front. The record_id and
+    defensible_record_url are reserved now and returned with the job.
+
+    Raises:
+        HTTPException: 422 for a malformed context or callback URL,
+            429 if the organization has too many jobs queued
+    """
+    if callback_url is not None:
+        try:
+            await resolve_callback_url(callback_url)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    prepare_evaluation(request)
+
+    record_id = uuid4()
+    job = Job(
+        org_id=api_key_data.org_id,
+        payload=request.model_dump(mode="json"),
+        record_id=str(record_id),
+        record_url=f"{RECORDS_BASE_URL}/{record_id}",
+        callback_url=callback_url,
+    )
+    try:
+        await get_job_pool().submit(job)
+    except QueueFull as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobResponse.model_validate(job.to_dict()).model_dump(mode="json"),
+        headers={"Location": f"/v1/jobs/{job.id}"}
+    )
+
+
+@router.post(
+    "/evaluate",
+    response_model=EvaluateResponse,
+    responses={202: {"model": JobResponse, "description": "Evaluation queued (mode=async)"}},
+)
 async def evaluate(
     request: EvaluateRequest,
-    api_key_data: dict = Depends(verify_api_key)
-) -> EvaluateResponse:
+    mode: EvaluationMode = Query(EvaluationMode.SYNC, description="sync: score now; async: queue a job"),
+    callback_url: Optional[str] = Query(None, description="HTTPS URL to POST the finished job to (mode=async)"),
+    api_key_data: APIKeyInfo = Depends(verify_api_key)
+) -> Union[EvaluateResponse, JSONResponse]:
     """
     Evaluate AI output for compliance and generate a defensible record.
     
     This endpoint:
     1. Accepts AI-generated output with human action context
-    2. Evaluates against specified compliance packs
+    2. Evaluates against the organization's enabled compliance packs
+       (narrowed to compliance_packs when given)
     3. Generates a LUMEN score and verdict
     4. Creates a defensible record for audit purposes
     
+    With ``mode=async`` the evaluation is queued instead and the job is
+    returned with 202; poll GET /v1/jobs/{id} or pass ``callback_url``.
+    
     Args:
         request: Evaluation request containing AI output and context
+        mode: Run now (sync, default) or as a queued job (async)
+        callback_url: Where to POST the finished job (async only)
         api_key_data: Validated API key metadata (injected)
         
     Returns:
-        EvaluateResponse with score, verdict, and record URL
+        EvaluateResponse with score, verdict, and record URL, or the
+        queued JobResponse (202) in async mode
     """
-    # Generate unique record ID
-    record_id = uuid4()
-    
-    # Calculate LUMEN Score (MVP implementation)
-    lumen_score, tier, verdict, citation_integrity = calculate_lumen_score(request)
-    
-    # Generate defensible record URL
-    defensible_record_url = f"{RECORDS_BASE_URL}/{record_id}"
-    
-    # Note: Database persistence and full compliance engine integration
-    # will be added in v1.1.0. See CHANGELOG.md for roadmap.
-    
-    return EvaluateResponse(
-        record_id=record_id,
-        lumen_score=lumen_score,
-        tier=tier,
-        verdict=verdict,
-        citation_integrity=citation_integrity,
-        defensible_record_url=defensible_record_url
+    if mode == EvaluationMode.ASYNC:
+        return await enqueue_evaluation(request, api_key_data, callback_url)
+    if callback_url is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="callback_url requires mode=async"
+        )
+    packs = await get_enabled_packs(api_key_data.org_id)
+    # Scoring is CPU-bound (the Monte Carlo runs); keep it off the event loop
+    scores = await asyncio.to_thread(calculate_lumen_score, request)
+    response = build_response(scores, compliance=evaluate_compliance(request, packs))
+    save_records([build_record(api_key_data.org_id, request, response)], key_actor(api_key_data))
+    return response
+
+
+@router.post("/evaluate/batch", response_model=BatchEvaluateResponse)
+async def evaluate_batch(
+    batch: BatchEvaluateRequest,
+    request: Request,
+    api_key_data: APIKeyInfo = Depends(verify_api_key)
+) -> BatchEvaluateResponse:
+    """
+    Evaluate many AI outputs in one request.
+
+    The key is verified once and the rate limit is charged once, weighted
+    by the number of items. Each item is validated and scored like a
+    /v1/evaluate body; all Monte Carlo simulations run together (see
+    monte_carlo.run), so results match /v1/evaluate exactly. Items that
+    fail (invalid body, malformed scoring inputs, monthly limit reached)
+    get a per-item error and do not fail the batch. Usage is incremented
+    once by the number of items evaluated.
+
+    Args:
+        batch: Items to evaluate
+        request: Incoming request (carries usage and rate limit state)
+        api_key_data: Validated API key metadata (injected)
+
+    Returns:
+        BatchEvaluateResponse with one result per item, in request order
+
+    Raises:
+        HTTPException: 413 if the batch is larger than BATCH_MAX_ITEMS or
+            the plan's rate limit, 429 if the rate limit has no room for it
+    """
+    items = batch.items
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch carries {len(items)} items; the maximum is {BATCH_MAX_ITEMS}"
+        )
+    await charge_rate_limit(request, api_key_data.key_id, api_key_data.plan, len(items))
+
+    # Evaluations left this billing period (set by the usage middleware)
+    allowance = getattr(request.state, "usage_remaining", len(items))
+
+    packs = await get_enabled_packs(api_key_data.org_id)
+    results, records, _ = await asyncio.to_thread(
+        evaluate_items, list(enumerate(items)), allowance, api_key_data.org_id, packs
+    )
+    save_records(records, key_actor(api_key_data))
+
+    succeeded = len(records)
+    request.state.usage_units = succeeded
+
+    return BatchEvaluateResponse(results=results, succeeded=succeeded, failed=len(items) - succeeded)
+
+
+class _RequestBodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator reads the request body itself.
+
+    StreamingResponse listens for disconnects by calling receive() alongside
+    the body iterator, which would swallow request body messages; here the
+    iterator is the only reader and sees a disconnect as ClientDisconnect.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+
+class _NDJSONLines:
+    """Split NDJSON request body chunks into (index, line) pairs."""
+
+    __slots__ = ("max_line_bytes", "buffer", "index", "overflow")
+
+    def __init__(self, max_line_bytes: int):
+        self.max_line_bytes = max_line_bytes
+        self.buffer = bytearray()
+        self.index = 0
+        # True while discarding the rest of an over-long line
+        self.overflow = False
+
+    def _line(self, line: bytes, lines: list) -> None:
+        if self.overflow or len(line) > self.max_line_bytes:
+            lines.append((self.index, None))
+            self.overflow = False
+        elif line.strip():
+            lines.append((self.index, line))
+        self.index += 1
+
+    def feed(self, data: bytes) -> list[tuple[int, Optional[bytes]]]:
+        """
+        Add body bytes and take the lines they complete.
+
+        Returns:
+            list: (line index, line) pairs; the line is None if it was longer
+            than max_line_bytes. Blank lines are skipped but keep their index.
+        """
+        lines: list[tuple[int, Optional[bytes]]] = []
+        start = 0
+        while (end := data.find(b"\n", start)) != -1:
+            self.buffer += data[start:end]
+            self._line(bytes(self.buffer), lines)
+            self.buffer.clear()
+            start = end + 1
+
+        self.buffer += data[start:]
+        if len(self.buffer) > self.max_line_bytes:
+            self.overflow = True
+            self.buffer.clear()
+        return lines
+
+    def close(self) -> list[tuple[int, Optional[bytes]]]:
+        """Take the final line if the body did not end with a newline."""
+        lines: list[tuple[int, Optional[bytes]]] = []
+        if self.buffer or self.overflow:
+            self._line(bytes(self.buffer), lines)
+            self.buffer.clear()
+        return lines
+
+
+async def _evaluate_lines(lines: list[tuple[int, Optional[bytes]]], api_key_data: APIKeyInfo) -> tuple[str, bool]:
+    """
+    Charge and score one chunk of NDJSON lines.
+
+    The rate limit is charged for the lines the monthly allowance leaves
+    room for; with no allowance left, lines are only validated and valid
+    ones fail with 429, without throttling or scoring.
+
+    Returns:
+        tuple: (NDJSON results, whether the monthly limit cut the chunk short)
+    """
+    counter = get_usage_counter()
+    now = datetime.now(timezone.utc)
+    period_start = billing_period_start(now)
+    allowance = get_plan_usage_limit(api_key_data.plan) - await counter.current(api_key_data.org_id, period_start)
+    if allowance > 0:
+        await throttle_rate_limit(api_key_data.key_id, api_key_data.plan, min(len(lines), allowance))
+
+    failed: list[BatchItemResult] = []
+    items: list[tuple[int, Any]] = []
+    for index, line in lines:
+        if line is None:
+            failed.append(_item_error(
+                index, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"Line exceeds {STREAM_MAX_LINE_BYTES} bytes"
+            ))
+            continue
+        try:
+            items.append((index, json.loads(line)))
+        except ValueError as e:
+            failed.append(_item_error(index, status.HTTP_422_UNPROCESSABLE_ENTITY, f"Invalid JSON: {e}"))
+
+    packs = await get_enabled_packs(api_key_data.org_id) if allowance > 0 else None
+    results, records, refused = await asyncio.to_thread(
+        evaluate_items, items, allowance, api_key_data.org_id, packs
     )
+    save_records(records, key_actor(api_key_data))
+    succeeded = len(records)
+    if succeeded:
+        counter.add(api_key_data.org_id, period_start, succeeded, now)
+
+    if failed:
+        results = sorted(results + failed, key=lambda result: result.index)
+    # Lines that fail validation use no allowance and don't end the stream
+    exhausted = refused > 0
+    return "".join(result.model_dump_json() + "\n" for result in results), exhausted
+
+
+async def _stream_results(request: Request, api_key_data: APIKeyInfo) -> AsyncIterator[str]:
+    """Score NDJSON lines as they arrive and yield their results."""
+    # A chunk is charged against the rate limit at once, so it must fit in it
+    chunk_items = min(STREAM_CHUNK_ITEMS, get_plan_rate_limit(api_key_data.plan))
+    splitter = _NDJSONLines(STREAM_MAX_LINE_BYTES)
+
+    async def chunks() -> AsyncIterator[list[tuple[int, Optional[bytes]]]]:
+        async for data in request.stream():
+            lines = splitter.feed(data)
+            for start in range(0, len(lines), chunk_items):
+                yield lines[start:start + chunk_items]
+        lines = splitter.close()
+        if lines:
+            yield lines
+
+    async for lines in chunks():
+        output, exhausted = await _evaluate_lines(lines, api_key_data)
+        yield output
+        if exhausted:
+            # Stop reading; the client resumes after the last scored index
+            return
+
+
+@router.post(
+    "/evaluate/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def evaluate_stream(
+    request: Request,
+    api_key_data: APIKeyInfo = Depends(verify_api_key)
+) -> StreamingResponse:
+    """
+    Evaluate an NDJSON stream of evaluation requests.
+
+    Each request body line is an /v1/evaluate body; each response line is
+    a batch item result (see BatchItemResult) whose index is the zero-based
+    line number. Lines are read and scored as they arrive, in chunks of up
+    to STREAM_CHUNK_ITEMS, and the next chunk is only read once the previous
+    results have been sent, so a slow reader slows the stream down instead
+    of growing buffers.
+
+    Each chunk is charged against the rate limit (waiting if it has no
+    room) and added to monthly usage as it is scored. If the monthly limit
+    is reached, the remaining items of that chunk fail with 429 and the
+    stream ends.
+
+    Args:
+        request: Incoming request with an NDJSON body
+        api_key_data: Validated API key metadata (injected)
+
+    Returns:
+        StreamingResponse of NDJSON results
+    """
+    # Usage is charged per chunk while streaming, not by the middleware
+    request.state.usage_units = 0
+    return _RequestBodyStreamingResponse(_stream_results(request, api_key_data), media_type="application/x-ndjson")
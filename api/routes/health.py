@@ -6,10 +6,19 @@ Copyright 2026 Forge Partners Inc.
 import os
 import time
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from models.schemas import HealthResponse
 from auth.supabase_client import health_check as supabase_health_check
+from auth.jwt_auth import verify_jwt_token
+from auth.key_cache import get_key_cache
+from auth.hashing import get_hash_executor
+from auth.last_used import get_last_used_buffer
+from middleware.usage_counter import get_usage_counter
+from scoring.result_cache import get_result_cache
+from compliance.org_packs import get_org_pack_cache
+from records import get_record_writer
+from audit import get_audit_log
 
 router = APIRouter(tags=["Health"])
 
@@ -93,4 +102,28 @@ async def liveness_check():
     
     Returns 200 if service process is alive.
     """
-    return {"status": "alive"}
\ No newline at end of file
+    return {"status": "alive"}
+
+
+@router.get("/health/metrics", include_in_schema=False, dependencies=[Depends(verify_jwt_token)])
+async def metrics():
+    """
+    Internal performance metrics for this worker.
+    
+    Requires portal authentication (Bearer JWT): the statistics describe
+    the deployment's internals.
+    
+    Reports verified-key cache, password-hash executor, write-behind
+    buffer, usage counter, evaluation result cache, enabled pack cache and
+    record writer statistics used to size caches and worker pools.
+    """
+    return {
+        "key_cache": get_key_cache().stats(),
+        "hash_executor": get_hash_executor().stats(),
+        "last_used_buffer": get_last_used_buffer().stats(),
+        "usage_counter": get_usage_counter().stats(),
+        "result_cache": get_result_cache().stats(),
+        "org_pack_cache": get_org_pack_cache().stats(),
+        "record_writer": get_record_writer().stats(),
+        "audit_log": get_audit_log().stats(),
+    }
@@ -0,0 +1,39 @@
+"""Asynchronous evaluation job endpoints for LUMEN SDK API."""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from auth.api_keys import APIKeyInfo, verify_api_key
+from jobs import get_job_pool
+from models.schemas import JobResponse
+
+router = APIRouter(prefix="/v1", tags=["Jobs"])
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    api_key_data: APIKeyInfo = Depends(verify_api_key)
+) -> JobResponse:
+    """
+    Poll an asynchronous evaluation job.
+    
+    Args:
+        job_id: Job ID returned by POST /v1/evaluate?mode=async
+        api_key_data: Validated API key metadata (injected)
+        
+    Returns:
+        JobResponse with status, and the evaluation result once succeeded
+        
+    Raises:
+        HTTPException: 404 if the job does not exist, has been purged or
+            belongs to another organization
+    """
+    job = await get_job_pool().queue.get(str(job_id))
+    if job is None or job.org_id != api_key_data.org_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return JobResponse.model_validate(job.to_dict())
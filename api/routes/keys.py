@@ -11,8 +11,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 import logging
 from auth.jwt_auth import verify_jwt_token
-from auth.supabase_client import get_supabase
+from db.repository import get_repository
 from auth.api_keys import hash_api_key
+from auth.key_cache import invalidate_cached_key
+from audit import API_KEY_CREATED, API_KEY_REVOKED, record_events
 
 logger = logging.getLogger(__name__)
 
@@ -109,18 +111,16 @@ async def generate_api_key(
     Respects plan limits and records legal acknowledgment if first key.
     """
     try:
-        supabase = get_supabase()
+        repository = get_repository()
         org_id = user_info["org_id"]
         plan = user_info["plan"]
         
         # Check plan limits
         key_limit = 2 if plan == "free" else 10
         
-        existing_keys = supabase.from_("api_keys").select("count", count="exact").eq(
-            "org_id", org_id
-        ).eq("status", "active").execute()
+        existing_count = await repository.count_active_keys(org_id)
         
-        if existing_keys.count >= key_limit:
+        if existing_count >= key_limit:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"API key limit reached. {plan.title()} plan allows {key_limit} active keys."
@@ -137,7 +137,7 @@ async def generate_api_key(
         random_suffix = secrets.token_urlsafe(32)
         api_key = f"lumen_pk_{request.environment}_{random_suffix}"
         key_prefix = api_key[:20]
-        key_hash = hash_api_key(api_key)
+        key_hash = await hash_api_key(api_key)
         
         # Prepare key data
         now = datetime.now(timezone.utc)
@@ -155,22 +155,24 @@ async def generate_api_key(
         }
         
         # Insert key
-        result = supabase.from_("api_keys").insert(key_data).execute()
+        key_record = await repository.insert_api_key(key_data)
         
-        if not result.data:
+        if not key_record:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create API key"
             )
         
-        key_record = result.data[0]
-        
         # Check if this is the first API key for this org (legal acknowledgment)
-        if existing_keys.count == 0:
-            supabase.from_("organizations").update({
-                "legal_acknowledgment": True,
-                "legal_acknowledgment_at": now.isoformat()
-            }).eq("id", org_id).execute()
+        if existing_count == 0:
+            await repository.record_legal_acknowledgment(org_id, now.isoformat())
+        
+        record_events(API_KEY_CREATED, org_id, {"type": "USER", "id": user_info.get("user_id")}, [{
+            "key_id": key_record["id"],
+            "name": key_record["name"],
+            "environment": key_record["environment"],
+            "key_prefix": key_prefix,
+        }])
         
         return GenerateKeyResponse(
             key_id=key_record["id"],
@@ -199,13 +201,10 @@ async def list_api_keys(
     List API keys for authenticated user.
     
     Returns masked keys (prefix only), names, environments, status, last_used.
+    last_used_at is written back in batches and may lag by a few seconds.
     """
     try:
-        supabase = get_supabase()
-        
-        result = supabase.from_("api_keys").select(
-            "id, name, environment, key_prefix, status, created_at, last_used_at, expires_at"
-        ).eq("org_id", user_info["org_id"]).order("created_at", desc=True).execute()
+        keys = await get_repository().list_api_keys(user_info["org_id"])
         
         return [
             KeyInfo(
@@ -218,7 +217,7 @@ async def list_api_keys(
                 last_used_at=key.get("last_used_at"),
                 expires_at=key.get("expires_at")
             )
-            for key in result.data
+            for key in keys
         ]
         
     except Exception as e:
@@ -237,27 +236,27 @@ async def revoke_api_key(
     """
     Revoke an API key.
     
-    Sets status = 'revoked' and revoked_at = now().
+    Sets status = 'revoked' and revoked_at = now() and drops the key from
+    the verified-key cache.
     """
     try:
-        supabase = get_supabase()
+        repository = get_repository()
         
         # Verify key belongs to this organization
-        key_check = supabase.from_("api_keys").select("id").eq(
-            "id", key_id
-        ).eq("org_id", user_info["org_id"]).execute()
+        key_check = await repository.get_api_key_for_org(key_id, user_info["org_id"])
         
-        if not key_check.data:
+        if not key_check:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="API key not found"
             )
         
         # Revoke the key
-        supabase.from_("api_keys").update({
-            "status": "revoked",
-            "revoked_at": datetime.now(timezone.utc).isoformat()
-        }).eq("id", key_id).execute()
+        await repository.revoke_api_key(key_id, datetime.now(timezone.utc).isoformat())
+        invalidate_cached_key(key_id)
+        record_events(
+            API_KEY_REVOKED, user_info["org_id"], {"type": "USER", "id": user_info.get("user_id")}, [{"key_id": key_id}]
+        )
         
         return {"message": "API key revoked successfully"}
         
@@ -281,20 +280,14 @@ async def get_usage_info(
     Returns: plan, evaluationsThisMonth, evaluationsLimit, resetDate, percentUsed.
     """
     try:
-        supabase = get_supabase()
-        
         # Get current month usage
         now = datetime.now(timezone.utc)
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         next_month = month_start.replace(month=month_start.month + 1) if month_start.month < 12 else month_start.replace(year=month_start.year + 1, month=1)
         
-        usage_result = supabase.from_("api_usage").select(
-            "evaluations_count"
-        ).eq("org_id", user_info["org_id"]).gte(
-            "period_start", month_start.isoformat()
-        ).lt("period_start", next_month.isoformat()).execute()
-        
-        evaluations_this_month = sum(row["evaluations_count"] for row in usage_result.data)
+        evaluations_this_month = await get_repository().sum_usage(
+            user_info["org_id"], month_start.isoformat(), next_month.isoformat()
+        )
         
         # Plan limits
         plan = user_info["plan"]
@@ -11,7 +11,9 @@ from pydantic import BaseModel, Field
 import logging
 from auth.jwt_auth import verify_jwt_token
 from auth.api_keys import verify_api_key, APIKeyInfo
-from auth.supabase_client import get_supabase
+from db.repository import get_repository
+from compliance.org_packs import invalidate_enabled_packs
+from audit import POLICY_PACK_DISABLED, POLICY_PACK_ENABLED, record_events
 from data.packs import get_all_packs, get_pack_by_id, get_pack_summary
 
 logger = logging.getLogger(__name__)
@@ -196,37 +198,31 @@ async def enable_policy_pack(
                 detail=f"Policy pack '{request.pack_id}' requires a Pro plan"
             )
         
-        supabase = get_supabase()
+        repository = get_repository()
         org_id = user_info["org_id"]
         plan = user_info["plan"]
         
         # Check if already enabled
-        existing = supabase.from_("organization_packs").select("id").eq(
-            "org_id", org_id
-        ).eq("pack_id", request.pack_id).eq("enabled", True).execute()
-        
-        if existing.data:
+        if await repository.is_pack_enabled(org_id, request.pack_id):
             return {"message": f"Policy pack '{request.pack_id}' is already enabled"}
         
         # Check plan limits
         if plan == "free":
-            enabled_count = supabase.from_("organization_packs").select("count", count="exact").eq(
-                "org_id", org_id
-            ).eq("enabled", True).execute()
+            enabled_count = await repository.count_enabled_packs(org_id)
             
-            if enabled_count.count >= 2:
+            if enabled_count >= 2:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Free plan allows maximum 2 enabled policy packs"
                 )
         
         # Enable the pack
-        supabase.from_("organization_packs").upsert({
-            "org_id": org_id,
+        await repository.enable_pack(org_id, request.pack_id, datetime.now(timezone.utc).isoformat())
+        invalidate_enabled_packs(org_id)
+        record_events(POLICY_PACK_ENABLED, org_id, {"type": "USER", "id": user_info.get("user_id")}, [{
             "pack_id": request.pack_id,
-            "enabled": True,
-            "enabled_at": f"{datetime.now(timezone.utc).isoformat()}"
-        }).execute()
+            "version": pack_data["version"],
+        }])
         
         return {
             "message": f"Policy pack '{request.pack_id}' enabled successfully",
@@ -254,25 +250,22 @@ async def disable_policy_pack(
     Requires JWT authentication.
     """
     try:
-        supabase = get_supabase()
+        repository = get_repository()
         org_id = user_info["org_id"]
         
         # Check if currently enabled
-        existing = supabase.from_("organization_packs").select("id").eq(
-            "org_id", org_id
-        ).eq("pack_id", request.pack_id).eq("enabled", True).execute()
-        
-        if not existing.data:
+        if not await repository.is_pack_enabled(org_id, request.pack_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Policy pack '{request.pack_id}' is not currently enabled"
             )
         
         # Disable the pack
-        supabase.from_("organization_packs").update({
-            "enabled": False,
-            "disabled_at": f"{datetime.now(timezone.utc).isoformat()}"
-        }).eq("org_id", org_id).eq("pack_id", request.pack_id).execute()
+        await repository.disable_pack(org_id, request.pack_id, datetime.now(timezone.utc).isoformat())
+        invalidate_enabled_packs(org_id)
+        record_events(
+            POLICY_PACK_DISABLED, org_id, {"type": "USER", "id": user_info.get("user_id")}, [{"pack_id": request.pack_id}]
+        )
         
         # Get pack name for response
         pack_data = get_pack_by_id(request.pack_id)
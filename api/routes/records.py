@@ -1,83 +1,139 @@
 """Records retrieval endpoint for LUMEN SDK API."""
 
+import base64
+import binascii
+import json
+import os
 from datetime import datetime, timezone
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from auth.api_keys import verify_api_key
-from models.schemas import HumanAction, RecordResponse, Verdict
+from auth.api_keys import APIKeyInfo, verify_api_key
+from models.schemas import RecordListResponse, RecordResponse, Verdict
+from records import Position, RecordQuery, get_record_store, get_record_writer
 
 router = APIRouter(prefix="/v1", tags=["Records"])
 
-# In-memory store for MVP (v1.0.0)
-# Production (v1.1.0+): PostgreSQL persistence
-MOCK_RECORDS: dict[str, RecordResponse] = {}
+# Page sizes for GET /v1/records; larger limits are capped at the maximum
+RECORDS_DEFAULT_PAGE_SIZE = int(os.getenv("RECORDS_DEFAULT_PAGE_SIZE", "10"))
+RECORDS_MAX_PAGE_SIZE = int(os.getenv("RECORDS_MAX_PAGE_SIZE", "100"))
+
+
+def encode_cursor(position: Position) -> str:
+    """Encode a list position as an opaque cursor."""
+    raw = json.dumps(list(position), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Position:
+    """
+    Decode a cursor from encode_cursor().
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(created_at, (int, float)) and not isinstance(created_at, bool) and isinstance(record_id, str):
+            return float(created_at), record_id
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        pass
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _timestamp(moment: Optional[datetime]) -> Optional[float]:
+    if moment is None:
+        return None
+    # Times without an offset are taken as UTC
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
 
 
 @router.get("/records/{record_id}", response_model=RecordResponse)
 async def get_record(
     record_id: UUID,
-    api_key_data: dict = Depends(verify_api_key)
+    api_key_data: APIKeyInfo = Depends(verify_api_key)
 ) -> RecordResponse:
     """
     Retrieve a defensible record by ID.
-    
+
     Args:
         record_id: UUID of the record to retrieve
         api_key_data: Validated API key metadata (injected)
-        
+
     Returns:
         RecordResponse with full record details
-        
+
     Raises:
-        HTTPException: If record not found
+        HTTPException: 404 if the record does not exist or belongs to
+            another organization
     """
-    record_id_str = str(record_id)
-    
-    # Check store
-    if record_id_str in MOCK_RECORDS:
-        return MOCK_RECORDS[record_id_str]
-    
-    # MVP (v1.0.0): Return demonstration record
-    # Production (v1.1.0+): Query PostgreSQL, return 404 if not found
-    
-    # Generate deterministic demo record for API testing
-    demo_record = RecordResponse(
-        record_id=record_id,
-        ai_output="[Demo] Sample AI output for API demonstration.",
-        human_action=HumanAction.ACCEPTED,
-        compliance_packs=["phipa"],
-        lumen_score=85,
-        tier=1,
-        verdict=Verdict.ALLOW,
-        citation_integrity=0.92,
-        created_at=datetime.now(timezone.utc).isoformat(),
-        context={"demo": True, "version": "1.0.0"}
-    )
-    
-    return demo_record
+    # Records not yet flushed by the write-behind writer are served from it
+    record = get_record_writer().pending(api_key_data.org_id, str(record_id))
+    if record is None:
+        record = await get_record_store().get(api_key_data.org_id, str(record_id))
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Record '{record_id}' not found"
+        )
+    return RecordResponse.model_validate(record.to_dict())
 
 
-@router.get("/records", response_model=list[RecordResponse])
+@router.get("/records", response_model=RecordListResponse)
 async def list_records(
-    limit: int = 10,
-    offset: int = 0,
-    api_key_data: dict = Depends(verify_api_key)
-) -> list[RecordResponse]:
+    limit: int = Query(RECORDS_DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    verdict: Optional[Verdict] = Query(None, description="Only records with this verdict"),
+    tier: Optional[int] = Query(None, ge=1, le=3, description="Only records in this risk tier"),
+    pack: Optional[str] = Query(None, description="Only records evaluated against this pack"),
+    created_after: Optional[datetime] = Query(None, description="Only records created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only records created before this time"),
+    api_key_data: APIKeyInfo = Depends(verify_api_key)
+) -> RecordListResponse:
     """
-    List defensible records with pagination.
-    
+    List the organization's defensible records, newest first.
+
+    Pages are keyset-paginated on (created_at, record_id): pass the
+    returned next_cursor to get the next page, with the same filters.
+    Every filter is served from an index, so a deep page costs the same
+    as the first one, and new records do not shift later pages. Records
+    are listed once the record writer has flushed them (see
+    RECORD_FLUSH_INTERVAL_SECONDS).
+
     Args:
-        limit: Maximum number of records to return (default 10)
-        offset: Number of records to skip (default 0)
+        limit: Maximum number of records to return (capped at RECORDS_MAX_PAGE_SIZE)
+        cursor: Where the page starts; None for the newest records
+        verdict: Verdict filter
+        tier: Risk tier filter
+        pack: Pack id filter
+        created_after: Start of the time range (inclusive)
+        created_before: End of the time range (exclusive)
         api_key_data: Validated API key metadata (injected)
-        
+
     Returns:
-        List of RecordResponse objects
+        RecordListResponse with the page and the cursor of the next one
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
     """
-    # MVP (v1.0.0): In-memory storage
-    # Production (v1.1.0+): PostgreSQL with proper pagination
-    
-    records = list(MOCK_RECORDS.values())
-    return records[offset:offset + limit]
+    after = decode_cursor(cursor) if cursor is not None else None
+    limit = min(limit, RECORDS_MAX_PAGE_SIZE)
+    query = RecordQuery(
+        verdict=verdict.value if verdict is not None else None,
+        tier=tier,
+        pack_id=pack,
+        created_after=_timestamp(created_after),
+        created_before=_timestamp(created_before),
+    )
+
+    # One extra record tells whether there is a next page
+    records = await get_record_store().list(api_key_data.org_id, limit + 1, query, after)
+    next_cursor = encode_cursor(records[limit - 1].position) if len(records) > limit else None
+    return RecordListResponse(
+        records=[RecordResponse.model_validate(record.to_dict()) for record in records[:limit]],
+        next_cursor=next_cursor
+    )
@@ -0,0 +1,31 @@
+"""
+Scoring package for LUMEN SDK API.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from .kernel import (
+    CONFIDENCE_SCORES,
+    FACTOR_WEIGHTS,
+    KERNEL_VERSION,
+    KERNEL_WEIGHTS,
+    MCDA_VERSION,
+    calculate_decision_trust,
+    calculate_lumen_score,
+    calculate_strategic_confidence,
+    determine_tier,
+)
+from .monte_carlo import calculate_risk_adjusted_score
+
+__all__ = [
+    "CONFIDENCE_SCORES",
+    "FACTOR_WEIGHTS",
+    "KERNEL_VERSION",
+    "KERNEL_WEIGHTS",
+    "MCDA_VERSION",
+    "calculate_decision_trust",
+    "calculate_lumen_score",
+    "calculate_risk_adjusted_score",
+    "calculate_strategic_confidence",
+    "determine_tier",
+]
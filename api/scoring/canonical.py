@@ -0,0 +1,165 @@
+"""
+JavaScript-compatible canonical JSON and rounding for the LUMEN scoring kernel.
+
+The TypeScript kernel hashes ``JSON.stringify`` output and rounds with
+``Math.round``. Python's ``json.dumps`` formats numbers differently
+(``1.0``, ``1e-05``) and ``round`` rounds half to even, so reproducing
+the TS ``inputsHash`` and scores needs these helpers.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import hashlib
+import math
+import re
+from decimal import Decimal
+from json.encoder import encode_basestring
+from typing import Any, List, Tuple
+
+# Lone surrogates are the only characters JSON.stringify escapes that
+# json's (C accelerated) encode_basestring leaves as they are
+_SURROGATES = re.compile("[\ud800-\udfff]")
+
+# Printable ASCII in ICU root collation order, as used by
+# String.prototype.localeCompare in Node. Letters differing only in case
+# share a primary weight; lowercase sorts first on ties.
+_COLLATION_ORDER = " _-,;:!?.'\"()[]{}@*/\\&#%`^+<=>|~$0123456789abcdefghijklmnopqrstuvwxyz"
+_PRIMARY_WEIGHTS = {char: rank for rank, char in enumerate(_COLLATION_ORDER)}
+_PRIMARY_WEIGHTS.update({char.upper(): _PRIMARY_WEIGHTS[char] for char in "abcdefghijklmnopqrstuvwxyz"})
+
+
+def js_round(value: float) -> int:
+    """
+    Round like JavaScript's Math.round (halves round towards +infinity).
+
+    Args:
+        value: Number to round
+
+    Returns:
+        int: Rounded value
+    """
+    floor = math.floor(value)
+    return floor + 1 if value - floor >= 0.5 else floor
+
+
+def js_number(value: float) -> str:
+    """
+    Format a number the way JavaScript's Number.prototype.toString does.
+
+    Args:
+        value: int or float
+
+    Returns:
+        str: Decimal representation matching JSON.stringify
+    """
+    if isinstance(value, int):
+        return str(value)
+    if not math.isfinite(value):
+        return "null"
+    if value.is_integer() and abs(value) < 2**53:
+        return str(int(value))
+
+    sign = "-" if value < 0 else ""
+    # repr() gives the shortest round-tripping digits, as JavaScript does
+    _, raw_digits, exponent = Decimal(repr(abs(value))).as_tuple()
+    raw = "".join(map(str, raw_digits))
+    digits = raw.rstrip("0")
+    exponent += len(raw) - len(digits)
+    k = len(digits)
+    n = exponent + k  # value = 0.<digits> * 10**n
+
+    if k <= n <= 21:
+        return sign + digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return sign + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + digits
+    e = n - 1
+    mantissa = digits if k == 1 else digits[0] + "." + digits[1:]
+    return f"{sign}{mantissa}e{'+' if e >= 0 else '-'}{abs(e)}"
+
+
+def _js_string(value: str) -> str:
+    encoded = encode_basestring(value)
+    if value.isascii() or not _SURROGATES.search(value):
+        return encoded
+    return _SURROGATES.sub(lambda m: f"\\u{ord(m.group()):04x}", encoded)
+
+
+def _is_array_index(key: str) -> bool:
+    return key.isdigit() and key.isascii() and (key == "0" or key[0] != "0") and int(key) < 2**32 - 1
+
+
+def _js_object(value: dict) -> str:
+    keys = list(value)
+    if any(key[:1].isdigit() and _is_array_index(key) for key in keys):
+        indexes = sorted((key for key in keys if _is_array_index(key)), key=int)
+        keys = indexes + [key for key in keys if not _is_array_index(key)]
+    return "{" + ",".join([_js_string(key) + ":" + js_stringify(value[key]) for key in keys]) + "}"
+
+
+def js_stringify(value: Any) -> str:
+    """
+    Serialize a value exactly as JavaScript's JSON.stringify would.
+
+    Objects keep insertion order, except that array-index keys come first
+    in ascending order, as in JavaScript property enumeration.
+
+    Args:
+        value: JSON-compatible value (dict, list, str, int, float, bool, None)
+
+    Returns:
+        str: Compact JSON text
+
+    Raises:
+        TypeError: If the value is not JSON-compatible
+    """
+    kind = type(value)
+    if kind is str:
+        return _js_string(value)
+    if kind is dict:
+        return _js_object(value)
+    if kind is list or kind is tuple:
+        return "[" + ",".join([js_stringify(item) for item in value]) + "]"
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if kind is int or kind is float:
+        return js_number(value)
+    # Subclasses (str enums, OrderedDict, ...) take the slower checks
+    if isinstance(value, str):
+        return _js_string(value)
+    if isinstance(value, dict):
+        return _js_object(value)
+    if isinstance(value, (int, float)):
+        return js_number(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join([js_stringify(item) for item in value]) + "]"
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def sha256_hex(message: str) -> str:
+    """SHA-256 of the UTF-8 encoded message as lowercase hex."""
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+def locale_compare_key(value: str) -> Tuple[List[int], List[int]]:
+    """
+    Sort key approximating String.prototype.localeCompare for ASCII.
+
+    Compares case-insensitively first using ICU root collation weights,
+    then breaks ties with lowercase before uppercase. Characters outside
+    printable ASCII sort after it by code point.
+
+    Args:
+        value: String to compare
+
+    Returns:
+        tuple: (primary weights, case weights)
+    """
+    primary = [_PRIMARY_WEIGHTS.get(char, 0x100 + ord(char)) for char in value]
+    tertiary = [1 if "A" <= char <= "Z" else 0 for char in value]
+    return primary, tertiary
@@ -0,0 +1,600 @@
+"""
+LUMEN Score kernel for LUMEN SDK API.
+
+Python port of src/scoring/LumenScore.ts:
+- Strategic Confidence (MCDA) with Risk Radar and PHIPA hard gate modifiers
+- Decision Trust kernel (citation, control, evidence, execution factors)
+- Composite LUMEN Score
+
+Inputs and results use the same camelCase shapes as the TypeScript SDK,
+and inputsHash is computed over the same canonical JSON, so a score
+calculated here can be reproduced by the SDK and vice versa.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from scoring.canonical import js_number, js_round, js_stringify, locale_compare_key, sha256_hex
+
+# Confidence scores (v3.0 - pessimistic)
+CONFIDENCE_SCORES: Dict[str, int] = {
+    "Strong": 85,        # Verified: specific citations, audit artifacts, enforcement
+    "Moderate": 60,      # Reasonable: some evidence, gaps in verification
+    "Limited": 35,       # Weak: stated intent only, no enforcement, no metrics
+    "Unverifiable": 15,  # Critical: vague claims, cannot be audited
+}
+
+# MCDA factor weights
+FACTOR_WEIGHTS: Dict[str, float] = {
+    "Technical Maturity": 0.20,
+    "Regulatory Alignment": 0.25,
+    "Labour Impact": 0.20,
+    "Workforce Change Impact": 0.20,
+    "Vendor Ecosystem": 0.15,
+    "Funding Pathway": 0.20,
+}
+
+DEFAULT_WEIGHT = 0.20
+
+# Decision Trust kernel weights, in summation order
+KERNEL_WEIGHTS: Dict[str, float] = {
+    "citationIntegrity": 0.30,
+    "controlAlignment": 0.25,
+    "evidenceQuality": 0.25,
+    "executionReadiness": 0.20,
+}
+
+TIER_THRESHOLDS: Tuple[Tuple[str, int], ...] = (
+    ("EXCELLENT", 90),
+    ("STRONG", 75),
+    ("MODERATE", 60),
+    ("WEAK", 40),
+    ("POOR", 0),
+)
+
+SEVERITY_WEIGHTS: Dict[str, int] = {"CRITICAL": 4, "HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+RECOMMENDED_RUNS: Dict[str, int] = {"LOW": 3, "MODERATE": 5, "HIGH": 10, "CRITICAL": 20}
+
+# PHIPA hard gate: regulatory confidence -> (modifier, audit note)
+PHIPA_MODIFIERS: Dict[str, Tuple[float, Optional[str]]] = {
+    "Strong": (1.00, None),
+    "Moderate": (0.90, "PHIPA: Moderate regulatory confidence with PHI"),
+    "Limited": (0.70, "PHIPA HARD GATE: Limited regulatory confidence with PHI"),
+    "Unverifiable": (0.50, "PHIPA HARD GATE: Unverifiable regulatory confidence with PHI"),
+}
+
+KERNEL_VERSION = "1.0.0"
+MCDA_VERSION = "LUMEN-v3.0"
+COMPOSITE_VERSION = f"COMPOSITE({MCDA_VERSION},{KERNEL_VERSION})"
+
+STRATEGIC_DESCRIPTION = "Pessimistic-by-default: penalizes vagueness, rewards verifiability."
+DECISION_DESCRIPTION = "Instance-specific assessment of output safety and trustworthiness"
+
+_TIER_ORDER = ("POOR", "WEAK", "MODERATE", "STRONG", "EXCELLENT")
+
+
+def _timestamp() -> str:
+    """ISO timestamp with millisecond precision, as Date.toISOString()."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+# ============================================================================
+# Monte Carlo variance
+# ============================================================================
+
+def compute_monte_carlo_variance(context: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compute variance across multiple runs (SDK stub).
+
+    Returns an unknown signal, which degrades scores by 25%. The simulated
+    signal is produced by scoring.monte_carlo.
+    """
+    return {"variance": 0, "runs": 0, "method": "STUB", "isStable": False}
+
+
+def calculate_variance_degradation(signal: Mapping[str, Any]) -> float:
+    """
+    Calculate the degradation factor for a Monte Carlo signal.
+
+    Args:
+        signal: Monte Carlo signal (variance, runs, method, isStable)
+
+    Returns:
+        float: Multiplier between 0.25 and 1.0
+    """
+    if signal["runs"] == 0:
+        return 0.75  # 25% penalty for unknown
+    if signal["isStable"]:
+        return 1.0
+    normalized_variance = min(1, signal["variance"])
+    return max(0.25, 1.0 - normalized_variance * 0.75)
+
+
+def is_variance_unknown(signal: Mapping[str, Any]) -> bool:
+    """Check whether a Monte Carlo signal carries no variance information."""
+    return signal["runs"] == 0 or signal["method"] == "STUB"
+
+
+def recommended_runs(risk_class: str) -> int:
+    """Recommended number of Monte Carlo runs for a risk class (LOW..CRITICAL)."""
+    return RECOMMENDED_RUNS[risk_class]
+
+
+def _monte_carlo_note(degradation: float) -> str:
+    return f"Monte Carlo degradation: {js_round((1 - degradation) * 100)}% penalty"
+
+
+# ============================================================================
+# Strategic Confidence (MCDA)
+# ============================================================================
+
+def calculate_risk_modifier(risk_radar: Optional[Mapping[str, Any]], fatal_flaw_detected: bool) -> float:
+    """
+    Calculate the Risk Radar modifier.
+
+    A fatal flaw caps the score at 42 (below the MODERATE threshold).
+    """
+    if fatal_flaw_detected:
+        return 0.42
+    if not risk_radar:
+        return 1.00
+
+    values = list(risk_radar.values())
+    red_count = values.count("Red")
+    amber_count = values.count("Amber")
+
+    if red_count >= 3:
+        return 0.50
+    if red_count >= 2:
+        return 0.60
+    if red_count == 1:
+        return 0.75
+    if amber_count >= 4:
+        return 0.80
+    if amber_count >= 3:
+        return 0.85
+    if amber_count >= 2:
+        return 0.90
+    if amber_count >= 1:
+        return 0.95
+    return 1.00
+
+
+def calculate_phipa_modifier(
+    factors: Sequence[Mapping[str, Any]], phi_involved: bool
+) -> Tuple[float, Optional[str]]:
+    """
+    PHIPA hard gate: PHI combined with weak regulatory evidence is penalized.
+
+    Returns:
+        tuple: (modifier, audit note or None)
+    """
+    if not phi_involved:
+        return 1.00, None
+
+    for factor in factors:
+        name = factor["factorName"]
+        if name == "Regulatory Alignment" or "regulatory" in name.lower():
+            return PHIPA_MODIFIERS.get(factor["confidence"], (0.80, "PHIPA: Unknown regulatory confidence"))
+
+    return 0.55, "PHIPA HARD GATE: PHI involved but no regulatory assessment"
+
+
+def strategic_inputs_hash(
+    factors: Sequence[Mapping[str, Any]],
+    risk_radar: Optional[Mapping[str, Any]],
+    fatal_flaw_detected: bool,
+    phi_involved: bool,
+) -> str:
+    """SHA-256 of the Strategic Confidence inputs, as hashed by the SDK."""
+    hash_input: Dict[str, Any] = {"factors": factors}
+    # JSON.stringify drops an undefined riskRadar
+    if risk_radar is not None:
+        hash_input["riskRadar"] = risk_radar
+    hash_input["fatalFlawDetected"] = fatal_flaw_detected
+    hash_input["phiInvolved"] = phi_involved
+    return sha256_hex(js_stringify(hash_input))
+
+
+def calculate_strategic_confidence(
+    factors: Sequence[Mapping[str, Any]],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+    monte_carlo_signal: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Calculate the LUMEN Strategic Confidence score (MCDA).
+
+    Answers: "How viable is this system for adoption?"
+
+    Args:
+        factors: Evidence factors ({"factorName", "confidence"})
+        risk_radar: Risk level per domain ("Green", "Amber", "Red")
+        fatal_flaw_detected: Cap the score at 42
+        phi_involved: Apply the PHIPA hard gate
+        monte_carlo_signal: Optional variance signal
+
+    Returns:
+        dict: StrategicConfidenceResult, as in the TypeScript SDK
+    """
+    inputs_hash = strategic_inputs_hash(factors, risk_radar, fatal_flaw_detected, phi_involved)
+    calculated_at = _timestamp()
+
+    if not factors:
+        return {
+            "scoreName": "STRATEGIC_CONFIDENCE",
+            "finalScore": 50,
+            "baseScore": 50,
+            "riskModifier": 1.00,
+            "factorBreakdown": [],
+            "calculatedAt": calculated_at,
+            "algorithmVersion": MCDA_VERSION,
+            "description": STRATEGIC_DESCRIPTION,
+            "provenance": _provenance(
+                MCDA_VERSION, calculated_at, inputs_hash, monte_carlo_signal,
+                ["No factors provided — defaulting to neutral score"],
+            ),
+        }
+
+    factor_breakdown: List[Dict[str, Any]] = []
+    base_score = 0
+    for factor in factors:
+        numeric_score = CONFIDENCE_SCORES.get(factor["confidence"]) or 50
+        weight = FACTOR_WEIGHTS.get(factor["factorName"]) or DEFAULT_WEIGHT
+        contribution = numeric_score * weight
+        base_score += contribution
+        factor_breakdown.append({
+            "factorName": factor["factorName"],
+            "confidence": factor["confidence"],
+            "numericScore": numeric_score,
+            "weight": weight,
+            "contribution": contribution,
+        })
+
+    audit_notes: List[str] = []
+    risk_modifier = calculate_risk_modifier(risk_radar, fatal_flaw_detected)
+    if fatal_flaw_detected:
+        audit_notes.append("FATAL FLAW: Score capped at 42")
+
+    phipa_modifier, phipa_note = calculate_phipa_modifier(factors, phi_involved)
+    if phipa_note:
+        audit_notes.append(phipa_note)
+
+    mc_degradation = 1.0
+    if monte_carlo_signal is not None:
+        mc_degradation = calculate_variance_degradation(monte_carlo_signal)
+        if mc_degradation < 1.0:
+            audit_notes.append(_monte_carlo_note(mc_degradation))
+
+    combined_modifier = risk_modifier * phipa_modifier * mc_degradation
+    final_score = max(1, min(100, js_round(base_score * combined_modifier)))
+
+    return {
+        "scoreName": "STRATEGIC_CONFIDENCE",
+        "finalScore": final_score,
+        "baseScore": js_round(base_score),
+        "riskModifier": combined_modifier,
+        "factorBreakdown": factor_breakdown,
+        "calculatedAt": calculated_at,
+        "algorithmVersion": MCDA_VERSION,
+        "description": STRATEGIC_DESCRIPTION + " Litmus test: would this score survive a subpoena?",
+        "provenance": _provenance(MCDA_VERSION, calculated_at, inputs_hash, monte_carlo_signal, audit_notes),
+    }
+
+
+# ============================================================================
+# Decision Trust (kernel)
+# ============================================================================
+
+def _citation_integrity_factor(metrics: Mapping[str, Any]) -> int:
+    total = metrics["totalCitations"]
+    if total == 0:
+        return 70
+
+    score = metrics["verifiedCitations"] / total * 100
+    score -= metrics["fabricatedCitations"] / total * 50
+    score -= metrics["mismatchedCitations"] / total * 20
+    return max(0, min(100, js_round(score)))
+
+
+def _control_alignment_factor(results: Sequence[Mapping[str, Any]]) -> int:
+    if not results:
+        return 50
+
+    total_weight = 0
+    passed_weight = 0
+    critical_failure = False
+    for result in results:
+        weight = SEVERITY_WEIGHTS[result["severity"]]
+        total_weight += weight
+        if result["passed"]:
+            passed_weight += weight
+        elif result["severity"] == "CRITICAL":
+            critical_failure = True
+
+    score = passed_weight / total_weight * 100
+    if critical_failure:
+        score = min(score, 40)
+    return max(0, min(100, js_round(score)))
+
+
+def _evidence_quality_factor(metrics: Mapping[str, Any]) -> int:
+    source_count = metrics["sourceCount"]
+    if source_count == 0:
+        return 20
+
+    source_score = min(source_count / 10, 1) * 40
+    retrieval_score = metrics["avgRetrievalScore"] * 40
+    diversity_score = min(metrics["documentTypeCount"] / 5, 1) * 20
+    return max(0, min(100, js_round(source_score + retrieval_score + diversity_score)))
+
+
+def _execution_readiness_factor(context: Optional[Mapping[str, Any]]) -> int:
+    if context is None:
+        return 50
+
+    score = 40
+    if context.get("hasDefinedBoundaries"):
+        score += 20
+    if context.get("hasRollbackPlan"):
+        score += 20
+    if context.get("hasMonitoringPlan"):
+        score += 20
+    return max(0, min(100, score))
+
+
+def _citation_note(metrics: Mapping[str, Any]) -> str:
+    if metrics["totalCitations"] == 0:
+        return "No citations to verify"
+    if metrics["fabricatedCitations"] > 0:
+        return f"{js_number(metrics['fabricatedCitations'])} fabricated citation(s) detected"
+    if metrics["mismatchedCitations"] > 0:
+        return f"{js_number(metrics['mismatchedCitations'])} content mismatch(es)"
+    return f"{js_number(metrics['verifiedCitations'])}/{js_number(metrics['totalCitations'])} verified"
+
+
+def _control_note(results: Sequence[Mapping[str, Any]]) -> str:
+    if not results:
+        return "No controls evaluated"
+    passed = sum(1 for result in results if result["passed"])
+    critical = sum(1 for result in results if result["severity"] == "CRITICAL" and not result["passed"])
+    if critical > 0:
+        return f"{critical} critical control(s) failed"
+    return f"{passed}/{len(results)} controls passed"
+
+
+def _evidence_note(metrics: Mapping[str, Any]) -> str:
+    if metrics["sourceCount"] == 0:
+        return "No sources available"
+    return (
+        f"{js_number(metrics['sourceCount'])} sources, {js_number(metrics['documentTypeCount'])} types, "
+        f"avg score {js_round(metrics['avgRetrievalScore'] * 100)}%"
+    )
+
+
+def _execution_note(context: Optional[Mapping[str, Any]]) -> str:
+    if context is None:
+        return "Workflow context not provided"
+    items = [
+        label for key, label in (
+            ("hasDefinedBoundaries", "boundaries"),
+            ("hasRollbackPlan", "rollback"),
+            ("hasMonitoringPlan", "monitoring"),
+        )
+        if context.get(key)
+    ]
+    if not items:
+        return "No execution safeguards defined"
+    return "Has: " + ", ".join(items)
+
+
+def determine_tier(score: float) -> str:
+    """Map a 0-100 score to its tier (EXCELLENT, STRONG, MODERATE, WEAK, POOR)."""
+    for tier, threshold in TIER_THRESHOLDS:
+        if score >= threshold:
+            return tier
+    return "POOR"
+
+
+def decision_factor_scores(decision_input: Mapping[str, Any]) -> Tuple[int, int, int, int]:
+    """
+    Raw Decision Trust factor scores, in KERNEL_WEIGHTS order.
+
+    Returns:
+        tuple: (citationIntegrity, controlAlignment, evidenceQuality, executionReadiness)
+    """
+    return (
+        _citation_integrity_factor(decision_input["citationIntegrity"]),
+        _control_alignment_factor(decision_input["controlResults"]),
+        _evidence_quality_factor(decision_input["evidenceMetrics"]),
+        _execution_readiness_factor(decision_input.get("workflowContext")),
+    )
+
+
+def decision_inputs_hash(decision_input: Mapping[str, Any]) -> str:
+    """
+    SHA-256 of the canonical Decision Trust input.
+
+    Control results are sorted by controlId then severity, so the hash
+    does not depend on the order controls were evaluated in.
+    """
+    controls = sorted(
+        decision_input["controlResults"],
+        key=lambda control: (locale_compare_key(control["controlId"]), locale_compare_key(control["severity"])),
+    )
+    workflow = decision_input.get("workflowContext")
+    canonical = {
+        "citationIntegrity": decision_input["citationIntegrity"],
+        "controlResults": [
+            {"controlId": c["controlId"], "passed": c["passed"], "severity": c["severity"]}
+            for c in controls
+        ],
+        "evidenceMetrics": decision_input["evidenceMetrics"],
+        "workflowContext": {
+            "hasDefinedBoundaries": _default_false(workflow.get("hasDefinedBoundaries")),
+            "hasRollbackPlan": _default_false(workflow.get("hasRollbackPlan")),
+            "hasMonitoringPlan": _default_false(workflow.get("hasMonitoringPlan")),
+        } if workflow is not None else None,
+        "kernelVersion": KERNEL_VERSION,
+    }
+    return sha256_hex(js_stringify(canonical))
+
+
+def _default_false(value: Any) -> Any:
+    """JavaScript's ``value ?? false``."""
+    return False if value is None else value
+
+
+def calculate_decision_trust(
+    decision_input: Mapping[str, Any],
+    monte_carlo_signal: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Calculate the LUMEN Decision Trust score (kernel).
+
+    Answers: "Can this specific output be trusted right now?"
+
+    Args:
+        decision_input: citationIntegrity, controlResults, evidenceMetrics
+            and optional workflowContext
+        monte_carlo_signal: Optional variance signal
+
+    Returns:
+        dict: DecisionTrustResult, as in the TypeScript SDK
+    """
+    inputs_hash = decision_inputs_hash(decision_input)
+    citation_integrity = decision_input["citationIntegrity"]
+    control_results = decision_input["controlResults"]
+    evidence_metrics = decision_input["evidenceMetrics"]
+    workflow_context = decision_input.get("workflowContext")
+
+    raw_scores = decision_factor_scores(decision_input)
+    weighted = [score * weight for score, weight in zip(raw_scores, KERNEL_WEIGHTS.values())]
+
+    audit_notes: List[str] = []
+    mc_degradation = 1.0
+    if monte_carlo_signal is not None:
+        mc_degradation = calculate_variance_degradation(monte_carlo_signal)
+        if mc_degradation < 1.0:
+            audit_notes.append(_monte_carlo_note(mc_degradation))
+
+    weighted_sum = weighted[0] + weighted[1] + weighted[2] + weighted[3]
+    overall = js_round(weighted_sum * mc_degradation)
+    safe_sum = weighted_sum if weighted_sum > 0 else 1
+
+    notes = (
+        _citation_note(citation_integrity),
+        _control_note(control_results),
+        _evidence_note(evidence_metrics),
+        _execution_note(workflow_context),
+    )
+    factors = {
+        name: {
+            "score": score,
+            "contributionPct": js_round(value / safe_sum * 1000) / 10,
+            "note": note,
+        }
+        for name, score, value, note in zip(KERNEL_WEIGHTS, raw_scores, weighted, notes)
+    }
+    calculated_at = _timestamp()
+
+    return {
+        "scoreName": "DECISION_TRUST",
+        "overall": overall,
+        "tier": determine_tier(overall),
+        "factors": factors,
+        "description": DECISION_DESCRIPTION,
+        "inputsHash": inputs_hash,
+        "kernelVersion": KERNEL_VERSION,
+        "calculatedAt": calculated_at,
+        "reproducible": True,
+        "provenance": _provenance(KERNEL_VERSION, calculated_at, inputs_hash, monte_carlo_signal, audit_notes),
+    }
+
+
+# ============================================================================
+# Composite score
+# ============================================================================
+
+def composite_inputs_hash(strategic_hash: str, decision_hash: str) -> str:
+    """SHA-256 identifying a composite score, from its two inputs hashes."""
+    return sha256_hex(js_stringify({"strategic": strategic_hash, "decision": decision_hash}))
+
+
+def calculate_lumen_score(
+    strategic_factors: Sequence[Mapping[str, Any]],
+    decision_input: Mapping[str, Any],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+    monte_carlo_signal: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Calculate the composite LUMEN Score.
+
+    Composite = Strategic x 0.4 + Decision x 0.6; Decision Trust is
+    weighted higher because it is instance-specific.
+
+    Args:
+        monte_carlo_signal: Variance signal from scoring.monte_carlo; the
+            SDK's stub signal (25% penalty) is used when not given
+
+    Returns:
+        dict: strategicConfidence, decisionTrust, compositeScore and
+        compositeProvenance, as in the TypeScript SDK
+    """
+    mc = monte_carlo_signal if monte_carlo_signal is not None else compute_monte_carlo_variance()
+
+    strategic = calculate_strategic_confidence(
+        strategic_factors, risk_radar, fatal_flaw_detected, phi_involved, mc
+    )
+    decision = calculate_decision_trust(decision_input, mc)
+
+    composite_score = js_round(strategic["finalScore"] * 0.4 + decision["overall"] * 0.6)
+    composite_hash = composite_inputs_hash(
+        strategic["provenance"]["inputsHash"], decision["provenance"]["inputsHash"]
+    )
+
+    return {
+        "strategicConfidence": strategic,
+        "decisionTrust": decision,
+        "compositeScore": composite_score,
+        "compositeProvenance": _provenance(
+            COMPOSITE_VERSION, _timestamp(), composite_hash, mc,
+            strategic["provenance"]["auditNotes"] + decision["provenance"]["auditNotes"],
+        ),
+    }
+
+
+def meets_threshold(score: float, threshold: float) -> bool:
+    """Check if a score meets a minimum threshold."""
+    return score >= threshold
+
+
+def meets_minimum_tier(tier: str, required_tier: str) -> bool:
+    """Check if a tier is at or above the required tier."""
+    return _TIER_ORDER.index(tier) >= _TIER_ORDER.index(required_tier)
+
+
+def _provenance(
+    algorithm_version: str,
+    calculated_at: str,
+    inputs_hash: str,
+    monte_carlo_signal: Optional[Mapping[str, Any]],
+    audit_notes: List[str],
+) -> Dict[str, Any]:
+    provenance: Dict[str, Any] = {
+        "algorithmVersion": algorithm_version,
+        "calculatedAt": calculated_at,
+        "inputsHash": inputs_hash,
+        "reproducible": True,
+    }
+    # Omitted rather than null when absent, as JSON.stringify drops undefined
+    if monte_carlo_signal is not None:
+        provenance["monteCarloSignal"] = monte_carlo_signal
+    provenance["auditNotes"] = audit_notes
+    return provenance
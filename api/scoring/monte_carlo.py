@@ -0,0 +1,392 @@
+"""
+Monte Carlo risk adjustment for the LUMEN scoring kernel.
+
+Implements the risk adjustment from ADR 001 (docs/adr/001-scoring-kernel-design.md):
+every input factor score is perturbed within its uncertainty range, the
+composite score is recomputed for each run, and the reported score blends
+the base score with the 5th-percentile (worst-case) score:
+
+    Final Score = 0.7 x Base Score + 0.3 x Worst-Case Score
+
+All perturbations are drawn as one (runs x factors) matrix and scored
+with a single matrix product; the percentile is taken with np.partition.
+Batches of evaluations are stacked and scored together (see run()).
+Each generator is seeded from its composite inputs hash, so identical
+inputs always reproduce the same simulation.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import math
+import os
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring import kernel
+from scoring.canonical import js_round
+
+# Runs per evaluation = recommended_runs(risk class) x multiplier
+# (LOW 1,500 / MODERATE 2,500 / HIGH 5,000 / CRITICAL 10,000 by default)
+MONTE_CARLO_RUN_MULTIPLIER = int(os.getenv("MONTE_CARLO_RUN_MULTIPLIER", "500"))
+# Most simulations stacked into one simulate_many() call; bounds the draw
+# tensor (simulations x runs x factors) however large the batch
+MONTE_CARLO_GROUP_SIZE = int(os.getenv("MONTE_CARLO_GROUP_SIZE", "32"))
+# Standard deviation (score points) at or below which a simulation is stable
+MONTE_CARLO_STABLE_STDDEV = float(os.getenv("MONTE_CARLO_STABLE_STDDEV", "3"))
+
+WORST_CASE_PERCENTILE = 5
+BASE_WEIGHT = 0.7
+WORST_CASE_WEIGHT = 0.3
+
+# Composite = Strategic x 0.4 + Decision x 0.6 (as in kernel.calculate_lumen_score)
+STRATEGIC_WEIGHT = 0.4
+DECISION_WEIGHT = 0.6
+
+# Half-width of the uncertainty range, in score points, per evidence confidence
+CONFIDENCE_RANGES: Dict[str, float] = {
+    "Strong": 5.0,
+    "Moderate": 10.0,
+    "Limited": 15.0,
+    "Unverifiable": 20.0,
+}
+DEFAULT_CONFIDENCE_RANGE = 15.0
+
+# Decision Trust factors: (range per unit sample, range with no samples)
+CITATION_RANGE = (50.0, 30.0)
+CONTROL_RANGE = (30.0, 30.0)
+EVIDENCE_RANGE = (40.0, 20.0)
+# Execution readiness: (workflow context given, not given)
+EXECUTION_RANGE = (10.0, 25.0)
+MIN_RANGE = 2.0
+
+
+def _sample_range(count: float, scale: Tuple[float, float]) -> float:
+    """Uncertainty shrinks with the square root of the sample size."""
+    per_unit, missing = scale
+    if not count:
+        return missing
+    return min(missing, max(MIN_RANGE, per_unit / math.sqrt(count)))
+
+
+def decision_ranges(decision_input: Mapping[str, Any]) -> Tuple[float, float, float, float]:
+    """
+    Uncertainty range of each Decision Trust factor, in KERNEL_WEIGHTS order.
+
+    Factors backed by more citations, controls or sources are less uncertain.
+    """
+    return (
+        _sample_range(decision_input["citationIntegrity"]["totalCitations"], CITATION_RANGE),
+        _sample_range(len(decision_input["controlResults"]), CONTROL_RANGE),
+        _sample_range(decision_input["evidenceMetrics"]["sourceCount"], EVIDENCE_RANGE),
+        EXECUTION_RANGE[0] if decision_input.get("workflowContext") is not None else EXECUTION_RANGE[1],
+    )
+
+
+def classify_risk(
+    decision_input: Mapping[str, Any],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+) -> str:
+    """
+    Risk class of an evaluation, which sets the number of runs.
+
+    Returns:
+        str: LOW, MODERATE, HIGH or CRITICAL
+    """
+    failed = [control["severity"] for control in decision_input["controlResults"] if not control["passed"]]
+    radar = list(risk_radar.values()) if risk_radar else []
+
+    if fatal_flaw_detected or "CRITICAL" in failed:
+        return "CRITICAL"
+    if phi_involved or "Red" in radar or "HIGH" in failed:
+        return "HIGH"
+    if failed or "Amber" in radar:
+        return "MODERATE"
+    return "LOW"
+
+
+def run_count(risk_class: str) -> int:
+    """Number of simulation runs for a risk class."""
+    return kernel.recommended_runs(risk_class) * MONTE_CARLO_RUN_MULTIPLIER
+
+
+def composite_model(
+    strategic_factors: Sequence[Mapping[str, Any]],
+    decision_input: Mapping[str, Any],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Express the composite score as a linear model over factor scores.
+
+    Row i of the weight matrix holds factor i's contribution to the
+    strategic (column 0) and decision (column 1) parts of the composite,
+    with the composite weights, Risk Radar and PHIPA modifiers folded in.
+    With no strategic factors the kernel's neutral score of 50 is a fixed
+    row with no uncertainty.
+
+    Returns:
+        tuple: (values, ranges, weights) with shapes (k,), (k,), (k, 2)
+    """
+    strategic_count = len(strategic_factors) or 1
+    size = strategic_count + len(kernel.KERNEL_WEIGHTS)
+    values = np.empty(size)
+    ranges = np.empty(size)
+    weights = np.zeros((size, 2))
+
+    if strategic_factors:
+        modifier = (
+            kernel.calculate_risk_modifier(risk_radar, fatal_flaw_detected)
+            * kernel.calculate_phipa_modifier(strategic_factors, phi_involved)[0]
+        )
+        for i, factor in enumerate(strategic_factors):
+            confidence = factor["confidence"]
+            values[i] = kernel.CONFIDENCE_SCORES.get(confidence) or 50
+            ranges[i] = CONFIDENCE_RANGES.get(confidence, DEFAULT_CONFIDENCE_RANGE)
+            weight = kernel.FACTOR_WEIGHTS.get(factor["factorName"]) or kernel.DEFAULT_WEIGHT
+            weights[i, 0] = STRATEGIC_WEIGHT * weight * modifier
+    else:
+        values[0] = 50
+        ranges[0] = 0
+        weights[0, 0] = STRATEGIC_WEIGHT
+
+    values[strategic_count:] = kernel.decision_factor_scores(decision_input)
+    ranges[strategic_count:] = decision_ranges(decision_input)
+    weights[strategic_count:, 1] = [DECISION_WEIGHT * w for w in kernel.KERNEL_WEIGHTS.values()]
+    return values, ranges, weights
+
+
+class Simulation:
+    """One evaluation's kernel inputs and Monte Carlo model; results are filled in by run()."""
+
+    __slots__ = ("inputs", "inputs_hash", "risk_class", "runs", "values", "ranges", "weights", "signal", "summary")
+
+    def __init__(self, inputs: Dict[str, Any], inputs_hash: str, risk_class: str,
+                 values: np.ndarray, ranges: np.ndarray, weights: np.ndarray):
+        self.inputs = inputs
+        self.inputs_hash = inputs_hash
+        self.risk_class = risk_class
+        self.runs = run_count(risk_class)
+        self.values = values
+        self.ranges = ranges
+        self.weights = weights
+        self.signal: Optional[Dict[str, Any]] = None
+        self.summary: Optional[Dict[str, Any]] = None
+
+
+def prepare(
+    strategic_factors: Sequence[Mapping[str, Any]],
+    decision_input: Mapping[str, Any],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+    risk_class: Optional[str] = None,
+) -> Simulation:
+    """
+    Hash the inputs, classify the risk and build the composite model.
+
+    Args:
+        strategic_factors: Evidence factors ({"factorName", "confidence"})
+        decision_input: Decision Trust input
+        risk_radar: Risk level per domain
+        fatal_flaw_detected: Fatal flaw flag
+        phi_involved: PHI flag
+        risk_class: Overrides classify_risk()
+
+    Returns:
+        Simulation: Ready to run; the composite inputs hash is the seed
+
+    Raises:
+        KeyError, TypeError, ValueError: If the inputs are malformed
+    """
+    inputs = {
+        "strategic_factors": strategic_factors,
+        "decision_input": decision_input,
+        "risk_radar": risk_radar,
+        "fatal_flaw_detected": fatal_flaw_detected,
+        "phi_involved": phi_involved,
+    }
+    inputs_hash = kernel.composite_inputs_hash(
+        kernel.strategic_inputs_hash(strategic_factors, risk_radar, fatal_flaw_detected, phi_involved),
+        kernel.decision_inputs_hash(decision_input),
+    )
+    if risk_class is None:
+        risk_class = classify_risk(decision_input, risk_radar, fatal_flaw_detected, phi_involved)
+    values, ranges, weights = composite_model(
+        strategic_factors, decision_input, risk_radar, fatal_flaw_detected, phi_involved
+    )
+    return Simulation(inputs, inputs_hash, risk_class, values, ranges, weights)
+
+
+def simulate_many(
+    values: np.ndarray,
+    ranges: np.ndarray,
+    weights: np.ndarray,
+    runs: int,
+    seeds: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score ``runs`` uniform perturbations of n same-shaped models at once.
+
+    Each model draws from its own seeded generator, so its runs do not
+    depend on which other models share the call.
+
+    Args:
+        values: Factor scores, shape (n, k)
+        ranges: Half-width of each factor's uncertainty range, shape (n, k)
+        weights: Strategic/decision weight matrices, shape (n, k, 2)
+        runs: Number of runs per model
+        seeds: Generator seed per model
+
+    Returns:
+        tuple: (composite scores, strategic/decision parts) with shapes
+        (n, runs) and (n, runs, 2)
+    """
+    draws = np.empty((len(seeds), runs, values.shape[1]))
+    for i, seed in enumerate(seeds):
+        np.random.default_rng(seed).random(out=draws[i])
+    draws *= 2 * ranges[:, None, :]
+    draws += (values - ranges)[:, None, :]
+    np.clip(draws, 0, 100, out=draws)
+
+    parts = draws @ weights
+    # The kernel clamps Strategic Confidence to 1..100 before weighting it
+    np.clip(parts[..., 0], STRATEGIC_WEIGHT, STRATEGIC_WEIGHT * 100, out=parts[..., 0])
+    return parts.sum(axis=2), parts
+
+
+def simulate(
+    values: np.ndarray,
+    ranges: np.ndarray,
+    weights: np.ndarray,
+    runs: int,
+    seed: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score ``runs`` uniform perturbations of one model.
+
+    Returns:
+        tuple: (composite scores, strategic/decision parts) with shapes
+        (runs,) and (runs, 2)
+    """
+    scores, parts = simulate_many(values[None], ranges[None], weights[None], runs, [seed])
+    return scores[0], parts[0]
+
+
+def run(simulations: Sequence[Simulation]) -> None:
+    """
+    Run simulations, filling in their signal and summary.
+
+    Simulations with the same run count and factor count are stacked and
+    scored in batched matrix products, at most MONTE_CARLO_GROUP_SIZE at a
+    time, so peak memory does not grow with the number of simulations.
+    """
+    groups: Dict[Tuple[int, int], list] = {}
+    for simulation in simulations:
+        groups.setdefault((simulation.runs, simulation.values.size), []).append(simulation)
+
+    for (runs, _), same_shape in groups.items():
+        for start in range(0, len(same_shape), MONTE_CARLO_GROUP_SIZE):
+            _run_group(same_shape[start:start + MONTE_CARLO_GROUP_SIZE], runs)
+
+
+def _run_group(group: Sequence[Simulation], runs: int) -> None:
+    """Run same-shaped simulations in one simulate_many() call."""
+    scores, parts = simulate_many(
+        np.stack([sim.values for sim in group]),
+        np.stack([sim.ranges for sim in group]),
+        np.stack([sim.weights for sim in group]),
+        runs,
+        [int(sim.inputs_hash[:16], 16) for sim in group],
+    )
+
+    means = scores.mean(axis=1)
+    stddevs = scores.std(axis=1)
+    part_variances = parts.var(axis=1)
+    index = runs * WORST_CASE_PERCENTILE // 100
+    scores.partition(index, axis=1)
+    worst_cases = scores[:, index]
+
+    for i, simulation in enumerate(group):
+        stddev = float(stddevs[i])
+        simulation.signal = {
+            # Variance of the composite on a 0-1 scale
+            "variance": stddev * stddev / 10000,
+            "runs": runs,
+            "method": "MULTI_RUN",
+            "isStable": stddev <= MONTE_CARLO_STABLE_STDDEV,
+            "varianceBreakdown": {
+                "strategicConfidence": float(part_variances[i, 0]) / 10000,
+                "decisionTrust": float(part_variances[i, 1]) / 10000,
+            },
+        }
+        simulation.summary = {
+            "riskClass": simulation.risk_class,
+            "runs": runs,
+            "mean": float(means[i]),
+            "stddev": stddev,
+            "worstCase": float(worst_cases[i]),
+            "percentile": WORST_CASE_PERCENTILE,
+        }
+
+
+def risk_adjusted_result(simulation: Simulation) -> Dict[str, Any]:
+    """
+    Score a simulation that has been run.
+
+    The simulated variance signal replaces the SDK stub in the kernel, and
+    the composite is blended with the worst-case score.
+
+    Returns:
+        dict: kernel.calculate_lumen_score result plus ``riskAdjustment``
+        (simulation summary and ``adjustedScore``)
+    """
+    result = kernel.calculate_lumen_score(**simulation.inputs, monte_carlo_signal=simulation.signal)
+
+    summary = dict(simulation.summary)
+    adjusted = BASE_WEIGHT * result["compositeScore"] + WORST_CASE_WEIGHT * summary["worstCase"]
+    summary["adjustedScore"] = max(0, min(100, js_round(adjusted)))
+    result["riskAdjustment"] = summary
+    return result
+
+
+def compute_monte_carlo_variance(
+    strategic_factors: Sequence[Mapping[str, Any]],
+    decision_input: Mapping[str, Any],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+    risk_class: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Simulate the composite score of one evaluation and summarize its spread.
+
+    Returns:
+        tuple: (MonteCarloSignal for the kernel, simulation summary with
+        riskClass, runs, mean, stddev and worstCase)
+    """
+    simulation = prepare(strategic_factors, decision_input, risk_radar, fatal_flaw_detected, phi_involved, risk_class)
+    run([simulation])
+    return simulation.signal, simulation.summary
+
+
+def calculate_risk_adjusted_score(
+    strategic_factors: Sequence[Mapping[str, Any]],
+    decision_input: Mapping[str, Any],
+    risk_radar: Optional[Mapping[str, Any]] = None,
+    fatal_flaw_detected: bool = False,
+    phi_involved: bool = False,
+    risk_class: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Calculate the composite LUMEN Score with Monte Carlo risk adjustment.
+
+    Returns:
+        dict: See risk_adjusted_result()
+    """
+    simulation = prepare(strategic_factors, decision_input, risk_radar, fatal_flaw_detected, phi_involved, risk_class)
+    run([simulation])
+    return risk_adjusted_result(simulation)
@@ -0,0 +1,176 @@
+"""
+Evaluation result cache for LUMEN SDK API.
+
+Scoring is deterministic: the kernel hashes its canonicalized inputs
+(inputsHash) and the Monte Carlo simulation is seeded from that hash, so
+identical inputs always produce the same score. Results are cached under
+the composite inputs hash plus the versions of the requested compliance
+packs and the scoring configuration, so retries and templated requests
+skip rescoring.
+
+Pack versions are part of every key, so a changed pack version in
+data/packs.py can never serve an old result; when the cache notices a
+version change it also drops every entry at once.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from data.packs import get_all_packs
+from scoring import kernel, monte_carlo
+
+# Cache configuration - override via environment
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "50000"))
+
+
+def pack_versions() -> Tuple[Tuple[str, str], ...]:
+    """Current (pack_id, version) of every compliance pack, sorted by id."""
+    return tuple(sorted((pack_id, pack["version"]) for pack_id, pack in get_all_packs().items()))
+
+
+class _CacheEntry:
+    """A cached evaluation result."""
+
+    __slots__ = ("result", "expires_at")
+
+    def __init__(self, result: Any, expires_at: float):
+        self.result = result
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of evaluation results with TTL expiry.
+
+    Keys are content addresses (see key()); values are whatever the caller
+    stores for them, here the (lumen_score, tier, verdict,
+    citation_integrity) tuple of the evaluation route.
+    """
+
+    def __init__(self, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._versions = pack_versions()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_versions(self) -> Dict[str, str]:
+        """Drop every entry if a pack version changed; return current versions."""
+        versions = pack_versions()
+        if versions != self._versions:
+            with self._lock:
+                if versions != self._versions:
+                    self.invalidations += len(self._entries)
+                    self._entries.clear()
+                    self._versions = versions
+        return dict(versions)
+
+    def key(self, inputs_hash: str, compliance_packs: Iterable[str]) -> str:
+        """
+        Content address of an evaluation.
+
+        Args:
+            inputs_hash: Composite inputsHash of the kernel inputs
+            compliance_packs: Requested pack ids (order and duplicates ignored)
+
+        Returns:
+            str: SHA-256 over the inputs hash, the requested packs with their
+            current versions, and the kernel and simulation configuration
+        """
+        versions = self._check_versions()
+        packs = ",".join(f"{pack_id}@{versions.get(pack_id, '')}" for pack_id in sorted(set(compliance_packs)))
+        material = "|".join((
+            inputs_hash,
+            packs,
+            kernel.KERNEL_VERSION,
+            str(monte_carlo.MONTE_CARLO_RUN_MULTIPLIER),
+            str(monte_carlo.MONTE_CARLO_STABLE_STDDEV),
+        ))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a result.
+
+        Args:
+            key: Content address from key()
+
+        Returns:
+            The cached result, or None on a miss or TTL expiry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if now >= entry.expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result
+
+    def put(self, key: str, result: Any) -> None:
+        """Cache a result, evicting the least recently used entries over max_entries."""
+        entry = _CacheEntry(result, time.time() + self.ttl_seconds)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """
+        Remove entries past their TTL.
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if now >= entry.expires_at]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global cache instance
+_result_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    """Get the process-wide evaluation result cache."""
+    return _result_cache
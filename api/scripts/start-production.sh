@@ -22,6 +22,20 @@ export PYTHONUNBUFFERED=1
 export PYTHONDONTWRITEBYTECODE=1
 export LOG_LEVEL=${LOG_LEVEL:-"info"}
 export API_VERSION=${API_VERSION:-"1.0.0"}
+# Workers on this host share rate-limit state (use "redis" across hosts)
+export RATE_LIMIT_BACKEND=${RATE_LIMIT_BACKEND:-"sqlite"}
+# Local state that must survive restarts (journals, queues, records)
+LUMEN_DATA_DIR=${LUMEN_DATA_DIR:-"/var/lib/lumen"}
+mkdir -p "$LUMEN_DATA_DIR"
+chmod 700 "$LUMEN_DATA_DIR"
+export USAGE_JOURNAL_DIR=${USAGE_JOURNAL_DIR:-"$LUMEN_DATA_DIR/usage"}
+export RATE_LIMIT_SQLITE_PATH=${RATE_LIMIT_SQLITE_PATH:-"$LUMEN_DATA_DIR/rate-limits.db"}
+# Async jobs must be visible to every worker and survive worker recycling
+export JOB_QUEUE_BACKEND=${JOB_QUEUE_BACKEND:-"sqlite"}
+export JOB_QUEUE_SQLITE_PATH=${JOB_QUEUE_SQLITE_PATH:-"$LUMEN_DATA_DIR/jobs.db"}
+export RECORD_STORE_SQLITE_PATH=${RECORD_STORE_SQLITE_PATH:-"$LUMEN_DATA_DIR/records.db"}
+export RECORD_JOURNAL_DIR=${RECORD_JOURNAL_DIR:-"$LUMEN_DATA_DIR/records-journal"}
+export AUDIT_LOG_DIR=${AUDIT_LOG_DIR:-"$LUMEN_DATA_DIR/audit"}
 
 # Check if running in container
 if [[ -f /.dockerenv ]]; then
@@ -36,11 +50,22 @@ else
     PORT=${PORT:-8000}
 fi
 
+if [[ "$JOB_QUEUE_BACKEND" == "memory" && "$WORKERS" -gt 1 ]]; then
+  echo "❌ Error: JOB_QUEUE_BACKEND=memory only works with a single worker (WORKERS=$WORKERS)"
+  exit 1
+fi
+
+# Also read by the app, which refuses the memory job queue with several workers
+export WEB_CONCURRENCY=$WORKERS
+
 echo "📊 Configuration:"
 echo "  - Workers: $WORKERS"
 echo "  - Host: $HOST"
 echo "  - Port: $PORT"
 echo "  - Log Level: $LOG_LEVEL"
+echo "  - Rate Limit Backend: $RATE_LIMIT_BACKEND"
+echo "  - Data Directory: $LUMEN_DATA_DIR"
+echo "  - Job Queue Backend: $JOB_QUEUE_BACKEND"
 echo "  - API Version: $API_VERSION"
 
 # Start with Gunicorn for production
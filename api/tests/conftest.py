@@ -0,0 +1,71 @@
+"""
+Shared fixtures for LUMEN SDK API tests.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import secrets
+import sys
+from pathlib import Path
+
+import bcrypt
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audit import AuditLog, set_audit_log
+from auth.key_cache import get_key_cache
+from compliance.org_packs import get_org_pack_cache
+from db.memory_backend import InMemoryRepository
+from db.repository import set_repository
+from middleware.usage_counter import UsageCounter, set_usage_counter
+from records import MemoryRecordStore, RecordWriter, set_record_store, set_record_writer
+from scoring.result_cache import get_result_cache
+
+
+@pytest.fixture(autouse=True)
+def repository(tmp_path):
+    """Install a fresh in-memory repository (and audit log) for every test."""
+    repo = InMemoryRepository()
+    set_repository(repo)
+    audit_log = AuditLog(str(tmp_path / "audit"))
+    set_audit_log(audit_log)
+    set_record_store(MemoryRecordStore())
+    set_record_writer(RecordWriter(journal_dir=None))
+    set_usage_counter(UsageCounter(journal_dir=None))
+    get_key_cache().clear()
+    get_result_cache().clear()
+    get_org_pack_cache().clear()
+    yield repo
+    set_repository(None)
+    audit_log.close()
+    get_key_cache().clear()
+    get_result_cache().clear()
+    get_org_pack_cache().clear()
+
+
+@pytest.fixture
+def organization(repository):
+    """A free-plan organization owned by user123."""
+    return repository.add_organization("Test Org", plan="free", owner_id="user123")
+
+
+@pytest.fixture
+def api_key(repository, organization):
+    """A valid dev API key for the test organization (plaintext)."""
+    key = f"lumen_pk_dev_{secrets.token_urlsafe(32)}"
+    repository.api_keys["key123"] = {
+        "id": "key123",
+        "org_id": organization["id"],
+        "name": "test",
+        "environment": "dev",
+        "key_prefix": key[:20],
+        # Low work factor keeps tests fast; production uses bcrypt defaults
+        "key_hash": bcrypt.hashpw(key.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8"),
+        "status": "active",
+        "created_at": "2026-02-13T15:30:00+00:00",
+        "expires_at": None,
+        "last_used_at": None,
+    }
+    return key
@@ -0,0 +1,114 @@
+"""
+Local Redis-protocol stand-in for LUMEN SDK API tests.
+
+Speaks RESP2 over TCP and implements the commands the Redis rate limiter
+backend uses (PING, AUTH, SELECT, GET, INCRBY, DECRBY, PEXPIRE, DEL,
+MULTI/EXEC). Commands run one at a time on the event loop, so MULTI/EXEC
+blocks are atomic as on a real server.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RedisStandIn:
+    """In-process Redis-protocol server for tests."""
+
+    def __init__(self):
+        self.data: Dict[bytes, bytes] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.commands: List[Tuple[bytes, ...]] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: set = set()
+        self.port: Optional[int] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self) -> "RedisStandIn":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        self._server.close()
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        queued: Optional[List[List[bytes]]] = None
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                name = args[0].upper()
+                self.commands.append(tuple(args))
+                if name == b"MULTI":
+                    queued = []
+                    writer.write(b"+OK\r\n")
+                elif name == b"EXEC":
+                    replies = [self._execute(command) for command in queued or []]
+                    queued = None
+                    writer.write(f"*{len(replies)}\r\n".encode() + b"".join(replies))
+                elif queued is not None:
+                    queued.append(args)
+                    writer.write(b"+QUEUED\r\n")
+                else:
+                    writer.write(self._execute(args))
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        expires_at = self.expires.get(key)
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def _execute(self, args: List[bytes]) -> bytes:
+        name = args[0].upper()
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name in (b"AUTH", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"GET":
+            value = self._get(args[1])
+            return b"$-1\r\n" if value is None else f"${len(value)}\r\n".encode() + value + b"\r\n"
+        if name in (b"INCRBY", b"DECRBY"):
+            delta = int(args[2]) if name == b"INCRBY" else -int(args[2])
+            value = int(self._get(args[1]) or 0) + delta
+            self.data[args[1]] = str(value).encode()
+            return f":{value}\r\n".encode()
+        if name == b"PEXPIRE":
+            if self._get(args[1]) is None:
+                return b":0\r\n"
+            self.expires[args[1]] = time.monotonic() + int(args[2]) / 1000
+            return b":1\r\n"
+        if name == b"DEL":
+            removed = sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+            return f":{removed}\r\n".encode()
+        return f"-ERR unknown command '{name.decode()}'\r\n".encode()
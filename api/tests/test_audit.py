@@ -0,0 +1,482 @@
+"""
+Tests for LUMEN SDK API hash-chained audit log.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import hashlib
+import io
+import json
+import os
+import pytest
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audit import (
+    GENESIS,
+    AuditIntegrityError,
+    AuditLog,
+    AuditLogLocked,
+    MerkleTree,
+    get_audit_log,
+    init_audit_log,
+    set_audit_log,
+    verify_inclusion,
+)
+from audit.merkle import leaf_hash, node_hash
+from audit.segments import (
+    ENTRY_HEADER, FILE_HEADER, SegmentCorrupt, SegmentReader, SegmentWriter, WriterLock, segment_base,
+)
+from auth.jwt_auth import verify_jwt_token
+from main import app
+
+ACTOR = {"type": "SERVICE", "id": "key123"}
+
+
+def rfc6962_root(nodes: list) -> bytes:
+    """Reference Merkle tree hash, straight from the RFC recursion."""
+    if len(nodes) == 1:
+        return nodes[0]
+    split = 1
+    while split * 2 < len(nodes):
+        split *= 2
+    return node_hash(rfc6962_root(nodes[:split]), rfc6962_root(nodes[split:]))
+
+
+def fill(log: AuditLog, count: int) -> list:
+    return log.append_many(
+        "EVALUATION_COMPLETED", "org", ACTOR, [{"n": index, "record_id": f"rec-{index % 10}"} for index in range(count)]
+    )
+
+
+def reopen(log: AuditLog, **options) -> AuditLog:
+    return AuditLog(log.directory, checkpoint_interval=8, segment_events=32, index_interval=4, **options)
+
+
+def tamper(log: AuditLog, sequence: int, rehash: bool = False) -> None:
+    """
+    Rewrite one stored event's payload in place, as an attacker would:
+    the entry CRC is fixed up, the event hash only if rehash.
+    """
+    first = sequence - sequence % log.segment_events
+    path = Path(segment_base(log.directory, first) + ".seg")
+    data = bytearray(path.read_bytes())
+    offset = FILE_HEADER.size
+    while True:
+        length, _, found, key, digest = ENTRY_HEADER.unpack_from(data, offset)
+        if found == sequence:
+            break
+        offset += ENTRY_HEADER.size + length
+    body = json.loads(data[offset + ENTRY_HEADER.size:offset + ENTRY_HEADER.size + length])
+    body["payload"]["n"] = -1
+    payload = json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    if rehash:
+        digest = hashlib.sha256(payload).digest()
+    header = ENTRY_HEADER.pack(len(payload), zlib.crc32(payload), sequence, key, digest)
+    data[offset:offset + ENTRY_HEADER.size + length] = header + payload
+    path.write_bytes(bytes(data))
+
+
+@pytest.fixture
+def log(tmp_path):
+    audit_log = AuditLog(str(tmp_path / "audit"), checkpoint_interval=8, segment_events=32, index_interval=4, compress=False)
+    yield audit_log
+    audit_log.close()
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def portal_user(organization):
+    """Authenticate portal requests as the owner of the test organization."""
+    app.dependency_overrides[verify_jwt_token] = lambda: {
+        "user_id": "user123",
+        "org_id": organization["id"],
+        "plan": "free"
+    }
+    yield
+    app.dependency_overrides.pop(verify_jwt_token, None)
+
+
+class TestMerkleTree:
+    """Test roots and inclusion paths against the RFC 6962 definition."""
+
+    def test_roots_and_paths_of_every_prefix(self):
+        leaves = [leaf_hash(bytes([index])) for index in range(37)]
+        tree = MerkleTree(leaves)
+
+        for size in range(1, len(leaves) + 1):
+            root = tree.root(size)
+            assert root == rfc6962_root(leaves[:size])
+            for index in range(size):
+                path = tree.path(index, size)
+                assert len(path) <= (size - 1).bit_length()
+                assert verify_inclusion(leaves[index], index, size, path, root)
+                if size > 1:
+                    assert not verify_inclusion(leaves[index], (index + 1) % size, size, path, root)
+
+    def test_tree_of_block_roots_matches_tree_of_leaves(self):
+        leaves = [leaf_hash(bytes([index])) for index in range(40)]
+        blocks = MerkleTree(MerkleTree(leaves[start:start + 8]).root() for start in range(0, 40, 8))
+
+        for count in range(1, 6):
+            assert blocks.root(count) == rfc6962_root(leaves[:count * 8])
+
+
+class TestAppend:
+    """Test the chain, checkpoints, segments and recovery."""
+
+    def test_events_are_chained(self, log):
+        events = fill(log, 3)
+
+        assert [event.sequence for event in events] == [0, 1, 2]
+        assert events[0].previous_hash == GENESIS
+        assert events[1].previous_hash == events[0].hash
+        assert all(event.compute_hash() == event.hash for event in events)
+
+    def test_checkpoint_per_block_and_segment_rotation(self, log, tmp_path):
+        events = fill(log, 70)
+
+        checkpoint = log.checkpoint()
+        assert checkpoint.size == 64
+        assert checkpoint.head == events[63].hash
+        leaves = [leaf_hash(bytes.fromhex(event.hash)) for event in events[:64]]
+        assert checkpoint.root == rfc6962_root(leaves).hex()
+        assert sorted(os.listdir(tmp_path / "audit")) == [
+            "checkpoints.log", "lock",
+            "segment-000000000000.idx", "segment-000000000000.keys", "segment-000000000000.seg",
+            "segment-000000000032.idx", "segment-000000000032.keys", "segment-000000000032.seg",
+            "segment-000000000064.idx", "segment-000000000064.seg",
+        ]
+        assert log.stats() == {
+            "events": 70, "checkpoints": 8, "unsealed": 6, "segments": 3, "compressed_segments": 0,
+            "root": checkpoint.root,
+        }
+
+    def test_reopen_continues_chain(self, log):
+        events = fill(log, 21)
+        log.close()
+
+        reopened = reopen(log)
+        event = reopened.append("EVALUATION_COMPLETED", "org", ACTOR, {"n": 21})
+        assert event.sequence == 21
+        assert event.previous_hash == events[-1].hash
+        assert reopened.verify(deep=True) == 22
+        reopened.close()
+
+    def test_torn_tail_dropped_and_missing_checkpoint_written(self, log):
+        fill(log, 8)
+        log.close()
+        checkpoints = Path(log.directory) / "checkpoints.log"
+        checkpoints.write_bytes(b"")
+        with open(segment_base(log.directory, 0) + ".seg", "ab") as f:
+            f.write(ENTRY_HEADER.pack(500, 0, 8, bytes(16), bytes(32)) + b'{"actor"')
+
+        reopened = reopen(log)
+        assert reopened.size == 8
+        assert reopened.checkpoint().size == 8
+        assert fill(reopened, 1)[0].sequence == 8
+        reopened.close()
+
+    def test_corrupt_line_refuses_to_open(self, log):
+        fill(log, 3)
+        log.close()
+        tamper(log, 1)
+
+        reopened = reopen(log)
+        with pytest.raises(AuditIntegrityError) as error:
+            reopened.append("EVALUATION_COMPLETED", "org", ACTOR, {})
+        assert error.value.sequence == 1
+
+    def test_second_process_refused(self, log):
+        """A directory is written by one process at a time (the lock is per open file)."""
+        fill(log, 3)
+        other = reopen(log)
+        with pytest.raises(AuditLogLocked):
+            other.append("EVALUATION_COMPLETED", "org", ACTOR, {})
+        assert log.size == 3
+
+        log.close()
+        assert fill(other, 1)[0].sequence == 3
+        other.close()
+
+    def test_files_owner_only(self, log):
+        fill(log, 40)
+
+        assert os.stat(log.directory).st_mode & 0o777 == 0o700
+        modes = {path.name: path.stat().st_mode & 0o777 for path in Path(log.directory).iterdir()}
+        assert set(modes.values()) == {0o600}, modes
+
+    def test_init_takes_a_free_worker_directory(self, tmp_path):
+        set_audit_log(None)
+        with pytest.raises(ValueError, match="AUDIT_LOG_DIR must be set"):
+            init_audit_log("")
+        with pytest.raises(ValueError, match="temporary directory"):
+            init_audit_log(str(tmp_path / "logs"))
+
+        with patch("audit.log.tempfile.gettempdir", return_value="/nonexistent-tmp"):
+            set_audit_log(None)
+            first = init_audit_log(str(tmp_path / "logs"))
+            set_audit_log(None)
+            second = init_audit_log(str(tmp_path / "logs"))
+        assert [Path(first.directory).name, Path(second.directory).name] == ["worker-0", "worker-1"]
+        first.close()
+        second.close()
+
+    def test_import_writes_nothing(self, tmp_path):
+        """Importing the app (benchmarks, tools) creates no audit files; the log opens at startup."""
+        script = (
+            "import main\n"
+            "from audit import get_audit_log, record_events\n"
+            "record_events('EVALUATION_COMPLETED', 'org', {}, [{}])\n"
+            "try:\n"
+            "    get_audit_log()\n"
+            "except RuntimeError:\n"
+            "    print('not initialized')\n"
+        )
+        env = {**os.environ, "TMPDIR": str(tmp_path)}
+        env.pop("AUDIT_LOG_DIR", None)
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=Path(__file__).parent.parent, env=env,
+            capture_output=True, text=True, timeout=60,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "not initialized"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_invalid_configuration(self, tmp_path):
+        with pytest.raises(ValueError):
+            AuditLog(str(tmp_path), checkpoint_interval=6)
+        with pytest.raises(ValueError):
+            AuditLog(str(tmp_path), checkpoint_interval=8, segment_events=12)
+
+
+class TestVerification:
+    """Test proofs, range verification and tamper detection."""
+
+    def test_proof_is_logarithmic_and_anchored(self, log):
+        events = fill(log, 200)
+        proof = log.prove(37)
+
+        assert proof.event_hash == events[37].hash
+        assert proof.size == 200 - 200 % 8
+        assert len(proof.path) <= proof.size.bit_length()
+        assert proof.verify()
+        assert proof.verify(log.checkpoint().root)
+        assert not log.prove(37, size=64).verify(log.checkpoint().root)
+
+    def test_unsealed_event_has_no_proof(self, log):
+        fill(log, 10)
+        with pytest.raises(ValueError):
+            log.prove(9)
+
+    def test_verify_range(self, log):
+        fill(log, 100)
+
+        events = log.verify_range(10, 90)
+        assert [event.payload["n"] for event in events] == list(range(10, 90))
+        assert [event.sequence for event in log.verify_range(97, 100)] == [97, 98, 99]
+
+    def test_tampered_event_detected_in_range(self, log):
+        fill(log, 100)
+        tamper(log, 40)
+
+        log.verify_range(41, 90)
+        with pytest.raises(AuditIntegrityError) as error:
+            log.verify_range(30, 50)
+        assert error.value.sequence == 40
+
+    def test_verify_rehashes_only_the_tail(self, log):
+        fill(log, 100)
+        tamper(log, 5)
+
+        # Last sealed event plus the unsealed tail
+        assert log.verify() == 5
+        with pytest.raises(AuditIntegrityError):
+            log.verify(deep=True)
+
+    def test_rewritten_block_breaks_checkpoint(self, log):
+        fill(log, 24)
+        tamper(log, 20, rehash=True)
+
+        with pytest.raises(AuditIntegrityError):
+            log.verify_range(20, 21)
+
+
+class TestSegments:
+    """Test the binary segment format."""
+
+    @pytest.fixture
+    def lock(self, tmp_path):
+        writer_lock = WriterLock(str(tmp_path))
+        assert writer_lock.acquire()
+        yield writer_lock
+        writer_lock.release()
+
+    def write(self, tmp_path, lock, count: int, seal: bool = False) -> str:
+        base = str(tmp_path / "segment-000000000100")
+        writer = SegmentWriter(base, 100, 4, lock)
+        for index in range(count):
+            payload = json.dumps({"n": index}).encode("utf-8")
+            writer.append(100 + index, bytes([index % 3 + 1]) * 16, hashlib.sha256(payload).digest(), payload)
+        writer.seal() if seal else writer.close()
+        return base
+
+    def test_range_scan_from_sparse_index(self, tmp_path, lock):
+        reader = SegmentReader(self.write(tmp_path, lock, 30), 100)
+
+        entries = list(reader.entries(113, 118))
+        assert [entry.sequence for entry in entries] == [113, 114, 115, 116, 117]
+        assert isinstance(entries[0].payload, memoryview)
+        assert json.loads(bytes(entries[0].payload)) == {"n": 13}
+        assert entries[0].digest == hashlib.sha256(entries[0].payload).digest()
+
+    def test_key_lookup_sealed_and_unsealed(self, tmp_path, lock):
+        base = self.write(tmp_path, lock, 30, seal=True)
+        assert os.path.exists(base + ".keys")
+        sealed = SegmentReader(base, 100).find(bytes([2]) * 16)
+        assert sealed == [101, 104, 107, 110, 113, 116, 119, 122, 125, 128]
+
+        os.remove(base + ".keys")
+        assert SegmentReader(base, 100).find(bytes([2]) * 16) == sealed
+        assert SegmentReader(base, 100).find(bytes([9]) * 16) == []
+
+    def test_torn_entry_cut_on_recovery(self, tmp_path, lock):
+        base = self.write(tmp_path, lock, 5)
+        with open(base + ".seg", "ab") as f:
+            f.write(ENTRY_HEADER.pack(100, 0, 105, bytes(16), bytes(32)) + b"{")
+
+        writer = SegmentWriter(base, 100, 4, lock)
+        assert writer.count == 5
+        writer.close()
+        assert [entry.sequence for entry in SegmentReader(base, 100).entries(100, 200)] == list(range(100, 105))
+
+    def test_damaged_entry_before_the_end(self, tmp_path, lock):
+        base = self.write(tmp_path, lock, 5)
+        data = bytearray(Path(base + ".seg").read_bytes())
+        data[FILE_HEADER.size + ENTRY_HEADER.size] ^= 0xFF
+        Path(base + ".seg").write_bytes(bytes(data))
+
+        with pytest.raises(SegmentCorrupt):
+            SegmentWriter(base, 100, 4, lock)
+
+    def test_recovery_and_appends_need_the_writer_lock(self, tmp_path, lock):
+        """A second process cannot recover (truncate) or append to a segment being written."""
+        base = self.write(tmp_path, lock, 5)
+        with open(base + ".seg", "ab") as f:
+            # Looks torn, but may be another writer's append in flight
+            f.write(ENTRY_HEADER.pack(100, 0, 105, bytes(16), bytes(32)) + b"{")
+        size = os.path.getsize(base + ".seg")
+
+        other = WriterLock(str(tmp_path))
+        assert not other.acquire()
+        with pytest.raises(ValueError, match="writer lock"):
+            SegmentWriter(base, 100, 4, other)
+        elsewhere = WriterLock(str(tmp_path / "elsewhere"))
+        assert elsewhere.acquire()
+        with pytest.raises(ValueError, match="writer lock"):
+            SegmentWriter(base, 100, 4, elsewhere)
+        elsewhere.release()
+        assert os.path.getsize(base + ".seg") == size
+
+        writer = SegmentWriter(base, 100, 4, lock)
+        lock.release()
+        with pytest.raises(ValueError, match="released"):
+            writer.append(105, bytes(16), bytes(32), b"{}")
+        writer.close()
+
+
+class TestLookupsAndColdSegments:
+    """Test record lookups, export and compressed segments."""
+
+    def test_find_by_record_id(self, log):
+        fill(log, 75)
+
+        events = log.find("rec-3")
+        assert [event.sequence for event in events] == [3, 13, 23, 33, 43, 53, 63, 73]
+        assert log.find("rec-missing") == []
+
+    def test_export_is_stored_json(self, log):
+        events = fill(log, 40)
+        out = io.BytesIO()
+
+        assert log.export(30, 40, out) == 10
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert lines == [event.to_dict() for event in events[30:]]
+
+    def test_cold_segments_compressed_and_readable(self, log):
+        events = fill(log, 100)
+        log.hot_segments = 1
+
+        assert log.compress_cold_segments() == 2
+        names = os.listdir(log.directory)
+        assert "segment-000000000000.seg.z" in names and "segment-000000000000.seg" not in names
+        assert "segment-000000000064.seg" in names
+        assert log.verify(deep=True) == 100
+        assert log.prove(5).event_hash == events[5].hash
+        assert [event.sequence for event in log.find("rec-4")][:2] == [4, 14]
+        log.close()
+
+        reopened = reopen(log)
+        assert reopened.verify_range(0, 100)[-1].hash == events[-1].hash
+        reopened.close()
+
+    def test_rollover_compresses_in_background(self, tmp_path):
+        log = AuditLog(str(tmp_path / "audit"), checkpoint_interval=8, segment_events=16, hot_segments=1)
+        fill(log, 64)
+        log.close()
+
+        names = os.listdir(log.directory)
+        assert {"segment-000000000000.seg.z", "segment-000000000016.seg.z", "segment-000000000032.seg.z"} <= set(names)
+        assert "segment-000000000048.seg" in names
+        assert AuditLog(log.directory, checkpoint_interval=8, segment_events=16).verify(deep=True) == 64
+
+
+class TestAuditedRoutes:
+    """Test the events written by the API."""
+
+    def test_evaluation_event(self, client, api_key):
+        response = client.post("/v1/evaluate", headers={"X-API-Key": api_key}, json={
+            "ai_output": "Take 500mg twice daily.",
+            "human_action": "accepted",
+        })
+        assert response.status_code == 200
+
+        (event,) = get_audit_log().verify_range(0, 1)
+        assert event.event_type == "EVALUATION_COMPLETED"
+        assert event.actor == {"type": "SERVICE", "id": "key123"}
+        assert event.payload["record_id"] == response.json()["record_id"]
+        assert "ai_output" not in event.payload
+
+    def test_key_and_pack_events(self, client, portal_user, organization):
+        created = client.post("/v1/keys/generate", json={"name": "ci", "environment": "test"})
+        assert created.status_code == 200
+        key_id = created.json()["key_id"]
+        assert client.delete(f"/v1/keys/{key_id}").status_code == 200
+        assert client.post("/v1/packs/enable", json={"pack_id": "ca-on-phipa"}).status_code == 200
+        assert client.post("/v1/packs/disable", json={"pack_id": "ca-on-phipa"}).status_code == 200
+
+        events = get_audit_log().verify_range(0, 4)
+        assert [event.event_type for event in events] == [
+            "API_KEY_CREATED", "API_KEY_REVOKED", "POLICY_PACK_ENABLED", "POLICY_PACK_DISABLED",
+        ]
+        assert {event.org_id for event in events} == {organization["id"]}
+        assert events[0].actor == {"type": "USER", "id": "user123"}
+        assert events[1].payload == {"key_id": key_id}
+        assert "api_key" not in events[0].payload
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
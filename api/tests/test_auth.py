@@ -0,0 +1,201 @@
+"""
+Tests for LUMEN SDK API key authentication internals.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+from starlette.requests import Request
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from auth.api_keys import APIKeyInfo, verify_api_key
+from auth.key_cache import VerifiedKeyCache
+from auth.hashing import HashExecutor
+from auth.last_used import LastUsedBuffer
+
+
+API_KEY = "lumen_pk_dev_" + "x" * 43
+
+
+class TestVerifiedKeyCache:
+    """Test the verified-key cache used by verify_api_key."""
+
+    def test_hit_after_put(self):
+        """A verified key is returned from the cache."""
+        cache = VerifiedKeyCache(ttl_seconds=60, max_entries=10)
+        info = APIKeyInfo("key123", "org123", "free", "test", "dev")
+        cache.put(API_KEY, info)
+
+        assert cache.get(API_KEY) is info
+        assert cache.stats()["hits"] == 1
+
+    def test_plaintext_not_stored(self):
+        """Cache keys are keyed digests, never the plaintext key."""
+        cache = VerifiedKeyCache(secret=b"s" * 32)
+        cache.put(API_KEY, APIKeyInfo("key123", "org123", "free", "test", "dev"))
+
+        assert API_KEY not in cache._entries
+        assert cache.digest(API_KEY) in cache._entries
+        assert VerifiedKeyCache(secret=b"t" * 32).digest(API_KEY) != cache.digest(API_KEY)
+
+    def test_ttl_expiry(self):
+        """Entries past their TTL are treated as misses."""
+        cache = VerifiedKeyCache(ttl_seconds=0, max_entries=10)
+        cache.put(API_KEY, APIKeyInfo("key123", "org123", "free", "test", "dev"))
+
+        assert cache.get(API_KEY) is None
+        assert cache.stats()["size"] == 0
+
+    def test_key_expiry_respected(self):
+        """A key whose own expires_at has passed is not served from cache."""
+        cache = VerifiedKeyCache(ttl_seconds=60, max_entries=10)
+        cache.put(API_KEY, APIKeyInfo("key123", "org123", "free", "test", "dev"), "2020-01-01T00:00:00Z")
+
+        assert cache.get(API_KEY) is None
+
+    def test_invalidate_key_id(self):
+        """Revocation drops the cached verification immediately."""
+        cache = VerifiedKeyCache(ttl_seconds=60, max_entries=10)
+        cache.put(API_KEY, APIKeyInfo("key123", "org123", "free", "test", "dev"))
+
+        assert cache.invalidate_key_id("key123") == 1
+        assert cache.get(API_KEY) is None
+
+    def test_bounded_size(self):
+        """Least recently used entries are evicted past max_entries."""
+        cache = VerifiedKeyCache(ttl_seconds=60, max_entries=2)
+        for i in range(3):
+            cache.put(f"{API_KEY}{i}", APIKeyInfo(f"key{i}", "org123", "free", "test", "dev"))
+
+        assert cache.stats()["size"] == 2
+        assert cache.stats()["evictions"] == 1
+        assert cache.get(f"{API_KEY}0") is None
+        assert "key0" not in cache._by_key_id
+
+    def test_rejected_keys_bounded_with_ttl(self):
+        """Rejected keys are remembered briefly in a bounded LRU."""
+        cache = VerifiedKeyCache(ttl_seconds=60, max_entries=10, rejected_ttl_seconds=60, rejected_max_entries=2)
+        for i in range(3):
+            cache.reject(f"{API_KEY}{i}")
+
+        assert cache.stats()["rejected_size"] == 2
+        assert not cache.is_rejected(f"{API_KEY}0")
+        assert cache.is_rejected(f"{API_KEY}2")
+
+        cache.rejected_ttl_seconds = 0
+        cache.reject(API_KEY)
+        assert not cache.is_rejected(API_KEY)
+
+
+class TestHashExecutor:
+    """Test the password-hash executor."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_off_loop(self):
+        """Hashes made on the pool verify on the pool and are counted."""
+        executor = HashExecutor(kind="thread", max_workers=2)
+        try:
+            hashed = await executor.hashpw(API_KEY)
+            assert await executor.checkpw(API_KEY, hashed)
+            assert not await executor.checkpw(API_KEY + "y", hashed)
+
+            stats = executor.stats()
+            assert stats["completed"] == 3
+            assert stats["in_flight"] == 0
+            assert stats["queue_depth"] == 0
+            assert stats["avg_wait_ms"] >= 0
+        finally:
+            executor.shutdown()
+
+    def test_rejects_unknown_kind(self):
+        """Only thread and process pools are supported."""
+        with pytest.raises(ValueError):
+            HashExecutor(kind="fiber")
+
+
+class TestRequestScopedVerification:
+    """Test that a request verifies its API key only once."""
+
+    @staticmethod
+    def _request() -> Request:
+        return Request({"type": "http", "method": "POST", "path": "/v1/evaluate", "headers": []})
+
+    @pytest.mark.asyncio
+    async def test_success_reused(self):
+        """Middleware and route dependency share one verification."""
+        info = APIKeyInfo("key123", "org123", "free", "test", "dev")
+        request = self._request()
+        with patch("auth.api_keys.authenticate_api_key", AsyncMock(return_value=info)) as mock_auth:
+            assert await verify_api_key(request, API_KEY) is info
+            assert await verify_api_key(request, API_KEY) is info
+
+        assert mock_auth.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_reused(self):
+        """A failed verification is not retried later in the same request."""
+        request = self._request()
+        error = HTTPException(status_code=403, detail="Invalid API key.")
+        with patch("auth.api_keys.authenticate_api_key", AsyncMock(side_effect=error)) as mock_auth:
+            for _ in range(2):
+                with pytest.raises(HTTPException) as exc_info:
+                    await verify_api_key(request, API_KEY)
+                assert exc_info.value.status_code == 403
+
+        assert mock_auth.await_count == 1
+
+
+class TestLastUsedBuffer:
+    """Test write-behind batching of last_used_at."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_and_flushes_in_bulk(self):
+        """Only the latest timestamp per key is written, grouped per second."""
+        buffer = LastUsedBuffer(flush_interval=60, max_pending=100)
+        t0 = datetime(2026, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+        buffer.touch("key1", t0)
+        buffer.touch("key1", t0 + timedelta(seconds=2))
+        buffer.touch("key2", t0 + timedelta(seconds=2))
+        buffer.touch("key3", t0)
+
+        mock_repository = MagicMock(touch_api_keys=AsyncMock())
+        with patch("auth.last_used.get_repository", return_value=mock_repository):
+            assert await buffer.flush() == 3
+
+        touch = mock_repository.touch_api_keys
+        assert touch.await_count == 2
+        assert {c.args[1]: sorted(c.args[0]) for c in touch.await_args_list} == {
+            (t0 + timedelta(seconds=2)).isoformat(): ["key1", "key2"],
+            t0.isoformat(): ["key3"],
+        }
+        assert buffer.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self):
+        """Entries survive a failed flush."""
+        buffer = LastUsedBuffer(flush_interval=60, max_pending=100)
+        buffer.touch("key1")
+
+        with patch("auth.last_used.get_repository", side_effect=RuntimeError("down")):
+            assert await buffer.flush() == 0
+
+        assert buffer.pending_count() == 1
+
+    def test_size_threshold_requests_flush(self):
+        """Reaching max_pending wakes the flusher early."""
+        buffer = LastUsedBuffer(flush_interval=60, max_pending=2)
+        buffer.touch("key1")
+        assert not buffer._flush_requested.is_set()
+        buffer.touch("key2")
+        assert buffer._flush_requested.is_set()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
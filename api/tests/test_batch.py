@@ -0,0 +1,146 @@
+"""
+Tests for LUMEN SDK API batch evaluation.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from middleware.limiter_backends import GCRARateLimit
+from models.schemas import EvaluateRequest
+from routes.evaluate import calculate_lumen_score
+
+EVALUATIONS = [
+    {"ai_output": "Take 500mg twice daily.", "human_action": "accepted"},
+    {"ai_output": "Refer to cardiology.", "human_action": "modified", "context": {"phiInvolved": True}},
+    {"ai_output": "Discontinue metformin.", "human_action": "rejected", "context": {"riskRadar": {"legal": "Red"}}},
+]
+
+
+def current_period() -> str:
+    now = datetime.now(timezone.utc)
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+
+@pytest.fixture
+def limiter():
+    """Fresh limiter state so charges from other tests don't leak in."""
+    backend = GCRARateLimit()
+    with patch("middleware.rate_limit._rate_limiter", backend):
+        yield backend
+
+
+@pytest.fixture
+def client(limiter):
+    return TestClient(app)
+
+
+def post_batch(client, api_key, items):
+    return client.post("/v1/evaluate/batch", json={"items": items}, headers={"X-API-Key": api_key})
+
+
+class TestBatchEvaluation:
+    """Test /v1/evaluate/batch results."""
+
+    def test_results_match_single_evaluations(self, client, api_key):
+        response = post_batch(client, api_key, EVALUATIONS)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["succeeded"], body["failed"]) == (3, 0)
+        for item, outcome in zip(EVALUATIONS, body["results"]):
+            lumen_score, tier, verdict, citation_integrity = calculate_lumen_score(EvaluateRequest(**item))
+            assert outcome["status"] == "ok"
+            assert outcome["result"]["lumen_score"] == lumen_score
+            assert outcome["result"]["verdict"] == verdict.value
+
+    def test_partial_failure(self, client, api_key):
+        """Invalid items get per-item errors and are not counted as usage."""
+        items = [
+            EVALUATIONS[0],
+            {"ai_output": "missing human action"},
+            {"ai_output": "x", "human_action": "accepted", "context": {"strategicFactors": [{"name": "x"}]}},
+            EVALUATIONS[1],
+        ]
+
+        response = post_batch(client, api_key, items)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [r["status"] for r in body["results"]] == ["ok", "error", "error", "ok"]
+        assert [r["index"] for r in body["results"]] == [0, 1, 2, 3]
+        assert body["results"][1]["error"]["status_code"] == 422
+        assert body["results"][1]["error"]["details"][0]["loc"] == ["human_action"]
+        assert body["results"][2]["error"]["status_code"] == 422
+        assert (body["succeeded"], body["failed"]) == (2, 2)
+        assert response.headers["X-Lumen-Usage-Used"] == "2"
+
+    def test_empty_batch_rejected(self, client, api_key):
+        assert post_batch(client, api_key, []).status_code == 422
+
+    def test_batch_size_limit(self, client, api_key):
+        with patch("routes.evaluate.BATCH_MAX_ITEMS", 2):
+            response = post_batch(client, api_key, EVALUATIONS)
+
+        assert response.status_code == 413
+
+
+class TestBatchCharging:
+    """Test the aggregated rate limit and usage charges."""
+
+    def test_rate_limit_charged_by_item_count(self, client, api_key, limiter):
+        with patch.object(limiter, "is_allowed", wraps=limiter.is_allowed) as is_allowed:
+            response = post_batch(client, api_key, EVALUATIONS)
+
+        assert response.status_code == 200
+        is_allowed.assert_awaited_once()
+        assert is_allowed.await_args.kwargs["cost"] == 3
+        assert response.headers["X-RateLimit-Limit"] == "100"
+        assert response.headers["X-RateLimit-Remaining"] == "97"
+
+    def test_rate_limited_batch_not_evaluated(self, client, api_key):
+        metadata = {"limit": 100, "remaining": 1, "reset": 1708789200, "retry_after": 2}
+        with patch("middleware.rate_limit._rate_limiter.is_allowed", AsyncMock(return_value=(False, metadata))), \
+                patch("routes.evaluate.prepare_evaluation") as prepare:
+            response = post_batch(client, api_key, EVALUATIONS)
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        assert response.headers["X-RateLimit-Remaining"] == "1"
+        prepare.assert_not_called()
+
+    def test_batch_larger_than_plan_limit_rejected(self, client, api_key):
+        response = post_batch(client, api_key, EVALUATIONS * 34)
+
+        assert response.status_code == 413
+
+    def test_monthly_limit_caps_items(self, client, api_key, repository, organization):
+        """Items beyond the remaining monthly allowance fail individually."""
+        period = current_period()
+        repository.api_usage["usage1"] = {
+            "id": "usage1",
+            "org_id": organization["id"],
+            "period_start": period,
+            "evaluations_count": 998,
+            "last_evaluation_at": period,
+        }
+
+        response = post_batch(client, api_key, EVALUATIONS)
+
+        body = response.json()
+        assert [r["status"] for r in body["results"]] == ["ok", "ok", "error"]
+        assert body["results"][2]["error"]["status_code"] == 429
+        assert response.headers["X-Lumen-Usage-Used"] == "1000"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,152 @@
+"""
+Tests for LUMEN SDK API compliance rule engine.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from compliance import EvaluationContext, RuleEngine, compile_pack, get_rule_engine
+from compliance.engine import NO_PHI_REASON
+from compliance.rules import RULES, SAFE_HARBOR_IDENTIFIERS
+from data.packs import get_all_packs
+
+SECURE_PHI_CONTEXT = {
+    "phiPresent": True,
+    "phiTypes": ["diagnosis"],
+    "purpose": "treatment",
+    "isTPO": True,
+    "isHealthcareProvision": True,
+    "consentType": "deemed",
+    "hasExplicitConsent": True,
+    "safeguards": ["administrative", "physical", "technical"],
+    "encryptionAtRest": True,
+    "encryptionInTransit": True,
+    "accessControlsImplemented": True,
+    "retentionDays": 3650,
+}
+
+
+def outcomes(results):
+    return {check.check_id: check for pack in results for check in pack.checks}
+
+
+class TestCompilation:
+    """Test compiling data/packs.py against the registered rules."""
+
+    def test_every_check_has_a_rule(self):
+        engine = get_rule_engine()
+        results = engine.evaluate({})
+
+        packs = get_all_packs()
+        assert [pack.pack_id for pack in results] == list(packs)
+        for pack in results:
+            expected = [check["checkId"] for check in packs[pack.pack_id]["checks"]]
+            assert [check.check_id for check in pack.checks] == expected
+            assert pack.version == packs[pack.pack_id]["version"]
+
+    def test_missing_rule_rejected(self):
+        pack = {"version": "v1", "checks": [{"checkId": "nope-001", "name": "x", "severity": "high"}]}
+
+        with pytest.raises(ValueError, match="nope-001"):
+            compile_pack("nope", pack)
+
+    def test_plan_selection_and_cache(self):
+        engine = get_rule_engine()
+        plan = engine.plan(["us-fed-hipaa", "ca-on-phipa", "us-fed-hipaa"])
+
+        assert plan.pack_ids == ("us-fed-hipaa", "ca-on-phipa")
+        assert engine.plan(["us-fed-hipaa", "ca-on-phipa"]) is plan
+        with pytest.raises(ValueError, match="Unknown compliance pack"):
+            engine.plan(["phipa"])
+
+
+class TestEvaluation:
+    """Test per-check results and the PHI short-circuit."""
+
+    def test_no_phi_skips_phi_only_evaluators(self):
+        called = []
+        rule = RULES["hipaa-003"]
+        with patch.object(rule, "evaluator", lambda ctx: called.append(ctx) or (False, "x")):
+            engine = RuleEngine()
+
+        hipaa_003 = outcomes(engine.evaluate({"phiPresent": False}, ["us-fed-hipaa"]))["hipaa-003"]
+        assert (hipaa_003.passed, hipaa_003.reason) == (True, NO_PHI_REASON)
+        assert called == []
+
+        assert not outcomes(engine.evaluate({"phiPresent": True}, ["us-fed-hipaa"]))["hipaa-003"].passed
+        assert len(called) == 1
+
+    def test_secure_context_passes_privacy_packs(self):
+        results = get_rule_engine().evaluate(SECURE_PHI_CONTEXT, ["ca-on-phipa", "us-fed-hipaa", "ca-fed-pipeda"])
+
+        assert [pack.failed for pack in results] == [[], [], []]
+        assert all(pack.passed for pack in results)
+
+    @pytest.mark.parametrize("change, check_id", [
+        ({"hasExplicitConsent": False, "isTPO": False, "consentType": "none"}, "phipa-001"),
+        ({"isCanadianResidency": False}, "phipa-002"),
+        ({"retentionDays": 365}, "phipa-008"),
+        ({"safeguards": ["administrative"]}, "phipa-014"),
+        ({"userRole": "business_associate", "baaInPlace": False}, "hipaa-002"),
+        ({"encryptionInTransit": False}, "hipaa-008"),
+        ({"auditLoggingEnabled": False}, "hipaa-005"),
+        ({"isCanadianResidency": False, "transferAgreementInPlace": False}, "pipeda-011"),
+    ])
+    def test_ported_rules_fail(self, change, check_id):
+        checks = outcomes(get_rule_engine().evaluate({**SECURE_PHI_CONTEXT, **change}))
+
+        assert not checks[check_id].passed
+        assert checks[check_id].reason
+
+    def test_safe_harbor_lists_missing_identifiers(self):
+        context = {
+            "isDeIdentified": True,
+            "deidentificationMethod": "safe_harbor",
+            "safeHarborRemoved": list(SAFE_HARBOR_IDENTIFIERS[:-1]),
+        }
+        check = outcomes(get_rule_engine().evaluate(context, ["us-fed-hipaa"]))["hipaa-009"]
+
+        assert not check.passed
+        assert check.reason.endswith("Missing: other_unique_identifiers")
+
+    def test_high_risk_ai_act_requirements(self):
+        checks = outcomes(get_rule_engine().evaluate({"aiActRiskCategory": "high"}, ["eu-ai-act"]))
+
+        assert {c.check_id for c in checks.values() if not c.passed} == {"ai-act-003", "ai-act-013", "ai-act-014"}
+
+    def test_malformed_field_fails_check(self):
+        checks = outcomes(get_rule_engine().evaluate({**SECURE_PHI_CONTEXT, "retentionDays": "ten years"}))
+
+        assert not checks["phipa-008"].passed
+        assert checks["phipa-001"].passed
+
+    def test_prebuilt_context_accepted(self):
+        context = EvaluationContext(SECURE_PHI_CONTEXT)
+        engine = get_rule_engine()
+
+        assert (context.phi_present, context.breach_detected) == (True, None)
+        assert [pack.to_dict() for pack in engine.evaluate(context)] == \
+            [pack.to_dict() for pack in engine.evaluate(SECURE_PHI_CONTEXT)]
+
+    def test_all_packs_well_under_a_millisecond(self):
+        plan = get_rule_engine().plan()
+        plan.evaluate(SECURE_PHI_CONTEXT)
+
+        start = time.perf_counter()
+        for _ in range(200):
+            plan.evaluate(SECURE_PHI_CONTEXT)
+        per_evaluation = (time.perf_counter() - start) / 200
+
+        assert per_evaluation < 0.001
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
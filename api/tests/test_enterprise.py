@@ -6,7 +6,7 @@ Copyright 2026 Forge Partners Inc.
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import patch
 import sys
 from pathlib import Path
 
@@ -14,6 +14,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from main import app
+from auth.jwt_auth import verify_jwt_token
 
 
 @pytest.fixture
@@ -23,12 +24,15 @@ def client():
 
 
 @pytest.fixture
-def mock_supabase():
-    """Mock Supabase client."""
-    with patch("auth.supabase_client.get_supabase") as mock:
-        mock_client = Mock()
-        mock.return_value = mock_client
-        yield mock_client
+def portal_user(organization):
+    """Authenticate portal requests as the owner of the test organization."""
+    app.dependency_overrides[verify_jwt_token] = lambda: {
+        "user_id": "user123",
+        "org_id": organization["id"],
+        "plan": "free"
+    }
+    yield
+    app.dependency_overrides.pop(verify_jwt_token, None)
 
 
 class TestPolicyPacks:
@@ -56,14 +60,9 @@ class TestPolicyPacks:
         response = client.get("/v1/packs/ca-on-phipa")
         assert response.status_code == 401
     
-    @patch("auth.api_keys.verify_api_key")
-    def test_get_pack_detail_with_auth(self, mock_verify, client):
+    def test_get_pack_detail_with_auth(self, client, api_key):
         """Test pack detail with authentication."""
-        from auth.api_keys import APIKeyInfo
-        
-        mock_verify.return_value = APIKeyInfo("key123", "org123", "free", "test", "dev")
-        
-        headers = {"X-API-Key": "lumen_pk_dev_test123"}
+        headers = {"X-API-Key": api_key}
         response = client.get("/v1/packs/ca-on-phipa", headers=headers)
         assert response.status_code == 200
         
@@ -72,15 +71,11 @@ class TestPolicyPacks:
         assert pack["name"] == "Ontario PHIPA Healthcare Pack"
         assert len(pack["checks"]) == 15  # Should have 15 checks
     
-    def test_get_nonexistent_pack(self, client):
+    def test_get_nonexistent_pack(self, client, api_key):
         """Test getting non-existent pack."""
-        with patch("auth.api_keys.verify_api_key") as mock_verify:
-            from auth.api_keys import APIKeyInfo
-            mock_verify.return_value = APIKeyInfo("key123", "org123", "free", "test", "dev")
-            
-            headers = {"X-API-Key": "lumen_pk_dev_test123"}
-            response = client.get("/v1/packs/nonexistent", headers=headers)
-            assert response.status_code == 404
+        headers = {"X-API-Key": api_key}
+        response = client.get("/v1/packs/nonexistent", headers=headers)
+        assert response.status_code == 404
 
 
 class TestAPIKeyManagement:
@@ -94,32 +89,8 @@ class TestAPIKeyManagement:
         })
         assert response.status_code == 401
     
-    @patch("auth.jwt_auth.verify_jwt_token")
-    @patch("auth.supabase_client.get_supabase")
-    def test_generate_key_success(self, mock_supabase, mock_jwt, client):
+    def test_generate_key_success(self, client, portal_user, repository, organization):
         """Test successful key generation."""
-        # Mock JWT verification
-        mock_jwt.return_value = {
-            "user_id": "user123",
-            "org_id": "org123", 
-            "plan": "free"
-        }
-        
-        # Mock Supabase responses
-        mock_client = Mock()
-        mock_supabase.return_value = mock_client
-        
-        # Mock existing key count (none)
-        mock_client.from_().select().eq().eq().execute.return_value = Mock(count=0)
-        
-        # Mock key insert
-        mock_client.from_().insert().execute.return_value = Mock(data=[{
-            "id": "key123",
-            "name": "Test Key",
-            "environment": "dev",
-            "created_at": "2026-02-13T15:30:00Z"
-        }])
-        
         headers = {"Authorization": "Bearer valid-jwt-token"}
         response = client.post("/v1/keys/generate", headers=headers, json={
             "name": "Test Key",
@@ -132,22 +103,19 @@ class TestAPIKeyManagement:
         assert data["environment"] == "dev"
         assert "api_key" in data
         assert data["api_key"].startswith("lumen_pk_dev_")
+        
+        # First key records the legal acknowledgment
+        assert repository.organizations[organization["id"]]["legal_acknowledgment"] is True
     
-    @patch("auth.jwt_auth.verify_jwt_token")
-    @patch("auth.supabase_client.get_supabase")
-    def test_generate_key_limit_exceeded(self, mock_supabase, mock_jwt, client):
+    def test_generate_key_limit_exceeded(self, client, portal_user, repository, organization):
         """Test key generation with limit exceeded."""
-        mock_jwt.return_value = {
-            "user_id": "user123",
-            "org_id": "org123",
-            "plan": "free"
-        }
-        
-        mock_client = Mock()
-        mock_supabase.return_value = mock_client
-        
-        # Mock existing key count (at limit)
-        mock_client.from_().select().eq().eq().execute.return_value = Mock(count=2)
+        # Existing active keys (at limit)
+        for i in range(2):
+            repository.api_keys[f"existing{i}"] = {
+                "id": f"existing{i}",
+                "org_id": organization["id"],
+                "status": "active",
+            }
         
         headers = {"Authorization": "Bearer valid-jwt-token"}
         response = client.post("/v1/keys/generate", headers=headers, json={
@@ -163,12 +131,8 @@ class TestRateLimiting:
     """Test rate limiting middleware."""
     
     @patch("middleware.rate_limit._rate_limiter.is_allowed")
-    @patch("auth.api_keys.verify_api_key")
-    def test_rate_limit_headers(self, mock_verify, mock_rate_limit, client):
+    def test_rate_limit_headers(self, mock_rate_limit, client, api_key):
         """Test rate limit headers are added."""
-        from auth.api_keys import APIKeyInfo
-        
-        mock_verify.return_value = APIKeyInfo("key123", "org123", "free", "test", "dev")
         mock_rate_limit.return_value = (True, {
             "limit": 100,
             "remaining": 99,
@@ -176,7 +140,7 @@ class TestRateLimiting:
             "retry_after": 0
         })
         
-        headers = {"X-API-Key": "lumen_pk_dev_test123"}
+        headers = {"X-API-Key": api_key}
         response = client.get("/v1/packs", headers=headers)
         
         assert "X-RateLimit-Limit" in response.headers
@@ -184,7 +148,7 @@ class TestRateLimiting:
         assert response.headers["X-RateLimit-Limit"] == "100"
     
     @patch("middleware.rate_limit._rate_limiter.is_allowed")
-    def test_rate_limit_exceeded(self, mock_rate_limit, client):
+    def test_rate_limit_exceeded(self, mock_rate_limit, client, api_key):
         """Test rate limit exceeded response."""
         mock_rate_limit.return_value = (False, {
             "limit": 100,
@@ -193,17 +157,49 @@ class TestRateLimiting:
             "retry_after": 60
         })
         
-        headers = {"X-API-Key": "lumen_pk_dev_test123"}
+        headers = {"X-API-Key": api_key}
         response = client.get("/v1/packs", headers=headers)
         
         assert response.status_code == 429
         assert "Retry-After" in response.headers
+    
+    @patch("middleware.rate_limit._rate_limiter.is_allowed")
+    def test_limit_by_key_id_and_plan(self, mock_rate_limit, client, api_key, repository, organization):
+        """Buckets are per verified key_id with the organization's plan limit."""
+        mock_rate_limit.return_value = (True, {
+            "limit": 1000,
+            "remaining": 999,
+            "reset": 1708789200,
+            "retry_after": 0
+        })
+        organization["plan"] = "pro"
+        
+        client.get("/v1/packs", headers={"X-API-Key": api_key})
+        
+        key, limit, _ = mock_rate_limit.await_args.args
+        assert key == "key123"
+        assert limit == 1000
+    
+    @patch("middleware.rate_limit._rate_limiter.is_allowed")
+    def test_invalid_key_rejected_before_limiter(self, mock_rate_limit, client, repository):
+        """Unknown keys are rejected without touching limiter state."""
+        headers = {"X-API-Key": "lumen_pk_dev_" + "x" * 43}
+        with patch.object(repository, "find_active_keys_by_prefix",
+                          wraps=repository.find_active_keys_by_prefix) as lookup:
+            first = client.get("/v1/packs", headers=headers)
+            second = client.get("/v1/packs", headers=headers)
+        
+        assert first.status_code == 403
+        assert second.status_code == 403
+        # The second attempt is answered from the rejected-key cache
+        assert lookup.await_count == 1
+        mock_rate_limit.assert_not_called()
 
 
 class TestHealthCheck:
     """Test health check endpoints."""
     
-    @patch("auth.supabase_client.health_check")
+    @patch("routes.health.supabase_health_check")
     def test_health_check_healthy(self, mock_health, client):
         """Test healthy status."""
         mock_health.return_value = True
@@ -216,7 +212,7 @@ class TestHealthCheck:
         assert data["supabase_healthy"] is True
         assert "uptime" in data
     
-    @patch("auth.supabase_client.health_check")
+    @patch("routes.health.supabase_health_check")
     def test_health_check_degraded(self, mock_health, client):
         """Test degraded status when Supabase is down."""
         mock_health.return_value = False
@@ -248,14 +244,9 @@ class TestSecurityFeatures:
         response = client.get("/v1/packs/ca-on-phipa", headers=headers)
         assert response.status_code == 403
     
-    @patch("auth.api_keys.verify_api_key")  
-    def test_environment_isolation(self, mock_verify, client):
+    def test_environment_isolation(self, client, api_key):
         """Test environment isolation in key generation."""
-        from auth.api_keys import APIKeyInfo
-        
-        mock_verify.return_value = APIKeyInfo("key123", "org123", "free", "test", "dev")
-        
-        headers = {"X-API-Key": "lumen_pk_dev_test123"}
+        headers = {"X-API-Key": api_key}
         response = client.get("/v1/packs/ca-on-phipa", headers=headers)
         
         # Should work with dev key
@@ -31,6 +31,15 @@ async def test_root_endpoint():
     assert "LUMEN" in data.get("name", "") or "lumen" in str(data).lower()
 
 
+@pytest.mark.asyncio
+async def test_metrics_requires_auth():
+    """Metrics endpoint requires a portal token."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/health/metrics")
+    assert response.status_code in [401, 403]
+
+
 @pytest.mark.asyncio
 async def test_evaluate_requires_auth():
     """Evaluate endpoint requires API key."""
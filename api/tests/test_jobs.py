@@ -0,0 +1,364 @@
+"""
+Tests for LUMEN SDK API asynchronous evaluation jobs.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import json
+import pytest
+import socket
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from jobs import Job, JobFailed, JobWorkerPool, MemoryJobQueue, QueueFull, SQLiteJobQueue, create_job_queue, resolve_callback_url
+from jobs.worker import sign_callback
+from main import app
+from models.schemas import EvaluateRequest
+from routes.evaluate import calculate_lumen_score, run_evaluation_job
+
+EVALUATION = {"ai_output": "Take 500mg twice daily.", "human_action": "accepted"}
+
+
+def make_job(org_id: str, created_at: float, **kwargs) -> Job:
+    return Job(org_id, EVALUATION, "550e8400-e29b-41d4-a716-446655440000",
+               "https://lumen.forge.health/records/550e8400-e29b-41d4-a716-446655440000",
+               created_at=created_at, **kwargs)
+
+
+def fake_dns(answers: dict):
+    """Patch host name resolution to answer from a {host: [addresses]} dict."""
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host not in answers:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET6 if ":" in address else socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+                for address in answers[host]]
+    return patch("jobs.worker.socket.getaddrinfo", getaddrinfo)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobQueue()
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"))
+
+
+@pytest.fixture
+def pool():
+    """Fresh global pool (workers not started) so jobs from other tests don't leak in."""
+    fresh = JobWorkerPool(MemoryJobQueue())
+    with patch("jobs.worker._job_pool", fresh):
+        yield fresh
+
+
+class TestJobQueue:
+    """Test claiming order and per-organization caps on both backends."""
+
+    @pytest.mark.asyncio
+    async def test_org_cap_lets_other_orgs_through(self, queue):
+        for i in range(3):
+            await queue.put(make_job("busy", created_at=i, id=f"busy-{i}"))
+        await queue.put(make_job("quiet", created_at=10, id="quiet-0"))
+
+        first = await queue.claim(org_limit=1)
+        second = await queue.claim(org_limit=1)
+
+        assert (first.id, second.id) == ("busy-0", "quiet-0")
+        assert await queue.claim(org_limit=1) is None
+
+        await queue.finish(first.id, result={"ok": True})
+        assert (await queue.claim(org_limit=1)).id == "busy-1"
+
+    @pytest.mark.asyncio
+    async def test_finish_records_outcome(self, queue):
+        await queue.put(make_job("org", created_at=1, id="a"))
+        await queue.put(make_job("org", created_at=2, id="b"))
+        await queue.claim(org_limit=2)
+        await queue.claim(org_limit=2)
+
+        await queue.finish("a", result={"lumen_score": 80})
+        await queue.finish("b", error="bad input")
+
+        succeeded, failed = await queue.get("a"), await queue.get("b")
+        assert (succeeded.status, succeeded.result) == ("succeeded", {"lumen_score": 80})
+        assert (failed.status, failed.error) == ("failed", "bad input")
+        assert succeeded.finished_at is not None
+
+    @pytest.mark.asyncio
+    async def test_queued_count_and_purge(self, queue):
+        await queue.put(make_job("org", created_at=1, id="a"))
+        await queue.put(make_job("org", created_at=2, id="b"))
+        assert await queue.queued_count("org") == 2
+
+        await queue.claim(org_limit=1)
+        await queue.finish("a", result={})
+
+        assert await queue.queued_count("org") == 1
+        assert await queue.purge(finished_before=float("inf")) == 1
+        assert await queue.get("a") is None
+        assert await queue.get("b") is not None
+
+
+class TestSQLiteJobQueue:
+    """Test lease recovery and sharing across queue instances."""
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed_then_failed(self, tmp_path):
+        queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), lease_seconds=-1, max_attempts=2)
+        await queue.put(make_job("org", created_at=1, id="a"))
+
+        assert (await queue.claim(org_limit=1)).attempts == 1
+        # The first worker died; its lease has expired
+        assert (await queue.claim(org_limit=1)).attempts == 2
+        assert await queue.claim(org_limit=1) is None
+        assert (await queue.get("a")).status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_cap_shared_across_instances(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        first, second = SQLiteJobQueue(path), SQLiteJobQueue(path)
+        await first.put(make_job("org", created_at=1, id="a"))
+        await first.put(make_job("org", created_at=2, id="b"))
+
+        assert (await first.claim(org_limit=1)).id == "a"
+        assert await second.claim(org_limit=1) is None
+        await first.close()
+        await second.close()
+
+
+class TestCreateJobQueue:
+    """Test backend configuration checks."""
+
+    def test_memory_queue_refused_with_several_workers(self):
+        assert isinstance(create_job_queue("memory", workers=1), MemoryJobQueue)
+        with pytest.raises(ValueError, match="single worker"):
+            create_job_queue("memory", workers=4)
+
+    def test_sqlite_requires_path_outside_temp_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="must be set"):
+            create_job_queue("sqlite", "")
+        with pytest.raises(ValueError, match="temporary directory"):
+            create_job_queue("sqlite", str(tmp_path / "jobs.db"))
+
+    @pytest.mark.asyncio
+    async def test_sqlite_files_owner_only(self, tmp_path):
+        queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+        await queue.put(make_job("org", created_at=1, id="a"))
+
+        modes = {path.name: path.stat().st_mode & 0o777 for path in tmp_path.iterdir()}
+        await queue.close()
+        assert modes["jobs.db"] == 0o600 and set(modes.values()) == {0o600}
+
+
+class TestJobWorkerPool:
+    """Test job execution and completion callbacks."""
+
+    @pytest.mark.asyncio
+    async def test_workers_run_evaluation(self):
+        pool = JobWorkerPool(MemoryJobQueue(), workers=2, poll_interval=0.01)
+        pool.start(run_evaluation_job)
+        job = await pool.submit(make_job("org", created_at=1))
+
+        for _ in range(200):
+            if (await pool.queue.get(job.id)).status == "succeeded":
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+        finished = await pool.queue.get(job.id)
+        lumen_score, _, _, _ = calculate_lumen_score(EvaluateRequest(**EVALUATION))
+        assert finished.status == "succeeded"
+        assert finished.result["record_id"] == job.record_id
+        assert finished.result["defensible_record_url"] == job.record_url
+        assert finished.result["lumen_score"] == lumen_score
+
+    @pytest.mark.asyncio
+    async def test_handler_failure_fails_job(self):
+        async def handler(job):
+            raise JobFailed("Invalid scoring inputs")
+
+        pool = JobWorkerPool(MemoryJobQueue())
+        pool.handler = handler
+        await pool.submit(make_job("org", created_at=1, id="a"))
+
+        finished = await pool.run_job(await pool.queue.claim(org_limit=1))
+
+        assert (finished.status, finished.error) == ("failed", "Invalid scoring inputs")
+        assert pool.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_callback_is_signed_and_retried(self):
+        received = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            received.append(request)
+            return httpx.Response(503 if len(received) == 1 else 204)
+
+        async def handler(job):
+            return {"lumen_score": 80}
+
+        pool = JobWorkerPool(MemoryJobQueue(), http_client=httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+        pool.handler = handler
+        await pool.submit(make_job("org", created_at=1, id="a", callback_url="https://hooks.example.com/lumen"))
+
+        with patch("jobs.worker.JOB_CALLBACK_SECRET", "s3cret"), \
+                patch("jobs.worker.asyncio.sleep") as sleep, \
+                fake_dns({"hooks.example.com": ["93.184.216.34"]}):
+            await pool.run_job(await pool.queue.claim(org_limit=1))
+            await asyncio.gather(*pool._callbacks)
+
+        assert len(received) == 2
+        sleep.assert_awaited_once_with(1)
+        body = received[-1].content
+        assert json.loads(body)["status"] == "succeeded"
+        assert received[-1].headers["X-Lumen-Job-Id"] == "a"
+        assert received[-1].headers["X-Lumen-Signature"] == sign_callback(body, "s3cret")
+        # Sent to the checked address, under the URL's host name
+        assert str(received[-1].url) == "https://93.184.216.34/lumen"
+        assert received[-1].headers["Host"] == "hooks.example.com"
+        assert received[-1].extensions["sni_hostname"] == "hooks.example.com"
+
+    @pytest.mark.asyncio
+    async def test_callback_rechecks_address_before_delivery(self):
+        """A host re-pointed at an internal address after queueing is not called."""
+        received = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            received.append(request)
+            return httpx.Response(204)
+
+        async def handler(job):
+            return {"lumen_score": 80}
+
+        pool = JobWorkerPool(MemoryJobQueue(), http_client=httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+        pool.handler = handler
+        with fake_dns({"hooks.example.com": ["93.184.216.34"]}):
+            url = "https://hooks.example.com/lumen"
+            await resolve_callback_url(url)
+            await pool.submit(make_job("org", created_at=1, id="a", callback_url=url))
+
+        with fake_dns({"hooks.example.com": ["169.254.169.254"]}), patch("jobs.worker.asyncio.sleep"):
+            await pool.run_job(await pool.queue.claim(org_limit=1))
+            assert await asyncio.gather(*pool._callbacks) == [False]
+
+        assert received == []
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_capped_per_org(self):
+        pool = JobWorkerPool(MemoryJobQueue(), max_queued_per_org=1)
+        await pool.submit(make_job("org", created_at=1))
+
+        with pytest.raises(QueueFull):
+            await pool.submit(make_job("org", created_at=2))
+        await pool.submit(make_job("other", created_at=3))
+
+
+class TestCallbackAddresses:
+    """Test that callback hosts must resolve to public addresses."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("address", [
+        "127.0.0.1", "10.0.0.5", "172.16.0.1", "192.168.1.1", "169.254.169.254", "100.64.0.1",
+        "0.0.0.0", "224.0.0.1", "240.0.0.1", "::1", "fe80::1", "fd00::1", "ff02::1", "::ffff:127.0.0.1",
+    ])
+    async def test_internal_addresses_refused(self, address):
+        with fake_dns({"hooks.example.com": [address]}), pytest.raises(ValueError, match="must not resolve"):
+            await resolve_callback_url("https://hooks.example.com/lumen")
+
+    @pytest.mark.asyncio
+    async def test_address_literals_checked(self):
+        with fake_dns({"169.254.169.254": ["169.254.169.254"]}), pytest.raises(ValueError):
+            await resolve_callback_url("https://169.254.169.254/latest/meta-data/")
+
+    @pytest.mark.asyncio
+    async def test_any_internal_answer_refuses(self):
+        with fake_dns({"hooks.example.com": ["93.184.216.34", "10.0.0.5"]}), pytest.raises(ValueError):
+            await resolve_callback_url("https://hooks.example.com/lumen")
+
+    @pytest.mark.asyncio
+    async def test_public_address_accepted(self):
+        with fake_dns({"hooks.example.com": ["2606:2800:220:1::248", "93.184.216.34"]}):
+            assert await resolve_callback_url("https://hooks.example.com/lumen") == "2606:2800:220:1::248"
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_host_refused(self):
+        with fake_dns({}), pytest.raises(ValueError, match="does not resolve"):
+            await resolve_callback_url("https://hooks.example.com/lumen")
+
+    @pytest.mark.asyncio
+    async def test_private_allowed_for_local_development(self):
+        with fake_dns({"localhost": ["127.0.0.1"]}), patch("jobs.worker.JOB_CALLBACK_ALLOW_PRIVATE", True):
+            assert await resolve_callback_url("https://localhost/hook") == "127.0.0.1"
+
+
+class TestAsyncEvaluateEndpoint:
+    """Test POST /v1/evaluate?mode=async and GET /v1/jobs/{id}."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_enqueue_then_poll(self, client, api_key, pool):
+        headers = {"X-API-Key": api_key}
+        response = client.post("/v1/evaluate?mode=async", json=EVALUATION, headers=headers)
+
+        assert response.status_code == 202
+        queued = response.json()
+        assert queued["status"] == "queued"
+        assert response.headers["Location"] == f"/v1/jobs/{queued['job_id']}"
+        assert queued["defensible_record_url"].endswith(queued["record_id"])
+
+        pool.handler = run_evaluation_job
+        asyncio.run(pool.run_job(asyncio.run(pool.queue.claim(org_limit=1))))
+
+        polled = client.get(f"/v1/jobs/{queued['job_id']}", headers=headers).json()
+        assert polled["status"] == "succeeded"
+        assert polled["result"]["record_id"] == queued["record_id"]
+
+    def test_malformed_context_rejected_before_queueing(self, client, api_key, pool):
+        response = client.post(
+            "/v1/evaluate?mode=async",
+            json={**EVALUATION, "context": {"strategicFactors": [{"name": "x"}]}},
+            headers={"X-API-Key": api_key},
+        )
+
+        assert response.status_code == 422
+        assert asyncio.run(pool.queue.claim(org_limit=1)) is None
+
+    @pytest.mark.parametrize("query", [
+        "mode=async&callback_url=http://hooks.example.com/lumen",
+        "callback_url=https://hooks.example.com/lumen",
+    ])
+    def test_invalid_callback_rejected(self, client, api_key, pool, query):
+        response = client.post(f"/v1/evaluate?{query}", json=EVALUATION, headers={"X-API-Key": api_key})
+
+        assert response.status_code == 422
+
+    def test_internal_callback_rejected_before_queueing(self, client, api_key, pool):
+        with fake_dns({"hooks.example.com": ["169.254.169.254"]}):
+            response = client.post(
+                "/v1/evaluate?mode=async&callback_url=https://hooks.example.com/lumen",
+                json=EVALUATION, headers={"X-API-Key": api_key},
+            )
+
+        assert response.status_code == 422
+        assert asyncio.run(pool.queue.claim(org_limit=1)) is None
+
+    def test_other_orgs_job_not_found(self, client, api_key, pool):
+        job = make_job("another-org", created_at=1)
+        asyncio.run(pool.submit(job))
+
+        response = client.get(f"/v1/jobs/{job.id}", headers={"X-API-Key": api_key})
+
+        assert response.status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
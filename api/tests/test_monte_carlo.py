@@ -0,0 +1,140 @@
+"""
+Tests for LUMEN SDK API Monte Carlo risk adjustment.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scoring import kernel, monte_carlo
+
+FACTORS = [
+    {"factorName": "Technical Maturity", "confidence": "Moderate"},
+    {"factorName": "Regulatory Alignment", "confidence": "Strong"},
+    {"factorName": "Vendor Ecosystem", "confidence": "Limited"},
+]
+
+DECISION_INPUT = {
+    "citationIntegrity": {"totalCitations": 9, "verifiedCitations": 8, "fabricatedCitations": 0, "mismatchedCitations": 1},
+    "controlResults": [{"controlId": "phipa-001", "passed": True, "severity": "HIGH"}],
+    "evidenceMetrics": {"sourceCount": 4, "avgRetrievalScore": 0.73, "documentTypeCount": 2},
+}
+
+
+def with_controls(*controls):
+    return {**DECISION_INPUT, "controlResults": list(controls)}
+
+
+class TestMonteCarloSimulation:
+    """Test the vectorized simulation."""
+
+    def test_seeded_by_inputs(self):
+        """Identical inputs reproduce the simulation; different inputs do not."""
+        first, _ = monte_carlo.compute_monte_carlo_variance(FACTORS, DECISION_INPUT)
+        second, _ = monte_carlo.compute_monte_carlo_variance(FACTORS, DECISION_INPUT)
+        other, _ = monte_carlo.compute_monte_carlo_variance(FACTORS, DECISION_INPUT, phi_involved=True)
+
+        assert first == second
+        assert other["variance"] != first["variance"]
+
+    def test_model_matches_kernel_without_uncertainty(self):
+        """The linear model reproduces the kernel's composite score."""
+        values, ranges, weights = monte_carlo.composite_model(FACTORS, DECISION_INPUT, {"legal": "Amber"})
+        scores, _ = monte_carlo.simulate(values, np.zeros_like(ranges), weights, runs=10, seed=1)
+        result = kernel.calculate_lumen_score(
+            FACTORS, DECISION_INPUT, {"legal": "Amber"},
+            monte_carlo_signal={"variance": 0, "runs": 1, "method": "MULTI_RUN", "isStable": True},
+        )
+
+        assert np.allclose(scores, scores[0])
+        strategic = result["strategicConfidence"]
+        assert scores[0] == pytest.approx(0.4 * strategic["baseScore"] * strategic["riskModifier"]
+                                          + 0.6 * result["decisionTrust"]["overall"], abs=0.5)
+
+    def test_worst_case_is_fifth_percentile(self):
+        _, summary = monte_carlo.compute_monte_carlo_variance(FACTORS, DECISION_INPUT, risk_class="CRITICAL")
+        values, ranges, weights = monte_carlo.composite_model(FACTORS, DECISION_INPUT)
+        inputs_hash = kernel.composite_inputs_hash(
+            kernel.strategic_inputs_hash(FACTORS, None, False, False),
+            kernel.decision_inputs_hash(DECISION_INPUT),
+        )
+        scores, _ = monte_carlo.simulate(values, ranges, weights, 10000, int(inputs_hash[:16], 16))
+
+        assert summary["runs"] == 10000
+        assert summary["worstCase"] == np.sort(scores)[500]
+        assert summary["worstCase"] < summary["mean"]
+
+    def test_batched_run_matches_single_runs(self):
+        """Stacking simulations does not change any of their results."""
+        variants = [{}, {"phi_involved": True}, {"risk_radar": {"legal": "Amber"}}, {"strategic_factors": FACTORS[:1]}]
+        simulations = [monte_carlo.prepare(**{"strategic_factors": FACTORS, "decision_input": DECISION_INPUT, **v})
+                       for v in variants * 2]
+
+        monte_carlo.run(simulations)
+
+        for variant, simulation in zip(variants * 2, simulations):
+            signal, summary = monte_carlo.compute_monte_carlo_variance(
+                **{"strategic_factors": FACTORS, "decision_input": DECISION_INPUT, **variant}
+            )
+            assert simulation.signal == signal
+            assert simulation.summary == summary
+
+    def test_large_batches_run_in_bounded_groups(self):
+        """At most MONTE_CARLO_GROUP_SIZE simulations share one draw tensor."""
+        simulations = [monte_carlo.prepare(FACTORS, with_controls({"controlId": str(i), "passed": True, "severity": "HIGH"}))
+                       for i in range(8)]
+        simulate_many = monte_carlo.simulate_many
+
+        with patch.object(monte_carlo, "MONTE_CARLO_GROUP_SIZE", 3), \
+                patch.object(monte_carlo, "simulate_many", side_effect=simulate_many) as spy:
+            monte_carlo.run(simulations)
+
+        assert [len(call.args[4]) for call in spy.call_args_list] == [3, 3, 2]
+        for simulation in simulations:
+            signal, summary = monte_carlo.compute_monte_carlo_variance(**simulation.inputs)
+            assert simulation.summary == summary
+
+    @pytest.mark.parametrize("kwargs,risk_class", [
+        ({}, "LOW"),
+        ({"risk_radar": {"legal": "Amber"}}, "MODERATE"),
+        ({"phi_involved": True}, "HIGH"),
+        ({"decision_input": with_controls({"controlId": "c", "passed": False, "severity": "CRITICAL"})}, "CRITICAL"),
+    ])
+    def test_runs_follow_risk_class(self, kwargs, risk_class):
+        arguments = {"decision_input": DECISION_INPUT, **kwargs}
+        signal, summary = monte_carlo.compute_monte_carlo_variance(FACTORS, **arguments)
+
+        assert summary["riskClass"] == risk_class
+        assert signal["runs"] == kernel.recommended_runs(risk_class) * monte_carlo.MONTE_CARLO_RUN_MULTIPLIER
+
+
+class TestRiskAdjustedScore:
+    """Test the blended score."""
+
+    def test_blends_base_and_worst_case(self):
+        result = monte_carlo.calculate_risk_adjusted_score(FACTORS, DECISION_INPUT)
+        adjustment = result["riskAdjustment"]
+
+        expected = 0.7 * result["compositeScore"] + 0.3 * adjustment["worstCase"]
+        assert adjustment["adjustedScore"] == round(expected)
+        assert result["compositeProvenance"]["monteCarloSignal"]["method"] == "MULTI_RUN"
+
+    def test_simulated_signal_replaces_stub_penalty(self):
+        """A low-variance simulation degrades the score far less than the stub."""
+        stub = kernel.calculate_lumen_score(FACTORS, DECISION_INPUT)
+        simulated = monte_carlo.calculate_risk_adjusted_score(FACTORS, DECISION_INPUT)
+
+        assert simulated["compositeScore"] > stub["compositeScore"]
+        assert not any("Monte Carlo degradation: 25%" in note
+                       for note in simulated["compositeProvenance"]["auditNotes"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,157 @@
+"""
+Tests for LUMEN SDK API per-organization enabled pack cache.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from auth.jwt_auth import verify_jwt_token
+from compliance import get_rule_engine
+from compliance.org_packs import OrgPackCache, get_enabled_packs, get_org_pack_cache
+from main import app
+
+OUTPUT = "Patient name: Jane Roe, SSN 123-45-6789."
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def portal_user(organization):
+    """Authenticate portal requests as the owner of the test organization."""
+    app.dependency_overrides[verify_jwt_token] = lambda: {
+        "user_id": "user123",
+        "org_id": organization["id"],
+        "plan": "free"
+    }
+    yield
+    app.dependency_overrides.pop(verify_jwt_token, None)
+
+
+class TestOrgPackCache:
+    """Test entries, plans, expiry and invalidation."""
+
+    def test_catalog_order_and_unknown_packs_dropped(self):
+        cache = OrgPackCache()
+        packs = cache.put("org", ["us-fed-hipaa", "retired-pack", "ca-on-phipa"])
+
+        assert packs.pack_ids == ("ca-on-phipa", "us-fed-hipaa")
+        assert packs.plan is get_rule_engine().plan(["ca-on-phipa", "us-fed-hipaa"])
+        assert cache.get("org") is packs
+
+    def test_select_narrows_to_enabled_packs(self):
+        packs = OrgPackCache().put("org", ["ca-on-phipa", "us-fed-hipaa"])
+
+        assert packs.select([]) is packs.plan
+        assert packs.select(["us-fed-hipaa", "eu-ai-act", "phipa"]).pack_ids == ("us-fed-hipaa",)
+        assert packs.select(["eu-ai-act"]).pack_ids == ()
+
+    def test_ttl_expiry(self):
+        cache = OrgPackCache(ttl_seconds=10)
+        with patch("compliance.org_packs.time.time", return_value=1000.0):
+            cache.put("org", ["ca-on-phipa"])
+        with patch("compliance.org_packs.time.time", return_value=1009.0):
+            assert cache.get("org") is not None
+        with patch("compliance.org_packs.time.time", return_value=1010.0):
+            assert cache.get("org") is None
+
+    def test_lru_eviction(self):
+        cache = OrgPackCache(max_entries=2)
+        cache.put("a", [])
+        cache.put("b", [])
+        cache.get("a")
+        cache.put("c", [])
+
+        assert (cache.get("a") is None, cache.get("b") is None, cache.get("c") is None) == (False, True, False)
+        assert cache.stats()["evictions"] == 1
+
+    def test_load_racing_invalidation_not_cached(self):
+        cache = OrgPackCache()
+        generation = cache.generation
+        cache.invalidate("org")
+        packs = cache.put("org", ["ca-on-phipa"], generation)
+
+        assert packs.pack_ids == ("ca-on-phipa",)
+        assert cache.get("org") is None
+
+    @pytest.mark.asyncio
+    async def test_steady_state_skips_repository(self, repository, organization):
+        await repository.enable_pack(organization["id"], "ca-on-phipa", "2026-02-13T15:30:00+00:00")
+
+        with patch.object(repository, "list_enabled_packs", wraps=repository.list_enabled_packs) as loads:
+            first = await get_enabled_packs(organization["id"])
+            second = await get_enabled_packs(organization["id"])
+
+        assert first is second
+        assert first.pack_ids == ("ca-on-phipa",)
+        assert loads.call_count == 1
+
+
+class TestEvaluateWithEnabledPacks:
+    """Test that /v1/evaluate runs the organization's packs."""
+
+    def evaluate(self, client, api_key, **body):
+        response = client.post(
+            "/v1/evaluate",
+            json={"ai_output": OUTPUT, "human_action": "accepted", **body},
+            headers={"X-API-Key": api_key}
+        )
+        assert response.status_code == 200
+        return response.json()["compliance"]
+
+    def test_no_packs_enabled(self, client, api_key):
+        assert self.evaluate(client, api_key, compliance_packs=["ca-on-phipa"]) == []
+
+    def test_enable_and_disable_take_effect_immediately(self, client, api_key, portal_user):
+        headers = {"Authorization": "Bearer valid-jwt-token"}
+        assert self.evaluate(client, api_key) == []
+
+        for pack_id in ("ca-on-phipa", "us-fed-hipaa"):
+            assert client.post("/v1/packs/enable", json={"pack_id": pack_id}, headers=headers).status_code == 200
+        compliance = self.evaluate(client, api_key, context={"phiPresent": True})
+
+        assert [pack["pack_id"] for pack in compliance] == ["ca-on-phipa", "us-fed-hipaa"]
+        hipaa_001 = next(check for check in compliance[1]["checks"] if check["check_id"] == "hipaa-001")
+        assert not hipaa_001["passed"]
+        assert {match["pattern"] for match in hipaa_001["matches"]} == {"identifier_label", "ssn"}
+
+        assert [pack["pack_id"] for pack in self.evaluate(client, api_key, compliance_packs=["us-fed-hipaa"])] == \
+            ["us-fed-hipaa"]
+
+        assert client.post("/v1/packs/disable", json={"pack_id": "ca-on-phipa"}, headers=headers).status_code == 200
+        assert [pack["pack_id"] for pack in self.evaluate(client, api_key)] == ["us-fed-hipaa"]
+        assert get_org_pack_cache().stats()["hits"] >= 1
+
+    def test_batch_items_get_their_own_results(self, client, api_key, repository, organization):
+        repository.organization_packs["row"] = {
+            "id": "row", "org_id": organization["id"], "pack_id": "us-fed-hipaa",
+            "enabled": True, "enabled_at": "2026-02-13T15:30:00+00:00", "disabled_at": None,
+        }
+        items = [
+            {"ai_output": OUTPUT, "human_action": "accepted", "context": {"phiPresent": True}},
+            {"ai_output": "Continue metformin.", "human_action": "accepted", "context": {"phiPresent": True}},
+        ]
+        response = client.post("/v1/evaluate/batch", json={"items": items}, headers={"X-API-Key": api_key})
+
+        results = [item["result"] for item in response.json()["results"]]
+        matched = [
+            [check["matches"] for check in result["compliance"][0]["checks"] if check["check_id"] == "hipaa-001"][0]
+            for result in results
+        ]
+        assert results[0]["lumen_score"] == results[1]["lumen_score"]
+        assert matched[0] and not matched[1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,276 @@
+"""
+Tests for LUMEN SDK API rate limiting.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import multiprocessing
+import pytest
+import pytest_asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from middleware.limiter_backends import (
+    GCRARateLimit,
+    RedisRateLimit,
+    SQLiteRateLimit,
+    create_rate_limiter,
+)
+from tests.redis_standin import RedisStandIn
+
+
+class FakeClock:
+    """Controllable replacement for time.time()."""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("middleware.limiter_backends.time.time", fake):
+        yield fake
+
+
+class TestGCRARateLimit:
+    """Test the GCRA limiter."""
+
+    @pytest.mark.asyncio
+    async def test_allows_burst_up_to_limit(self, clock):
+        """A fresh key gets `limit` requests, counting remaining down to zero."""
+        limiter = GCRARateLimit()
+        remaining = []
+        for _ in range(10):
+            allowed, metadata = await limiter.is_allowed("key1", 10, 60)
+            assert allowed
+            remaining.append(metadata["remaining"])
+
+        assert remaining == list(range(9, -1, -1))
+        allowed, metadata = await limiter.is_allowed("key1", 10, 60)
+        assert not allowed
+        assert metadata["remaining"] == 0
+        assert metadata["retry_after"] == 6
+
+    @pytest.mark.asyncio
+    async def test_refills_one_token_per_interval(self, clock):
+        """After the emission interval exactly one more request conforms."""
+        limiter = GCRARateLimit()
+        for _ in range(10):
+            await limiter.is_allowed("key1", 10, 60)
+
+        clock.now += 6
+        assert (await limiter.is_allowed("key1", 10, 60))[0]
+        assert not (await limiter.is_allowed("key1", 10, 60))[0]
+
+        clock.now += 60
+        allowed, metadata = await limiter.is_allowed("key1", 10, 60)
+        assert allowed
+        assert metadata["remaining"] == 9
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, clock):
+        """One key exhausting its bucket does not affect another."""
+        limiter = GCRARateLimit()
+        for _ in range(3):
+            await limiter.is_allowed("key1", 2, 60)
+
+        assert (await limiter.is_allowed("key2", 2, 60))[0]
+
+    @pytest.mark.asyncio
+    async def test_reset_and_cleanup(self, clock):
+        """Reset is when the bucket is full again; full buckets are dropped."""
+        limiter = GCRARateLimit()
+        _, metadata = await limiter.is_allowed("key1", 10, 60)
+        assert metadata["reset"] == int(clock.now) + 6
+
+        await limiter.cleanup()
+        assert limiter.size() == 1
+
+        clock.now += 6
+        await limiter.cleanup()
+        assert limiter.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_sweep_is_bounded_and_incremental(self, clock):
+        """Each sweep visits one shard and at most max_keys keys."""
+        limiter = GCRARateLimit(shards=2)
+        for i in range(20):
+            await limiter.is_allowed(f"key{i}", 10, 60)
+        sizes = [len(shard.tats) for shard in limiter._shards]
+
+        clock.now += 60
+        assert await limiter.sweep(max_keys=3) == min(3, sizes[0])
+        assert await limiter.sweep(max_keys=3) == min(3, sizes[1])
+        assert limiter.size() == 20 - min(3, sizes[0]) - min(3, sizes[1])
+
+    @pytest.mark.asyncio
+    async def test_sweep_visits_least_recently_updated_first(self, clock):
+        """Recently updated keys move to the back of their shard."""
+        limiter = GCRARateLimit(shards=1)
+        await limiter.is_allowed("old", 10, 60)
+        await limiter.is_allowed("hot", 10, 60)
+        clock.now += 10
+        await limiter.is_allowed("hot", 10, 60)
+
+        assert await limiter.sweep(max_keys=1) == 1
+        assert list(limiter._shards[0].tats) == ["hot"]
+
+
+def _sqlite_worker(path: str, attempts: int) -> int:
+    """Run in a separate process: count allowed requests against a shared file."""
+    async def run():
+        limiter = SQLiteRateLimit(path)
+        allowed = 0
+        for _ in range(attempts):
+            allowed += (await limiter.is_allowed("shared", 20, 3600))[0]
+        await limiter.close()
+        return allowed
+    return asyncio.run(run())
+
+
+class TestSQLiteRateLimit:
+    """Test the SQLite backend shared by workers on one host."""
+
+    @pytest.mark.asyncio
+    async def test_limit_shared_across_instances(self, tmp_path, clock):
+        """Two workers on the same database share one bucket."""
+        path = str(tmp_path / "limits.db")
+        first, second = SQLiteRateLimit(path), SQLiteRateLimit(path)
+        results = [
+            (await limiter.is_allowed("key1", 4, 60))[0]
+            for limiter in (first, second) * 3
+        ]
+
+        assert results == [True, True, True, True, False, False]
+        allowed, metadata = await first.is_allowed("key1", 4, 60)
+        assert not allowed
+        assert metadata["retry_after"] == 15
+        await first.close()
+        await second.close()
+
+    def test_atomic_across_processes(self, tmp_path):
+        """Concurrent processes never admit more than the limit."""
+        path = str(tmp_path / "limits.db")
+        with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context("fork")) as pool:
+            allowed = sum(pool.map(_sqlite_worker, [path] * 4, [15] * 4))
+
+        assert allowed == 20
+
+    @pytest.mark.asyncio
+    async def test_sweep_removes_expired(self, tmp_path, clock):
+        limiter = SQLiteRateLimit(str(tmp_path / "limits.db"))
+        for i in range(5):
+            await limiter.is_allowed(f"key{i}", 10, 60)
+
+        clock.now += 60
+        assert await limiter.sweep(max_keys=2) == 2
+        await limiter.cleanup()
+        assert await limiter.sweep() == 0
+        await limiter.close()
+
+    @pytest.mark.asyncio
+    async def test_file_owner_only(self, tmp_path, clock):
+        limiter = SQLiteRateLimit(str(tmp_path / "limits.db"))
+        await limiter.is_allowed("key1", 10, 60)
+
+        modes = {path.name: path.stat().st_mode & 0o777 for path in tmp_path.iterdir()}
+        await limiter.close()
+        assert modes["limits.db"] == 0o600 and set(modes.values()) == {0o600}
+
+
+@pytest_asyncio.fixture
+async def redis_server():
+    server = await RedisStandIn().start()
+    yield server
+    await server.stop()
+
+
+class TestRedisRateLimit:
+    """Test the Redis-protocol backend against a local stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_share_limit(self, redis_server, clock):
+        """Concurrent checks from two clients admit exactly the limit."""
+        clock.now = 1_700_000_040.0  # window start
+        first = RedisRateLimit(redis_server.url, pool_size=4)
+        second = RedisRateLimit(redis_server.url, pool_size=4)
+
+        results = await asyncio.gather(*(
+            limiter.is_allowed("key1", 10, 60)
+            for limiter in (first, second) * 10
+        ))
+
+        assert sum(allowed for allowed, _ in results) == 10
+        # Rejected requests gave their units back
+        key = f"lumen:rl:key1:{int(clock.now // 60)}".encode()
+        assert redis_server.data[key] == b"10"
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_uses_multi_exec(self, redis_server, clock):
+        limiter = RedisRateLimit(redis_server.url)
+        allowed, metadata = await limiter.is_allowed("key1", 10, 60)
+
+        assert allowed
+        assert metadata["remaining"] == 9
+        assert [command[0] for command in redis_server.commands] == [
+            b"MULTI", b"INCRBY", b"PEXPIRE", b"GET", b"EXEC"
+        ]
+        await limiter.close()
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self, redis_server, clock):
+        """The sliding window counts the overlapping part of the last window."""
+        clock.now = 1_700_000_040.0
+        limiter = RedisRateLimit(redis_server.url)
+        for _ in range(10):
+            assert (await limiter.is_allowed("key1", 10, 60))[0]
+
+        # 15s into the next window, 75% of the previous window still counts
+        clock.now += 75
+        results = [(await limiter.is_allowed("key1", 10, 60)) for _ in range(3)]
+        assert [allowed for allowed, _ in results] == [True, True, False]
+        assert results[2][1]["retry_after"] == 3
+        await limiter.close()
+
+    @pytest.mark.asyncio
+    async def test_cost_is_charged(self, redis_server, clock):
+        clock.now = 1_700_000_040.0
+        limiter = RedisRateLimit(redis_server.url)
+
+        assert (await limiter.is_allowed("key1", 10, 60, cost=8))[0]
+        assert not (await limiter.is_allowed("key1", 10, 60, cost=3))[0]
+        assert (await limiter.is_allowed("key1", 10, 60, cost=2))[0]
+        await limiter.close()
+
+
+class TestBackendSelection:
+    def test_known_backends(self):
+        assert isinstance(create_rate_limiter("memory"), GCRARateLimit)
+        assert isinstance(create_rate_limiter("sqlite", "/var/lib/lumen/rate-limits.db"), SQLiteRateLimit)
+        assert isinstance(create_rate_limiter("redis"), RedisRateLimit)
+
+    def test_sqlite_requires_path_outside_temp_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="must be set"):
+            create_rate_limiter("sqlite", "")
+        with pytest.raises(ValueError, match="temporary directory"):
+            create_rate_limiter("sqlite", str(tmp_path / "limits.db"))
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_rate_limiter("memcached")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,246 @@
+"""
+Tests for LUMEN SDK API write-behind record writer.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from records import EvaluationRecord, MemoryRecordStore, RecordWriter, create_record_writer
+
+
+def make_records(count: int, org_id: str = "org-a", start: int = 0) -> list:
+    return [
+        EvaluationRecord(
+            f"r{index:04d}", org_id, 1000.0 + index, 85, 1, "ALLOW", 0.9, "accepted", [],
+            "Take 500mg twice daily.", {}, [],
+        )
+        for index in range(start, start + count)
+    ]
+
+
+class FlakyStore(MemoryRecordStore):
+    """Memory store whose writes fail while ``down`` or for the next ``failures`` calls."""
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.down = False
+        self.failures = failures
+        self.calls = []
+
+    async def put_many(self, records):
+        records = list(records)
+        self.calls.append(len(records))
+        if self.down or self.failures:
+            self.failures = max(0, self.failures - 1)
+            raise ConnectionError("store unavailable")
+        await super().put_many(records)
+
+
+async def stored(store, org_id: str = "org-a") -> int:
+    return len(await store.list(org_id, 100_000))
+
+
+class TestBatching:
+    """Test queueing, batching and reads of queued records."""
+
+    @pytest.mark.asyncio
+    async def test_multi_row_batches(self):
+        store = FlakyStore()
+        writer = RecordWriter(store, batch_size=500, journal_dir=None)
+        writer.submit(make_records(1200))
+
+        assert await writer.flush() == 1200
+        assert store.calls == [500, 500, 200]
+        assert await stored(store) == 1200
+        assert writer.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_pending_records_readable_per_organization(self):
+        writer = RecordWriter(MemoryRecordStore(), journal_dir=None)
+        writer.submit(make_records(1))
+
+        assert writer.pending("org-a", "r0000").record_id == "r0000"
+        assert writer.pending("org-b", "r0000") is None
+        await writer.flush()
+        assert writer.pending("org-a", "r0000") is None
+
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_flusher(self):
+        store = MemoryRecordStore()
+        writer = RecordWriter(store, flush_interval=60, batch_size=10, journal_dir=None)
+        task = asyncio.create_task(writer.run())
+        await asyncio.sleep(0)
+
+        writer.submit(make_records(10))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        assert await stored(store) == 10
+
+        await writer.stop()
+        await task
+
+
+class TestFailures:
+    """Test retries, spilling to the journal and replay."""
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retried(self):
+        store = FlakyStore(failures=1)
+        writer = RecordWriter(store, retry_backoff=0, journal_dir=None)
+        writer.submit(make_records(3))
+
+        assert await writer.flush() == 3
+        assert writer.stats()["failed_attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_records_journaled_before_submit_returns(self, tmp_path):
+        writer = RecordWriter(MemoryRecordStore(), journal_dir=str(tmp_path / "journal"))
+        writer.submit(make_records(2))
+
+        journal = Path(writer.journal_path)
+        assert len(journal.read_text().splitlines()) == 2
+        assert journal.stat().st_mode & 0o777 == 0o600
+        assert journal.parent.stat().st_mode & 0o777 == 0o700
+        # Compacted to the records still queued once they are stored
+        await writer.flush()
+        assert journal.read_text() == ""
+        await writer.stop()
+        assert not journal.exists()
+
+    @pytest.mark.asyncio
+    async def test_outage_spills_then_replays(self, tmp_path):
+        store = FlakyStore()
+        store.down = True
+        writer = RecordWriter(store, batch_size=2, retries=2, retry_backoff=0, journal_dir=str(tmp_path))
+        writer.submit(make_records(5))
+
+        assert await writer.flush() == 0
+        assert writer.spilling and writer.pending_count() == 0
+        writer.submit(make_records(2, start=5))
+        assert writer.pending_count() == 0
+        assert len(Path(writer.journal_path).read_text().splitlines()) == 7
+
+        store.down = False
+        await writer.flush()
+        assert await stored(store) == 7
+        assert not writer.spilling
+        assert [path.name for path in tmp_path.iterdir()] == [Path(writer.journal_path).name]
+        assert writer.stats()["replayed"] == 7
+
+    @pytest.mark.asyncio
+    async def test_journal_replayed_after_restart(self, tmp_path):
+        before = RecordWriter(MemoryRecordStore(), journal_dir=str(tmp_path))
+        before.submit(make_records(3))
+        # The process dies before a flush, releasing its lock; its last
+        # line was torn mid-write
+        with open(before.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"record_id": "r9')
+        before._journal.close()
+
+        store = MemoryRecordStore()
+        after = RecordWriter(store, journal_dir=str(tmp_path))
+        after.submit(make_records(1, start=3))
+        await after.flush()
+
+        assert await stored(store) == 4
+        assert (await store.get("org-a", "r0001")).created_at == 1001.0
+        assert not Path(before.journal_path).exists()
+
+    @pytest.mark.asyncio
+    async def test_replay_does_not_block_the_event_loop(self, tmp_path):
+        """A large orphan journal is read off the loop, so other tasks keep running."""
+        before = RecordWriter(MemoryRecordStore(), journal_dir=str(tmp_path))
+        before.submit(make_records(2000))
+        before._journal.close()
+
+        store = MemoryRecordStore()
+        after = RecordWriter(store, batch_size=100, journal_dir=str(tmp_path))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await after.flush()
+        task.cancel()
+
+        assert await stored(store) == 2000
+        assert ticks >= 20
+        assert not Path(before.journal_path).exists()
+
+    def test_journal_dir_not_in_temp_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="temporary directory"):
+            create_record_writer(str(tmp_path / "records-journal"))
+        assert create_record_writer("").journal_dir is None
+
+    @pytest.mark.asyncio
+    async def test_live_writers_journal_left_alone(self, tmp_path):
+        """Workers sharing the journal directory never replay or remove each other's journals."""
+        first_store, second_store = MemoryRecordStore(), FlakyStore()
+        first = RecordWriter(first_store, journal_dir=str(tmp_path))
+        second = RecordWriter(second_store, retries=1, journal_dir=str(tmp_path))
+        first.submit(make_records(3))
+        second_store.down = True
+        second.submit(make_records(2, start=3))
+        await second.flush()
+        second_store.down = False
+        await second.flush()
+
+        assert await stored(second_store) == 2
+        assert len(Path(first.journal_path).read_text().splitlines()) == 3
+        await first.flush()
+        assert await stored(first_store) == 3
+
+    def test_forked_workers_get_their_own_journals(self, tmp_path):
+        """The global writer is created before a preloading server forks; workers must not share its journal."""
+        writer = RecordWriter(MemoryRecordStore(), journal_dir=str(tmp_path))
+        writer.submit(make_records(1))
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                writer.submit(make_records(2, start=1))
+                os.write(write_end, writer.journal_path.encode())
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        child_path = os.read(read_end, 4096).decode()
+        os.close(read_end)
+        os.waitpid(pid, 0)
+        writer.submit(make_records(3, start=3))
+
+        assert child_path and child_path != writer.journal_path
+        assert len(Path(child_path).read_text().splitlines()) == 2
+        assert len(Path(writer.journal_path).read_text().splitlines()) == 4
+
+    @pytest.mark.asyncio
+    async def test_without_journal_failed_batch_kept_in_order(self):
+        store = FlakyStore()
+        store.down = True
+        writer = RecordWriter(store, batch_size=2, max_pending=3, retries=1, journal_dir=None)
+        writer.submit(make_records(4))
+
+        assert await writer.flush() == 0
+        assert writer.stats()["dropped"] == 1
+        writer.submit(make_records(1, start=4))
+
+        store.down = False
+        store.calls.clear()
+        await writer.flush()
+        assert [r.record_id for r in reversed(await store.list("org-a", 10))] == ["r0000", "r0001", "r0002"]
+        assert writer.stats()["dropped"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
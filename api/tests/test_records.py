@@ -0,0 +1,261 @@
+"""
+Tests for LUMEN SDK API defensible record stores.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import pytest
+import secrets
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+import bcrypt
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from records import (
+    EvaluationRecord, MemoryRecordStore, RecordQuery, SQLiteRecordStore, create_record_store, get_record_writer,
+)
+from routes import records as records_route
+
+EVALUATION = {"ai_output": "Take 500mg twice daily.", "human_action": "accepted", "context": {"visit": 1}}
+
+
+def make_record(record_id: str, org_id: str = "org-a", created_at: float = 1000.0, tier: int = 1,
+                packs: tuple = ()) -> EvaluationRecord:
+    verdict = {1: "ALLOW", 2: "WARN", 3: "BLOCK"}[tier]
+    compliance = [{"pack_id": pack_id, "version": "v1", "passed": True, "checks": []} for pack_id in packs]
+    return EvaluationRecord(
+        record_id, org_id, created_at, 85, tier, verdict, 0.9, "accepted", ["ca-on-phipa"],
+        "Take 500mg twice daily.", {"visit": 1}, compliance,
+    )
+
+
+async def walk(store, org_id, limit, query=None):
+    """Page through a store with cursors; returns the pages' record ids."""
+    pages, after = [], None
+    while True:
+        page = await store.list(org_id, limit, query, after)
+        if not page:
+            return pages
+        pages.append([record.record_id for record in page])
+        after = page[-1].position
+
+
+def flush_records():
+    """Write the records queued by the write-behind writer."""
+    asyncio.run(get_record_writer().flush())
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each record store backend, empty."""
+    if request.param == "memory":
+        return MemoryRecordStore()
+    return SQLiteRecordStore(str(tmp_path / "records.db"))
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+class TestRecordStores:
+    """Test both backends against the same contract."""
+
+    @pytest.mark.asyncio
+    async def test_get_is_scoped_to_organization(self, store):
+        await store.put(make_record("r1"))
+
+        assert (await store.get("org-a", "r1")).to_dict()["ai_output"] == "Take 500mg twice daily."
+        assert await store.get("org-b", "r1") is None
+        assert await store.get("org-a", "missing") is None
+
+    @pytest.mark.asyncio
+    async def test_list_newest_first_with_paging(self, store):
+        await store.put_many([make_record(f"r{i}", created_at=1000.0 + i) for i in range(5)])
+        await store.put(make_record("other", org_id="org-b", created_at=2000.0))
+
+        assert await walk(store, "org-a", 2) == [["r4", "r3"], ["r2", "r1"], ["r0"]]
+        assert await walk(store, "org-b", 10) == [["other"]]
+
+    @pytest.mark.asyncio
+    async def test_cursor_stable_under_inserts_and_ties(self, store):
+        await store.put_many([make_record(f"r{i}", created_at=1000.0 + i // 2) for i in range(6)])
+        first = await store.list("org-a", 3)
+        await store.put(make_record("newest", created_at=5000.0))
+
+        rest = await store.list("org-a", 10, after=first[-1].position)
+        assert [r.record_id for r in first + rest] == ["r5", "r4", "r3", "r2", "r1", "r0"]
+
+    @pytest.mark.asyncio
+    async def test_filters(self, store):
+        await store.put_many([
+            make_record(f"r{i}", created_at=1000.0 + i, tier=i % 3 + 1,
+                        packs=("ca-on-phipa", "us-fed-hipaa") if i % 2 else ("us-fed-hipaa",))
+            for i in range(12)
+        ])
+
+        assert await walk(store, "org-a", 2, RecordQuery(tier=3)) == [["r11", "r8"], ["r5", "r2"]]
+        assert await walk(store, "org-a", 10, RecordQuery(verdict="WARN", pack_id="ca-on-phipa")) == \
+            [["r7", "r1"]]
+        assert await walk(store, "org-a", 3, RecordQuery(pack_id="ca-on-phipa", created_after=1003.0,
+                                                         created_before=1009.0)) == [["r7", "r5", "r3"]]
+        assert await walk(store, "org-a", 10, RecordQuery(pack_id="eu-ai-act")) == []
+        assert await walk(store, "org-b", 10, RecordQuery(pack_id="us-fed-hipaa")) == []
+
+    @pytest.mark.asyncio
+    async def test_records_are_immutable(self, store):
+        await store.put(make_record("r1"))
+        rewritten = make_record("r1")
+        rewritten.lumen_score = 10
+        await store.put(rewritten)
+
+        assert (await store.get("org-a", "r1")).lumen_score == 85
+        assert len(await store.list("org-a", 10)) == 1
+
+    @pytest.mark.asyncio
+    async def test_sqlite_survives_reopen_and_uses_indexes(self, tmp_path):
+        path = str(tmp_path / "records.db")
+        first = SQLiteRecordStore(path)
+        await first.put(make_record("r1"))
+        await first.close()
+
+        second = SQLiteRecordStore(path)
+        assert (await second.get("org-a", "r1")).context == {"visit": 1}
+        conn = second._connect()
+        lookup = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM records WHERE record_id = ? AND org_id = ?", ("r1", "org-a")
+        ).fetchall()
+        page = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM records WHERE org_id = ? "
+            "ORDER BY created_at DESC, record_id DESC LIMIT 10", ("org-a",)
+        ).fetchall()
+        await second.close()
+
+        assert "sqlite_autoindex_records_1" in str(lookup)
+        assert "records_org_created" in str(page) and "TEMP B-TREE" not in str(page)
+
+    @pytest.mark.parametrize("query, index", [
+        (RecordQuery(), "records_org_created"),
+        (RecordQuery(verdict="ALLOW"), "records_org_verdict"),
+        (RecordQuery(tier=2, created_after=1.0, created_before=2.0), "records_org_tier"),
+        (RecordQuery(pack_id="ca-on-phipa", tier=1), "SEARCH i USING PRIMARY KEY"),
+    ])
+    def test_sqlite_pages_seek_an_index(self, tmp_path, query, index):
+        store = SQLiteRecordStore(str(tmp_path / "records.db"))
+        sql, args = store._list_query("org-a", 10, query, (1.5, "r1"))
+        plan = str(store._connect().execute(f"EXPLAIN QUERY PLAN {sql}", args).fetchall())
+
+        assert index in plan and "TEMP B-TREE" not in plan
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="RECORD_STORE_BACKEND"):
+            create_record_store("postgres")
+
+    def test_sqlite_requires_configured_path(self):
+        with pytest.raises(ValueError, match="RECORD_STORE_SQLITE_PATH"):
+            create_record_store("sqlite", "")
+
+    def test_sqlite_path_not_in_temp_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="temporary directory"):
+            create_record_store("sqlite", str(tmp_path / "records.db"))
+
+    @pytest.mark.asyncio
+    async def test_sqlite_files_owner_only(self, tmp_path):
+        store = SQLiteRecordStore(str(tmp_path / "records.db"))
+        await store.put(make_record("r1"))
+
+        modes = {path.name: path.stat().st_mode & 0o777 for path in tmp_path.iterdir()}
+        await store.close()
+        assert modes["records.db"] == 0o600 and set(modes.values()) == {0o600}
+
+
+class TestRecordRoutes:
+    """Test that evaluations are stored and served per organization."""
+
+    def test_evaluate_writes_record(self, client, api_key):
+        headers = {"X-API-Key": api_key}
+        evaluated = client.post("/v1/evaluate", json=EVALUATION, headers=headers).json()
+
+        # Served from the writer's queue before it is flushed
+        response = client.get(f"/v1/records/{evaluated['record_id']}", headers=headers)
+        assert response.status_code == 200
+        record = response.json()
+        assert record["lumen_score"] == evaluated["lumen_score"]
+        assert record["context"] == {"visit": 1}
+
+        flush_records()
+        assert client.get(f"/v1/records/{evaluated['record_id']}", headers=headers).json() == record
+        page = client.get("/v1/records", headers=headers).json()
+        assert [r["record_id"] for r in page["records"]] == [evaluated["record_id"]]
+        assert page["next_cursor"] is None
+
+    def test_batch_writes_records(self, client, api_key):
+        headers = {"X-API-Key": api_key}
+        batch = client.post("/v1/evaluate/batch", json={"items": [EVALUATION, {"bad": True}, EVALUATION]},
+                            headers=headers).json()
+        flush_records()
+
+        stored = {r["record_id"] for r in client.get("/v1/records", headers=headers).json()["records"]}
+        assert stored == {item["result"]["record_id"] for item in batch["results"] if item["status"] == "ok"}
+        assert len(stored) == 2
+
+    def test_other_organization_gets_404(self, client, api_key, repository):
+        evaluated = client.post("/v1/evaluate", json=EVALUATION, headers={"X-API-Key": api_key}).json()
+        flush_records()
+
+        other_org = repository.add_organization("Other Org", plan="free", owner_id="user456")
+        other_key = f"lumen_pk_dev_{secrets.token_urlsafe(32)}"
+        repository.api_keys["key456"] = {
+            "id": "key456", "org_id": other_org["id"], "name": "other", "environment": "dev",
+            "key_prefix": other_key[:20],
+            "key_hash": bcrypt.hashpw(other_key.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8"),
+            "status": "active", "created_at": "2026-02-13T15:30:00+00:00", "expires_at": None, "last_used_at": None,
+        }
+        headers = {"X-API-Key": other_key}
+
+        assert client.get(f"/v1/records/{evaluated['record_id']}", headers=headers).status_code == 404
+        assert client.get("/v1/records", headers=headers).json() == {"records": [], "next_cursor": None}
+
+    def test_cursor_pagination(self, client, api_key):
+        headers = {"X-API-Key": api_key}
+        batch = client.post("/v1/evaluate/batch", json={"items": [EVALUATION] * 5}, headers=headers).json()
+        flush_records()
+        created = {item["result"]["record_id"] for item in batch["results"]}
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/v1/records", params=params, headers=headers).json()
+            seen.extend(r["record_id"] for r in page["records"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(seen) == 5 and set(seen) == created
+        verdict = batch["results"][0]["result"]["verdict"]
+        assert len(client.get("/v1/records", params={"verdict": verdict}, headers=headers).json()["records"]) == 5
+        other = "BLOCK" if verdict != "BLOCK" else "ALLOW"
+        assert client.get("/v1/records", params={"verdict": other}, headers=headers).json()["records"] == []
+
+    def test_limit_capped_and_bad_cursor(self, client, api_key):
+        headers = {"X-API-Key": api_key}
+        client.post("/v1/evaluate/batch", json={"items": [EVALUATION] * 3}, headers=headers)
+        flush_records()
+
+        with patch.object(records_route, "RECORDS_MAX_PAGE_SIZE", 2):
+            page = client.get("/v1/records", params={"limit": 1000}, headers=headers).json()
+        assert len(page["records"]) == 2 and page["next_cursor"]
+
+        assert client.get("/v1/records", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
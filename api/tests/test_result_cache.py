@@ -0,0 +1,108 @@
+"""
+Tests for LUMEN SDK API evaluation result caching.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from auth.jwt_auth import verify_jwt_token
+from data.packs import PACKS
+from main import app
+from scoring import monte_carlo
+from scoring.result_cache import ResultCache, get_result_cache
+
+INPUTS_HASH = "a" * 64
+EVALUATION = {"ai_output": "Take 500mg twice daily.", "human_action": "accepted", "compliance_packs": ["ca-on-phipa"]}
+
+
+class TestResultCache:
+    """Test keys, LRU eviction and expiry."""
+
+    def test_key_covers_packs_not_their_order(self):
+        cache = ResultCache()
+
+        assert cache.key(INPUTS_HASH, ["ca-on-phipa", "us-fed-hipaa"]) == cache.key(INPUTS_HASH, ["us-fed-hipaa", "ca-on-phipa"])
+        assert cache.key(INPUTS_HASH, ["ca-on-phipa"]) != cache.key(INPUTS_HASH, [])
+        assert cache.key(INPUTS_HASH, []) != cache.key("b" * 64, [])
+
+    def test_pack_version_change_invalidates(self):
+        cache = ResultCache()
+        old_key = cache.key(INPUTS_HASH, ["ca-on-phipa"])
+        cache.put(old_key, "old")
+
+        with patch.dict(PACKS["ca-on-phipa"], {"version": "v2026-Q2-r1"}):
+            new_key = cache.key(INPUTS_HASH, ["ca-on-phipa"])
+
+            assert new_key != old_key
+            assert cache.get(old_key) is None
+            assert cache.stats()["invalidations"] == 1
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = ResultCache(ttl_seconds=10)
+        with patch("scoring.result_cache.time.time", return_value=1000.0):
+            cache.put("a", 1)
+        with patch("scoring.result_cache.time.time", return_value=1011.0):
+            assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+
+
+class TestEvaluateCaching:
+    """Repeated evaluations are served from the cache."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_repeat_evaluation_is_not_rescored(self, client, api_key):
+        headers = {"X-API-Key": api_key}
+        first = client.post("/v1/evaluate", json=EVALUATION, headers=headers).json()
+        hits = get_result_cache().stats()["hits"]
+
+        with patch.object(monte_carlo, "run", wraps=monte_carlo.run) as run:
+            second = client.post("/v1/evaluate", json=EVALUATION, headers=headers).json()
+
+        run.assert_not_called()
+        assert (second["lumen_score"], second["verdict"]) == (first["lumen_score"], first["verdict"])
+        assert second["record_id"] != first["record_id"]
+        assert get_result_cache().stats()["hits"] == hits + 1
+
+    def test_batch_scores_duplicates_once(self, client, api_key):
+        with patch.object(monte_carlo, "run", wraps=monte_carlo.run) as run:
+            response = client.post(
+                "/v1/evaluate/batch", json={"items": [EVALUATION, EVALUATION, {**EVALUATION, "human_action": "rejected"}]},
+                headers={"X-API-Key": api_key},
+            )
+
+        body = response.json()
+        assert body["succeeded"] == 3
+        assert len(run.call_args.args[0]) == 2
+        assert body["results"][0]["result"]["lumen_score"] == body["results"][1]["result"]["lumen_score"]
+
+    def test_metrics_report_cache(self, client):
+        app.dependency_overrides[verify_jwt_token] = lambda: {"user_id": "user123", "org_id": "org", "plan": "free"}
+        try:
+            assert "result_cache" in client.get("/health/metrics").json()
+        finally:
+            app.dependency_overrides.pop(verify_jwt_token, None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,154 @@
+"""
+Tests for LUMEN SDK API identifier scanner.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+from pydantic import ValidationError
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from compliance import get_rule_engine
+from compliance.engine import NO_PHI_REASON
+from compliance.scanner import CHECK_PATTERNS, IdentifierScanner, PhraseAutomaton, create_scanner
+from models.schemas import AI_OUTPUT_MAX_LENGTH, EvaluateRequest
+
+OUTPUT = (
+    "Patient name: Jane Roe, date of birth 1980-02-03, SSN 123-45-6789, MRN: 1234567. "
+    "Call (416) 555-1234 or email jane.doe@example.com; see https://portal.example.org/a, "
+    "HIV positive, health card 1234-567-890-AB, M5V 2T6."
+)
+
+
+def found(scanner, text):
+    return {check_id: [(text[start:end], name) for start, end, name in spans]
+            for check_id, spans in scanner.scan(text).items()}
+
+
+class TestPhraseAutomaton:
+    """Test the word-level Aho-Corasick automaton."""
+
+    def test_overlapping_phrases_and_fail_links(self):
+        scanner = IdentifierScanner({"check": ("identifier_label",)})
+        text = "date of date of birth; social security social security number; DOB"
+
+        assert found(scanner, text)["check"] == [
+            ("date of birth", "identifier_label"),
+            ("social security number", "identifier_label"),
+            ("DOB", "identifier_label"),
+        ]
+
+    def test_whole_words_only(self):
+        scanner = IdentifierScanner({"check": ("sensitive_condition",)})
+
+        assert scanner.scan("braids and hivemind") == {}
+        assert found(scanner, "Hepatitis   C")["check"] == [("Hepatitis   C", "sensitive_condition")]
+
+    def test_suffix_outputs_are_inherited(self):
+        automaton = PhraseAutomaton([("a b c", "long"), ("b c", "short")])
+        state = automaton.goto[automaton.goto[automaton.goto[0]["a"]]["b"]]["c"]
+
+        assert set(automaton.out[state]) == {("long", 3), ("short", 2)}
+
+
+class TestIdentifierScanner:
+    """Test the combined single-pass scan."""
+
+    def test_spans_reported_per_check(self):
+        spans = found(create_scanner(CHECK_PATTERNS), OUTPUT)
+
+        assert spans["hipaa-001"] == [
+            ("Patient name", "identifier_label"),
+            ("date of birth", "identifier_label"),
+            ("123-45-6789", "ssn"),
+            ("MRN: 1234567", "mrn"),
+            ("HIV", "sensitive_condition"),
+        ]
+        assert ("https://portal.example.org/a", "url") in spans["hipaa-009"]
+        assert ("jane.doe@example.com", "email") in spans["pipeda-003"]
+        assert ("1234-567-890-AB", "health_card") in spans["phipa-003"]
+        assert ("M5V 2T6", "postal_code") in spans["phipa-003"]
+
+    def test_only_enabled_checks_patterns(self):
+        scanner = create_scanner(["hipaa-001", "phipa-001"])
+
+        assert set(scanner.scan(OUTPUT)) == {"hipaa-001"}
+        assert "email" not in scanner.regex.pattern
+
+    def test_unknown_pattern_rejected(self):
+        with pytest.raises(ValueError, match="Unknown identifier pattern"):
+            IdentifierScanner({"check": ("passport",)})
+
+    def test_no_patterns(self):
+        assert create_scanner(["fda-001"]).scan(OUTPUT) == {}
+
+    @pytest.mark.parametrize("unit", ["a.", "a-", "1-", "+1-", "a@", "http://"])
+    def test_pathological_input_scans_in_linear_time(self, unit):
+        """Runs without an identifier used to make scan() quadratic (~25 s at this size)."""
+        scanner = create_scanner(CHECK_PATTERNS)
+        text = unit * (AI_OUTPUT_MAX_LENGTH // len(unit))
+
+        started = time.perf_counter()
+        scanner.scan(text)
+        assert time.perf_counter() - started < 2.0
+
+    def test_longest_local_part_still_matches(self):
+        text = "a" * 64 + "@example.com"
+
+        assert found(IdentifierScanner({"check": ("email",)}), text)["check"] == [(text, "email")]
+
+    def test_ai_output_length_capped(self):
+        EvaluateRequest(ai_output="a" * AI_OUTPUT_MAX_LENGTH, human_action="accepted")
+        with pytest.raises(ValidationError):
+            EvaluateRequest(ai_output="a" * (AI_OUTPUT_MAX_LENGTH + 1), human_action="accepted")
+
+
+class TestScannerInEvaluation:
+    """Test identifier detections feeding the checks."""
+
+    def test_deidentified_output_with_identifiers_fails_safe_harbor(self):
+        context = {"isDeIdentified": True, "deidentificationMethod": "expert_determination"}
+        engine = get_rule_engine()
+
+        clean = engine.evaluate(context, ["us-fed-hipaa"], output="Continue metformin.")
+        leaked = engine.evaluate(context, ["us-fed-hipaa"], output=OUTPUT)
+
+        check = {c.check_id: c for c in leaked[0].checks}["hipaa-009"]
+        assert {c.check_id: c for c in clean[0].checks}["hipaa-009"].passed
+        assert not check.passed
+        assert "ssn" in check.reason
+        assert check.to_dict()["matches"][0] == {"start": 0, "end": 12, "pattern": "identifier_label"}
+
+    def test_minimum_necessary_reads_detections(self):
+        context = {"phiPresent": True, "purpose": "billing"}
+        engine = get_rule_engine()
+
+        checks = {c.check_id: c for pack in engine.evaluate(context, output=OUTPUT) for c in pack.checks}
+        assert not checks["hipaa-001"].passed
+        assert not checks["phipa-003"].passed
+
+        applied = {c.check_id: c for pack in engine.evaluate({**context, "minimumNecessaryApplied": True}, output=OUTPUT)
+                   for c in pack.checks}
+        assert applied["hipaa-001"].passed
+        assert applied["hipaa-001"].matches
+
+    def test_detections_count_as_phi_without_phi_present(self):
+        output = "Patient John, SSN 123-45-6789, MRN: 1234567, date of birth 01/02/1960"
+        engine = get_rule_engine()
+
+        checks = {c.check_id: c for pack in engine.evaluate({}, output=output) for c in pack.checks}
+        for check_id in ("hipaa-001", "phipa-003", "pipeda-003"):
+            assert not checks[check_id].passed, check_id
+            assert checks[check_id].reason != NO_PHI_REASON
+
+        clean = {c.check_id: c for pack in engine.evaluate({}, output="Continue metformin.") for c in pack.checks}
+        assert clean["hipaa-001"].reason == NO_PHI_REASON
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,180 @@
+"""
+Tests for the LUMEN SDK API scoring kernel.
+
+Expected outputs in fixtures/scoring_parity.json were produced by running
+src/scoring/LumenScore.ts under Node 20 (calculatedAt fields removed).
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from models.schemas import EvaluateRequest
+from routes.evaluate import STRATEGIC_FACTORS_MAX, calculate_lumen_score
+from scoring import calculate_lumen_score as score_options, calculate_strategic_confidence
+from scoring.canonical import js_number, js_round, js_stringify
+
+PARITY = json.loads((Path(__file__).parent / "fixtures" / "scoring_parity.json").read_text(encoding="utf-8"))
+
+
+def strip_timestamps(value):
+    if isinstance(value, dict):
+        return {k: strip_timestamps(v) for k, v in value.items() if k != "calculatedAt"}
+    if isinstance(value, list):
+        return [strip_timestamps(v) for v in value]
+    return value
+
+
+def kernel_kwargs(options: dict) -> dict:
+    return {
+        "strategic_factors": options["strategicFactors"],
+        "decision_input": options["decisionInput"],
+        "risk_radar": options.get("riskRadar"),
+        "fatal_flaw_detected": options.get("fatalFlawDetected", False),
+        "phi_involved": options.get("phiInvolved", False),
+    }
+
+
+class TestTypeScriptParity:
+    """The Python kernel reproduces the TypeScript kernel exactly."""
+
+    @pytest.mark.parametrize("case", PARITY["cases"], ids=lambda case: case["name"])
+    def test_composite_score(self, case):
+        result = score_options(**kernel_kwargs(case["options"]))
+
+        assert strip_timestamps(result) == case["expected"]
+
+    @pytest.mark.parametrize("case", PARITY["cases"], ids=lambda case: case["name"])
+    def test_strategic_without_monte_carlo(self, case):
+        options = case["options"]
+        result = calculate_strategic_confidence(
+            options["strategicFactors"],
+            options.get("riskRadar"),
+            options.get("fatalFlawDetected", False),
+            options.get("phiInvolved", False),
+        )
+
+        assert strip_timestamps(result) == case["expectedStrategicWithoutMonteCarlo"]
+
+    def test_control_order_does_not_change_hash(self):
+        case = next(c for c in PARITY["cases"] if c["name"] == "controls mixed")
+        kwargs = kernel_kwargs(case["options"])
+        controls = kwargs["decision_input"]["controlResults"]
+        kwargs["decision_input"] = {**kwargs["decision_input"], "controlResults": controls[::-1]}
+
+        result = score_options(**kwargs)
+
+        assert result["decisionTrust"]["inputsHash"] == case["expected"]["decisionTrust"]["inputsHash"]
+
+
+class TestCanonicalJson:
+    """JavaScript-compatible number formatting and rounding."""
+
+    def test_numbers_match_javascript(self):
+        assert js_stringify([1.0, 0.5, 1e-7, 1e21, 0.000001, -0.0, 0.1 + 0.2]) == (
+            "[1,0.5,1e-7,1e+21,0.000001,0,0.30000000000000004]"
+        )
+
+    def test_round_half_up(self):
+        assert [js_round(v) for v in (0.5, 1.5, 2.5, -0.5, -2.5)] == [1, 2, 3, 0, -2]
+
+    def test_large_integral_float_uses_shortest_digits(self):
+        assert js_number(123456789012345680000.0) == "123456789012345680000"
+
+
+class TestEvaluateScoring:
+    """Evaluation requests are scored by the kernel."""
+
+    def test_scoring_is_deterministic(self):
+        request = EvaluateRequest(ai_output="Take 500mg twice daily.", human_action="accepted")
+
+        assert calculate_lumen_score(request) == calculate_lumen_score(request)
+
+    def test_human_rejection_lowers_score(self):
+        context = {"decisionInput": {
+            "citationIntegrity": {"totalCitations": 4, "verifiedCitations": 4,
+                                  "fabricatedCitations": 0, "mismatchedCitations": 0},
+            "controlResults": [],
+            "evidenceMetrics": {"sourceCount": 10, "avgRetrievalScore": 0.9, "documentTypeCount": 5},
+        }}
+        accepted = EvaluateRequest(ai_output="x", human_action="accepted", context=context)
+        rejected = EvaluateRequest(ai_output="x", human_action="rejected", context=context)
+
+        accepted_score, _, _, citation_integrity = calculate_lumen_score(accepted)
+        rejected_score, _, _, _ = calculate_lumen_score(rejected)
+
+        assert rejected_score < accepted_score
+        assert citation_integrity == 1.0
+
+    def test_malformed_context_rejected(self, api_key):
+        client = TestClient(app)
+        response = client.post(
+            "/v1/evaluate",
+            json={"ai_output": "x", "human_action": "accepted", "context": {"strategicFactors": [{"name": "x"}]}},
+            headers={"X-API-Key": api_key},
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("flag", ["fatalFlawDetected", "phiInvolved"])
+    @pytest.mark.parametrize("value", ["false", "true", 1, None])
+    def test_non_boolean_flags_rejected(self, api_key, flag, value):
+        client = TestClient(app)
+        response = client.post(
+            "/v1/evaluate",
+            json={"ai_output": "x", "human_action": "accepted", "context": {flag: value}},
+            headers={"X-API-Key": api_key},
+        )
+
+        assert response.status_code == 422
+        assert flag in response.json()["detail"]
+
+    def test_overflowing_counts_rejected(self, api_key):
+        client = TestClient(app)
+        decision_input = {
+            "citationIntegrity": {"totalCitations": 1e308, "verifiedCitations": 1e308,
+                                  "fabricatedCitations": 0, "mismatchedCitations": 0},
+            "controlResults": [],
+            "evidenceMetrics": {"sourceCount": 1e308, "avgRetrievalScore": 1e308, "documentTypeCount": 1e308},
+        }
+        body = {"ai_output": "x", "human_action": "accepted", "context": {"decisionInput": decision_input}}
+
+        response = client.post("/v1/evaluate", json=body, headers={"X-API-Key": api_key})
+        assert response.status_code == 422
+        assert "OverflowError" in response.json()["detail"]
+
+        response = client.post("/v1/evaluate/batch", json={"items": [body]}, headers={"X-API-Key": api_key})
+        assert response.json()["results"][0]["error"]["status_code"] == 422
+
+    def test_too_many_strategic_factors_rejected(self, api_key):
+        client = TestClient(app)
+        factors = [{"factorName": f"Factor {i}", "confidence": "Moderate"} for i in range(STRATEGIC_FACTORS_MAX + 1)]
+        response = client.post(
+            "/v1/evaluate",
+            json={"ai_output": "x", "human_action": "accepted",
+                  "context": {"strategicFactors": factors, "fatalFlawDetected": True}},
+            headers={"X-API-Key": api_key},
+        )
+
+        assert response.status_code == 422
+        assert "maximum" in response.json()["detail"]
+
+        factors.pop()
+        response = client.post(
+            "/v1/evaluate",
+            json={"ai_output": "x", "human_action": "accepted", "context": {"strategicFactors": factors}},
+            headers={"X-API-Key": api_key},
+        )
+        assert response.status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
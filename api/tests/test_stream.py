@@ -0,0 +1,188 @@
+"""
+Tests for LUMEN SDK API streaming NDJSON evaluation.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import json
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from middleware.limiter_backends import GCRARateLimit
+from middleware.rate_limit import throttle_rate_limit
+from middleware.usage import billing_period_start
+from middleware.usage_counter import get_usage_counter
+from models.schemas import EvaluateRequest
+from routes.evaluate import _NDJSONLines, calculate_lumen_score
+
+EVALUATIONS = [
+    {"ai_output": "Take 500mg twice daily.", "human_action": "accepted"},
+    {"ai_output": "Refer to cardiology.", "human_action": "modified", "context": {"phiInvolved": True}},
+    {"ai_output": "Discontinue metformin.", "human_action": "rejected", "context": {"riskRadar": {"legal": "Red"}}},
+]
+
+
+def ndjson(*lines) -> bytes:
+    return b"".join((line if isinstance(line, bytes) else json.dumps(line).encode()) + b"\n" for line in lines)
+
+
+@pytest.fixture
+def limiter():
+    """Fresh limiter state so charges from other tests don't leak in."""
+    backend = GCRARateLimit()
+    with patch("middleware.rate_limit._rate_limiter", backend):
+        yield backend
+
+
+@pytest.fixture
+def client(limiter):
+    return TestClient(app)
+
+
+def post_stream(client, api_key, body):
+    response = client.post(
+        "/v1/evaluate/stream",
+        content=body,
+        headers={"X-API-Key": api_key, "Content-Type": "application/x-ndjson"},
+    )
+    return response, [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestNDJSONLines:
+    """Test incremental line splitting."""
+
+    def test_lines_split_across_chunks(self):
+        splitter = _NDJSONLines(max_line_bytes=100)
+
+        assert splitter.feed(b'{"a": ') == []
+        assert splitter.feed(b'1}\n\n{"b"') == [(0, b'{"a": 1}')]
+        assert splitter.feed(b": 2}") == []
+        assert splitter.close() == [(2, b'{"b": 2}')]
+
+    def test_long_lines_are_dropped(self):
+        splitter = _NDJSONLines(max_line_bytes=8)
+
+        lines = splitter.feed(b"0123456789")
+        lines += splitter.feed(b"0123456789\n{}\n")
+
+        assert lines == [(0, None), (1, b"{}")]
+        assert len(splitter.buffer) == 0
+
+
+class TestStreamEvaluation:
+    """Test /v1/evaluate/stream."""
+
+    def test_results_match_single_evaluations(self, client, api_key):
+        response, results = post_stream(client, api_key, ndjson(*EVALUATIONS))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [r["index"] for r in results] == [0, 1, 2]
+        for item, outcome in zip(EVALUATIONS, results):
+            lumen_score, _, verdict, _ = calculate_lumen_score(EvaluateRequest(**item))
+            assert outcome["status"] == "ok"
+            assert outcome["result"]["lumen_score"] == lumen_score
+            assert outcome["result"]["verdict"] == verdict.value
+
+    def test_bad_lines_fail_individually(self, client, api_key):
+        body = ndjson(EVALUATIONS[0], b"{not json", {"ai_output": "x"}, b"", EVALUATIONS[1])
+
+        with patch("routes.evaluate.STREAM_MAX_LINE_BYTES", 200):
+            _, results = post_stream(client, api_key, body + b'{"ai_output": "' + b"x" * 300 + b'"}\n')
+
+        assert [(r["index"], r["status"]) for r in results] == [
+            (0, "ok"), (1, "error"), (2, "error"), (4, "ok"), (5, "error"),
+        ]
+        assert [r["error"]["status_code"] for r in results if r["error"]] == [422, 422, 413]
+
+    def test_usage_charged_per_chunk(self, client, api_key, organization):
+        period = billing_period_start(datetime.now(timezone.utc))
+
+        with patch("routes.evaluate.STREAM_CHUNK_ITEMS", 2), \
+                patch.object(get_usage_counter(), "add", wraps=get_usage_counter().add) as add:
+            post_stream(client, api_key, ndjson(*EVALUATIONS, {"ai_output": "x"}))
+
+        assert [c.args[2] for c in add.call_args_list] == [2, 1]
+        assert add.call_args_list[0].args[:2] == (organization["id"], period)
+
+    def test_rate_limit_charged_per_chunk(self, client, api_key, limiter):
+        with patch("routes.evaluate.STREAM_CHUNK_ITEMS", 2), \
+                patch.object(limiter, "is_allowed", wraps=limiter.is_allowed) as is_allowed:
+            post_stream(client, api_key, ndjson(*EVALUATIONS))
+
+        assert [c.kwargs["cost"] for c in is_allowed.await_args_list] == [2, 1]
+
+    def test_monthly_limit_ends_stream(self, client, api_key, repository, organization):
+        period = billing_period_start(datetime.now(timezone.utc))
+        repository.api_usage["usage1"] = {
+            "id": "usage1",
+            "org_id": organization["id"],
+            "period_start": period,
+            "evaluations_count": 999,
+            "last_evaluation_at": period,
+        }
+
+        with patch("routes.evaluate.STREAM_CHUNK_ITEMS", 2):
+            _, results = post_stream(client, api_key, ndjson(*EVALUATIONS, *EVALUATIONS))
+
+        assert [r["status"] for r in results] == ["ok", "error"]
+        assert results[1]["error"]["status_code"] == 429
+
+
+    def test_invalid_lines_use_no_allowance(self, client, api_key, repository, organization, limiter):
+        """Only valid lines count against the allowance; none left means 429s without throttling."""
+        period = billing_period_start(datetime.now(timezone.utc))
+        repository.api_usage["usage1"] = {
+            "id": "usage1",
+            "org_id": organization["id"],
+            "period_start": period,
+            "evaluations_count": 998,
+            "last_evaluation_at": period,
+        }
+        invalid = {"ai_output": "x"}
+        body = ndjson(EVALUATIONS[0], invalid, invalid, invalid,
+                      EVALUATIONS[1], invalid, invalid, invalid,
+                      EVALUATIONS[2], EVALUATIONS[0], EVALUATIONS[1], EVALUATIONS[2],
+                      EVALUATIONS[0])
+
+        with patch("routes.evaluate.STREAM_CHUNK_ITEMS", 4), \
+                patch.object(limiter, "is_allowed", wraps=limiter.is_allowed) as is_allowed:
+            _, results = post_stream(client, api_key, body)
+
+        # The third chunk finds no allowance left; the stream ends before the last line
+        assert [r["status"] for r in results] == ["ok"] + ["error"] * 3 + ["ok"] + ["error"] * 7
+        assert [r["error"]["status_code"] for r in results[8:]] == [429] * 4
+        # Charged for the allowance left, not for every line
+        assert [c.kwargs["cost"] for c in is_allowed.await_args_list] == [2, 1]
+
+class TestThrottle:
+    """Test waiting out the rate limit mid-stream."""
+
+    @pytest.mark.asyncio
+    async def test_waits_until_allowed(self):
+        denied = (False, {"limit": 100, "remaining": 0, "reset": 1708789200, "retry_after": 3})
+        allowed = (True, {"limit": 100, "remaining": 90, "reset": 1708789200, "retry_after": 0})
+
+        with patch("middleware.rate_limit._rate_limiter.is_allowed", AsyncMock(side_effect=[denied, allowed])), \
+                patch("middleware.rate_limit.asyncio.sleep", AsyncMock()) as sleep:
+            metadata = await throttle_rate_limit("key123", "free", 10)
+
+        assert metadata["remaining"] == 90
+        sleep.assert_awaited_once_with(3)
+
+    @pytest.mark.asyncio
+    async def test_cost_above_limit_rejected(self):
+        with pytest.raises(ValueError):
+            await throttle_rate_limit("key123", "free", 101)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
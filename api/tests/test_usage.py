@@ -0,0 +1,266 @@
+"""
+Tests for LUMEN SDK API usage counting.
+
+Copyright 2026 Forge Partners Inc.
+"""
+
+import asyncio
+import json
+import os
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+# Add api directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from main import app
+from middleware.usage_counter import UsageCounter, create_usage_counter
+
+
+PERIOD = "2026-03-01T00:00:00+00:00"
+
+EVALUATION = {"ai_output": "Take 500mg twice daily.", "human_action": "accepted"}
+
+
+def current_period() -> str:
+    now = datetime.now(timezone.utc)
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+
+class TestUsageCounter:
+    """Test the write-behind monthly usage counter."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_increments_not_lost(self, repository, organization):
+        """Increments racing with flushes all reach the database."""
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=None)
+        org_id = organization["id"]
+
+        async def worker():
+            for _ in range(50):
+                counter.add(org_id, PERIOD)
+                await asyncio.sleep(0)
+
+        async def flusher():
+            for _ in range(20):
+                await counter.flush()
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(worker() for _ in range(10)), flusher())
+        await counter.flush()
+
+        assert (await repository.get_usage(org_id, PERIOD))["evaluations_count"] == 500
+        assert await counter.current(org_id, PERIOD) == 500
+        assert counter.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_aggregates_into_one_increment(self, repository, organization):
+        """Pending evaluations for a period are written as one atomic increment."""
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=None)
+        for _ in range(7):
+            counter.add(organization["id"], PERIOD)
+
+        with patch.object(repository, "increment_usage", AsyncMock(return_value=7)) as increment:
+            assert await counter.flush() == 7
+
+        increment.assert_awaited_once()
+        assert increment.await_args.args[:3] == (organization["id"], PERIOD, 7)
+
+    @pytest.mark.asyncio
+    async def test_quota_reads_are_cached(self, repository, organization):
+        """Only the first read for a period hits the database."""
+        await repository.increment_usage(organization["id"], PERIOD, 10, PERIOD)
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=None)
+
+        with patch.object(repository, "get_usage", wraps=repository.get_usage) as get_usage:
+            assert await counter.current(organization["id"], PERIOD) == 10
+            counter.add(organization["id"], PERIOD)
+            assert await counter.current(organization["id"], PERIOD) == 11
+
+        assert get_usage.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_deltas(self, repository, organization):
+        """A failed increment is retried on the next flush."""
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=None)
+        counter.add(organization["id"], PERIOD, 3)
+
+        with patch.object(repository, "increment_usage", AsyncMock(side_effect=RuntimeError("down"))):
+            assert await counter.flush() == 0
+
+        assert counter.stats()["pending"] == 3
+        assert await counter.flush() == 3
+        assert (await repository.get_usage(organization["id"], PERIOD))["evaluations_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_past_periods_evicted_after_flush(self, repository, organization):
+        """Totals of past billing periods are dropped once their deltas are flushed."""
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=None)
+        org_id = organization["id"]
+        for period, count in ((PERIOD, 2), (current_period(), 3)):
+            await counter.current(org_id, period)
+            counter.add(org_id, period, count)
+
+        with patch.object(repository, "increment_usage", AsyncMock(side_effect=RuntimeError("down"))):
+            await counter.flush()
+        # Unflushed deltas keep their period
+        assert await counter.current(org_id, PERIOD) == 2
+        assert counter.stats()["tracked_periods"] == 2
+
+        assert await counter.flush() == 5
+        assert counter.stats()["tracked_periods"] == 1
+        assert await counter.current(org_id, current_period()) == 3
+        # A late read of a dropped period goes back to the database
+        assert await counter.current(org_id, PERIOD) == 2
+
+    @pytest.mark.asyncio
+    async def test_journal_recovers_after_crash(self, tmp_path, repository, organization):
+        """Unflushed increments are replayed from the journal on restart."""
+        crashed = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        crashed.add(organization["id"], PERIOD, 2)
+        await crashed.flush()
+        crashed.add(organization["id"], PERIOD, 5)
+        # Process dies here without flushing, releasing its lock
+        crashed._journal.close()
+
+        restarted = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        assert restarted.recover() == 5
+        await restarted.flush()
+
+        assert (await repository.get_usage(organization["id"], PERIOD))["evaluations_count"] == 7
+        assert [path.name for path in tmp_path.iterdir()] == [Path(restarted.journal_path).name]
+
+    def test_malformed_journal_entries_skipped(self, tmp_path, organization):
+        """Only positive integer increments are recovered; bad entries don't abort startup."""
+        entry = {"org_id": organization["id"], "period_start": PERIOD, "at": PERIOD}
+        lines = [
+            {**entry, "count": 4},
+            {**entry, "count": -1000},
+            {**entry, "count": 0},
+            {**entry, "count": 2.5},
+            {**entry, "count": True},
+            {"org_id": organization["id"], "count": 7},
+            [1, 2],
+        ]
+        (tmp_path / "usage-1-0.journal").write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        assert counter.recover() == 4
+        assert counter.stats()["pending"] == 4
+
+    def test_journal_dir_not_in_temp_dir(self, tmp_path):
+        with pytest.raises(ValueError, match="temporary directory"):
+            create_usage_counter(str(tmp_path / "usage"))
+        assert create_usage_counter("").journal_dir is None
+
+    @pytest.mark.asyncio
+    async def test_workers_sharing_journal_dir(self, tmp_path, repository, organization):
+        """Compaction and recovery leave a live worker's journal alone."""
+        org_id = organization["id"]
+        live = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        crashed = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        live.add(org_id, PERIOD, 3)
+        crashed.add(org_id, PERIOD, 4)
+        crashed.add(org_id, PERIOD, 1)
+        # Compacting one worker's journal keeps the other's entries
+        assert await crashed.flush() == 5
+        crashed.add(org_id, PERIOD, 6)
+        live.add(org_id, PERIOD, 2)
+        crashed._journal.close()
+
+        restarted = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        assert restarted.recover() == 6
+        # A second recovery finds nothing left to take over
+        assert UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path)).recover() == 0
+        assert await restarted.flush() == 6
+        assert await live.flush() == 5
+
+        assert (await repository.get_usage(org_id, PERIOD))["evaluations_count"] == 16
+        await live.stop()
+        await restarted.stop()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_forked_workers_get_their_own_journals(self, tmp_path):
+        """The global counter is created before a preloading server forks; workers must not share its journal."""
+        def journaled(path):
+            return sum(json.loads(line)["count"] for line in Path(path).read_text().splitlines())
+
+        counter = UsageCounter(shards=4, flush_interval=60, journal_dir=str(tmp_path))
+        counter.add("org-a", PERIOD, 1)
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                counter.recover()
+                counter.add("org-a", PERIOD, 2)
+                counter._compact_journal()
+                os.write(write_end, counter.journal_path.encode())
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        child_path = os.read(read_end, 4096).decode()
+        os.close(read_end)
+        os.waitpid(pid, 0)
+        counter.add("org-a", PERIOD, 3)
+
+        assert child_path and child_path != counter.journal_path
+        assert journaled(child_path) == 2
+        assert journaled(counter.journal_path) == 4
+        assert counter.stats()["pending"] == 4
+
+
+class TestUsageTrackingMiddleware:
+    """Test quota enforcement and usage headers on /v1/evaluate."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_usage_and_rate_limit_headers(self, client, api_key):
+        response = client.post("/v1/evaluate", json=EVALUATION, headers={"X-API-Key": api_key})
+
+        assert response.status_code == 200
+        assert response.headers["X-Lumen-Usage-Limit"] == "1000"
+        assert response.headers["X-Lumen-Usage-Used"] == "1"
+        assert response.headers["X-RateLimit-Limit"] == "100"
+
+    def test_quota_exceeded_short_circuits(self, client, api_key, repository, organization):
+        """Over quota, the 429 is sent without running the endpoint."""
+        period = current_period()
+        repository.api_usage["usage1"] = {
+            "id": "usage1",
+            "org_id": organization["id"],
+            "period_start": period,
+            "evaluations_count": 1000,
+            "last_evaluation_at": period,
+        }
+
+        with patch("routes.evaluate.calculate_lumen_score") as score:
+            response = client.post("/v1/evaluate", json=EVALUATION, headers={"X-API-Key": api_key})
+
+        assert response.status_code == 429
+        assert response.json()["detail"]["used"] == 1000
+        assert "Retry-After" in response.headers
+        score.assert_not_called()
+
+    @pytest.mark.parametrize("path, body", [
+        ("/v1/evaluate", EVALUATION),
+        ("/v1/evaluate/batch", {"items": [EVALUATION]}),
+    ])
+    def test_route_errors_are_not_replayed(self, api_key, path, body):
+        """A failing route returns 500 once; the middleware never re-runs it."""
+        client = TestClient(app, raise_server_exceptions=False)
+
+        with patch("routes.evaluate.record_events", side_effect=RuntimeError("boom")) as record:
+            response = client.post(path, json=body, headers={"X-API-Key": api_key})
+
+        assert response.status_code == 500
+        assert record.call_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])